@@ -6,7 +6,6 @@ from .settings import (
     default_location,
     get_grid_coords,
     get_pm_grade,
-    GRID_COORDINATES,
     SKY_CODE,
     PTY_CODE,
 )
@@ -21,3 +20,11 @@ __all__ = [
     "SKY_CODE",
     "PTY_CODE",
 ]
+
+
+def __getattr__(name: str):
+    # GRID_COORDINATES는 참조 데이터에서 지연 로딩 (config.settings 참고)
+    if name == "GRID_COORDINATES":
+        from . import settings
+        return settings.GRID_COORDINATES
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,6 +2,7 @@
 Weather Life MCP 설정 관리
 """
 
+import math
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -13,20 +14,27 @@ env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(env_path)
 
 
+# 공공데이터포털 주소 (v3.8: 부하 테스트 시 외부 API 시뮬레이터 주소로 바꿀 수 있음)
+PUBLIC_DATA_API_URL = os.getenv("PUBLIC_DATA_API_URL", "http://apis.data.go.kr").rstrip("/")
+
+
 @dataclass
 class APIConfig:
     """공공데이터포털 API 설정"""
 
     # 기상청 단기예보 API
     weather_api_key: str = os.getenv("WEATHER_API_KEY", "")
-    weather_base_url: str = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0"
+    weather_base_url: str = f"{PUBLIC_DATA_API_URL}/1360000/VilageFcstInfoService_2.0"
 
     # 에어코리아 대기오염정보 API
     air_quality_api_key: str = os.getenv("AIR_QUALITY_API_KEY", "")
-    air_quality_base_url: str = "http://apis.data.go.kr/B552584/ArpltnInforInqireSvc"
+    air_quality_base_url: str = f"{PUBLIC_DATA_API_URL}/B552584/ArpltnInforInqireSvc"
 
     # 에어코리아 측정소정보 API
-    station_info_base_url: str = "http://apis.data.go.kr/B552584/MsrstnInfoInqireSvc"
+    station_info_base_url: str = f"{PUBLIC_DATA_API_URL}/B552584/MsrstnInfoInqireSvc"
+
+    # 기상청 생활기상지수 API
+    life_index_base_url: str = f"{PUBLIC_DATA_API_URL}/1360000/LivingWthrIdxServiceV4"
 
 
 @dataclass
@@ -37,6 +45,9 @@ class ServerConfig:
     port: int = int(os.getenv("PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "false").lower() == "true"
 
+    # 워커 프로세스 수 (v3.8, 기본: CPU 수)
+    workers: int = int(os.getenv("SERVER_WORKERS") or os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+
 
 @dataclass
 class DefaultLocation:
@@ -56,92 +67,20 @@ server_config = ServerConfig()
 default_location = DefaultLocation()
 
 
-# 격자 좌표 매핑 (주요 지역)
-GRID_COORDINATES = {
-    # 서울
-    "서울": (60, 127),
-    "강남구": (61, 126),
-    "강동구": (62, 126),
-    "강북구": (61, 128),
-    "강서구": (58, 126),
-    "관악구": (59, 125),
-    "광진구": (62, 126),
-    "구로구": (58, 125),
-    "금천구": (59, 124),
-    "노원구": (61, 129),
-    "도봉구": (61, 129),
-    "동대문구": (61, 127),
-    "동작구": (59, 125),
-    "마포구": (59, 127),
-    "서대문구": (59, 127),
-    "서초구": (61, 125),
-    "성동구": (61, 127),
-    "성북구": (61, 127),
-    "송파구": (62, 126),
-    "양천구": (58, 126),
-    "영등포구": (58, 126),
-    "용산구": (60, 126),
-    "은평구": (59, 128),
-    "종로구": (60, 127),
-    "중구": (60, 127),
-    "중랑구": (62, 128),
-
-    # 경기
-    "수원": (60, 121),
-    "성남": (63, 124),
-    "고양": (57, 128),
-    "용인": (64, 119),
-    "부천": (56, 125),
-    "안산": (57, 121),
-    "안양": (59, 123),
-    "남양주": (64, 128),
-    "화성": (57, 119),
-    "평택": (51, 119),
-    "의정부": (61, 130),
-    "시흥": (57, 123),
-    "파주": (56, 131),
-    "광명": (58, 125),
-    "김포": (55, 128),
-    "군포": (59, 122),
-    "광주": (65, 123),
-    "이천": (68, 121),
-    "양주": (61, 131),
-    "오산": (62, 118),
-    "구리": (62, 127),
-    "안성": (65, 115),
-    "포천": (64, 134),
-    "의왕": (60, 122),
-    "하남": (64, 126),
-    "여주": (71, 121),
-    "양평": (69, 125),
-    "동두천": (61, 134),
-    "과천": (60, 124),
-
-    # 광역시
-    "부산": (98, 76),
-    "대구": (89, 90),
-    "인천": (55, 124),
-    "광주광역시": (58, 74),
-    "대전": (67, 100),
-    "울산": (102, 84),
-    "세종": (66, 103),
-
-    # 기타 주요 도시
-    "춘천": (73, 134),
-    "원주": (76, 122),
-    "강릉": (92, 131),
-    "청주": (69, 107),
-    "천안": (63, 110),
-    "전주": (63, 89),
-    "목포": (50, 67),
-    "여수": (73, 66),
-    "순천": (70, 70),
-    "포항": (102, 94),
-    "경주": (100, 91),
-    "거제": (90, 69),
-    "제주": (52, 38),
-    "서귀포": (52, 33),
-}
+# 격자 좌표 매핑 (주요 지역) - v3.8: data/reference_data.json으로 이동
+# GRID_COORDINATES는 기존 import 호환용 (모듈 __getattr__로 지연 로딩)
+
+
+def _grid_coordinates() -> dict:
+    """격자 좌표 표 (참조 데이터, 지연 로딩)"""
+    from src.reference_data import get_reference_data
+    return get_reference_data().grid_coordinates
+
+
+def __getattr__(name: str):
+    if name == "GRID_COORDINATES":
+        return _grid_coordinates()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # 미세먼지 측정소 매핑 (시도별)
@@ -207,14 +146,46 @@ def get_pm_grade(value: float, pm_type: str = "pm10") -> str:
 
 def get_grid_coords(location: str) -> tuple[int, int]:
     """지역명으로 격자 좌표 조회"""
+    grid_coordinates = _grid_coordinates()
+
     # 정확히 일치하는 경우
-    if location in GRID_COORDINATES:
-        return GRID_COORDINATES[location]
+    if location in grid_coordinates:
+        return grid_coordinates[location]
 
     # 부분 일치 검색
-    for name, coords in GRID_COORDINATES.items():
+    for name, coords in grid_coordinates.items():
         if location in name or name in location:
             return coords
 
     # 기본값 반환 (서울)
     return (default_location.nx, default_location.ny)
+
+
+def latlon_to_grid(lat: float, lon: float) -> tuple[int, int]:
+    """
+    위경도를 기상청 격자 좌표(nx, ny)로 변환
+
+    기상청 동네예보 격자 (Lambert Conformal Conic, 5km 격자)
+    """
+    re_ = 6371.00877 / 5.0  # 지구 반경 / 격자 간격 (km)
+    slat1, slat2 = math.radians(30.0), math.radians(60.0)  # 표준위도
+    olon, olat = math.radians(126.0), math.radians(38.0)  # 기준점 경도/위도
+    xo, yo = 43, 136  # 기준점 격자
+
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(
+        math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    )
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5) ** sn * math.cos(slat1) / sn
+    ro = re_ * sf / math.tan(math.pi * 0.25 + olat * 0.5) ** sn
+
+    ra = re_ * sf / math.tan(math.pi * 0.25 + math.radians(lat) * 0.5) ** sn
+    theta = math.radians(lon) - olon
+    if theta > math.pi:
+        theta -= 2.0 * math.pi
+    if theta < -math.pi:
+        theta += 2.0 * math.pi
+    theta *= sn
+
+    nx = int(ra * math.sin(theta) + xo + 0.5)
+    ny = int(ro - ra * math.cos(theta) + yo + 0.5)
+    return (nx, ny)
@@ -0,0 +1,138 @@
+"""
+3일 활동 플래너 (v3.8)
+
+단기예보(getVilageFcst) 한 번의 발표분에서 오늘/내일/모레의
+시간대별(아침/오후/저녁) 파생 스냅샷을 만들고,
+모든 활동을 한 번에 점수화하여 활동별 최적 날짜/시간대를 찾습니다.
+
+추가 API 호출 없음 - 캐시된 스냅샷 하나로 계산합니다.
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.weather_snapshot import WeatherSnapshot, ACTIVITY_SCORERS
+
+
+# 시간대 구분 (시작시각, 종료시각) - get_best_time_for_activity와 동일한 구분
+PLANNER_PERIODS = {
+    "아침": (6, 12),
+    "오후": (12, 18),
+    "저녁": (18, 22),
+}
+
+DAY_NAMES = ["오늘", "내일", "모레"]
+WEEKDAYS = ["월", "화", "수", "목", "금", "토", "일"]
+
+
+def build_period_snapshots(snap: WeatherSnapshot, now: Optional[datetime] = None) -> list:
+    """
+    예보를 날짜 x 시간대로 나눠 파생 스냅샷 목록 생성
+
+    이미 지난 시간대는 제외합니다.
+
+    Returns:
+        [{"day", "date", "period", "window", "snapshot"}, ...]
+    """
+    now = now or datetime.now()
+    current_hour = now.strftime("%Y%m%d%H")
+
+    # 날짜/시간대별 슬롯 그룹화 (한 번 순회)
+    buckets = {}
+    for f in snap.forecasts:
+        date = f.get("date")
+        time_str = f.get("time", "")
+        if not date or len(time_str) < 2:
+            continue
+        if f"{date}{time_str[:2]}" < current_hour:
+            continue
+        hour = int(time_str[:2])
+        for period, (start, end) in PLANNER_PERIODS.items():
+            if start <= hour < end:
+                buckets.setdefault((date, period), []).append(f)
+                break
+
+    dates = [(now + timedelta(days=i)).strftime("%Y%m%d") for i in range(len(DAY_NAMES))]
+
+    results = []
+    for i, date in enumerate(dates):
+        for period, (start, end) in PLANNER_PERIODS.items():
+            slots = buckets.get((date, period))
+            if not slots:
+                continue
+            dt = datetime.strptime(date, "%Y%m%d")
+            results.append({
+                "day": DAY_NAMES[i],
+                "date": f"{dt.strftime('%m/%d')}({WEEKDAYS[dt.weekday()]})",
+                "period": period,
+                "window": f"{start:02d}:00-{end:02d}:00",
+                "snapshot": WeatherSnapshot.from_hourly(snap, date, slots),
+            })
+
+    return results
+
+
+def plan_activities(snap: WeatherSnapshot, activities: Optional[list] = None) -> dict:
+    """
+    활동별 최적 날짜/시간대 계산
+
+    Args:
+        snap: 기준 날씨 스냅샷 (3일 예보 포함)
+        activities: 활동 목록 (None이면 지원하는 모든 활동)
+
+    Returns:
+        활동별 최적 시간대, 날짜별 요약
+    """
+    names = [a for a in (activities or ACTIVITY_SCORERS) if a in ACTIVITY_SCORERS]
+    unsupported = [a for a in (activities or []) if a not in ACTIVITY_SCORERS]
+
+    windows = build_period_snapshots(snap)
+
+    # 배치 점수화: 시간대 x 활동 점수 행렬
+    scores = []
+    for w in windows:
+        period_snap = w["snapshot"]
+        row = {}
+        for name in names:
+            result = ACTIVITY_SCORERS[name](period_snap)
+            row[name] = (result.get("score", 0), result.get("grade", ""))
+        scores.append(row)
+
+    best_by_activity = {}
+    for name in names:
+        if not windows:
+            break
+        best_idx = max(range(len(windows)), key=lambda i: scores[i][name][0])
+        w = windows[best_idx]
+        score, grade = scores[best_idx][name]
+        period_snap = w["snapshot"]
+        best_by_activity[name] = {
+            "day": w["day"],
+            "date": w["date"],
+            "period": w["period"],
+            "window": w["window"],
+            "score": score,
+            "grade": grade,
+            "weather": f"{period_snap.temperature}°C, {period_snap.sky}, 강수 {period_snap.rain_prob}%",
+            "recommendation": f"{w['day']} {w['period']}({w['window']})에 {name} 추천! ({score}점)",
+        }
+
+    # 날짜별 최고 활동
+    days = {}
+    for w, row in zip(windows, scores):
+        day = days.setdefault(w["day"], {"day": w["day"], "date": w["date"], "periods": []})
+        top = max(row.items(), key=lambda item: item[1][0]) if row else None
+        day["periods"].append({
+            "period": w["period"],
+            "window": w["window"],
+            "weather": f"{w['snapshot'].temperature}°C, {w['snapshot'].sky}, 강수 {w['snapshot'].rain_prob}%",
+            "top_activity": top[0] if top else None,
+            "top_score": top[1][0] if top else None,
+        })
+
+    return {
+        "best_by_activity": best_by_activity,
+        "by_day": list(days.values()),
+        "windows_analyzed": len(windows),
+        "unsupported": unsupported,
+    }
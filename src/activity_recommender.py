@@ -13,6 +13,8 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
+from src.response_detail import DETAIL_COMPACT, DETAIL_NORMAL
+
 
 @dataclass
 class WeatherData:
@@ -30,11 +32,45 @@ class WeatherData:
     temp_max: float = None  # 최고기온
 
 
+class _Discard:
+    """compact용 빈 컬렉션 - 요인/팁/점수 내역을 담지 않고 버림"""
+
+    __slots__ = ()
+
+    def append(self, item) -> None:
+        pass
+
+    def extend(self, items) -> None:
+        pass
+
+    def __setitem__(self, key, value) -> None:
+        pass
+
+    def __len__(self) -> int:
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+
+_DISCARD = _Discard()
+
+
+def _notes(detail: str, factory=list):
+    """
+    요인/팁/점수 내역을 모을 컬렉션
+
+    detail이 compact면 아무것도 담지 않는 _DISCARD를 돌려줘 목록/내역 dict를 만들지 않습니다
+    (compact 응답은 점수/등급/메시지만 사용).
+    """
+    return _DISCARD if detail == DETAIL_COMPACT else factory()
+
+
 # =============================================================================
 # 빨래지수 (기상청 서비스 종료 → 자체 부활!)
 # =============================================================================
 
-def calculate_laundry_index(weather: WeatherData) -> dict:
+def calculate_laundry_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     빨래 건조 적합도 계산 (0-100)
 
@@ -49,11 +85,11 @@ def calculate_laundry_index(weather: WeatherData) -> dict:
     - 장마철/겨울철 특별 처리
     """
     score = 100
-    factors = []
-    tips = []
+    factors = _notes(detail)
+    tips = _notes(detail)
 
     # 점수 breakdown (각 요소별 상세 점수)
-    score_breakdown = {}
+    score_breakdown = _notes(detail, dict)
 
     # 1. 강수확률 (가장 중요! 최대 -60점)
     rain_deduction = 0
@@ -168,7 +204,7 @@ def calculate_laundry_index(weather: WeatherData) -> dict:
 # 등산지수 (한국인 등산 사랑 반영!)
 # =============================================================================
 
-def calculate_hiking_index(weather: WeatherData) -> dict:
+def calculate_hiking_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     등산 적합도 계산 (0-100)
 
@@ -185,9 +221,9 @@ def calculate_hiking_index(weather: WeatherData) -> dict:
     - 일출 등산, 야간 등산 안내
     """
     score = 100
-    factors = []
-    tips = []
-    warnings = []
+    factors = _notes(detail)
+    tips = _notes(detail)
+    warnings = _notes(detail)
 
     # 1. 강수확률 (안전 최우선!)
     if weather.rain_prob >= 60:
@@ -297,7 +333,7 @@ def calculate_hiking_index(weather: WeatherData) -> dict:
     elif score >= 50:
         recommendations = ["인왕산", "안산", "아차산"]  # 비교적 낮은 산
     else:
-        recommendations = []
+        recommendations = _notes(detail)
 
     return {
         "score": score,
@@ -315,7 +351,7 @@ def calculate_hiking_index(weather: WeatherData) -> dict:
 # 피크닉지수 (한강/공원)
 # =============================================================================
 
-def calculate_picnic_index(weather: WeatherData) -> dict:
+def calculate_picnic_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     한강/공원 피크닉 적합도 (0-100)
 
@@ -331,8 +367,8 @@ def calculate_picnic_index(weather: WeatherData) -> dict:
     - 돗자리, 텐트 설치 고려
     """
     score = 100
-    factors = []
-    tips = []
+    factors = _notes(detail)
+    tips = _notes(detail)
 
     # 1. 강수확률
     if weather.rain_prob >= 50:
@@ -453,7 +489,7 @@ def calculate_picnic_index(weather: WeatherData) -> dict:
 # 세차지수
 # =============================================================================
 
-def calculate_car_wash_index(weather: WeatherData) -> dict:
+def calculate_car_wash_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     세차 적합도 계산 (0-100)
 
@@ -463,8 +499,8 @@ def calculate_car_wash_index(weather: WeatherData) -> dict:
     - 황사 여부 (봄철)
     """
     score = 100
-    factors = []
-    tips = []
+    factors = _notes(detail)
+    tips = _notes(detail)
 
     # 1. 오늘 강수확률
     if weather.rain_prob >= 50:
@@ -685,7 +721,7 @@ def calculate_kimjang_index(weather: WeatherData) -> dict:
 # 운동지수 (Health-Weather Integration, v2.2 신규)
 # =============================================================================
 
-def calculate_exercise_index(weather: WeatherData) -> dict:
+def calculate_exercise_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     야외 운동 적합도 계산 (0-100)
 
@@ -703,9 +739,9 @@ def calculate_exercise_index(weather: WeatherData) -> dict:
     - 최적 운동 시간대
     """
     score = 100
-    factors = []
-    tips = []
-    warnings = []
+    factors = _notes(detail)
+    tips = _notes(detail)
+    warnings = _notes(detail)
 
     # 1. 기온 (체온 조절 핵심!)
     if weather.temperature < -5:
@@ -976,7 +1012,7 @@ def get_weekend_recommendations(
 # 감기 위험 지수 (Cold/Flu Risk Index) - 과학적 근거 기반
 # =============================================================================
 
-def calculate_cold_flu_risk_index(weather: WeatherData, yesterday_temp: float = None) -> dict:
+def calculate_cold_flu_risk_index(weather: WeatherData, yesterday_temp: float = None, detail: str = DETAIL_NORMAL) -> dict:
     """
     감기/독감 위험 지수 계산 (0-100, 높을수록 위험)
 
@@ -989,8 +1025,8 @@ def calculate_cold_flu_risk_index(weather: WeatherData, yesterday_temp: float =
     출처: Yale University, MIT, PNAS, Nature 연구
     """
     risk_score = 0
-    factors = []
-    recommendations = []
+    factors = _notes(detail)
+    recommendations = _notes(detail)
 
     temp = weather.temperature
     humidity = weather.humidity
@@ -1162,7 +1198,7 @@ def calculate_cold_flu_risk_index(weather: WeatherData, yesterday_temp: float =
 # 출퇴근 지수 (Commute Index) - 다중 교통수단 고려
 # =============================================================================
 
-def calculate_commute_index(weather: WeatherData) -> dict:
+def calculate_commute_index(weather: WeatherData, detail: str = DETAIL_NORMAL) -> dict:
     """
     출퇴근 적합도 지수 (0-100, 높을수록 좋음)
 
@@ -1185,11 +1221,11 @@ def calculate_commute_index(weather: WeatherData) -> dict:
     pm25 = weather.pm25_grade
 
     # 공통 감점 요소 계산
-    common_factors = []
+    common_factors = _notes(detail)
 
     # === 자가용/택시 점수 ===
     car_score = 100
-    car_factors = []
+    car_factors = _notes(detail)
 
     # 강수 영향 (치명사고 증가)
     if rain_prob >= 80 or "비" in sky or "눈" in sky:
@@ -1218,7 +1254,7 @@ def calculate_commute_index(weather: WeatherData) -> dict:
 
     # === 대중교통 점수 (버스정류장 대기 고려) ===
     transit_score = 100
-    transit_factors = []
+    transit_factors = _notes(detail)
 
     # 기온 영향 (정류장 대기)
     if temp < -5:
@@ -1267,7 +1303,7 @@ def calculate_commute_index(weather: WeatherData) -> dict:
 
     # === 도보/자전거 점수 ===
     walk_score = 100
-    walk_factors = []
+    walk_factors = _notes(detail)
 
     # 기온 영향 (UTCI 기준 9-26°C 쾌적)
     if temp < 0:
@@ -1348,7 +1384,7 @@ def calculate_commute_index(weather: WeatherData) -> dict:
         message = "가능하면 재택/휴가를 권장합니다"
 
     # 시간대별 팁
-    time_tips = []
+    time_tips = _notes(detail)
     if temp < 5:
         time_tips.append("아침: 체감온도 더 낮음, 따뜻하게")
     if temp > 28:
@@ -1401,7 +1437,7 @@ def _get_grade(score: int) -> str:
 # 알레르기 위험 지수 (Allergy Risk Index) - 계절/황사 연동
 # =============================================================================
 
-def calculate_allergy_risk_index(weather: WeatherData, season: str = None) -> dict:
+def calculate_allergy_risk_index(weather: WeatherData, season: str = None, detail: str = DETAIL_NORMAL) -> dict:
     """
     알레르기 위험 지수 (0-100, 높을수록 위험)
 
@@ -1424,8 +1460,8 @@ def calculate_allergy_risk_index(weather: WeatherData, season: str = None) -> di
             season = "겨울"
 
     risk_score = 0
-    factors = []
-    recommendations = []
+    factors = _notes(detail)
+    recommendations = _notes(detail)
     allergens = []
 
     # 1. 미세먼지 점수 (0-40점)
@@ -1544,7 +1580,7 @@ def calculate_allergy_risk_index(weather: WeatherData, season: str = None) -> di
 # 편두통 위험 지수 (Migraine Risk Index) - v2.4 신규
 # =============================================================================
 
-def calculate_migraine_risk_index(weather_data: dict, air_data: dict) -> dict:
+def calculate_migraine_risk_index(weather_data: dict, air_data: dict, detail: str = DETAIL_NORMAL) -> dict:
     """
     편두통 위험 지수 계산 (0-100, 높을수록 안전)
 
@@ -1562,7 +1598,7 @@ def calculate_migraine_risk_index(weather_data: dict, air_data: dict) -> dict:
         dict: score, grade, risk_factors, advice
     """
     risk_score = 0
-    risk_factors = []
+    risk_factors = _notes(detail)
 
     # 날씨 데이터 추출
     sky = weather_data.get("sky", "맑음")
@@ -1630,7 +1666,7 @@ def calculate_migraine_risk_index(weather_data: dict, air_data: dict) -> dict:
 # 수면 컨디션 지수 (Sleep Quality Index) - v2.4 신규
 # =============================================================================
 
-def calculate_sleep_quality_index(weather_data: dict, air_data: dict) -> dict:
+def calculate_sleep_quality_index(weather_data: dict, air_data: dict, detail: str = DETAIL_NORMAL) -> dict:
     """
     수면 컨디션 지수 계산 (0-100, 높을수록 좋음)
 
@@ -1647,7 +1683,7 @@ def calculate_sleep_quality_index(weather_data: dict, air_data: dict) -> dict:
         dict: score, grade, optimal_conditions, tips
     """
     score = 0
-    tips = []
+    tips = _notes(detail)
 
     # 데이터 추출
     temp_current = weather_data.get("temp_current", 20)
@@ -1723,7 +1759,7 @@ def calculate_sleep_quality_index(weather_data: dict, air_data: dict) -> dict:
 # 사진 촬영 지수 (Photography Index) - v2.4 신규
 # =============================================================================
 
-def calculate_photography_index(weather_data: dict) -> dict:
+def calculate_photography_index(weather_data: dict, detail: str = DETAIL_NORMAL) -> dict:
     """
     사진 촬영 적합도 지수 (0-100, 높을수록 좋음)
 
@@ -1821,7 +1857,7 @@ def calculate_photography_index(weather_data: dict) -> dict:
 # 관절통 지수 (Joint Pain Index) - v2.4 신규
 # =============================================================================
 
-def calculate_joint_pain_index(weather_data: dict, air_data: dict) -> dict:
+def calculate_joint_pain_index(weather_data: dict, air_data: dict, detail: str = DETAIL_NORMAL) -> dict:
     """
     관절통 위험 지수 계산 (0-100, 높을수록 관절에 좋음)
 
@@ -1838,7 +1874,7 @@ def calculate_joint_pain_index(weather_data: dict, air_data: dict) -> dict:
         dict: score, grade, risk_factors, advice
     """
     risk_score = 0
-    risk_factors = []
+    risk_factors = _notes(detail)
 
     # 데이터 추출
     temp_min = weather_data.get("temp_min")
@@ -2048,7 +2084,7 @@ def calculate_drive_index(weather_data: dict, air_data: dict = None) -> dict:
     }
 
 
-def calculate_camping_index(weather_data: dict, air_data: dict = None) -> dict:
+def calculate_camping_index(weather_data: dict, air_data: dict = None, detail: str = DETAIL_NORMAL) -> dict:
     """
     캠핑지수 - 야외 캠핑 적합도 계산 (0-100, 높을수록 좋음)
 
@@ -2067,9 +2103,9 @@ def calculate_camping_index(weather_data: dict, air_data: dict = None) -> dict:
     Returns:
         dict: score, grade, grade_kr, factors, recommendations, warnings
     """
-    factors = []
-    recommendations = []
-    warnings = []
+    factors = _notes(detail)
+    recommendations = _notes(detail)
+    warnings = _notes(detail)
 
     # 데이터 추출
     sky = weather_data.get("sky", "맑음")
@@ -2210,7 +2246,7 @@ def calculate_camping_index(weather_data: dict, air_data: dict = None) -> dict:
     }
 
 
-def calculate_fishing_index(weather_data: dict) -> dict:
+def calculate_fishing_index(weather_data: dict, detail: str = DETAIL_NORMAL) -> dict:
     """
     낚시지수 - 낚시 적합도 계산 (0-100, 높을수록 좋음)
 
@@ -2228,9 +2264,9 @@ def calculate_fishing_index(weather_data: dict) -> dict:
     Returns:
         dict: score, grade, grade_kr, factors, recommendations, warnings
     """
-    factors = []
-    recommendations = []
-    warnings = []
+    factors = _notes(detail)
+    recommendations = _notes(detail)
+    warnings = _notes(detail)
 
     # 데이터 추출
     sky = weather_data.get("sky", "맑음")
@@ -2350,7 +2386,7 @@ def calculate_fishing_index(weather_data: dict) -> dict:
     }
 
 
-def calculate_golf_index(weather_data: dict, air_data: dict = None) -> dict:
+def calculate_golf_index(weather_data: dict, air_data: dict = None, detail: str = DETAIL_NORMAL) -> dict:
     """
     골프지수 - 골프 플레이 적합도 계산 (0-100, 높을수록 좋음)
 
@@ -2370,9 +2406,9 @@ def calculate_golf_index(weather_data: dict, air_data: dict = None) -> dict:
         dict: score, grade, grade_kr, factors, recommendations, warnings
     """
     score = 100
-    factors = []
-    recommendations = []
-    warnings = []
+    factors = _notes(detail)
+    recommendations = _notes(detail)
+    warnings = _notes(detail)
 
     # 데이터 추출
     sky = weather_data.get("sky", "맑음")
@@ -2817,7 +2853,9 @@ def calculate_date_course(weather_data: dict, air_data: dict, style: str = "roma
     Returns:
         추천 데이트 코스 및 날씨 분석
     """
-    from src.spots_database import DATE_COURSES, PICNIC_SPOTS
+    from src.reference_data import get_reference_data
+
+    data = get_reference_data()
 
     # 날씨 데이터 추출
     temperature = weather_data.get("temperature", 20)
@@ -2890,7 +2928,7 @@ def calculate_date_course(weather_data: dict, air_data: dict, style: str = "roma
         message = "실내 데이트를 추천합니다."
 
     # 스타일에 맞는 코스 선택
-    courses = DATE_COURSES.get(style, DATE_COURSES["romantic"])
+    courses = data.date_courses.get(style, data.date_courses["romantic"])
 
     # 추천 코스 (상위 3개)
     recommended_courses = []
@@ -2920,7 +2958,7 @@ def calculate_date_course(weather_data: dict, air_data: dict, style: str = "roma
     if score >= 70 and 10 <= temperature <= 28 and rain_prob < 30:
         hangang_tip = {
             "recommendation": "한강 피크닉 추천!",
-            "best_spots": [spot["name"] for spot in PICNIC_SPOTS[:3]],
+            "best_spots": [spot["name"] for spot in data.spots_by_activity["picnic"][:3]],
             "chimaek_time": "17:00-21:00 치맥 타임"
         }
 
@@ -2944,31 +2982,17 @@ def calculate_date_course(weather_data: dict, air_data: dict, style: str = "roma
 
 def get_activity_spots(activity: str, weather_score: int, location: str = "서울") -> dict:
     """
-    활동별 추천 장소 반환 (v3.0)
+    활동별 추천 장소 반환 (v3.0, v3.8 위치 기반 정렬)
     """
-    from src.spots_database import (
-        HIKING_SPOTS, CAMPING_SPOTS, PICNIC_SPOTS,
-        DRIVE_COURSES, FISHING_SPOTS, GOLF_COURSES,
-        RUNNING_COURSES, BBQ_SPOTS
-    )
-
-    spots_map = {
-        "hiking": {"data": HIKING_SPOTS, "name": "등산"},
-        "camping": {"data": CAMPING_SPOTS, "name": "캠핑"},
-        "picnic": {"data": PICNIC_SPOTS, "name": "피크닉"},
-        "drive": {"data": DRIVE_COURSES, "name": "드라이브"},
-        "fishing": {"data": FISHING_SPOTS, "name": "낚시"},
-        "golf": {"data": GOLF_COURSES, "name": "골프"},
-        "running": {"data": RUNNING_COURSES, "name": "러닝"},
-        "bbq": {"data": BBQ_SPOTS, "name": "바베큐"},
-    }
+    from src.reference_data import get_reference_data
+    from src.kakao_map_api import get_location_coordinates
 
-    if activity not in spots_map:
+    data = get_reference_data()
+    if activity not in data.spots_by_activity:
         return {"error": f"지원하지 않는 활동: {activity}"}
 
-    activity_info = spots_map[activity]
-    all_spots = activity_info["data"]
-    activity_name = activity_info["name"]
+    all_spots = data.spots_by_activity[activity]
+    activity_name = data.activity_names[activity]
 
     # 점수에 따라 추천 개수 조절
     if weather_score >= 80:
@@ -2984,11 +3008,22 @@ def get_activity_spots(activity: str, weather_score: int, location: str = "서
         count = 1
         recommendation = f"오늘은 {activity_name}에 적합하지 않아요."
 
+    # 위치를 알면 가까운 순 (v3.8 공간 인덱스)
+    coords = get_location_coordinates(location)
+    if coords:
+        x, y = coords  # 경도, 위도
+        spots = [
+            {**spot, "distance_km": distance}
+            for spot, distance in data.spot_index().nearby(activity, y, x, limit=count)
+        ]
+    else:
+        spots = all_spots[:count]
+
     return {
         "activity": activity,
         "activity_name": activity_name,
         "weather_score": weather_score,
         "recommendation": recommendation,
-        "spots": all_spots[:count],
+        "spots": spots,
         "total_available": len(all_spots)
     }
@@ -3,7 +3,6 @@
 https://www.data.go.kr/data/15073861/openapi.do
 """
 
-import httpx
 from typing import Optional
 import sys
 from pathlib import Path
@@ -12,6 +11,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import api_config, get_pm_grade
+from src.upstream import upstream_get
+from src.upstream_errors import UpstreamError, parse_json
 
 
 class AirQualityAPI:
@@ -39,13 +40,18 @@ class AirQualityAPI:
             "ver": "1.3",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "airkorea",
                 f"{self.base_url}/getMsrstnAcctoRltmMesureDnsty",
                 params=params,
                 timeout=30.0,
+                hedge=True,
             )
-            return self._parse_station_response(response.json(), station_name)
+            data = parse_json("airkorea", response)
+        except UpstreamError as e:
+            return e.to_error()
+        return self._parse_station_response(data, station_name)
 
     async def get_realtime_by_sido(self, sido_name: str) -> dict:
         """
@@ -63,13 +69,18 @@ class AirQualityAPI:
             "ver": "1.3",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "airkorea",
                 f"{self.base_url}/getCtprvnRltmMesureDnsty",
                 params=params,
                 timeout=30.0,
+                hedge=True,
             )
-            return self._parse_sido_response(response.json(), sido_name)
+            data = parse_json("airkorea", response)
+        except UpstreamError as e:
+            return e.to_error()
+        return self._parse_sido_response(data, sido_name)
 
     async def get_forecast(self, search_date: Optional[str] = None) -> dict:
         """
@@ -91,13 +102,17 @@ class AirQualityAPI:
             "searchDate": search_date,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "airkorea",
                 f"{self.base_url}/getMinuDustFrcstDspth",
                 params=params,
                 timeout=30.0,
             )
-            return self._parse_forecast_response(response.json())
+            data = parse_json("airkorea", response)
+        except UpstreamError as e:
+            return e.to_error()
+        return self._parse_forecast_response(data)
 
     async def get_nearby_station(self, tm_x: float, tm_y: float) -> dict:
         """
@@ -115,13 +130,17 @@ class AirQualityAPI:
             "ver": "1.1",
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "airkorea",
                 f"{self.station_url}/getNearbyMsrstnList",
                 params=params,
                 timeout=30.0,
             )
-            return self._parse_nearby_station_response(response.json())
+            data = parse_json("airkorea", response)
+        except UpstreamError as e:
+            return e.to_error()
+        return self._parse_nearby_station_response(data)
 
     def _parse_station_response(self, data: dict, station_name: str) -> dict:
         """측정소별 응답 파싱"""
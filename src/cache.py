@@ -0,0 +1,327 @@
+"""
+캐싱 레이어 (v2.2 신규 - API 최적화)
+
+server.py에서 분리 - 스냅샷 빌더(weather_snapshot)와 도구들이 같은 캐시를 공유
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Hashable, Optional
+
+from config.settings import get_grid_coords
+from src.weather_api import get_current_weather, get_current_weather_at, get_weather_forecast
+from src.air_quality_api import get_air_quality
+from src.life_index_api import get_all_life_indices
+from src.upstream_errors import ERROR_BAD_REQUEST, ERROR_QUOTA, ERROR_TRANSIENT
+from src.cache_backend import CACHE_STALE_SECONDS, decode_entry, encode_entry, get_cache_backend
+from src.worker_bus import EVENT_UPDATE, add_bus_listener, publish
+from src.metrics import (
+    CACHE_COALESCED, CACHE_HIT, CACHE_MISS, CACHE_SHARED_HIT, CACHE_STALE, record_cache,
+)
+from src.tracing import current_span, span
+
+
+# 메모리 캐시 (TTL 지원)
+_cache = {}
+_cache_ttl = {}
+_cache_stored = {}  # 저장 시각 (데이터 나이 계산용)
+_inflight = {}  # 조회 중인 키 → Future (v3.8, 동시 미스 합치기)
+
+
+def _make_cache_key(name: str, args: tuple, kwargs: dict) -> str:
+    """캐시 키 생성"""
+    return f"{name}:{str(args)}:{str(kwargs)}"
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    """함께 기다린 요청이 없어도 '예외 미확인' 경고가 나지 않게"""
+    if not future.cancelled():
+        future.exception()
+
+
+def _record(name: str, event: str) -> None:
+    """캐시 조회 결과 기록 (메트릭 + 현재 캐시 스팬)"""
+    record_cache(name, event)
+    current_span().set("event", event)
+
+
+def _store_local(cache_key: str, value, stored_at: float, expires_at: float) -> None:
+    _cache[cache_key] = value
+    _cache_ttl[cache_key] = expires_at
+    _cache_stored[cache_key] = stored_at
+
+
+def _apply_bus_event(message: dict, body: bytes) -> None:
+    """다른 워커가 보낸 캐시 이벤트 반영"""
+    cache_key = message.get("key")
+    if not cache_key:
+        return
+    entry = decode_entry(body) if message.get("type") == EVENT_UPDATE and body else None
+    if entry is None:
+        # 무효화 - 이전 값은 오류 대비로 남기고 만료만 (다음 조회는 공유 백엔드에서)
+        if cache_key in _cache_ttl:
+            _cache_ttl[cache_key] = 0
+        return
+    if entry["stored_at"] >= _cache_stored.get(cache_key, 0):
+        _store_local(cache_key, entry["value"], entry["stored_at"], entry["expires_at"])
+
+
+add_bus_listener(_apply_bus_event)
+
+
+def cached_async(ttl_seconds: int = 300, shared: bool = True, cell_key: Optional[Callable[..., str]] = None):
+    """
+    비동기 함수용 TTL 캐시 데코레이터
+
+    v3.8: 프로세스 내 캐시(L1) 뒤에 공유 백엔드(cache_backend, CACHE_BACKEND 설정)를 둡니다.
+    L1에 없으면 공유 백엔드를 보고, 거기에도 없을 때만 함수를 실행합니다.
+    같은 키의 동시 미스는 한 번만 실행하고 결과를 나눠 씁니다.
+
+    Args:
+        ttl_seconds: 신선 기간 (초)
+        shared: False면 공유 백엔드/워커 버스를 쓰지 않음 (JSON으로 바꿀 수 없는 값)
+        cell_key: 인자 → 정규화된 셀 키 (샤딩 백엔드가 담당 노드를 고를 때 사용, 없으면 캐시 키)
+    """
+    def decorator(func):
+        name = func.__name__
+        span_name = f"cache {name}"
+
+        async def fill(cache_key: str, now: float, args, kwargs):
+            """L1 미스 - 공유 백엔드 확인 후 함수 실행"""
+            # 외부 API 실패(오류 응답/예외) 시 만료된 이전 값이 있으면 그 값으로 응답 (v3.8)
+            # 단, 잘못된 요청(bad_request)은 이전 값으로 가리지 않음
+            stale = _cache.get(cache_key)
+            has_stale = isinstance(stale, dict) and "error" not in stale
+
+            # 공유 백엔드 확인 (다른 워커가 저장한 값)
+            backend = get_cache_backend() if shared else None
+            route = cell_key(*args, **kwargs) if backend is not None and cell_key else None
+            if backend is not None:
+                data = await backend.get(cache_key, route)
+                entry = decode_entry(data) if data is not None else None
+                if entry is not None:
+                    if now < entry["expires_at"]:
+                        _store_local(cache_key, entry["value"], entry["stored_at"], entry["expires_at"])
+                        _record(name, CACHE_SHARED_HIT)
+                        return entry["value"]
+                    if not has_stale:
+                        stale, has_stale = entry["value"], True
+                        _cache_stored[cache_key] = entry["stored_at"]
+
+            # 캐시 미스 - 함수 실행
+            _record(name, CACHE_MISS)
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if has_stale and getattr(e, "serve_stale", True):
+                    _record(name, CACHE_STALE)
+                    return stale
+                raise
+
+            if isinstance(result, dict) and "error" in result:
+                error_type = result.get("error_type")
+                if has_stale and error_type != ERROR_BAD_REQUEST:
+                    _record(name, CACHE_STALE)
+                    return stale
+                # 일시적 오류/한도 초과는 캐시하지 않음 (다음 호출에서 다시 시도)
+                if error_type in (ERROR_TRANSIENT, ERROR_QUOTA):
+                    return result
+
+            # 캐시 저장 (공유 백엔드에는 이전 값 응답용으로 CACHE_STALE_SECONDS 더 보관)
+            # 새로 받은 값은 다른 워커에도 알림 (멀티 워커 모드)
+            _store_local(cache_key, result, now, now + ttl_seconds)
+            if shared and not (isinstance(result, dict) and "error" in result):
+                data = encode_entry(result, now, now + ttl_seconds)
+                if data is not None:
+                    if backend is not None:
+                        await backend.set(cache_key, data, ttl_seconds + CACHE_STALE_SECONDS, route)
+                    publish({"type": EVENT_UPDATE, "key": cache_key}, data)
+
+            return result
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name, cache=name):
+                # 캐시 키 생성
+                cache_key = _make_cache_key(name, args, kwargs)
+                now = time.time()
+
+                # 캐시 히트 확인
+                if cache_key in _cache:
+                    if now < _cache_ttl.get(cache_key, 0):
+                        _record(name, CACHE_HIT)
+                        return _cache[cache_key]
+
+                # 같은 키를 이미 조회 중이면 그 결과를 함께 기다림 (동시 미스 합치기)
+                loop = asyncio.get_running_loop()
+                inflight = _inflight.get(cache_key)
+                if inflight is not None and inflight.get_loop() is loop:
+                    _record(name, CACHE_COALESCED)
+                    try:
+                        return await asyncio.shield(inflight)
+                    except asyncio.CancelledError:
+                        if not inflight.cancelled():
+                            raise
+                        # 먼저 조회하던 요청이 취소됨 - 직접 조회
+
+                future = loop.create_future()
+                future.add_done_callback(_retrieve_exception)
+                _inflight[cache_key] = future
+                try:
+                    result = await fill(cache_key, now, args, kwargs)
+                except Exception as e:
+                    future.set_exception(e)
+                    raise
+                except BaseException:
+                    future.cancel()
+                    raise
+                else:
+                    future.set_result(result)
+                    return result
+                finally:
+                    if _inflight.get(cache_key) is future:
+                        del _inflight[cache_key]
+
+        def age(*args, **kwargs) -> Optional[float]:
+            """캐시된 값의 나이 (초), 캐시에 없으면 None"""
+            stored = _cache_stored.get(_make_cache_key(func.__name__, args, kwargs))
+            if stored is None:
+                return None
+            return time.time() - stored
+
+        wrapper.age = age
+        return wrapper
+    return decorator
+
+
+# =============================================================================
+# 크기 제한 TTL 캐시 (v3.8 - 외부 검색 결과용)
+# =============================================================================
+
+# 이름 → TTLCache (통계 조회용)
+_named_caches = {}
+
+
+class TTLCache:
+    """크기 제한 + TTL 캐시 (LRU 축출, 적중률 통계)"""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (만료 시각, 값)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        _named_caches[name] = self
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (없거나 만료되면 None)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            record_cache(self.name, CACHE_MISS)
+            return None
+
+        expires_at, value = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            record_cache(self.name, CACHE_MISS)
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        record_cache(self.name, CACHE_HIT)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """캐시 저장 (가득 차면 가장 오래 안 쓴 항목 축출)"""
+        self._entries[key] = (time.time() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """전체 삭제 (통계는 유지)"""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """적중률 통계"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+def clear_all_caches() -> None:
+    """cached_async + 모든 TTLCache 비우기 (테스트/벤치마크용, 공유 백엔드는 그대로)"""
+    _cache.clear()
+    _cache_ttl.clear()
+    _cache_stored.clear()
+    for cache in _named_caches.values():
+        cache.clear()
+
+
+def get_cache_stats() -> dict:
+    """모든 TTLCache + 공유 백엔드 통계"""
+    stats = {name: cache.stats() for name, cache in _named_caches.items()}
+    backend = get_cache_backend()
+    if backend is not None:
+        stats["shared_backend"] = backend.stats()
+    return stats
+
+
+# =============================================================================
+# 캐싱된 API 래퍼 함수들 (v2.5 성능 최적화)
+# =============================================================================
+
+def grid_cell_key(location: str) -> str:
+    """지역명 → 기상청 격자 셀 키 (같은 격자의 지역명들이 같은 캐시 노드로)"""
+    nx, ny = get_grid_coords(location)
+    return f"grid:{nx}:{ny}"
+
+
+def station_cell_key(location: str) -> str:
+    """지역명 → 에어코리아 조회 키 (측정소/시도는 조회 시 정해지므로 지역명 사용)"""
+    return f"airkorea:{location}"
+
+
+@cached_async(ttl_seconds=300, cell_key=grid_cell_key)  # 5분 캐시
+async def cached_get_weather(location: str) -> dict:
+    """캐싱된 날씨 조회"""
+    return await get_current_weather(location)
+
+@cached_async(ttl_seconds=300, cell_key=lambda nx, ny: f"grid:{nx}:{ny}")  # 5분 캐시
+async def cached_get_weather_at(nx: int, ny: int) -> dict:
+    """캐싱된 격자 좌표 날씨 조회 (같은 격자의 장소들이 공유)"""
+    return await get_current_weather_at(nx, ny)
+
+@cached_async(ttl_seconds=300, cell_key=grid_cell_key)  # 5분 캐시
+async def cached_get_forecast(location: str) -> dict:
+    """캐싱된 예보 조회"""
+    return await get_weather_forecast(location)
+
+@cached_async(ttl_seconds=600, cell_key=station_cell_key)  # 10분 캐시
+async def cached_get_air_quality(location: str) -> dict:
+    """캐싱된 미세먼지 조회"""
+    return await get_air_quality(location)
+
+@cached_async(ttl_seconds=3600, cell_key=grid_cell_key)  # 1시간 캐시
+async def cached_get_life_index(location: str) -> dict:
+    """캐싱된 생활기상지수 조회"""
+    return await get_all_life_indices(location)
@@ -0,0 +1,359 @@
+"""
+공유 캐시 백엔드 (v3.8)
+
+워커/파드를 여러 개 띄우면 프로세스마다 캐시가 따로 있어 외부 API 호출도 그만큼 늘어납니다.
+cached_async의 프로세스 내 캐시(L1) 뒤에 공유 백엔드를 두어 워커끼리 조회 결과를 나눠 씁니다.
+
+| CACHE_BACKEND | 범위 | 저장 위치 |
+|---------------|------|----------|
+| memory (기본) | 프로세스 하나 | L1만 사용 (공유 안 함) |
+| shm | 같은 호스트의 프로세스들 | /dev/shm(tmpfs) 아래 항목별 파일 |
+| redis | 여러 호스트 | Redis 프로토콜 서버 (RESP, 추가 패키지 없음) |
+| sharded | 여러 노드에 나눠 저장 | 셀 키 일관된 해싱 (cache_ring) |
+
+- 항목마다 JSON으로 직렬화 (JSON으로 바꿀 수 없는 값은 L1에만 저장)
+- 백엔드는 최선 노력: 실패하면 조회 없음으로 보고 외부 API를 호출 (요청은 실패하지 않음)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+import weakref
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "wlm:")
+
+# 신선 기간이 끝난 뒤에도 이전 값으로 응답할 수 있게 보관하는 시간 (초)
+CACHE_STALE_SECONDS = float(os.getenv("CACHE_STALE_SECONDS", "3600"))
+
+# shm - 같은 호스트 공유 디렉토리 (tmpfs가 있으면 메모리에 저장)
+_SHM_ROOT = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+CACHE_SHM_DIR = Path(os.getenv("CACHE_SHM_DIR", str(_SHM_ROOT / "weather-life-mcp-cache")))
+SHM_SWEEP_EVERY = 500  # 저장 몇 번마다 만료 파일 정리
+
+# redis
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://127.0.0.1:6379/0")
+CACHE_BACKEND_TIMEOUT = float(os.getenv("CACHE_BACKEND_TIMEOUT", "0.2"))
+REDIS_RETRY_SECONDS = 5.0  # 연결 실패 후 다시 연결을 시도하기까지 (그동안은 조회 없음)
+
+
+def encode_entry(value, stored_at: float, expires_at: float) -> Optional[bytes]:
+    """캐시 항목 직렬화 (JSON으로 바꿀 수 없으면 None)"""
+    try:
+        return json.dumps(
+            {"value": value, "stored_at": stored_at, "expires_at": expires_at},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+
+
+def decode_entry(data: bytes) -> Optional[dict]:
+    """캐시 항목 역직렬화 ({"value", "stored_at", "expires_at"}, 깨졌으면 None)"""
+    try:
+        entry = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict) or "value" not in entry:
+        return None
+    return entry
+
+
+class CacheBackend:
+    """공유 캐시 백엔드 인터페이스 (키는 str, 값은 직렬화된 bytes)"""
+
+    name = "base"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @staticmethod
+    def storage_key(key: str) -> str:
+        """백엔드 저장 키 (길이 고정, 공백/한글 없음)"""
+        return CACHE_KEY_PREFIX + hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    # route: 샤딩용 셀 키 (cache_ring.ShardedBackend만 사용, 나머지는 무시)
+
+    async def get(self, key: str, route: Optional[str] = None) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float, route: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str, route: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# =============================================================================
+# shm - 같은 호스트 프로세스 공유 (tmpfs 파일)
+# =============================================================================
+
+
+class SharedFileBackend(CacheBackend):
+    """
+    항목별 파일 (첫 줄: 만료 시각, 나머지: 데이터)
+
+    쓰기는 임시 파일 + os.replace로 원자적이라 다른 프로세스가 쓰다 만 파일을 읽지 않습니다.
+    """
+
+    name = "shm"
+
+    def __init__(self, directory: Path = CACHE_SHM_DIR):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / self.storage_key(key).replace(":", "_")
+
+    async def get(self, key: str, route: Optional[str] = None) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                header, _, data = f.read().partition(b"\n")
+            expires_at = float(header)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            self.errors += 1
+            return None
+        if time.time() >= expires_at:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float, route: Optional[str] = None) -> None:
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                f.write(f"{time.time() + ttl_seconds:.3f}\n".encode("ascii"))
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            self.errors += 1
+            return
+        self._writes += 1
+        if self._writes % SHM_SWEEP_EVERY == 0:
+            self.sweep()
+
+    async def delete(self, key: str, route: Optional[str] = None) -> None:
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def sweep(self) -> int:
+        """만료된 파일 삭제, 삭제한 수"""
+        removed = 0
+        now = time.time()
+        for path in self.directory.iterdir():
+            try:
+                with open(path, "rb") as f:
+                    expires_at = float(f.readline())
+                if now >= expires_at:
+                    path.unlink()
+                    removed += 1
+            except (OSError, ValueError):
+                continue
+        return removed
+
+
+# =============================================================================
+# redis - Redis 프로토콜 (RESP2) 클라이언트
+# =============================================================================
+
+
+class RedisProtocolError(Exception):
+    """Redis 서버 오류 응답"""
+
+
+def encode_command(*parts) -> bytes:
+    """RESP 배열로 명령 인코딩"""
+    out = [b"*%d\r\n" % len(parts)]
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = str(part).encode("ascii")
+        out.append(b"$%d\r\n%s\r\n" % (len(part), part))
+    return b"".join(out)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    """RESP 응답 1개 읽기"""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis 연결 종료")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        raise RedisProtocolError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        count = int(body)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise RedisProtocolError(f"알 수 없는 응답: {line[:20]!r}")
+
+
+class _DroppedConnection(Exception):
+    """다른 명령이 버린 연결 (새로 연결해서 다시 시도)"""
+
+
+class RedisBackend(CacheBackend):
+    """Redis 프로토콜 백엔드 (이벤트 루프마다 연결 1개, 명령은 순서대로)"""
+
+    name = "redis"
+
+    def __init__(self, url: str = CACHE_REDIS_URL, timeout: float = CACHE_BACKEND_TIMEOUT):
+        super().__init__()
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._connections: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self._down_until = 0.0
+
+    async def _connection(self):
+        loop = asyncio.get_running_loop()
+        conn = self._connections.get(loop)
+        if conn is None or conn[1].is_closing():
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            conn = (reader, writer, asyncio.Lock())
+            self._connections[loop] = conn
+            if self.password:
+                await self._execute(conn, "AUTH", self.password)
+            if self.db:
+                await self._execute(conn, "SELECT", self.db)
+        return conn
+
+    @staticmethod
+    async def _execute(conn, *parts):
+        reader, writer, lock = conn
+        async with lock:
+            if writer.is_closing():
+                # 앞 명령이 끝나지 못해 버려진 연결 (잠금을 기다리는 동안)
+                raise _DroppedConnection()
+            completed = False
+            try:
+                writer.write(encode_command(*parts))
+                await writer.drain()
+                reply = await read_reply(reader)
+                completed = True
+                return reply
+            finally:
+                if not completed:
+                    # 읽지 않은 응답이 남은 연결을 계속 쓰면 다음 명령이 이 응답을 받음 - 닫아서 버림
+                    writer.close()
+
+    def _drop(self, conn) -> None:
+        """연결 폐기 (다음 명령은 새로 연결)"""
+        if conn is None:
+            return
+        loop = asyncio.get_running_loop()
+        if self._connections.get(loop) is conn:
+            del self._connections[loop]
+        conn[1].close()
+
+    async def command(self, *parts):
+        """
+        명령 실행 (연결 실패/시간 초과면 None, 잠시 연결 시도 중단)
+
+        취소 등으로 요청/응답이 끝나지 않으면 연결을 버리고 예외를 그대로 올립니다.
+        """
+        if time.monotonic() < self._down_until:
+            return None
+        conn = None
+        try:
+            for _ in range(2):
+                conn = await asyncio.wait_for(self._connection(), self.timeout)
+                try:
+                    return await asyncio.wait_for(self._execute(conn, *parts), self.timeout)
+                except _DroppedConnection:
+                    self._drop(conn)
+            raise ConnectionError("Redis 연결을 다시 만들지 못했습니다")
+        except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError, RedisProtocolError):
+            self.errors += 1
+            self._down_until = time.monotonic() + REDIS_RETRY_SECONDS
+            self._drop(conn if conn is not None else self._connections.get(asyncio.get_running_loop()))
+            return None
+        except BaseException:
+            # 취소 - 요청을 보낸 뒤였다면 _execute가 연결을 닫아 둠 (잠금 대기 중 취소면 연결은 그대로 사용)
+            if conn is not None and conn[1].is_closing():
+                self._drop(conn)
+            raise
+
+    async def get(self, key: str, route: Optional[str] = None) -> Optional[bytes]:
+        data = await self.command("GET", self.storage_key(key))
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float, route: Optional[str] = None) -> None:
+        await self.command("SET", self.storage_key(key), data, "PX", max(1, int(ttl_seconds * 1000)))
+
+    async def delete(self, key: str, route: Optional[str] = None) -> None:
+        await self.command("DEL", self.storage_key(key))
+
+
+_backend: Optional[CacheBackend] = None
+_backend_loaded = False
+
+
+def get_cache_backend() -> Optional[CacheBackend]:
+    """설정된 공유 백엔드 (memory면 None - L1만 사용)"""
+    global _backend, _backend_loaded
+    if not _backend_loaded:
+        _backend_loaded = True
+        if CACHE_BACKEND == "shm":
+            _backend = SharedFileBackend()
+        elif CACHE_BACKEND == "redis":
+            _backend = RedisBackend()
+        elif CACHE_BACKEND == "sharded":
+            from src.cache_ring import CACHE_NODES, ShardedBackend, parse_nodes
+            _backend = ShardedBackend(parse_nodes(CACHE_NODES), spec=CACHE_NODES)
+    return _backend
+
+
+def set_cache_backend(backend: Optional[CacheBackend]) -> None:
+    """공유 백엔드 교체 (테스트/임베딩용)"""
+    global _backend, _backend_loaded
+    _backend = backend
+    _backend_loaded = True
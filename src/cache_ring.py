@@ -0,0 +1,209 @@
+"""
+캐시 노드 샤딩 - 일관된 해싱 (v3.8)
+
+파드마다 같은 데이터를 전부 캐시하면(복제) 전체 캐시 용량은 노드 하나 크기에 머뭅니다.
+기상청 격자 셀 / 에어코리아 측정소 단위의 정규화된 셀 키를 해시 링에 올려
+셀마다 담당 캐시 노드를 정하고, 그 노드에만 저장/조회합니다. 노드를 늘리면 캐시 용량도 늘어납니다.
+
+- 링: 노드마다 가상 노드 VNODES개 (md5 위치), 노드 추가/제거 시 약 1/N의 셀만 이동
+- 멤버십: 정적 설정 CACHE_NODES ("이름=redis://호스트:포트/DB,..." 또는 JSON 파일 경로)
+- 재배치: 설정 파일이 바뀌면 새 링으로 교체, 이전 링은 REBALANCE_GRACE_SECONDS 동안 유지해
+  새 담당 노드에 없으면 이전 담당 노드에서 읽어 옮겨 담음 (이동한 셀이 한꺼번에 외부 API로 가지 않음)
+
+CACHE_BACKEND=sharded 로 사용합니다. 셀 키는 cached_async(cell_key=...)로 정합니다.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from src.cache_backend import CacheBackend, RedisBackend
+
+
+# 노드당 가상 노드 수 - 클수록 셀이 고르게 나뉨
+VNODES = int(os.getenv("CACHE_RING_VNODES", "160"))
+
+# 노드 목록 - "a=redis://10.0.0.1:6379/0,b=redis://10.0.0.2:6379/0" 또는 JSON 파일 ({"이름": "주소"})
+CACHE_NODES = os.getenv("CACHE_NODES", "")
+
+# 멤버십 파일 변경 확인 주기 / 재배치 중 이전 담당 노드를 함께 보는 시간 (초)
+MEMBERSHIP_CHECK_SECONDS = 5.0
+REBALANCE_GRACE_SECONDS = float(os.getenv("CACHE_REBALANCE_GRACE_SECONDS", "600"))
+
+
+def _position(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """일관된 해싱 링"""
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = VNODES):
+        self.vnodes = vnodes
+        self._positions: List[int] = []
+        self._owners: List[str] = []
+        self.nodes = set()
+        for node in nodes:
+            self.add_node(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def add_node(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for i in range(self.vnodes):
+            position = _position(f"{node}#{i}")
+            index = bisect.bisect(self._positions, position)
+            self._positions.insert(index, position)
+            self._owners.insert(index, node)
+
+    def remove_node(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(p, o) for p, o in zip(self._positions, self._owners) if o != node]
+        self._positions = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    def owner(self, key: str) -> Optional[str]:
+        """키를 담당하는 노드 (노드가 없으면 None)"""
+        if not self._positions:
+            return None
+        index = bisect.bisect(self._positions, _position(key)) % len(self._positions)
+        return self._owners[index]
+
+    def moved(self, keys: Iterable[str], other: "HashRing") -> List[str]:
+        """다른 링에서 담당 노드가 바뀌는 키"""
+        return [key for key in keys if self.owner(key) != other.owner(key)]
+
+
+def parse_nodes(spec: str) -> Dict[str, str]:
+    """CACHE_NODES 값 → {이름: 주소} (파일 경로면 JSON 파일 읽기)"""
+    spec = spec.strip()
+    if not spec:
+        return {}
+    if "=" not in spec and Path(spec).is_file():
+        with open(spec, encoding="utf-8") as f:
+            return {str(k): str(v) for k, v in json.load(f).items()}
+    nodes = {}
+    for item in spec.split(","):
+        name, _, address = item.strip().partition("=")
+        if name and address:
+            nodes[name.strip()] = address.strip()
+    return nodes
+
+
+class ShardedBackend(CacheBackend):
+    """셀 키로 담당 노드를 골라 저장/조회하는 백엔드"""
+
+    name = "sharded"
+
+    def __init__(self, nodes: Dict[str, str], backend_factory=RedisBackend, spec: Optional[str] = None):
+        """
+        Args:
+            nodes: {노드 이름: 주소}
+            backend_factory: 주소 → 노드 백엔드 (기본: RedisBackend)
+            spec: 멤버십 파일 경로 (바뀌면 자동 재배치)
+        """
+        super().__init__()
+        self._factory = backend_factory
+        self._backends: Dict[str, CacheBackend] = {}
+        self.ring = HashRing()
+        self._previous: Optional[HashRing] = None
+        self._previous_until = 0.0
+        self.handoffs = 0
+        self.update_nodes(nodes)
+
+        self._spec = spec if spec and "=" not in spec else None
+        self._spec_mtime = self._membership_mtime()
+        self._last_check = time.monotonic()
+
+    def _backend(self, node: str) -> CacheBackend:
+        backend = self._backends.get(node)
+        if backend is None:
+            backend = self._backends[node] = self._factory(self._addresses[node])
+        return backend
+
+    def update_nodes(self, nodes: Dict[str, str]) -> None:
+        """멤버십 교체 - 이전 링은 재배치 유예 기간 동안 유지"""
+        if self.ring.nodes:
+            self._previous = self.ring
+            self._previous_until = time.monotonic() + REBALANCE_GRACE_SECONDS
+        self._addresses = dict(nodes)
+        self.ring = HashRing(nodes)
+        for node in list(self._backends):
+            if node not in nodes:
+                del self._backends[node]
+
+    def _membership_mtime(self) -> Optional[float]:
+        try:
+            return Path(self._spec).stat().st_mtime if self._spec else None
+        except OSError:
+            return None
+
+    def _check_membership(self) -> None:
+        """MEMBERSHIP_CHECK_SECONDS마다 멤버십 파일 확인, 바뀌었으면 재배치"""
+        now = time.monotonic()
+        if self._spec is None or now - self._last_check < MEMBERSHIP_CHECK_SECONDS:
+            return
+        self._last_check = now
+        mtime = self._membership_mtime()
+        if mtime is None or mtime == self._spec_mtime:
+            return
+        try:
+            nodes = parse_nodes(self._spec)
+        except (OSError, ValueError):
+            return
+        self._spec_mtime = mtime
+        if nodes and nodes != self._addresses:
+            self.update_nodes(nodes)
+
+    def owner(self, route: str) -> Optional[str]:
+        return self.ring.owner(route)
+
+    async def get(self, key: str, route: Optional[str] = None) -> Optional[bytes]:
+        self._check_membership()
+        route = route or key
+        node = self.ring.owner(route)
+        if node is None:
+            self.misses += 1
+            return None
+        data = await self._backend(node).get(key)
+        if data is None and self._previous is not None and time.monotonic() < self._previous_until:
+            # 재배치 중 - 이전 담당 노드에 있으면 새 담당 노드로 옮김
+            old = self._previous.owner(route)
+            if old is not None and old != node and old in self._addresses:
+                data = await self._backend(old).get(key)
+                if data is not None:
+                    self.handoffs += 1
+                    await self._backend(node).set(key, data, REBALANCE_GRACE_SECONDS)
+        if data is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    async def set(self, key: str, data: bytes, ttl_seconds: float, route: Optional[str] = None) -> None:
+        self._check_membership()
+        node = self.ring.owner(route or key)
+        if node is not None:
+            await self._backend(node).set(key, data, ttl_seconds)
+
+    async def delete(self, key: str, route: Optional[str] = None) -> None:
+        node = self.ring.owner(route or key)
+        if node is not None:
+            await self._backend(node).delete(key)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["nodes"] = sorted(self.ring.nodes)
+        stats["handoffs"] = self.handoffs
+        stats["rebalancing"] = self._previous is not None and time.monotonic() < self._previous_until
+        stats["node_errors"] = {node: backend.errors for node, backend in self._backends.items()}
+        return stats
@@ -0,0 +1,166 @@
+"""
+호스트별 서킷 브레이커 + 적응형 타임아웃 (v3.8)
+
+apis.data.go.kr가 느려지면 모든 도구 호출이 고정 타임아웃(30초)을 다 기다린 뒤에야
+기본값으로 넘어갔습니다. 호스트마다 상태를 추적해 빠르게 실패합니다.
+
+- 서킷 브레이커: 연속 실패가 쌓이면 열림(open) → 일정 시간 호출 없이 즉시 실패
+  → 반열림(half-open)에서 시험 호출 1건 → 성공하면 닫힘(closed)
+- 적응형 타임아웃: 최근 성공 응답 시간의 p99 × 배수 (호출 측 타임아웃이 상한)
+
+실패로 보는 것: 타임아웃, 연결 오류, HTTP 5xx (4xx는 호출 측 문제라 제외)
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.upstream_errors import UpstreamError
+
+
+# 서킷 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 연속 실패 몇 번이면 열지
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+# 열린 뒤 시험 호출까지 대기 (초)
+RECOVERY_SECONDS = float(os.getenv("CIRCUIT_RECOVERY_SECONDS", "30"))
+
+# 적응형 타임아웃
+LATENCY_WINDOW = 200           # 최근 성공 응답 시간 표본 수
+LATENCY_MIN_SAMPLES = 20       # 이보다 적으면 호출 측 타임아웃 사용
+TIMEOUT_P99_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "3.0"))
+TIMEOUT_FLOOR_SECONDS = float(os.getenv("ADAPTIVE_TIMEOUT_FLOOR", "1.0"))
+
+
+class CircuitOpenError(UpstreamError):
+    """서킷이 열려 호출하지 않음 (일시적 오류, 재시도 안 함)"""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(host, f"{host} 응답 지연으로 잠시 호출을 중단했습니다 ({retry_after:.0f}초 후 재시도)")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class HostGuard:
+    """호스트 하나의 서킷 브레이커 + 응답 시간 기록"""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        recovery_seconds: float = RECOVERY_SECONDS,
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+        self.total_failures = 0
+        self.total_rejected = 0
+
+    def before_request(self) -> None:
+        """
+        호출 가능 여부 확인
+
+        Raises:
+            CircuitOpenError: 열림 상태이거나, 반열림에서 이미 시험 호출 중
+        """
+        with self._lock:
+            if self.state == STATE_OPEN:
+                elapsed = time.monotonic() - self.opened_at
+                if elapsed < self.recovery_seconds:
+                    self.total_rejected += 1
+                    raise CircuitOpenError(self.host, self.recovery_seconds - elapsed)
+                self.state = STATE_HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == STATE_HALF_OPEN:
+                if self._probe_in_flight:
+                    self.total_rejected += 1
+                    raise CircuitOpenError(self.host, 1)
+                self._probe_in_flight = True
+
+    def release_probe(self) -> None:
+        """호출하지 않고 끝남 (호출량 제한, 취소) - 시험 호출 자리 반납"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self, latency: Optional[float]) -> None:
+        """호스트가 응답함 - latency가 None이면 (정상 응답이 아님) 응답 시간은 기록하지 않음"""
+        with self._lock:
+            if latency is not None:
+                self._latencies.append(latency)
+            self.consecutive_failures = 0
+            self.state = STATE_CLOSED
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.total_failures += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 성공 응답 시간 백분위 (초), 표본 부족하면 None"""
+        if len(self._latencies) < LATENCY_MIN_SAMPLES:
+            return None
+        return float(np.percentile(np.fromiter(self._latencies, dtype=float), q))
+
+    def p99(self) -> Optional[float]:
+        return self.percentile(99)
+
+    def hedge_delay(self, q: float) -> Optional[float]:
+        """헤징 요청을 보낼 대기 시간 (초) - 응답 시간 q 백분위"""
+        return self.percentile(q)
+
+    def timeout(self, ceiling: float) -> float:
+        """이번 호출에 쓸 타임아웃 (초)"""
+        p99 = self.p99()
+        if p99 is None:
+            return ceiling
+        return min(ceiling, max(TIMEOUT_FLOOR_SECONDS, p99 * TIMEOUT_P99_MULTIPLIER))
+
+    def stats(self) -> dict:
+        p99 = self.p99()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "rejected": self.total_rejected,
+            "p99_ms": round(p99 * 1000) if p99 is not None else None,
+            "samples": len(self._latencies),
+        }
+
+
+_guards: Dict[str, HostGuard] = {}
+_guards_lock = threading.Lock()
+
+
+def get_host_guard(host: str) -> HostGuard:
+    """호스트별 HostGuard (처음 사용 시 생성)"""
+    guard = _guards.get(host)
+    if guard is None:
+        with _guards_lock:
+            guard = _guards.setdefault(host, HostGuard(host))
+    return guard
+
+
+def get_host_stats() -> dict:
+    """/health용 호스트별 서킷/응답 시간 현황"""
+    return {host: guard.stats() for host, guard in list(_guards.items())}
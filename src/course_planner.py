@@ -0,0 +1,125 @@
+"""
+코스 동선 최적화 (v3.8)
+
+코스 단계별로 검색 후보 여러 개를 받아, 후보 간 거리 행렬(numpy haversine)로
+출발지 → 1단계 → 2단계 → 3단계 총 이동 거리가 가장 짧은 조합을 고릅니다.
+추가 API 호출 없이 검색 결과의 좌표만 사용합니다.
+
+- 검색 순위가 낮은 후보는 약간의 거리 벌점 (관련도 유지)
+- 실내 위주 날씨면 야외 장소 제외 (단계 후보가 전부 야외면 허용)
+- 같은 장소가 두 단계에 중복 선택되지 않음
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.spot_index import haversine_km
+
+
+# 검색 순위 1단계 낮을 때마다 더하는 거리 벌점 (km)
+RANK_PENALTY_KM = 0.3
+
+# 야외 장소로 보는 카테고리 단어
+OUTDOOR_CATEGORY_WORDS = ("공원", "산책", "야외", "캠핑", "해수욕장", "등산")
+
+
+def distance_matrix_km(
+    lats_a: np.ndarray, lons_a: np.ndarray, lats_b: np.ndarray, lons_b: np.ndarray
+) -> np.ndarray:
+    """두 지점 집합 사이 거리 행렬 (km, [len(a), len(b)])"""
+    return haversine_km(lats_a[:, None], lons_a[:, None], lats_b[None, :], lons_b[None, :])
+
+
+def is_outdoor_place(place: dict) -> bool:
+    """카테고리로 야외 장소 여부 판단"""
+    category = place.get("category", "")
+    return any(word in category for word in OUTDOOR_CATEGORY_WORDS)
+
+
+def _coords(places: List[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """장소 목록의 위도/경도 배열 (좌표 없으면 nan)"""
+    lats, lons = [], []
+    for place in places:
+        try:
+            lats.append(float(place["y"]))
+            lons.append(float(place["x"]))
+        except (KeyError, TypeError, ValueError):
+            lats.append(np.nan)
+            lons.append(np.nan)
+    return np.array(lats, dtype=float), np.array(lons, dtype=float)
+
+
+def _step_bias(places: List[dict], outdoor_ok: bool) -> np.ndarray:
+    """단계 후보별 고정 비용 (순위 벌점, 날씨 제약)"""
+    bias = RANK_PENALTY_KM * np.arange(len(places), dtype=float)
+    if not outdoor_ok:
+        outdoor = np.array([is_outdoor_place(p) for p in places])
+        if not outdoor.all():
+            bias[outdoor] = np.inf
+    return bias
+
+
+def optimize_course(
+    steps: List[List[dict]],
+    origin: Optional[Tuple[float, float]] = None,
+    outdoor_ok: bool = True,
+) -> Tuple[List[int], Optional[float]]:
+    """
+    단계별 후보 중 총 이동 거리가 가장 짧은 조합 선택
+
+    Args:
+        steps: 단계별 후보 장소 목록 (각 장소는 Kakao 검색 결과, x=경도, y=위도)
+        origin: 출발 좌표 (위도, 경도), 없으면 1단계부터 계산
+        outdoor_ok: False면 야외 장소 제외
+
+    Returns:
+        (단계별 선택 인덱스, 총 이동 거리 km) - 좌표가 없어 계산 못 하면 (0번씩, None)
+    """
+    if not steps or any(not places for places in steps):
+        return [0] * len(steps), None
+
+    coords = [_coords(places) for places in steps]
+
+    # 누적 비용 텐서: 축 s = s단계 후보
+    lats0, lons0 = coords[0]
+    total = _step_bias(steps[0], outdoor_ok)
+    if origin is not None:
+        total = total + haversine_km(origin[0], origin[1], lats0, lons0)
+
+    for s in range(1, len(steps)):
+        prev_lats, prev_lons = coords[s - 1]
+        lats, lons = coords[s]
+        legs = distance_matrix_km(prev_lats, prev_lons, lats, lons)
+        legs = legs + _step_bias(steps[s], outdoor_ok)[None, :]
+        total = total[..., None] + legs.reshape((1,) * (s - 1) + legs.shape)
+
+    # 같은 장소 중복 선택 금지
+    ids = [[p.get("id") or p.get("name") for p in places] for places in steps]
+    for a in range(len(steps)):
+        for b in range(a + 1, len(steps)):
+            same = np.array([[ia == ib for ib in ids[b]] for ia in ids[a]])
+            if same.any():
+                shape = [1] * len(steps)
+                shape[a], shape[b] = same.shape
+                total = np.where(same.reshape(shape), np.inf, total)
+
+    total = np.where(np.isnan(total), np.inf, total)
+    best = int(np.argmin(total))
+    if not np.isfinite(total.flat[best]):
+        return [0] * len(steps), None
+
+    choice = [int(i) for i in np.unravel_index(best, total.shape)]
+
+    # 보고용 실제 이동 거리 (벌점 제외)
+    distance = 0.0
+    if origin is not None:
+        distance += float(haversine_km(origin[0], origin[1], lats0[choice[0]], lons0[choice[0]]))
+    for s in range(1, len(steps)):
+        prev_lats, prev_lons = coords[s - 1]
+        lats, lons = coords[s]
+        distance += float(haversine_km(
+            prev_lats[choice[s - 1]], prev_lons[choice[s - 1]], lats[choice[s]], lons[choice[s]]
+        ))
+
+    return choice, round(distance, 2)
@@ -8,12 +8,22 @@ Kakao Maps REST API 연동 모듈 (v3.0)
 - 길찾기 URL 생성
 """
 
+import asyncio
 import os
 import httpx
 import math
 from typing import Optional, List, Dict
 from urllib.parse import quote, urlencode
 
+from src.cache import TTLCache
+from src.course_planner import optimize_course
+from src.landmark_index import INDEX_TRUST_RADIUS_M
+from src.reference_data import get_reference_data
+from src.response_detail import DETAIL_COMPACT, DETAIL_NORMAL
+from src.tracing import span
+from src.upstream import upstream_get
+from src.upstream_errors import UpstreamError
+
 
 def calculate_distance_between_coords(lat1: float, lon1: float, lat2: float, lon2: float) -> int:
     """
@@ -40,6 +50,9 @@ async def find_nearest_landmark(x: str, y: str) -> Optional[Dict]:
     주어진 좌표에서 가장 가까운 랜드마크 찾기
     우선순위: 지하철역 > 버스터미널 > 기차역
 
+    v3.8: 내장 역/터미널 인덱스에 아주 가까운 역(INDEX_TRUST_RADIUS_M)이 있으면 바로 사용,
+    아니면 Kakao 조회 (Kakao 실패 시 인덱스의 2km/5km 결과로 대체)
+
     Args:
         x: 경도 (longitude)
         y: 위도 (latitude)
@@ -47,9 +60,71 @@ async def find_nearest_landmark(x: str, y: str) -> Optional[Dict]:
     Returns:
         가장 가까운 랜드마크 정보 또는 None
     """
+    try:
+        lat, lon = float(y), float(x)
+    except (TypeError, ValueError):
+        return None
+
+    index = get_reference_data().landmark_index()
+    landmark = index.find(lat, lon, INDEX_TRUST_RADIUS_M)
+    if landmark:
+        return landmark
+
+    landmark = await _request_nearest_landmark(x, y, index)
+    return landmark or index.find(lat, lon)
+
+
+async def find_nearest_landmarks(places: List[Dict]) -> List[Optional[Dict]]:
+    """
+    여러 장소의 가장 가까운 랜드마크 일괄 조회
+
+    인덱스로 한 번에 찾고, 아주 가까운 역이 인덱스에 없는 장소만 Kakao로 동시에 조회합니다.
+
+    Args:
+        places: Kakao 검색 결과 장소 목록 (x=경도, y=위도)
+
+    Returns:
+        장소 순서대로의 랜드마크 정보 (없으면 None)
+    """
+    index = get_reference_data().landmark_index()
+
+    with span("landmarks", places=len(places)) as landmark_span:
+        landmarks: List[Optional[Dict]] = [None] * len(places)
+        misses = []
+        for i, place in enumerate(places):
+            try:
+                lat, lon = float(place.get("y", "")), float(place.get("x", ""))
+            except (TypeError, ValueError):
+                continue
+            landmarks[i] = index.find(lat, lon, INDEX_TRUST_RADIUS_M)
+            if landmarks[i] is None:
+                misses.append((i, lat, lon))
+        landmark_span.set("index_misses", len(misses))
+
+        if misses:
+            fetched = await asyncio.gather(
+                *(_request_nearest_landmark(places[i]["x"], places[i]["y"], index) for i, _, _ in misses)
+            )
+            for (i, lat, lon), landmark in zip(misses, fetched):
+                landmarks[i] = landmark or index.find(lat, lon)
+
+    return landmarks
+
+
+# Kakao 카테고리 코드 → 랜드마크 종류
+_LANDMARK_CATEGORY_TYPES = {"SW8": "subway", "BT1": "terminal"}
+
+
+async def _request_nearest_landmark(x: str, y: str, index=None) -> Optional[Dict]:
+    """Kakao 카테고리 검색으로 랜드마크 조회 (찾으면 인덱스에 추가, 좌표별 결과 캐시)"""
     if not KAKAO_REST_API_KEY:
         return None
 
+    cache_key = (str(x), str(y))
+    cached = _landmark_cache.get(cache_key)
+    if cached is not None:
+        return cached or None
+
     # 검색 우선순위: 지하철역 > 버스터미널
     search_configs = [
         ("SW8", "역", 2000),      # 지하철역, 2km
@@ -57,46 +132,90 @@ async def find_nearest_landmark(x: str, y: str) -> Optional[Dict]:
     ]
 
     try:
-        async with httpx.AsyncClient() as client:
-            for category_code, suffix_hint, radius in search_configs:
-                response = await client.get(
-                    f"{KAKAO_LOCAL_API}/search/category.json",
-                    headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
-                    params={
-                        "category_group_code": category_code,
-                        "x": x,
-                        "y": y,
-                        "radius": radius,
-                        "sort": "distance",
-                        "size": 1
-                    },
-                    timeout=5.0
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    documents = data.get("documents", [])
-                    if documents:
-                        place = documents[0]
-                        name = place.get("place_name", "")
-                        return {
+        for category_code, suffix_hint, radius in search_configs:
+            response = await upstream_get(
+                "kakao",
+                f"{KAKAO_LOCAL_API}/search/category.json",
+                headers={"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"},
+                params={
+                    "category_group_code": category_code,
+                    "x": x,
+                    "y": y,
+                    "radius": radius,
+                    "sort": "distance",
+                    "size": 1
+                },
+                timeout=5.0
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                documents = data.get("documents", [])
+                if documents:
+                    place = documents[0]
+                    name = place.get("place_name", "")
+                    if index is not None and place.get("x") and place.get("y"):
+                        # 다음 조회부터는 로컬에서 응답
+                        index.add({
                             "name": name,
-                            "distance": place.get("distance", ""),
-                            "x": place.get("x"),
-                            "y": place.get("y")
-                        }
+                            "type": _LANDMARK_CATEGORY_TYPES[category_code],
+                            "lat": float(place["y"]),
+                            "lon": float(place["x"]),
+                        })
+                    landmark = {
+                        "name": name,
+                        "distance": place.get("distance", ""),
+                        "x": place.get("x"),
+                        "y": place.get("y")
+                    }
+                    _landmark_cache.set(cache_key, landmark)
+                    return landmark
     except Exception:
-        pass
+        return None
 
+    _landmark_cache.set(cache_key, {})
     return None
 
 # API 키
 KAKAO_REST_API_KEY = os.getenv("KAKAO_REST_API_KEY", "")
 
-# API 엔드포인트
-KAKAO_LOCAL_API = "https://dapi.kakao.com/v2/local"
+# API 엔드포인트 (v3.8: KAKAO_API_URL로 외부 API 시뮬레이터 주소로 바꿀 수 있음)
+KAKAO_API_URL = os.getenv("KAKAO_API_URL", "https://dapi.kakao.com").rstrip("/")
+KAKAO_LOCAL_API = f"{KAKAO_API_URL}/v2/local"
 KAKAO_NAVI_URL = "https://map.kakao.com/link"
 
+# 검색 결과 캐시 (v3.8 - 일일 쿼터 절약)
+SEARCH_CACHE_TTL = int(os.getenv("KAKAO_SEARCH_CACHE_TTL", "3600"))  # 1시간
+SEARCH_CACHE_SIZE = int(os.getenv("KAKAO_SEARCH_CACHE_SIZE", "2000"))
+SEARCH_COORD_PRECISION = int(os.getenv("KAKAO_SEARCH_COORD_PRECISION", "3"))  # 소수점 3자리 ≈ 100m
+
+# 반경 구간 (미터) - 요청 반경을 올림하여 같은 구간끼리 캐시 공유
+RADIUS_BUCKETS = (500, 1000, 2000, 3000, 5000, 10000, 20000)
+
+# 페이지 검색 (Kakao Local: 페이지당 최대 15개, 최대 45개까지 조회 가능)
+MAX_PAGE_SIZE = 15
+MAX_SEARCH_RESULTS = 45
+
+# 다중 키워드 검색 - 동시 요청 수, 순위 점수 가중치 (관련도 + 거리)
+MULTI_SEARCH_CONCURRENCY = int(os.getenv("KAKAO_MULTI_SEARCH_CONCURRENCY", "4"))
+MULTI_SEARCH_RELEVANCE_WEIGHT = 0.6
+MULTI_SEARCH_DISTANCE_WEIGHT = 0.4
+
+# 스마트 추천에서 함께 검색할 상황 키워드 수
+SMART_SEARCH_KEYWORDS = int(os.getenv("KAKAO_SMART_SEARCH_KEYWORDS", "4"))
+
+# 코스 추천 전체 검색 마감 시간 (초) - 넘긴 단계는 제외하고 응답
+COURSE_DEADLINE_SECONDS = float(os.getenv("KAKAO_COURSE_DEADLINE", "8.0"))
+
+# 코스 단계별 후보 수 - 후보 조합 중 이동 거리가 가장 짧은 동선 선택
+COURSE_CANDIDATES = int(os.getenv("KAKAO_COURSE_CANDIDATES", "5"))
+
+_search_cache = TTLCache("kakao_search", SEARCH_CACHE_TTL, SEARCH_CACHE_SIZE)
+
+# 장소 좌표별 Kakao 랜드마크 조회 결과 (역 위치는 거의 바뀌지 않음, 못 찾은 경우는 {})
+LANDMARK_CACHE_TTL = int(os.getenv("KAKAO_LANDMARK_CACHE_TTL", "86400"))  # 1일
+_landmark_cache = TTLCache("kakao_landmark", LANDMARK_CACHE_TTL, SEARCH_CACHE_SIZE)
+
 # 카테고리 코드
 CATEGORY_CODES = {
     "대형마트": "MT1",
@@ -120,6 +239,166 @@ CATEGORY_CODES = {
 }
 
 
+def _radius_bucket(radius: int) -> int:
+    """반경을 구간 상한으로 올림"""
+    for bucket in RADIUS_BUCKETS:
+        if radius <= bucket:
+            return bucket
+    return RADIUS_BUCKETS[-1]
+
+
+def _round_coord(value) -> Optional[float]:
+    """좌표를 캐시 정밀도로 반올림"""
+    if value in (None, ""):
+        return None
+    return round(float(value), SEARCH_COORD_PRECISION)
+
+
+def _search_cache_key(kind: str, query: str, x, y, radius: int, sort: str, size: int) -> tuple:
+    """검색 캐시 키 (정규화된 검색어, 반올림 좌표, 반경 구간, 정렬, 개수)"""
+    normalized = " ".join(str(query).split()).lower()
+    x, y = _round_coord(x), _round_coord(y)
+    bucket = _radius_bucket(radius) if x is not None and y is not None else None
+    return (kind, normalized, x, y, bucket, sort, min(size, MAX_SEARCH_RESULTS))
+
+
+def _needs_radius_filter(x, y, radius: int) -> bool:
+    """
+    요청 반경이 구간 상한보다 작은지 (반경 구간 상한으로 조회하므로 반경 밖 장소가 섞여 걸러짐)
+    """
+    return _round_coord(x) is not None and _round_coord(y) is not None and radius < _radius_bucket(radius)
+
+
+def _cached_search_result(result: dict, x, y, radius: int, size: int, sort: str) -> dict:
+    """
+    캐시된 결과 복사 + 요청 좌표 기준 거리로 반경 밖 장소 제외, size개로 자름
+
+    캐시는 반올림 좌표로 조회한 결과라 거리를 요청 좌표에서 다시 계산합니다.
+    """
+    has_center = _round_coord(x) is not None and _round_coord(y) is not None
+    places = []
+    for place in result.get("places", []):
+        place = dict(place)
+        if has_center and place.get("x") and place.get("y"):
+            place["distance"] = str(calculate_distance_between_coords(
+                float(y), float(x), float(place["y"]), float(place["x"])
+            ))
+        distance = _distance_m(place)
+        if distance is not None and distance > radius:
+            continue
+        places.append(place)
+    if sort == "distance":
+        places.sort(key=lambda place: _distance_m(place) if _distance_m(place) is not None else float("inf"))
+    result = {key: value for key, value in result.items() if key != "next_page"}
+    return {**result, "places": places[:size]}
+
+
+async def _request_pages(request_page, size: int) -> dict:
+    """
+    여러 페이지 검색 결과 병합
+
+    1페이지로 전체 개수(pageable_count)를 확인한 뒤 필요한 나머지 페이지를
+    동시에 요청하고, 장소 id로 중복을 제거합니다. is_end면 더 요청하지 않습니다.
+
+    Args:
+        request_page: async (page, page_size) -> 검색 결과 (meta 포함)
+        size: 원하는 결과 개수 (최대 45)
+    """
+    size = max(1, min(size, MAX_SEARCH_RESULTS))
+    page_size = min(size, MAX_PAGE_SIZE)
+
+    first = await request_page(1, page_size)
+    if "error" in first:
+        return first
+
+    meta = first.pop("meta", {})
+    if size <= MAX_PAGE_SIZE or meta.get("is_end", True):
+        return first
+
+    pageable = meta.get("pageable_count", size)
+    last_page = min(-(-size // MAX_PAGE_SIZE), -(-pageable // MAX_PAGE_SIZE))
+    pages = await asyncio.gather(*(request_page(p, MAX_PAGE_SIZE) for p in range(2, last_page + 1)))
+
+    places = first["places"]
+    seen = {place.get("id") for place in places}
+    for page in pages:
+        if "error" in page:
+            break  # 이후 페이지 실패 - 받은 만큼만 반환
+        for place in page["places"]:
+            if place.get("id") not in seen:
+                seen.add(place.get("id"))
+                places.append(place)
+        if page.get("meta", {}).get("is_end"):
+            break
+
+    first["places"] = places[:size]
+    return first
+
+
+async def _request_pages_within_radius(cache_key: tuple, request_page, x, y, radius: int,
+                                      size: int, sort: str) -> dict:
+    """
+    반경 구간 조회 결과를 요청 반경으로 걸러 size개 채우기
+
+    걸러낸 결과가 size개에 못 미칠 때만 모자란 만큼의 다음 페이지(15개씩)를 요청합니다.
+    받은 페이지와 다음 페이지 번호(next_page)를 캐시에 두어, 같은 구간의 더 큰 요청은
+    이어서 받습니다. 뒤 페이지가 실패하면 받은 결과까지만 반환합니다 (다음 요청에서 다시 시도).
+
+    Args:
+        cache_key: 검색 캐시 키
+        request_page: async (page, page_size) -> 검색 결과 (meta 포함)
+        x, y, radius: 요청 좌표/반경 (걸러낼 기준)
+        size: 원하는 결과 개수 (최대 45)
+        sort: 정렬 기준
+    """
+    size = max(1, min(size, MAX_SEARCH_RESULTS))
+    max_page = MAX_SEARCH_RESULTS // MAX_PAGE_SIZE
+    cached = _search_cache.get(cache_key)
+    if cached is None:
+        first = await request_page(1, MAX_PAGE_SIZE)
+        if "error" in first:
+            return first
+        meta = first.pop("meta", {})
+        first["next_page"] = None if meta.get("is_end", True) else 2
+        cached = first
+        _search_cache.set(cache_key, cached)
+
+    while True:
+        result = _cached_search_result(cached, x, y, radius, size, sort)
+        next_page = cached.get("next_page")
+        if len(result["places"]) >= size or next_page is None:
+            return result
+
+        missing_pages = -(-(size - len(result["places"])) // MAX_PAGE_SIZE)
+        last_page = min(next_page + missing_pages - 1, max_page)
+        pages = await asyncio.gather(*(request_page(p, MAX_PAGE_SIZE) for p in range(next_page, last_page + 1)))
+
+        places = list(cached["places"])
+        seen = {place.get("id") for place in places}
+        for page_no, page in zip(range(next_page, last_page + 1), pages):
+            if "error" in page:
+                break  # 이후 페이지 실패 - 받은 만큼만 (next_page는 실패한 페이지)
+            for place in page["places"]:
+                if place.get("id") not in seen:
+                    seen.add(place.get("id"))
+                    places.append(place)
+            next_page = page_no + 1
+            if page.get("meta", {}).get("is_end") or next_page > max_page:
+                next_page = None
+                break
+
+        failed = next_page == cached.get("next_page")
+        cached = {**cached, "places": places, "next_page": next_page}
+        _search_cache.set(cache_key, cached)
+        if failed:
+            return _cached_search_result(cached, x, y, radius, size, sort)
+
+
+def get_search_cache_stats() -> dict:
+    """Kakao 검색 캐시 적중률 통계"""
+    return _search_cache.stats()
+
+
 async def search_place_by_keyword(
     keyword: str,
     x: Optional[float] = None,
@@ -136,7 +415,7 @@ async def search_place_by_keyword(
         x: 중심 경도 (longitude)
         y: 중심 위도 (latitude)
         radius: 검색 반경 (미터, 최대 20000)
-        size: 결과 개수 (1-15)
+        size: 결과 개수 (1-45, 15개 초과 시 여러 페이지를 동시에 조회)
         sort: 정렬 기준 (accuracy: 정확도순, distance: 거리순)
 
     Returns:
@@ -145,55 +424,179 @@ async def search_place_by_keyword(
     if not KAKAO_REST_API_KEY:
         return {"error": "KAKAO_REST_API_KEY가 설정되지 않았습니다."}
 
+    # 캐시 확인 (좌표는 반올림, 반경은 구간 상한으로 조회하여 공유)
+    # 요청 반경이 구간 상한보다 작으면 개수와 무관하게 한 항목에 페이지를 이어 받음
+    filtered = _needs_radius_filter(x, y, radius)
+    cache_key = _search_cache_key("keyword", keyword, x, y, radius, sort, MAX_SEARCH_RESULTS if filtered else size)
+    _, _, cx, cy, bucket, _, _ = cache_key
+
+    async def request_page(page, page_size):
+        return await _request_keyword_search(keyword, cx, cy, bucket, page_size, sort, page)
+
+    if filtered:
+        return await _request_pages_within_radius(cache_key, request_page, x, y, radius, size, sort)
+
+    cached = _search_cache.get(cache_key)
+    if cached is None:
+        cached = await _request_pages(request_page, size)
+        if "error" in cached:
+            return cached
+        _search_cache.set(cache_key, cached)
+
+    return _cached_search_result(cached, x, y, radius, size, sort)
+
+
+async def _request_keyword_search(
+    keyword: str,
+    x: Optional[float],
+    y: Optional[float],
+    radius: Optional[int],
+    size: int,
+    sort: str,
+    page: int = 1,
+) -> Dict:
+    """키워드 검색 API 호출 (캐시 없음, 한 페이지)"""
     url = f"{KAKAO_LOCAL_API}/search/keyword.json"
 
     params = {
         "query": keyword,
-        "size": min(size, 15),
+        "size": min(size, MAX_PAGE_SIZE),
+        "page": page,
         "sort": sort,
     }
 
     if x and y:
         params["x"] = x
         params["y"] = y
-        params["radius"] = min(radius, 20000)
+        params["radius"] = min(radius or 20000, 20000)
 
     headers = {
         "Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            # 결과 가공
-            places = []
-            for doc in data.get("documents", []):
-                places.append({
-                    "name": doc.get("place_name", ""),
-                    "address": doc.get("road_address_name") or doc.get("address_name", ""),
-                    "category": doc.get("category_name", ""),
-                    "phone": doc.get("phone", ""),
-                    "x": doc.get("x", ""),  # 경도
-                    "y": doc.get("y", ""),  # 위도
-                    "place_url": doc.get("place_url", ""),
-                    "distance": doc.get("distance", ""),
-                })
-
-            return {
-                "keyword": keyword,
-                "total_count": data.get("meta", {}).get("total_count", 0),
-                "places": places,
-            }
-
+        response = await upstream_get("kakao", url, params=params, headers=headers, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        # 결과 가공
+        places = []
+        for doc in data.get("documents", []):
+            places.append({
+                "id": doc.get("id", ""),
+                "name": doc.get("place_name", ""),
+                "address": doc.get("road_address_name") or doc.get("address_name", ""),
+                "category": doc.get("category_name", ""),
+                "phone": doc.get("phone", ""),
+                "x": doc.get("x", ""),  # 경도
+                "y": doc.get("y", ""),  # 위도
+                "place_url": doc.get("place_url", ""),
+                "distance": doc.get("distance", ""),
+            })
+
+        meta = data.get("meta", {})
+        return {
+            "keyword": keyword,
+            "total_count": meta.get("total_count", 0),
+            "places": places,
+            "meta": {
+                "is_end": meta.get("is_end", True),
+                "pageable_count": meta.get("pageable_count", 0),
+            },
+        }
+
+    except UpstreamError as e:
+        return e.to_error()
     except httpx.HTTPStatusError as e:
         return {"error": f"API 오류: {e.response.status_code}"}
     except Exception as e:
         return {"error": f"요청 실패: {str(e)}"}
 
 
+async def search_places_multi(
+    keywords: List[str],
+    x: Optional[str] = None,
+    y: Optional[str] = None,
+    radius: int = 5000,
+    size: int = 15,
+    sort: str = "accuracy",
+) -> Dict:
+    """
+    여러 키워드로 동시에 검색해 하나의 목록으로 병합
+
+    키워드별 검색은 MULTI_SEARCH_CONCURRENCY개씩 동시에 실행하고 장소 id로 중복을 제거합니다.
+    순위 점수 = 관련도(키워드별 검색 순위, 여러 키워드에 걸리면 가산) × 0.6 + 가까움 × 0.4
+
+    Args:
+        keywords: 검색 키워드 목록
+        x, y, radius, sort: search_place_by_keyword와 동일
+        size: 최종 결과 개수
+
+    Returns:
+        {"keywords", "total_count", "places"} - 장소마다 matched_keywords 포함
+    """
+    keywords = list(dict.fromkeys(k for k in keywords if k))
+    if not keywords:
+        return {"error": "검색 키워드가 없습니다."}
+
+    semaphore = asyncio.Semaphore(MULTI_SEARCH_CONCURRENCY)
+    per_keyword = min(max(size, 1), MAX_PAGE_SIZE)
+
+    async def search(keyword: str) -> Dict:
+        async with semaphore:
+            return await search_place_by_keyword(keyword, x, y, radius, per_keyword, sort)
+
+    results = await asyncio.gather(*(search(k) for k in keywords))
+
+    merged: Dict[str, Dict] = {}
+    relevance: Dict[str, float] = {}
+    total_count = 0
+    errors = []
+    for keyword, result in zip(keywords, results):
+        if "error" in result:
+            errors.append(result)
+            continue
+        total_count += result.get("total_count", 0)
+        for rank, place in enumerate(result.get("places", [])):
+            place_id = place.get("id") or place.get("name")
+            if place_id not in merged:
+                merged[place_id] = {**place, "matched_keywords": []}
+                relevance[place_id] = 0.0
+            merged[place_id]["matched_keywords"].append(keyword)
+            relevance[place_id] += 1.0 / (rank + 1)
+
+    if errors and not merged:
+        return errors[0]
+
+    max_relevance = max(relevance.values(), default=1.0)
+    max_distance = radius or max(
+        (_distance_m(p) for p in merged.values() if _distance_m(p) is not None), default=0
+    ) or 1
+
+    def score(place_id: str) -> float:
+        distance = _distance_m(merged[place_id])
+        closeness = 0.0 if distance is None else max(0.0, 1 - distance / max_distance)
+        return (
+            MULTI_SEARCH_RELEVANCE_WEIGHT * relevance[place_id] / max_relevance
+            + MULTI_SEARCH_DISTANCE_WEIGHT * closeness
+        )
+
+    ranked = sorted(merged, key=score, reverse=True)
+    return {
+        "keywords": keywords,
+        "total_count": total_count,
+        "places": [merged[place_id] for place_id in ranked[:size]],
+    }
+
+
+def _distance_m(place: Dict) -> Optional[int]:
+    """검색 결과 장소의 중심점 거리 (m), 없으면 None"""
+    try:
+        return int(place.get("distance"))
+    except (TypeError, ValueError):
+        return None
+
+
 async def search_place_by_category(
     category: str,
     x: float,
@@ -209,7 +612,7 @@ async def search_place_by_category(
         x: 중심 경도
         y: 중심 위도
         radius: 검색 반경 (미터)
-        size: 결과 개수
+        size: 결과 개수 (1-45, 15개 초과 시 여러 페이지를 동시에 조회)
 
     Returns:
         검색 결과
@@ -229,6 +632,38 @@ async def search_place_by_category(
                 "available": list(CATEGORY_CODES.keys())
             }
 
+    # 캐시 확인 (카테고리 검색은 항상 거리순)
+    filtered = _needs_radius_filter(x, y, radius)
+    cache_key = _search_cache_key("category", category_code, x, y, radius, "distance",
+                                  MAX_SEARCH_RESULTS if filtered else size)
+    _, _, cx, cy, bucket, _, _ = cache_key
+
+    async def request_page(page, page_size):
+        return await _request_category_search(category, category_code, cx, cy, bucket, page_size, page)
+
+    if filtered:
+        return await _request_pages_within_radius(cache_key, request_page, x, y, radius, size, "distance")
+
+    cached = _search_cache.get(cache_key)
+    if cached is None:
+        cached = await _request_pages(request_page, size)
+        if "error" in cached:
+            return cached
+        _search_cache.set(cache_key, cached)
+
+    return _cached_search_result(cached, x, y, radius, size, "distance")
+
+
+async def _request_category_search(
+    category: str,
+    category_code: str,
+    x: float,
+    y: float,
+    radius: int,
+    size: int,
+    page: int = 1,
+) -> Dict:
+    """카테고리 검색 API 호출 (캐시 없음, 한 페이지)"""
     url = f"{KAKAO_LOCAL_API}/search/category.json"
 
     params = {
@@ -236,7 +671,8 @@ async def search_place_by_category(
         "x": x,
         "y": y,
         "radius": min(radius, 20000),
-        "size": min(size, 15),
+        "size": min(size, MAX_PAGE_SIZE),
+        "page": page,
         "sort": "distance",
     }
 
@@ -245,28 +681,35 @@ async def search_place_by_category(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            places = []
-            for doc in data.get("documents", []):
-                places.append({
-                    "name": doc.get("place_name", ""),
-                    "address": doc.get("road_address_name") or doc.get("address_name", ""),
-                    "category": doc.get("category_name", ""),
-                    "phone": doc.get("phone", ""),
-                    "distance": doc.get("distance", ""),
-                    "place_url": doc.get("place_url", ""),
-                })
-
-            return {
-                "category": category,
-                "total_count": data.get("meta", {}).get("total_count", 0),
-                "places": places,
-            }
-
+        response = await upstream_get("kakao", url, params=params, headers=headers, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        places = []
+        for doc in data.get("documents", []):
+            places.append({
+                "id": doc.get("id", ""),
+                "name": doc.get("place_name", ""),
+                "address": doc.get("road_address_name") or doc.get("address_name", ""),
+                "category": doc.get("category_name", ""),
+                "phone": doc.get("phone", ""),
+                "distance": doc.get("distance", ""),
+                "place_url": doc.get("place_url", ""),
+            })
+
+        meta = data.get("meta", {})
+        return {
+            "category": category,
+            "total_count": meta.get("total_count", 0),
+            "places": places,
+            "meta": {
+                "is_end": meta.get("is_end", True),
+                "pageable_count": meta.get("pageable_count", 0),
+            },
+        }
+
+    except UpstreamError as e:
+        return e.to_error()
     except Exception as e:
         return {"error": f"요청 실패: {str(e)}"}
 
@@ -290,23 +733,24 @@ async def geocode(address: str) -> Dict:
     headers = {"Authorization": f"KakaoAK {KAKAO_REST_API_KEY}"}
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
-
-            documents = data.get("documents", [])
-            if not documents:
-                return {"error": "주소를 찾을 수 없습니다.", "address": address}
-
-            doc = documents[0]
-            return {
-                "address": address,
-                "x": doc.get("x", ""),
-                "y": doc.get("y", ""),
-                "address_type": doc.get("address_type", ""),
-            }
-
+        response = await upstream_get("kakao", url, params=params, headers=headers, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        documents = data.get("documents", [])
+        if not documents:
+            return {"error": "주소를 찾을 수 없습니다.", "address": address}
+
+        doc = documents[0]
+        return {
+            "address": address,
+            "x": doc.get("x", ""),
+            "y": doc.get("y", ""),
+            "address_type": doc.get("address_type", ""),
+        }
+
+    except UpstreamError as e:
+        return e.to_error()
     except Exception as e:
         return {"error": f"요청 실패: {str(e)}"}
 
@@ -372,174 +816,21 @@ def get_directions_url(
     }
 
 
-# 한국 전체 주요 지역 좌표
-KOREA_COORDINATES = {
-    # 서울 주요 지역/랜드마크
-    "서울": (126.9780, 37.5665),
-    "홍대": (126.9236, 37.5563),
-    "홍대입구": (126.9236, 37.5563),
-    "이태원": (126.9945, 37.5346),
-    "명동": (126.9857, 37.5636),
-    "강남역": (127.0276, 37.4979),
-    "서울역": (126.9706, 37.5547),
-    "잠실": (127.1000, 37.5133),
-    "여의도": (126.9246, 37.5219),
-    "신촌": (126.9368, 37.5551),
-    "건대입구": (127.0704, 37.5402),
-    "압구정": (127.0288, 37.5270),
-    "신사동": (127.0205, 37.5166),
-    "가로수길": (127.0230, 37.5198),
-    "성수동": (127.0560, 37.5447),
-    "망원동": (126.9052, 37.5556),
-    "연남동": (126.9213, 37.5660),
-    "합정": (126.9139, 37.5496),
-    "상수": (126.9230, 37.5478),
-    "을지로": (126.9910, 37.5660),
-    "종로": (126.9816, 37.5735),
-    "북촌": (126.9850, 37.5825),
-    "삼청동": (126.9820, 37.5900),
-    "인사동": (126.9850, 37.5740),
-    "동대문": (127.0093, 37.5711),
-    "청량리": (127.0470, 37.5803),
-
-    # 서울 구
-    "강남구": (127.0495, 37.5172),
-    "강북구": (127.0255, 37.6396),
-    "강서구": (126.8495, 37.5509),
-    "관악구": (126.9516, 37.4784),
-    "광진구": (127.0857, 37.5384),
-    "구로구": (126.8874, 37.4954),
-    "금천구": (126.8956, 37.4600),
-    "노원구": (127.0569, 37.6542),
-    "도봉구": (127.0471, 37.6688),
-    "동대문구": (127.0407, 37.5744),
-    "동작구": (126.9516, 37.5124),
-    "마포구": (126.9090, 37.5663),
-    "서대문구": (126.9388, 37.5791),
-    "서초구": (127.0327, 37.4837),
-    "성동구": (127.0369, 37.5633),
-    "성북구": (127.0203, 37.5894),
-    "송파구": (127.1059, 37.5048),
-    "양천구": (126.8665, 37.5270),
-    "영등포구": (126.8983, 37.5264),
-    "용산구": (126.9675, 37.5326),
-    "은평구": (126.9293, 37.6027),
-    "종로구": (126.9816, 37.5735),
-    "중구": (126.9996, 37.5640),
-    "중랑구": (127.0928, 37.6063),
-
-    # 경기도
-    "수원": (127.0286, 37.2636),
-    "성남": (127.1378, 37.4201),
-    "고양": (126.8320, 37.6584),
-    "용인": (127.1775, 37.2410),
-    "부천": (126.7660, 37.5034),
-    "안산": (126.8468, 37.3219),
-    "안양": (126.9526, 37.3943),
-    "남양주": (127.2165, 37.6360),
-    "화성": (126.8312, 37.1995),
-    "평택": (127.0889, 36.9921),
-    "의정부": (127.0338, 37.7381),
-    "시흥": (126.8030, 37.3800),
-    "파주": (126.7800, 37.7600),
-    "광명": (126.8664, 37.4786),
-    "김포": (126.7156, 37.6152),
-    "군포": (126.9350, 37.3614),
-    "광주": (127.2553, 37.4295),  # 경기 광주
-    "이천": (127.4350, 37.2722),
-    "양주": (127.0456, 37.7853),
-    "오산": (127.0770, 37.1499),
-    "구리": (127.1297, 37.5943),
-    "안성": (127.2798, 37.0078),
-    "포천": (127.2003, 37.8949),
-    "의왕": (126.9683, 37.3449),
-    "하남": (127.2146, 37.5393),
-    "여주": (127.6375, 37.2983),
-    "양평": (127.4875, 37.4917),
-    "동두천": (127.0606, 37.9034),
-    "과천": (126.9876, 37.4292),
-    "가평": (127.5095, 37.8315),
-    "연천": (127.0750, 38.0964),
-
-    # 광역시
-    "부산": (129.0756, 35.1796),
-    "대구": (128.6014, 35.8714),
-    "인천": (126.7052, 37.4563),
-    "광주광역시": (126.8526, 35.1595),
-    "대전": (127.3845, 36.3504),
-    "울산": (129.3114, 35.5384),
-    "세종": (127.2894, 36.4800),
-
-    # 강원도
-    "춘천": (127.7298, 37.8813),
-    "원주": (127.9470, 37.3422),
-    "강릉": (128.8761, 37.7519),
-    "동해": (129.1143, 37.5247),
-    "태백": (128.9856, 37.1640),
-    "속초": (128.5918, 38.2070),
-    "삼척": (129.1658, 37.4500),
-
-    # 충청도
-    "청주": (127.4890, 36.6424),
-    "충주": (127.9259, 36.9910),
-    "제천": (128.1909, 37.1325),
-    "천안": (127.1526, 36.8151),
-    "공주": (127.1190, 36.4466),
-    "보령": (126.6127, 36.3334),
-    "아산": (127.0024, 36.7898),
-    "서산": (126.4503, 36.7845),
-    "논산": (127.0987, 36.1872),
-    "당진": (126.6463, 36.8896),
-
-    # 전라도
-    "전주": (127.1480, 35.8242),
-    "군산": (126.7368, 35.9676),
-    "익산": (126.9576, 35.9483),
-    "정읍": (126.8561, 35.5699),
-    "남원": (127.3903, 35.4164),
-    "김제": (126.8809, 35.8037),
-    "목포": (126.3922, 34.8118),
-    "여수": (127.6622, 34.7604),
-    "순천": (127.4875, 34.9506),
-    "나주": (126.7108, 35.0159),
-    "광양": (127.6958, 34.9407),
-
-    # 경상도
-    "포항": (129.3435, 36.0190),
-    "경주": (129.2247, 35.8562),
-    "김천": (128.1136, 36.1398),
-    "안동": (128.7293, 36.5684),
-    "구미": (128.3441, 36.1195),
-    "영주": (128.6240, 36.8057),
-    "영천": (128.9385, 35.9733),
-    "상주": (128.1591, 36.4109),
-    "문경": (128.1867, 36.5866),
-    "경산": (128.7412, 35.8251),
-    "창원": (128.6811, 35.2280),
-    "진주": (128.1078, 35.1802),
-    "통영": (128.4332, 34.8545),
-    "사천": (128.0644, 35.0037),
-    "김해": (128.8893, 35.2285),
-    "밀양": (128.7464, 35.5037),
-    "거제": (128.6211, 34.8806),
-    "양산": (129.0373, 35.3350),
-
-    # 제주도
-    "제주": (126.5312, 33.4996),
-    "서귀포": (126.5606, 33.2541),
-}
+# 한국 전체 주요 지역 좌표 - v3.8: data/reference_data.json으로 이동 (korea_coordinates)
 
 
 def get_location_coordinates(location: str) -> tuple:
     """지역명으로 좌표 반환 (캐시 조회, 동기)"""
+    korea_coordinates = get_reference_data().korea_coordinates
+
     # 정확한 매칭
-    if location in KOREA_COORDINATES:
-        return KOREA_COORDINATES[location]
+    if location in korea_coordinates:
+        return korea_coordinates[location]
 
     # 부분 매칭 (예: "서울시" -> "서울")
-    for key in KOREA_COORDINATES:
+    for key in korea_coordinates:
         if key in location or location in key:
-            return KOREA_COORDINATES[key]
+            return korea_coordinates[key]
 
     # 못 찾으면 None (async 버전에서 API 호출)
     return None
@@ -559,105 +850,46 @@ async def get_location_coordinates_async(location: str) -> tuple:
     # 2. Kakao Geocoding API로 동적 조회
     if not KAKAO_REST_API_KEY:
         # API 키 없으면 서울 기본값
-        return KOREA_COORDINATES.get("서울")
+        return get_reference_data().korea_coordinates.get("서울")
 
-    result = await geocode(location)
-    if "error" not in result and result.get("x") and result.get("y"):
-        return (float(result["x"]), float(result["y"]))
+    with span("geocode", location=location):
+        result = await geocode(location)
+        if "error" not in result and result.get("x") and result.get("y"):
+            return (float(result["x"]), float(result["y"]))
 
-    # 3. 키워드 검색으로 시도
-    try:
-        search_result = await search_place_by_keyword(location, size=1)
-        if search_result.get("places"):
-            place = search_result["places"][0]
-            return (float(place["x"]), float(place["y"]))
-    except:
-        pass
+        # 3. 키워드 검색으로 시도
+        try:
+            search_result = await search_place_by_keyword(location, size=1)
+            if search_result.get("places"):
+                place = search_result["places"][0]
+                return (float(place["x"]), float(place["y"]))
+        except:
+            pass
 
     # 4. 기본값: 서울
-    return KOREA_COORDINATES.get("서울")
+    return get_reference_data().korea_coordinates.get("서울")
 
 
 # =============================================================================
 # 상황별 장소 추천 시스템
 # =============================================================================
 
-# 상황별 추천 카테고리
-SITUATION_CATEGORIES = {
-    "혼자": {
-        "keywords": ["카페", "서점", "독서실", "영화관", "미술관", "전시회", "공원"],
-        "description": "혼자만의 시간을 보내기 좋은 곳",
-    },
-    "친구": {
-        "keywords": ["맛집", "술집", "호프", "포차", "노래방", "볼링장", "방탈출", "보드게임카페"],
-        "description": "친구들과 즐기기 좋은 곳",
-    },
-    "데이트": {
-        "keywords": ["레스토랑", "카페", "영화관", "전시회", "야경", "루프탑", "와인바", "이자카야"],
-        "description": "연인과 로맨틱한 시간을 보내기 좋은 곳",
-    },
-    "가족": {
-        "keywords": ["한식", "뷔페", "키즈카페", "놀이공원", "동물원", "박물관", "수족관"],
-        "description": "가족과 함께하기 좋은 곳",
-    },
-    "비즈니스": {
-        "keywords": ["레스토랑", "호텔", "카페", "회의실", "코워킹"],
-        "description": "비즈니스 미팅에 적합한 곳",
-    },
-}
+# 상황별/시간대별/날씨별 추천 - v3.8: data/reference_data.json으로 이동
+# (situation_categories, time_recommendations, weather_recommendations)
 
-# 시간대별 추천
-TIME_RECOMMENDATIONS = {
-    "아침": {
-        "hours": (6, 10),
-        "keywords": ["브런치", "모닝커피", "베이커리", "아침식사"],
-        "vibe": "상쾌한 하루의 시작",
-    },
-    "점심": {
-        "hours": (11, 14),
-        "keywords": ["맛집", "런치", "한식", "일식", "중식"],
-        "vibe": "든든한 점심 식사",
-    },
-    "오후": {
-        "hours": (14, 17),
-        "keywords": ["카페", "디저트", "전시회", "공원", "산책"],
-        "vibe": "여유로운 오후 시간",
-    },
-    "저녁": {
-        "hours": (17, 21),
-        "keywords": ["레스토랑", "고기", "파스타", "회", "이자카야"],
-        "vibe": "분위기 있는 저녁 식사",
-    },
-    "심야": {
-        "hours": (21, 6),
-        "keywords": ["술집", "호프", "포차", "야식", "라멘", "24시"],
-        "vibe": "밤을 즐기는 시간",
-    },
+_LEGACY_TABLES = {
+    "KOREA_COORDINATES": "korea_coordinates",
+    "SITUATION_CATEGORIES": "situation_categories",
+    "TIME_RECOMMENDATIONS": "time_recommendations",
+    "WEATHER_RECOMMENDATIONS": "weather_recommendations",
 }
 
-# 날씨별 추천
-WEATHER_RECOMMENDATIONS = {
-    "맑음": {
-        "outdoor": True,
-        "keywords": ["공원", "산책", "테라스", "루프탑", "야외"],
-        "tip": "야외 활동하기 좋은 날씨예요!",
-    },
-    "흐림": {
-        "outdoor": True,
-        "keywords": ["카페", "전시회", "영화관", "쇼핑몰"],
-        "tip": "실내외 모두 좋아요",
-    },
-    "비": {
-        "outdoor": False,
-        "keywords": ["실내", "영화관", "쇼핑몰", "카페", "북카페"],
-        "tip": "실내 활동을 추천해요",
-    },
-    "눈": {
-        "outdoor": False,
-        "keywords": ["따뜻한", "국물", "찌개", "라멘", "카페"],
-        "tip": "따뜻한 곳에서 포근하게!",
-    },
-}
+
+def __getattr__(name: str):
+    """기존 모듈 상수 호환 (접근 시점의 데이터 반환)"""
+    if name in _LEGACY_TABLES:
+        return getattr(get_reference_data(), _LEGACY_TABLES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_korea_time():
@@ -894,6 +1126,20 @@ def enrich_place_info(
     return result
 
 
+def compact_place_info(place: Dict, step_num: int = 1) -> Dict:
+    """
+    장소 최소 정보 (detail=compact용)
+
+    추천 이유/팁/랜드마크 등 강화 정보를 만들지 않습니다.
+    """
+    return {
+        "step": step_num,
+        "name": place.get("place_name", place.get("name", "")),
+        "address": place.get("road_address_name", place.get("address", "")),
+        "kakao_map_url": place.get("place_url", place.get("kakao_map_url", "")),
+    }
+
+
 def get_current_time_of_day() -> str:
     """현재 한국 시간 기준 시간대 반환"""
     hour = get_korea_time().hour
@@ -915,7 +1161,8 @@ async def get_smart_recommendation(
     situation: str = "혼자",
     time_of_day: str = "",
     weather: str = "",
-    count: int = 5
+    count: int = 5,
+    detail: str = DETAIL_NORMAL
 ) -> Dict:
     """
     상황/시간/날씨에 맞는 스마트 장소 추천
@@ -926,6 +1173,7 @@ async def get_smart_recommendation(
         time_of_day: 시간대 (아침, 점심, 오후, 저녁, 심야) - 비어있으면 현재 한국 시간
         weather: 날씨 (맑음, 흐림, 비, 눈) - 비어있으면 무시
         count: 결과 개수
+        detail: 응답 상세도 (compact면 랜드마크 조회/정보 강화 생략)
 
     Returns:
         상황에 맞는 장소 추천
@@ -938,44 +1186,53 @@ async def get_smart_recommendation(
     x, y = coords
 
     # 상황별 키워드
-    situation_data = SITUATION_CATEGORIES.get(situation, SITUATION_CATEGORIES["혼자"])
+    data = get_reference_data()
+    situation_data = data.situation_categories.get(situation, data.situation_categories["혼자"])
     keywords = situation_data["keywords"].copy()
 
     # 시간대 자동 감지 (한국 시간 기준)
     if not time_of_day:
         time_of_day = get_current_time_of_day()
 
-    time_data = TIME_RECOMMENDATIONS.get(time_of_day, TIME_RECOMMENDATIONS["오후"])
+    time_data = data.time_recommendations.get(time_of_day, data.time_recommendations["오후"])
 
     # 날씨 키워드 추가
     weather_data = None
     if weather:
-        weather_data = WEATHER_RECOMMENDATIONS.get(weather)
+        weather_data = data.weather_recommendations.get(weather)
         if weather_data and not weather_data["outdoor"]:
             # 비/눈일 때 실내 위주
             keywords = [k for k in keywords if k not in ["공원", "산책", "야외", "테라스"]]
 
-    # 검색 키워드 조합 (상황 + 시간대)
-    search_keyword = f"{location} {keywords[0]}"
-    if time_of_day in ["아침", "점심", "저녁"]:
-        search_keyword = f"{location} {time_data['keywords'][0]}"
+    # 검색 키워드 조합 (시간대 + 상황 키워드 여러 개)
+    search_terms = keywords[:SMART_SEARCH_KEYWORDS]
+    if time_of_day in ["아침", "점심", "저녁"] or not search_terms:
+        search_terms = [time_data["keywords"][0]] + search_terms
+    search_keywords = [f"{location} {k}" for k in dict.fromkeys(search_terms)]
+    search_keyword = search_keywords[0]
 
-    # 장소 검색
-    result = await search_place_by_keyword(search_keyword, x, y, 3000, count, "accuracy")
+    # 장소 검색 (키워드별 동시 검색 후 병합)
+    result = await search_places_multi(search_keywords, x, y, 3000, count, "accuracy")
 
     if "error" in result:
         return result
 
+    # compact: 랜드마크 API 호출과 정보 강화 없이 바로 반환
+    if detail == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "situation": situation,
+            "time_of_day": time_of_day,
+            "places": [compact_place_info(p, i) for i, p in enumerate(result.get("places", []), 1)],
+        }
+
     # 장소에 강화된 정보 추가 (v3.4) + 랜드마크 정보 (v3.6)
-    places_with_links = []
-    for i, place in enumerate(result.get("places", []), 1):
-        # 가장 가까운 랜드마크 찾기 (지하철역 > 버스터미널)
-        place_x = place.get("x", "")
-        place_y = place.get("y", "")
-        nearest_landmark = None
-        if place_x and place_y:
-            nearest_landmark = await find_nearest_landmark(place_x, place_y)
+    # 가장 가까운 랜드마크 일괄 조회 (지하철역 > 버스터미널, 내장 인덱스 우선)
+    places = result.get("places", [])
+    landmarks = await find_nearest_landmarks(places)
 
+    places_with_links = []
+    for i, (place, nearest_landmark) in enumerate(zip(places, landmarks), 1):
         enriched = enrich_place_info(place, situation, time_of_day, i, nearest_landmark=nearest_landmark)
         places_with_links.append(enriched)
 
@@ -992,16 +1249,47 @@ async def get_smart_recommendation(
         "places": places_with_links,
         "total_found": result.get("total_count", 0),
         "search_keyword": search_keyword,
+        "search_keywords": search_keywords,
         "tip": f"각 장소의 '운영시간은 카카오맵에서 확인하세요' 링크를 클릭하세요!",
     }
 
 
+async def _search_course_steps(searches: List[tuple]) -> List[Dict]:
+    """
+    코스 단계별 키워드 검색을 동시에 실행
+
+    COURSE_DEADLINE_SECONDS 안에 끝나지 않은 단계는 취소하고
+    {"places": [], "timeout": True}로 채웁니다.
+
+    Args:
+        searches: search_place_by_keyword 인자 튜플 목록 (단계 순서)
+
+    Returns:
+        단계 순서대로의 검색 결과
+    """
+    tasks = [asyncio.ensure_future(search_place_by_keyword(*args)) for args in searches]
+    done, pending = await asyncio.wait(tasks, timeout=COURSE_DEADLINE_SECONDS)
+    for task in pending:
+        task.cancel()
+
+    results = []
+    for task in tasks:
+        if task in done and task.exception() is None:
+            results.append(task.result())
+        elif task in done:
+            results.append({"error": f"요청 실패: {task.exception()}"})
+        else:
+            results.append({"places": [], "timeout": True})
+    return results
+
+
 async def get_weather_based_course(
     location: str,
     situation: str = "데이트",
     weather_sky: str = "",
     rain_prob: int = 0,
     temperature: float = 20,
+    detail: str = DETAIL_NORMAL,
 ) -> Dict:
     """
     날씨 기반 코스 추천 (A→B→C 동선)
@@ -1012,6 +1300,7 @@ async def get_weather_based_course(
         weather_sky: 하늘 상태 (맑음, 구름많음, 흐림)
         rain_prob: 강수확률 (0-100)
         temperature: 현재 기온
+        detail: 응답 상세도 (compact면 장소 정보 강화 생략)
 
     Returns:
         날씨 기반 코스 추천 (순서대로)
@@ -1042,20 +1331,9 @@ async def get_weather_based_course(
     # 현재 시간대 파악
     time_of_day = get_current_time_of_day()
 
-    # 코스 구성 (3단계) - 강화된 정보 포함
-    course_steps = []
-    prev_place_raw = None  # 이전 장소 원본 데이터 (좌표 포함)
-
+    # 단계별 검색어
     # 1단계: 카페/브런치 (시작)
     step1_keyword = f"{location} 카페" if is_outdoor_ok else f"{location} 북카페"
-    step1_result = await search_place_by_keyword(step1_keyword, x, y, 2000, 2, "accuracy")
-    if step1_result.get("places"):
-        place = step1_result["places"][0]
-        enriched = enrich_place_info(place, situation, time_of_day, 1, is_course=True)
-        enriched["type"] = "시작"
-        enriched["course_tip"] = "여유롭게 대화하며 시작해요"
-        course_steps.append(enriched)
-        prev_place_raw = place  # 다음 단계를 위해 저장
 
     # 2단계: 메인 활동
     if situation == "데이트":
@@ -1067,15 +1345,6 @@ async def get_weather_based_course(
     else:
         step2_keyword = f"{location} 서점" if not is_outdoor_ok else f"{location} 산책"
 
-    step2_result = await search_place_by_keyword(step2_keyword, x, y, 3000, 2, "accuracy")
-    if step2_result.get("places"):
-        place = step2_result["places"][0]
-        enriched = enrich_place_info(place, situation, time_of_day, 2, prev_place=prev_place_raw, is_course=True)
-        enriched["type"] = "메인"
-        enriched["course_tip"] = "오늘의 하이라이트!"
-        course_steps.append(enriched)
-        prev_place_raw = place  # 다음 단계를 위해 저장
-
     # 3단계: 식사/마무리
     hour = get_korea_time().hour
     if 11 <= hour < 14:
@@ -1085,13 +1354,63 @@ async def get_weather_based_course(
     else:
         step3_keyword = f"{location} 맛집"
 
-    step3_result = await search_place_by_keyword(step3_keyword, x, y, 3000, 2, "accuracy")
-    if step3_result.get("places"):
-        place = step3_result["places"][0]
-        enriched = enrich_place_info(place, situation, time_of_day, 3, prev_place=prev_place_raw, is_course=True)
-        enriched["type"] = "마무리"
-        enriched["course_tip"] = "맛있는 식사로 마무리!"
+    # 세 단계 검색은 서로 독립 - 동시에 요청 (마감 시간 내 끝난 단계만 사용)
+    step_results = await _search_course_steps([
+        (step1_keyword, x, y, 2000, COURSE_CANDIDATES, "accuracy"),
+        (step2_keyword, x, y, 3000, COURSE_CANDIDATES, "accuracy"),
+        (step3_keyword, x, y, 3000, COURSE_CANDIDATES, "accuracy"),
+    ])
+
+    # 코스 구성 (3단계) - 강화된 정보 포함
+    step_meta = [
+        ("시작", "여유롭게 대화하며 시작해요"),
+        ("메인", "오늘의 하이라이트!"),
+        ("마무리", "맛있는 식사로 마무리!"),
+    ]
+    timed_out = any(result.get("timeout") for result in step_results)
+    found_steps = [
+        (step_num, result["places"], meta)
+        for step_num, (result, meta) in enumerate(zip(step_results, step_meta), start=1)
+        if result.get("places")
+    ]
+
+    # 후보 조합 중 출발지 → 1 → 2 → 3 이동 거리가 가장 짧은 동선 선택 (추가 API 호출 없음)
+    with span("course optimize", steps=len(found_steps)):
+        choice, route_km = optimize_course(
+            [places for _, places, _ in found_steps],
+            origin=(float(y), float(x)),
+            outdoor_ok=is_outdoor_ok,
+        )
+
+    course_steps = []
+    prev_place_raw = None  # 이전 장소 원본 데이터 (좌표 포함)
+
+    for (step_num, places, (step_type, course_tip)), index in zip(found_steps, choice):
+        place = places[index]
+        if detail == DETAIL_COMPACT:
+            enriched = compact_place_info(place, step_num)
+        else:
+            enriched = enrich_place_info(
+                place, situation, time_of_day, step_num, prev_place=prev_place_raw, is_course=True
+            )
+        enriched["type"] = step_type
+        enriched["course_tip"] = course_tip
         course_steps.append(enriched)
+        prev_place_raw = place  # 다음 단계를 위해 저장
+
+    if timed_out:
+        timeout_notice = "일부 장소 검색이 늦어져 코스에서 제외했어요."
+        weather_warning = f"{weather_warning} {timeout_notice}" if weather_warning else timeout_notice
+
+    if detail == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "is_outdoor_ok": is_outdoor_ok,
+            "warning": weather_warning,
+            "course": course_steps,
+            "course_summary": " → ".join([s["name"] for s in course_steps]),
+            "total_distance_km": route_km,
+        }
 
     return {
         "location": location,
@@ -1106,6 +1425,7 @@ async def get_weather_based_course(
         "course": course_steps,
         "course_summary": " → ".join([s["name"] for s in course_steps]),
         "total_steps": len(course_steps),
+        "total_distance_km": route_km,
         "guide": {
             "how_to_use": "각 장소의 kakao_map_url을 클릭하면 상세 정보/길찾기 가능",
             "what_you_get": "추천이유(why_recommend), 이동방법(how_to_get_there), 알아야 할 것(notice)",
@@ -0,0 +1,133 @@
+"""
+지하철역/버스터미널 랜드마크 인덱스 (v3.8)
+
+참조 데이터의 역/터미널 목록을 위경도 격자(셀)에 나눠 담고,
+"이 장소에서 가장 가까운 역"을 주변 셀만 보고 로컬에서 찾습니다.
+추천 장소마다 Kakao 카테고리 검색을 최대 2번 하던 것을 대체합니다.
+
+- 우선순위: 지하철역(2km) > 버스터미널(5km) - 기존 Kakao 조회와 동일
+- 내장 목록은 전국 역의 일부라 더 가까운 역이 빠져 있을 수 있음
+  → find(trust_radius_m=INDEX_TRUST_RADIUS_M)은 지하철역이 그 거리 안에 있을 때만 답함
+- 답하지 못하면 None → 호출 측에서 Kakao로 조회 후 add()로 학습 (Kakao 실패 시 find()로 대체)
+"""
+
+import math
+from collections import defaultdict
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.spot_index import KM_PER_DEG_LAT, haversine_km
+
+
+# 격자 셀 크기 (도) - 위도 0.05도 ≈ 5.5km
+CELL_DEG = 0.05
+
+# (종류, 검색 반경 m) - 앞에서부터 찾음
+LANDMARK_SEARCH_ORDER = (
+    ("subway", 2000),
+    ("terminal", 5000),
+)
+
+# 인덱스 결과를 Kakao 조회 없이 믿는 거리 (m) - 이보다 가까운 역이 목록에 빠져 있을 가능성이 낮음
+INDEX_TRUST_RADIUS_M = 300
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    """좌표가 속한 셀"""
+    return int(math.floor(lat / CELL_DEG)), int(math.floor(lon / CELL_DEG))
+
+
+class LandmarkIndex:
+    """역/터미널 격자 인덱스"""
+
+    def __init__(self, landmarks: Iterable[dict]):
+        self._cells = defaultdict(list)
+        self._names = set()
+        for landmark in landmarks:
+            self.add(landmark)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, landmark: dict) -> None:
+        """랜드마크 추가 (이름+종류가 같으면 무시)"""
+        key = (landmark["name"], landmark["type"])
+        if key in self._names:
+            return
+        self._names.add(key)
+        self._cells[_cell(landmark["lat"], landmark["lon"])].append(landmark)
+
+    def nearest(
+        self, lat: float, lon: float, kind: str, radius_m: float
+    ) -> Optional[Tuple[dict, int]]:
+        """
+        반경 안에서 가장 가까운 랜드마크
+
+        Returns:
+            (랜드마크, 거리m) 또는 None
+        """
+        radius_km = radius_m / 1000
+        dlat = radius_km / KM_PER_DEG_LAT
+        dlon = radius_km / (KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lon_lo = _cell(lat - dlat, lon - dlon)
+        lat_hi, lon_hi = _cell(lat + dlat, lon + dlon)
+
+        candidates = [
+            landmark
+            for i in range(lat_lo, lat_hi + 1)
+            for j in range(lon_lo, lon_hi + 1)
+            for landmark in self._cells.get((i, j), ())
+            if landmark["type"] == kind
+        ]
+        if not candidates:
+            return None
+
+        dist = haversine_km(
+            lat, lon,
+            np.array([c["lat"] for c in candidates]),
+            np.array([c["lon"] for c in candidates]),
+        )
+        best = int(np.argmin(dist))
+        if dist[best] > radius_km:
+            return None
+        return candidates[best], int(round(float(dist[best]) * 1000))
+
+    def find(self, lat: float, lon: float, trust_radius_m: Optional[float] = None) -> Optional[dict]:
+        """
+        우선순위대로 가장 가까운 랜드마크 (Kakao 조회 결과와 같은 형태)
+
+        Args:
+            trust_radius_m: 주어지면 1순위(지하철역)가 이 거리 안에 있을 때만 반환
+                (목록에 없는 더 가까운 역이 있을 수 있어 그 밖은 판단하지 않음)
+
+        Returns:
+            {"name", "distance"(m 문자열), "x", "y"} 또는 None
+        """
+        if trust_radius_m is not None:
+            kind = LANDMARK_SEARCH_ORDER[0][0]
+            return self._format(self.nearest(lat, lon, kind, trust_radius_m))
+
+        for kind, radius_m in LANDMARK_SEARCH_ORDER:
+            hit = self.nearest(lat, lon, kind, radius_m)
+            if hit:
+                return self._format(hit)
+        return None
+
+    def find_many(
+        self, points: List[Tuple[float, float]], trust_radius_m: Optional[float] = None
+    ) -> List[Optional[dict]]:
+        """여러 좌표 (위도, 경도)를 한 번에 조회"""
+        return [self.find(lat, lon, trust_radius_m) for lat, lon in points]
+
+    @staticmethod
+    def _format(hit: Optional[Tuple[dict, int]]) -> Optional[dict]:
+        if hit is None:
+            return None
+        landmark, distance = hit
+        return {
+            "name": landmark["name"],
+            "distance": str(distance),
+            "x": str(landmark["lon"]),
+            "y": str(landmark["lat"]),
+        }
@@ -8,17 +8,21 @@
 - 대기정체지수 (연중)
 """
 
+import asyncio
 import os
-import httpx
 from datetime import datetime, timedelta
 from typing import Optional
 from dotenv import load_dotenv
 
+from config.settings import api_config
+from src.upstream import upstream_get
+from src.upstream_errors import UpstreamError
+
 load_dotenv()
 
 # API 설정
 LIFE_INDEX_API_KEY = os.getenv("WEATHER_API_KEY", "")
-BASE_URL = "http://apis.data.go.kr/1360000/LivingWthrIdxServiceV4"
+BASE_URL = api_config.life_index_base_url
 
 
 # 지역 코드 매핑 (시도별)
@@ -120,6 +124,28 @@ def get_uv_grade(value: int) -> dict:
     return UV_INDEX_GRADES["low"]
 
 
+def _estimated_uv(location: str, message: str) -> dict:
+    """계절 기반 자외선지수 추정값 (API 실패/데이터 없음)"""
+    month = datetime.now().month
+    if month in [6, 7, 8]:  # 여름
+        estimated_uv = 8
+    elif month in [4, 5, 9, 10]:  # 봄/가을
+        estimated_uv = 5
+    else:  # 겨울
+        estimated_uv = 2
+
+    grade_info = get_uv_grade(estimated_uv)
+    return {
+        "location": location,
+        "uv_index": estimated_uv,
+        "grade": grade_info["grade"],
+        "emoji": grade_info["emoji"],
+        "advice": grade_info["advice"],
+        "estimated": True,
+        "message": message,
+    }
+
+
 async def get_uv_index(location: str = "서울") -> dict:
     """
     자외선지수 조회
@@ -148,72 +174,39 @@ async def get_uv_index(location: str = "서울") -> dict:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{BASE_URL}/getUVIdxV4",
-                params=params,
-            )
-
-            if response.status_code != 200:
-                # API 실패 시 계절 기반 추정값 반환
-                month = datetime.now().month
-                if month in [6, 7, 8]:  # 여름
-                    estimated_uv = 8
-                elif month in [4, 5, 9, 10]:  # 봄/가을
-                    estimated_uv = 5
-                else:  # 겨울
-                    estimated_uv = 2
-
-                grade_info = get_uv_grade(estimated_uv)
-                return {
-                    "location": location,
-                    "uv_index": estimated_uv,
-                    "grade": grade_info["grade"],
-                    "emoji": grade_info["emoji"],
-                    "advice": grade_info["advice"],
-                    "estimated": True,
-                    "message": "API 미지원, 계절 기반 추정값",
-                }
+        response = await upstream_get(
+            "life_index",
+            f"{BASE_URL}/getUVIdxV4",
+            params=params,
+            timeout=10.0,
+        )
+    except UpstreamError:
+        # API 실패 시 계절 기반 추정값 반환
+        return _estimated_uv(location, "API 호출 실패, 계절 기반 추정값")
 
-            data = response.json()
+    try:
+        data = response.json()
 
-            # 응답 파싱
-            items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+        # 응답 파싱
+        items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
 
-            if not items:
-                # API 실패 시 기본값 반환 (계절에 따라 추정)
-                month = datetime.now().month
-                if month in [6, 7, 8]:  # 여름
-                    estimated_uv = 8
-                elif month in [4, 5, 9, 10]:  # 봄/가을
-                    estimated_uv = 5
-                else:  # 겨울
-                    estimated_uv = 2
-
-                grade_info = get_uv_grade(estimated_uv)
-                return {
-                    "location": location,
-                    "uv_index": estimated_uv,
-                    "grade": grade_info["grade"],
-                    "emoji": grade_info["emoji"],
-                    "advice": grade_info["advice"],
-                    "estimated": True,
-                    "message": "실시간 데이터 없음, 계절 기반 추정값",
-                }
+        if not items:
+            # 실시간 데이터 없음 - 계절에 따라 추정
+            return _estimated_uv(location, "실시간 데이터 없음, 계절 기반 추정값")
 
-            # 현재 시간대 데이터 추출
-            item = items[0] if isinstance(items, list) else items
-            uv_value = int(item.get("h0", item.get("h3", 3)))
+        # 현재 시간대 데이터 추출
+        item = items[0] if isinstance(items, list) else items
+        uv_value = int(item.get("h0", item.get("h3", 3)))
 
-            grade_info = get_uv_grade(uv_value)
+        grade_info = get_uv_grade(uv_value)
 
-            return {
-                "location": location,
-                "uv_index": uv_value,
-                "grade": grade_info["grade"],
-                "emoji": grade_info["emoji"],
-                "advice": grade_info["advice"],
-            }
+        return {
+            "location": location,
+            "uv_index": uv_value,
+            "grade": grade_info["grade"],
+            "emoji": grade_info["emoji"],
+            "advice": grade_info["advice"],
+        }
 
     except Exception as e:
         return {"error": f"자외선지수 조회 실패: {str(e)}"}
@@ -295,29 +288,30 @@ async def get_heat_index(location: str = "서울", temperature: float = None, hu
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{BASE_URL}/getSenTaIdxV4",
-                params=params,
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
-
-                if items:
-                    item = items[0] if isinstance(items, list) else items
-                    heat_value = float(item.get("h0", item.get("h3", 30)))
-
-                    grade_info = get_heat_grade(heat_value)
-
-                    return {
-                        "location": location,
-                        "heat_index": heat_value,
-                        "grade": grade_info["grade"],
-                        "emoji": grade_info["emoji"],
-                        "advice": grade_info["advice"],
-                    }
+        response = await upstream_get(
+            "life_index",
+            f"{BASE_URL}/getSenTaIdxV4",
+            params=params,
+            timeout=10.0,
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+
+            if items:
+                item = items[0] if isinstance(items, list) else items
+                heat_value = float(item.get("h0", item.get("h3", 30)))
+
+                grade_info = get_heat_grade(heat_value)
+
+                return {
+                    "location": location,
+                    "heat_index": heat_value,
+                    "grade": grade_info["grade"],
+                    "emoji": grade_info["emoji"],
+                    "advice": grade_info["advice"],
+                }
     except:
         pass
 
@@ -396,27 +390,26 @@ async def get_pollen_index(location: str = "서울") -> dict:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(endpoint, params=params)
-
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
-
-                if items:
-                    item = items[0] if isinstance(items, list) else items
-                    pollen_value = int(item.get("today", 1))
-
-                    grade_info = get_pollen_grade(pollen_value)
-
-                    return {
-                        "location": location,
-                        "pollen_type": pollen_name,
-                        "pollen_index": pollen_value,
-                        "grade": grade_info["grade"],
-                        "emoji": grade_info["emoji"],
-                        "advice": grade_info["advice"],
-                    }
+        response = await upstream_get("life_index", endpoint, params=params, timeout=10.0)
+
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+
+            if items:
+                item = items[0] if isinstance(items, list) else items
+                pollen_value = int(item.get("today", 1))
+
+                grade_info = get_pollen_grade(pollen_value)
+
+                return {
+                    "location": location,
+                    "pollen_type": pollen_name,
+                    "pollen_index": pollen_value,
+                    "grade": grade_info["grade"],
+                    "emoji": grade_info["emoji"],
+                    "advice": grade_info["advice"],
+                }
     except:
         pass
 
@@ -525,29 +518,30 @@ async def get_food_poison_index(location: str = "서울", temperature: float = N
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{BASE_URL}/getFsnIdxV4",
-                params=params,
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
-
-                if items:
-                    item = items[0] if isinstance(items, list) else items
-                    index_value = int(item.get("h0", item.get("today", 50)))
-
-                    grade_info = get_food_poison_grade(index_value)
-
-                    return {
-                        "location": location,
-                        "food_poison_index": index_value,
-                        "grade": grade_info["grade"],
-                        "emoji": grade_info["emoji"],
-                        "advice": grade_info["advice"],
-                    }
+        response = await upstream_get(
+            "life_index",
+            f"{BASE_URL}/getFsnIdxV4",
+            params=params,
+            timeout=10.0,
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            items = data.get("response", {}).get("body", {}).get("items", {}).get("item", [])
+
+            if items:
+                item = items[0] if isinstance(items, list) else items
+                index_value = int(item.get("h0", item.get("today", 50)))
+
+                grade_info = get_food_poison_grade(index_value)
+
+                return {
+                    "location": location,
+                    "food_poison_index": index_value,
+                    "grade": grade_info["grade"],
+                    "emoji": grade_info["emoji"],
+                    "advice": grade_info["advice"],
+                }
     except:
         pass
 
@@ -585,23 +579,24 @@ async def get_all_life_indices(location: str = "서울", temperature: float = No
         "indices": {},
     }
 
+    # 자외선/체감온도/꽃가루/식중독 지수를 동시에 조회
+    uv, heat, pollen, food = await asyncio.gather(
+        get_uv_index(location),
+        get_heat_index(location, temperature, humidity),
+        get_pollen_index(location),
+        get_food_poison_index(location, temperature, humidity),
+    )
+
     # 자외선지수
-    uv = await get_uv_index(location)
     if "error" not in uv:
         results["indices"]["uv"] = uv
-
     # 체감온도 (여름철)
-    heat = await get_heat_index(location, temperature, humidity)
     if heat.get("available", True):
         results["indices"]["heat"] = heat
-
     # 꽃가루 (봄/가을)
-    pollen = await get_pollen_index(location)
     if pollen.get("available", True):
         results["indices"]["pollen"] = pollen
-
     # 식중독
-    food = await get_food_poison_index(location, temperature, humidity)
     if "error" not in food:
         results["indices"]["food_poison"] = food
 
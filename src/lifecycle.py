@@ -0,0 +1,150 @@
+"""
+서버 시작/종료 관리 + 준비 상태 (v3.8)
+
+uvicorn lifespan에서 공용 자원을 한 번만 준비하고 정리합니다.
+
+- 시작: 워커 버스 연결(멀티 워커), 참조 데이터 인덱스 생성, 공용 HTTP 클라이언트 생성,
+  주요 지역 캐시 예열(백그라운드)
+- 실행 중: 주요 지역 캐시를 주기적으로 갱신 (백그라운드 레인, 만료된 항목만 외부 호출),
+  추적 스팬 주기적 내보내기 (추적 사용 시)
+- 종료: 갱신 작업 취소, 워커 버스 닫기, HTTP 클라이언트 닫기, 남은 스팬 내보내기, 호출량 장부 저장
+
+/livez는 프로세스 생존만, /readyz는 예열 완료 여부와 업스트림 상태를 알려줍니다.
+"""
+
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from src.cache import cached_get_air_quality, cached_get_forecast, cached_get_life_index, cached_get_weather
+from src.circuit_breaker import STATE_OPEN, get_host_stats
+from src.rate_limiter import background_priority, flush_quota_ledger, get_limiter_stats
+from src.reference_data import get_reference_data
+from src.tracing import export_traces, is_tracing_enabled, span, trace_export_loop
+from src.upstream import close_http_clients, get_http_client
+from src.weather_snapshot import get_weather_snapshot
+from src.worker_bus import start_worker_bus, stop_worker_bus
+
+
+# 예열/주기 갱신할 지역 (쉼표 구분)
+WARMUP_LOCATIONS = [
+    name.strip() for name in os.getenv("WARMUP_LOCATIONS", "서울").split(",") if name.strip()
+]
+# 예열 최대 대기 (초) - 넘으면 예열 없이 준비 완료 (요청 시 조회)
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "20"))
+# 주기 갱신 간격 (초), 0이면 갱신 안 함
+WARMUP_REFRESH_SECONDS = float(os.getenv("WARMUP_REFRESH_SECONDS", "60"))
+
+
+_state = {
+    "started_at": None,
+    "ready_at": None,
+    "warmed": [],
+    "warmup_error": None,
+    "last_refresh_at": None,
+}
+
+
+def _cache_state(location: str) -> dict:
+    """지역의 원본 데이터 캐시 여부"""
+    return {
+        "weather": cached_get_weather.age(location) is not None,
+        "forecast": cached_get_forecast.age(location) is not None,
+        "air_quality": cached_get_air_quality.age(location) is not None,
+        "life_index": cached_get_life_index.age(location) is not None,
+    }
+
+
+async def _refresh(locations: List[str]) -> List[str]:
+    """지역 스냅샷 조회 (만료된 원본만 외부 호출), 성공한 지역 목록"""
+    with background_priority(), span("cache refresh", locations=len(locations)):
+        results = await asyncio.gather(
+            *(get_weather_snapshot(location) for location in locations),
+            return_exceptions=True,
+        )
+    return [location for location, result in zip(locations, results) if not isinstance(result, Exception)]
+
+
+async def warm_up(locations: Optional[List[str]] = None) -> None:
+    """
+    시작 시 예열 - 끝나면(실패/시간 초과 포함) 준비 완료
+
+    참조 데이터 인덱스는 첫 요청에서 만들지 않도록 여기서 생성합니다.
+    """
+    locations = WARMUP_LOCATIONS if locations is None else locations
+    try:
+        data = get_reference_data()
+        data.spot_index()
+        data.landmark_index()
+        get_http_client()
+        if locations:
+            _state["warmed"] = await asyncio.wait_for(_refresh(locations), WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        _state["warmup_error"] = f"예열 시간 초과 ({WARMUP_TIMEOUT_SECONDS:.0f}초)"
+    except Exception as e:
+        _state["warmup_error"] = f"예열 실패: {e}"
+    finally:
+        _state["ready_at"] = time.time()
+
+
+async def _refresh_loop() -> None:
+    """주요 지역 캐시 주기 갱신"""
+    while True:
+        await asyncio.sleep(WARMUP_REFRESH_SECONDS)
+        try:
+            await _refresh(WARMUP_LOCATIONS)
+            _state["last_refresh_at"] = time.time()
+        except Exception:
+            pass
+
+
+@asynccontextmanager
+async def lifespan(app=None):
+    """서버 lifespan - 예열/주기 갱신 시작, 종료 시 자원 정리"""
+    _state["started_at"] = time.time()
+    _state["ready_at"] = None
+    _state["warmup_error"] = None
+
+    start_worker_bus()
+    tasks = [asyncio.create_task(warm_up())]
+    if WARMUP_REFRESH_SECONDS > 0 and WARMUP_LOCATIONS:
+        tasks.append(asyncio.create_task(_refresh_loop()))
+    if is_tracing_enabled():
+        tasks.append(asyncio.create_task(trace_export_loop()))
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        stop_worker_bus()
+        await close_http_clients()
+        await export_traces()
+        flush_quota_ledger()
+
+
+def is_ready() -> bool:
+    return _state["ready_at"] is not None
+
+
+def get_readiness() -> dict:
+    """/readyz 응답 - 예열 상태, 호스트 서킷 상태, 남은 호출 한도"""
+    hosts = get_host_stats()
+    quota = get_limiter_stats()
+    return {
+        "ready": is_ready(),
+        "warmup": {
+            "locations": {location: _cache_state(location) for location in WARMUP_LOCATIONS},
+            "warmed": _state["warmed"],
+            "error": _state["warmup_error"],
+            "seconds": (
+                round(_state["ready_at"] - _state["started_at"], 2)
+                if _state["ready_at"] and _state["started_at"] else None
+            ),
+            "last_refresh_at": _state["last_refresh_at"],
+        },
+        "open_circuits": [host for host, stats in hosts.items() if stats["state"] == STATE_OPEN],
+        "quota_remaining": {name: stats["remaining"] for name, stats in quota.items()},
+    }
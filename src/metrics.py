@@ -0,0 +1,174 @@
+"""
+Prometheus 형식 메트릭 (v3.8)
+
+/health는 기능 목록과 현재 상태 위주라 시간에 따른 지연/오류 추이를 볼 수 없습니다.
+카운터/히스토그램을 메모리에 모아 /metrics에서 텍스트 노출 형식(text/plain; version=0.0.4)으로 내보냅니다.
+
+| 메트릭 | 라벨 | 내용 |
+|--------|------|------|
+| mcp_tool_requests_total | tool | 도구 호출 수 |
+| mcp_tool_errors_total | tool | 오류 응답/예외 수 |
+| mcp_tool_duration_seconds | tool | 도구 처리 시간 히스토그램 |
+| upstream_request_duration_seconds | upstream, endpoint | 외부 API 응답 시간 히스토그램 |
+| upstream_responses_total | upstream, endpoint, status | 상태 코드별 응답 수 (타임아웃은 "timeout", 연결 오류는 "error") |
+| upstream_response_bytes_total | upstream, endpoint | 응답 본문 바이트 |
+| cache_events_total | cache, event | hit / shared_hit / miss / stale / coalesced |
+
+기록은 dict 갱신 몇 번뿐이라 요청 경로에 부담이 없습니다 (잠금 없음 - 이벤트 루프 하나 기준).
+멀티 워커 모드에서는 워커마다 따로 집계되며, /metrics는 요청을 받은 워커의 값입니다.
+"""
+
+import bisect
+from typing import Dict, Tuple
+
+
+# 기본 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """라벨별 누적 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list:
+        return [
+            f"{self.name}{_label_text(self.labels, values)} {_format(value)}"
+            for values, value in sorted(self._values.items())
+        ]
+
+
+class Histogram:
+    """라벨별 히스토그램 (누적 구간 + 합계 + 개수)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], list] = {}  # 값: [구간별 개수..., +Inf 개수, 합계]
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> list:
+        lines = []
+        for values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, values, le)} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_label_text(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, values)} {_format(series[-1])}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, values)} {cumulative}")
+        return lines
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Registry:
+    """메트릭 모음"""
+
+    def __init__(self):
+        self._metrics = {}
+
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        """텍스트 노출 형식"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+TOOL_REQUESTS = REGISTRY.counter("mcp_tool_requests_total", "MCP 도구 호출 수", ("tool",))
+TOOL_ERRORS = REGISTRY.counter("mcp_tool_errors_total", "MCP 도구 오류 응답/예외 수", ("tool",))
+TOOL_DURATION = REGISTRY.histogram("mcp_tool_duration_seconds", "MCP 도구 처리 시간", ("tool",))
+
+UPSTREAM_DURATION = REGISTRY.histogram(
+    "upstream_request_duration_seconds", "외부 API 응답 시간", ("upstream", "endpoint")
+)
+UPSTREAM_RESPONSES = REGISTRY.counter(
+    "upstream_responses_total", "외부 API 상태 코드별 응답 수", ("upstream", "endpoint", "status")
+)
+UPSTREAM_BYTES = REGISTRY.counter(
+    "upstream_response_bytes_total", "외부 API 응답 본문 바이트", ("upstream", "endpoint")
+)
+
+CACHE_EVENTS = REGISTRY.counter("cache_events_total", "캐시 조회 결과 수", ("cache", "event"))
+
+CACHE_HIT = "hit"
+CACHE_SHARED_HIT = "shared_hit"
+CACHE_MISS = "miss"
+CACHE_STALE = "stale"
+CACHE_COALESCED = "coalesced"
+
+
+def record_cache(cache: str, event: str) -> None:
+    CACHE_EVENTS.inc(cache, event)
+
+
+def record_upstream(upstream: str, endpoint: str, status: str, seconds: float, size: int = 0) -> None:
+    UPSTREAM_DURATION.observe(seconds, upstream, endpoint)
+    UPSTREAM_RESPONSES.inc(upstream, endpoint, status)
+    if size:
+        UPSTREAM_BYTES.inc(upstream, endpoint, amount=size)
+
+
+def record_tool(tool: str, seconds: float, error: bool) -> None:
+    TOOL_REQUESTS.inc(tool)
+    TOOL_DURATION.observe(seconds, tool)
+    if error:
+        TOOL_ERRORS.inc(tool)
+
+
+def render_metrics() -> str:
+    return REGISTRY.render()
+
@@ -2,9 +2,12 @@
 옷차림 추천 및 외출 적합도 판단 로직
 """
 
+import copy
 from dataclasses import dataclass
 from typing import Optional
 
+from src.reference_data import get_reference_data
+
 
 @dataclass
 class WeatherCondition:
@@ -30,97 +33,41 @@ class AirQualityCondition:
     pm25_grade: str = "알수없음"
 
 
-# 기온별 옷차림 가이드
-OUTFIT_BY_TEMPERATURE = {
-    (28, 100): {
-        "category": "한여름",
-        "top": ["민소매", "반팔 티셔츠", "린넨 셔츠"],
-        "bottom": ["반바지", "린넨 팬츠", "면바지"],
-        "outer": [],
-        "accessories": ["모자", "선글라스"],
-        "tip": "더위 조심! 시원한 소재의 옷을 입으세요.",
-    },
-    (23, 27): {
-        "category": "초여름/초가을",
-        "top": ["반팔 티셔츠", "얇은 셔츠", "블라우스"],
-        "bottom": ["면바지", "청바지", "슬랙스"],
-        "outer": ["얇은 가디건"],
-        "accessories": [],
-        "tip": "일교차에 대비해 얇은 겉옷을 챙기세요.",
-    },
-    (20, 22): {
-        "category": "환절기",
-        "top": ["긴팔 티셔츠", "얇은 니트", "맨투맨"],
-        "bottom": ["청바지", "슬랙스", "면바지"],
-        "outer": ["가디건", "얇은 자켓"],
-        "accessories": [],
-        "tip": "아침저녁으로 쌀쌀할 수 있어요.",
-    },
-    (17, 19): {
-        "category": "선선한 날씨",
-        "top": ["니트", "맨투맨", "후드티"],
-        "bottom": ["청바지", "슬랙스"],
-        "outer": ["자켓", "야상", "트렌치코트"],
-        "accessories": [],
-        "tip": "겉옷은 필수! 레이어드 스타일 추천.",
-    },
-    (12, 16): {
-        "category": "쌀쌀한 날씨",
-        "top": ["니트", "기모 맨투맨", "셔츠 레이어드"],
-        "bottom": ["청바지", "기모 팬츠"],
-        "outer": ["자켓", "코트", "가죽자켓"],
-        "accessories": ["스카프"],
-        "tip": "두꺼운 겉옷을 준비하세요.",
-    },
-    (9, 11): {
-        "category": "초겨울",
-        "top": ["두꺼운 니트", "기모 후드"],
-        "bottom": ["기모 팬츠", "코듀로이"],
-        "outer": ["코트", "패딩", "무스탕"],
-        "accessories": ["머플러", "장갑"],
-        "tip": "보온에 신경 쓰세요.",
-    },
-    (5, 8): {
-        "category": "겨울",
-        "top": ["두꺼운 니트", "히트텍"],
-        "bottom": ["기모 팬츠", "울 팬츠"],
-        "outer": ["두꺼운 코트", "롱패딩", "숏패딩"],
-        "accessories": ["머플러", "장갑", "귀마개"],
-        "tip": "따뜻하게 입으세요!",
-    },
-    (-100, 4): {
-        "category": "한겨울",
-        "top": ["히트텍", "두꺼운 니트", "기모 후드"],
-        "bottom": ["기모 팬츠", "발열 내의"],
-        "outer": ["롱패딩", "두꺼운 코트"],
-        "accessories": ["머플러", "장갑", "귀마개", "핫팩"],
-        "tip": "최대한 따뜻하게! 동상 주의.",
-    },
-}
-
-
-def get_outfit_recommendation(weather: WeatherCondition) -> dict:
+# 기온별 옷차림 가이드 - v3.8: data/reference_data.json으로 이동 (outfit_by_temperature)
+# OUTFIT_BY_TEMPERATURE는 기존 import 호환용 (모듈 __getattr__로 지연 로딩)
+
+
+def __getattr__(name: str):
+    if name == "OUTFIT_BY_TEMPERATURE":
+        return get_reference_data().outfit_by_temperature
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_outfit_recommendation(weather: WeatherCondition, tpo: str = "") -> dict:
     """
     날씨 조건에 따른 옷차림 추천
 
     Args:
         weather: 날씨 조건
+        tpo: 상황 (출근, 데이트, 운동, 캐주얼) - 주어지면 응답의 your_situation에 표시
 
     Returns:
         옷차림 추천 정보
     """
     temp = weather.temperature
+    outfit_by_temperature = get_reference_data().outfit_by_temperature
 
     # 기온 범위에 맞는 추천 찾기
     recommendation = None
-    for (low, high), outfit in OUTFIT_BY_TEMPERATURE.items():
+    for (low, high), outfit in outfit_by_temperature.items():
         if low <= temp <= high:
-            recommendation = outfit.copy()
+            # 공유 참조 데이터를 수정하지 않도록 깊은 복사
+            recommendation = copy.deepcopy(outfit)
             break
 
     if recommendation is None:
         # 기본값
-        recommendation = OUTFIT_BY_TEMPERATURE[(17, 19)].copy()
+        recommendation = copy.deepcopy(outfit_by_temperature[(17, 19)])
 
     # 추가 조건 반영
 
@@ -146,7 +93,7 @@ def get_outfit_recommendation(weather: WeatherCondition) -> dict:
     if weather.humidity and weather.humidity >= 80:
         recommendation["tip"] += " 습도가 높아 불쾌할 수 있어요."
 
-    return {
+    result = {
         "temperature": temp,
         "category": recommendation["category"],
         "recommendation": {
@@ -157,6 +104,9 @@ def get_outfit_recommendation(weather: WeatherCondition) -> dict:
         },
         "tip": recommendation["tip"],
     }
+    if tpo:
+        result["your_situation"] = tpo
+    return result
 
 
 def calculate_outing_score(
@@ -0,0 +1,240 @@
+"""
+실행 중 프로파일링 - 통계적 스택 샘플러 (v3.8)
+
+재배포 없이 운영 중인 파드의 CPU 사용처(점수 계산, JSON 직렬화, httpx 응답 파싱 등)를 보기 위한 도구입니다.
+별도 스레드가 일정 간격으로 이벤트 루프 스레드의 스택을 읽어 세기만 하므로
+함수 호출마다 기록하는 결정적 프로파일러(cProfile)보다 부담이 훨씬 적습니다.
+
+- 결과는 collapsed stack 형식 ("루트;...;말단 횟수", flamegraph.pl / speedscope에서 바로 사용)
+- 샘플 시점에 실행 중인 asyncio 작업의 도구 이름(active_tool)을 맨 앞 프레임으로 붙임
+- 프로파일은 한 번에 하나, 최대 PROFILE_MAX_SECONDS
+
+/debug/profile 엔드포인트는 PROFILE_TOKEN이 설정된 경우에만 열립니다 (Authorization: Bearer 토큰).
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+PROFILE_DEFAULT_INTERVAL_MS = 10.0
+PROFILE_MIN_INTERVAL_MS = 1.0
+MAX_STACK_DEPTH = 128
+
+# 샘플 맨 앞 프레임 (도구 호출 밖 / 대기 중)
+TAG_NO_TOOL = "-"
+IDLE_FRAME = "(idle)"
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 실행 중인 도구 이름 (도구 미들웨어가 설정, asyncio 작업에 이어짐)
+active_tool: ContextVar[Optional[str]] = ContextVar("active_tool", default=None)
+
+# 작업 → 도구 이름 (샘플러 스레드는 다른 작업의 contextvars를 읽을 수 없어 따로 기록)
+_task_tools: "weakref.WeakKeyDictionary[asyncio.Task, str]" = weakref.WeakKeyDictionary()
+
+
+@contextmanager
+def tool_scope(name: str):
+    """블록 안에서 실행되는 코드(하위 작업 포함)를 도구 이름으로 표시"""
+    token = active_tool.set(name)
+    task = asyncio.current_task()
+    previous = _task_tools.get(task) if task is not None else None
+    if task is not None:
+        _task_tools[task] = name
+    try:
+        yield
+    finally:
+        active_tool.reset(token)
+        if task is not None:
+            if previous is None:
+                _task_tools.pop(task, None)
+            else:
+                _task_tools[task] = previous
+
+
+def _tagging_task_factory(previous_factory):
+    """프로파일 중 만든 작업에 만든 쪽의 도구 이름을 기록하는 작업 팩토리"""
+    def factory(loop, coro, **kwargs):
+        if previous_factory is not None:
+            task = previous_factory(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        tool = active_tool.get()
+        if tool is not None:
+            _task_tools[task] = tool
+        return task
+    return factory
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    if "site-packages" + os.sep in filename:
+        # 라이브러리 - site-packages 뒤 경로만
+        filename = filename.rsplit("site-packages" + os.sep, 1)[-1]
+    elif filename.startswith(_PROJECT_ROOT):
+        filename = os.path.relpath(filename, _PROJECT_ROOT)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _is_idle(frame) -> bool:
+    """이벤트 루프가 I/O 대기 중인지 (selectors의 select 안)"""
+    return frame.f_code.co_name in ("select", "poll") and frame.f_code.co_filename.endswith("selectors.py")
+
+
+def _task_tool(loop) -> str:
+    """loop에서 지금 실행 중인 작업의 도구 이름"""
+    if loop is None:
+        return TAG_NO_TOOL
+    task = getattr(asyncio.tasks, "_current_tasks", {}).get(loop)
+    if task is None:
+        return TAG_NO_TOOL
+    tool = _task_tools.get(task)
+    if tool is None and hasattr(task, "get_context"):
+        tool = task.get_context().get(active_tool)
+    return tool or TAG_NO_TOOL
+
+
+class StackSampler:
+    """한 스레드의 스택을 주기적으로 읽어 collapsed stack으로 집계"""
+
+    def __init__(
+        self,
+        thread_id: int,
+        interval: float = PROFILE_DEFAULT_INTERVAL_MS / 1000,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        include_idle: bool = False,
+    ):
+        """
+        Args:
+            thread_id: 샘플링할 스레드 (threading.get_ident())
+            interval: 샘플 간격 (초)
+            loop: 그 스레드의 이벤트 루프 (주면 샘플에 도구 이름 태그)
+            include_idle: I/O 대기 샘플도 포함 (기본: 제외, 개수만 셈)
+        """
+        self.thread_id = thread_id
+        self.interval = interval
+        self.loop = loop
+        self.include_idle = include_idle
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.started_at: Optional[float] = None
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels = {}  # 코드 객체 → 프레임 이름 (샘플마다 문자열을 다시 만들지 않게)
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        self.samples += 1
+        idle = _is_idle(frame)
+        if idle:
+            self.idle_samples += 1
+            if not self.include_idle:
+                return
+        names = []
+        while frame is not None and len(names) < MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _frame_label(code)
+            names.append(label)
+            frame = frame.f_back
+        names.append(IDLE_FRAME if idle else _task_tool(self.loop))
+        names.reverse()
+        self.stacks[";".join(names)] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._started
+
+    def collapsed(self) -> str:
+        """collapsed stack 텍스트 (많은 순)"""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def summary(self, top: int = 20) -> dict:
+        """도구별 샘플 수 + 자기 시간(말단 프레임) 상위 함수"""
+        by_tool: Counter = Counter()
+        self_time: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            by_tool[frames[0]] += count
+            self_time[frames[-1]] += count
+        busy = sum(self.stacks.values())
+        return {
+            "seconds": round(self.elapsed, 3),
+            "interval_ms": round(self.interval * 1000, 3),
+            "samples": self.samples,
+            "idle_samples": self.idle_samples,
+            "busy_ratio": round((self.samples - self.idle_samples) / self.samples, 3) if self.samples else 0.0,
+            "by_tool": dict(by_tool.most_common()),
+            "top_self": [
+                {"frame": frame, "samples": count, "ratio": round(count / busy, 3)}
+                for frame, count in self_time.most_common(top)
+            ],
+        }
+
+
+_running: Optional[StackSampler] = None
+
+
+class ProfileBusyError(Exception):
+    """이미 프로파일링 중"""
+
+
+async def profile_event_loop(seconds: float, interval: float, include_idle: bool = False) -> StackSampler:
+    """
+    현재 이벤트 루프를 seconds 동안 샘플링 (그동안 다른 요청은 그대로 처리됨)
+
+    Raises:
+        ProfileBusyError: 다른 프로파일이 진행 중
+    """
+    global _running
+    if _running is not None:
+        raise ProfileBusyError("이미 프로파일링 중입니다")
+    loop = asyncio.get_running_loop()
+    sampler = StackSampler(
+        threading.get_ident(),
+        interval=max(interval, PROFILE_MIN_INTERVAL_MS / 1000),
+        loop=loop,
+        include_idle=include_idle,
+    )
+    _running = sampler
+    previous_factory = loop.get_task_factory()
+    loop.set_task_factory(_tagging_task_factory(previous_factory))
+    sampler.start()
+    try:
+        await asyncio.sleep(min(max(seconds, 0.0), PROFILE_MAX_SECONDS))
+    finally:
+        sampler.stop()
+        loop.set_task_factory(previous_factory)
+        _running = None
+    return sampler
+
+
+def is_profiling() -> bool:
+    return _running is not None
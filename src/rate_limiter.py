@@ -0,0 +1,329 @@
+"""
+외부 API 호출량 제어 (v3.8)
+
+공공데이터포털(기상청/에어코리아/생활기상지수)과 Kakao는 일일 호출 한도가 있습니다.
+업스트림마다 토큰 버킷(초당 호출 속도)과 일일 사용량 장부를 두고 호출 전에 통과시킵니다.
+
+- 토큰 버킷: 순간 폭주를 평탄화, 토큰이 없으면 잠시 대기열에서 기다림 (실패 대신)
+- 우선순위 레인: 사용자 도구 호출(interactive)이 백그라운드 작업(background)보다 먼저 통과
+- 일일 장부: 한국 시간 자정에 초기화, 로컬 파일에 저장해 재시작해도 유지
+- 백그라운드 예약분: 한도의 일부는 사용자 호출 전용으로 남겨 둠
+
+- 멀티 워커: 초당 속도/버스트는 워커 수로 나누고, 장부는 파일에서 합산 (워커 간 공유)
+
+백그라운드 작업은 `with background_priority():` 안에서 호출하세요.
+"""
+
+import asyncio
+import contextvars
+import fcntl
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.upstream_errors import ERROR_QUOTA, ERROR_TRANSIENT, UpstreamError
+
+
+KST = timezone(timedelta(hours=9))
+
+# 우선순위 레인 (작을수록 먼저)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+# 대기열 최대 대기 시간 (초) - 넘으면 RateLimitedError
+MAX_QUEUE_SECONDS = {
+    PRIORITY_INTERACTIVE: float(os.getenv("UPSTREAM_MAX_QUEUE_SECONDS", "2.0")),
+    PRIORITY_BACKGROUND: float(os.getenv("UPSTREAM_BACKGROUND_MAX_QUEUE_SECONDS", "10.0")),
+}
+
+# 일일 한도 중 사용자 호출 전용으로 남겨 둘 비율
+BACKGROUND_RESERVE_RATIO = float(os.getenv("UPSTREAM_BACKGROUND_RESERVE_RATIO", "0.2"))
+
+# 장부 파일 / 저장 주기
+QUOTA_LEDGER_PATH = Path(
+    os.getenv(
+        "QUOTA_LEDGER_PATH",
+        str(Path(tempfile.gettempdir()) / "weather-life-mcp-quota.json"),
+    )
+)
+LEDGER_FLUSH_SECONDS = 10.0
+
+# 같은 호스트의 워커 수 (main()이 멀티 워커 모드에서 설정) - 워커별 속도 = 전체 속도 / 워커 수
+WORKER_COUNT = max(1, int(os.getenv("SERVER_WORKERS", "1")))
+
+# 업스트림별 기본값: (초당 호출 수, 버스트, 일일 한도) - docs/API.md Rate Limits 참고
+UPSTREAM_DEFAULTS = {
+    "kma": (10.0, 20, 10000),          # 기상청 단기예보
+    "airkorea": (10.0, 20, 10000),     # 에어코리아
+    "life_index": (10.0, 20, 10000),   # 생활기상지수
+    "kakao": (30.0, 50, 300000),       # Kakao Local
+}
+
+
+def _upstream_setting(name: str, key: str, default):
+    """환경변수 UPSTREAM_<NAME>_<KEY> (예: UPSTREAM_KMA_DAILY_QUOTA)"""
+    value = os.getenv(f"UPSTREAM_{name.upper()}_{key}")
+    return type(default)(value) if value else default
+
+
+# 현재 호출의 우선순위 (기본: 사용자 호출)
+_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "upstream_priority", default=PRIORITY_INTERACTIVE
+)
+
+
+@contextmanager
+def background_priority():
+    """이 블록 안의 외부 API 호출을 백그라운드 레인으로"""
+    token = _priority.set(PRIORITY_BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+class UpstreamLimitError(UpstreamError):
+    """호출량 제한으로 요청하지 않음"""
+
+
+class RateLimitedError(UpstreamLimitError):
+    """대기열에서 제한 시간 안에 차례가 오지 않음 (이미 기다렸으므로 재시도 안 함)"""
+
+    kind = ERROR_TRANSIENT
+
+
+class QuotaExceededError(UpstreamLimitError):
+    """일일 호출 한도 소진"""
+
+    kind = ERROR_QUOTA
+
+
+class QuotaLedger:
+    """업스트림별 일일 사용량 장부 (한국 시간 기준, 파일 저장)"""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._date = self._today()
+        self._counts: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}  # 마지막 저장 이후 이 프로세스 사용량
+        self._last_flush = time.monotonic()
+        self._load()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(KST).strftime("%Y-%m-%d")
+
+    def _read_saved(self) -> Dict[str, int]:
+        """파일에 저장된 오늘 사용량"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if saved.get("date") != self._date:
+            return {}
+        return {k: int(v) for k, v in saved.get("counts", {}).items()}
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        self._counts = self._read_saved()
+
+    def _roll(self) -> None:
+        """날짜가 바뀌면 초기화"""
+        today = self._today()
+        if today != self._date:
+            self._date = today
+            self._counts = {}
+            self._pending = {}
+
+    def used(self, upstream: str) -> int:
+        with self._lock:
+            self._roll()
+            return self._counts.get(upstream, 0)
+
+    def record(self, upstream: str, count: int = 1) -> None:
+        with self._lock:
+            self._roll()
+            self._counts[upstream] = self._counts.get(upstream, 0) + count
+            self._pending[upstream] = self._pending.get(upstream, 0) + count
+            due = time.monotonic() - self._last_flush >= LEDGER_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        이 프로세스 사용량을 파일에 더해 저장 (실패해도 무시 - 메모리 장부는 유지)
+
+        파일 잠금 안에서 읽고-더하고-쓰므로 워커 여러 개가 같은 장부를 써도 합계가 맞고,
+        저장 후에는 다른 워커 사용량까지 반영된 합계를 씁니다.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            date = self._date
+            self._last_flush = time.monotonic()
+        try:
+            with open(self.path.with_suffix(".lock"), "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                counts = self._read_saved()
+                for name, count in pending.items():
+                    counts[name] = counts.get(name, 0) + count
+                if pending:
+                    tmp = self.path.with_suffix(".tmp")
+                    with open(tmp, "w", encoding="utf-8") as f:
+                        json.dump({"date": date, "counts": counts}, f)
+                    os.replace(tmp, self.path)
+        except OSError:
+            with self._lock:
+                for name, count in pending.items():
+                    self._pending[name] = self._pending.get(name, 0) + count
+            return
+        with self._lock:
+            if self._date == date:
+                self._counts = {
+                    name: counts.get(name, 0) + self._pending.get(name, 0)
+                    for name in set(counts) | set(self._pending)
+                }
+
+
+class UpstreamLimiter:
+    """업스트림 하나의 토큰 버킷 + 우선순위 대기열"""
+
+    def __init__(self, name: str, rate: float, burst: int, daily_quota: int, ledger: QuotaLedger):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.daily_quota = daily_quota
+        self.ledger = ledger
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def remaining(self) -> int:
+        return max(0, self.daily_quota - self.ledger.used(self.name))
+
+    def _check_quota(self, priority: int) -> None:
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise QuotaExceededError(self.name, f"{self.name} 일일 호출 한도 소진")
+        if priority != PRIORITY_INTERACTIVE and remaining <= self.daily_quota * BACKGROUND_RESERVE_RATIO:
+            raise QuotaExceededError(self.name, f"{self.name} 남은 한도는 사용자 호출 전용")
+
+    async def acquire(self, priority: Optional[int] = None) -> None:
+        """
+        호출 1회 허가 (토큰이 없으면 우선순위 순서로 대기)
+
+        Raises:
+            QuotaExceededError: 일일 한도 소진
+            RateLimitedError: 최대 대기 시간 초과
+        """
+        if priority is None:
+            priority = current_priority()
+        self._check_quota(priority)
+
+        entry = (priority, next(self._seq))
+        heapq.heappush(self._waiters, entry)
+        deadline = time.monotonic() + MAX_QUEUE_SECONDS.get(priority, 2.0)
+        try:
+            while True:
+                self._refill()
+                # 앞선 대기자 수보다 토큰이 많으면 통과
+                ahead = sum(1 for waiter in self._waiters if waiter < entry)
+                if self._tokens >= ahead + 1:
+                    self._tokens -= 1
+                    break
+                wait = max((ahead + 1 - self._tokens) / self.rate, 0.001)
+                if time.monotonic() + wait > deadline:
+                    raise RateLimitedError(self.name, f"{self.name} 호출이 많아 잠시 후 다시 시도해주세요")
+                await asyncio.sleep(min(wait, 0.05))
+        finally:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+
+        self.ledger.record(self.name)
+
+    def try_acquire(self) -> bool:
+        """기다리지 않고 바로 허가받을 수 있으면 허가 (헤징 등 부가 요청용)"""
+        if self.remaining() <= self.daily_quota * BACKGROUND_RESERVE_RATIO:
+            return False
+        self._refill()
+        if self._waiters or self._tokens < 1:
+            return False
+        self._tokens -= 1
+        self.ledger.record(self.name)
+        return True
+
+    def stats(self) -> dict:
+        self._refill()
+        used = self.ledger.used(self.name)
+        return {
+            "daily_quota": self.daily_quota,
+            "used_today": used,
+            "remaining": max(0, self.daily_quota - used),
+            "rate_per_second": self.rate,
+            "tokens": round(self._tokens, 1),
+            "queued": len(self._waiters),
+        }
+
+
+_ledger: Optional[QuotaLedger] = None
+_limiters: Dict[str, UpstreamLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_ledger() -> QuotaLedger:
+    global _ledger
+    if _ledger is None:
+        _ledger = QuotaLedger(QUOTA_LEDGER_PATH)
+    return _ledger
+
+
+def get_limiter(upstream: str) -> UpstreamLimiter:
+    """업스트림 제한기 (처음 사용 시 생성)"""
+    limiter = _limiters.get(upstream)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(upstream)
+            if limiter is None:
+                rate, burst, quota = UPSTREAM_DEFAULTS.get(upstream, (10.0, 20, 10000))
+                limiter = UpstreamLimiter(
+                    upstream,
+                    rate=_upstream_setting(upstream, "RATE", rate) / WORKER_COUNT,
+                    burst=max(1, _upstream_setting(upstream, "BURST", burst) // WORKER_COUNT),
+                    daily_quota=_upstream_setting(upstream, "DAILY_QUOTA", quota),
+                    ledger=get_ledger(),
+                )
+                _limiters[upstream] = limiter
+    return limiter
+
+
+def get_limiter_stats() -> dict:
+    """/health용 업스트림별 호출량 현황"""
+    return {name: get_limiter(name).stats() for name in UPSTREAM_DEFAULTS}
+
+
+def flush_quota_ledger() -> None:
+    """장부 즉시 저장 (서버 종료 시)"""
+    if _ledger is not None:
+        _ledger.flush()
@@ -0,0 +1,153 @@
+"""
+정적 참조 데이터 로더 (v3.8)
+
+장소 DB, 격자/지역 좌표, 상황/시간대/날씨별 추천, 옷차림 표, 역/터미널 목록을
+data/reference_data.json 한 파일에서 읽습니다.
+
+- 지연 로딩: 처음 사용할 때 읽음 (서버 시작 비용 없음)
+- 버전 확인: 파일의 version이 지원 버전과 다르면 로딩 실패
+- 핫 리로드: 파일 수정 시각을 주기적으로 확인해 재시작 없이 교체
+- 인덱스: 장소 공간 인덱스 등은 데이터 객체마다 한 번만 생성 (리로드 시 재생성)
+
+모듈 상수(HIKING_SPOTS, GRID_COORDINATES 등)는 기존 import 호환용이며,
+핫 리로드를 반영하려면 get_reference_data()를 사용하세요.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+
+REFERENCE_DATA_PATH = Path(
+    os.getenv(
+        "REFERENCE_DATA_PATH",
+        str(Path(__file__).parent.parent / "data" / "reference_data.json"),
+    )
+)
+
+# 지원하는 데이터 파일 버전
+SUPPORTED_VERSION = 1
+
+# 파일 변경 확인 주기 (초)
+RELOAD_CHECK_SECONDS = 5.0
+
+
+class ReferenceDataError(Exception):
+    """참조 데이터 파일 오류"""
+
+
+class ReferenceData:
+    """참조 데이터 한 버전 (불변으로 취급)"""
+
+    def __init__(self, raw: dict, mtime: float = 0.0):
+        version = raw.get("version")
+        if version != SUPPORTED_VERSION:
+            raise ReferenceDataError(
+                f"지원하지 않는 데이터 버전: {version} (지원: {SUPPORTED_VERSION})"
+            )
+
+        self.version = version
+        self.mtime = mtime
+
+        self.spots_by_activity = raw["spots"]
+        self.activity_names = raw["activity_names"]
+        self.date_courses = raw["date_courses"]
+
+        # JSON 배열 → 튜플 (기존 코드 호환)
+        self.grid_coordinates = {k: tuple(v) for k, v in raw["grid_coordinates"].items()}
+        self.korea_coordinates = {k: tuple(v) for k, v in raw["korea_coordinates"].items()}
+
+        self.situation_categories = raw["situation_categories"]
+        self.time_recommendations = raw["time_recommendations"]
+        self.weather_recommendations = raw["weather_recommendations"]
+
+        # {(최저, 최고): 옷차림} (기존 OUTFIT_BY_TEMPERATURE 형태)
+        self.outfit_by_temperature = {
+            (row["min"], row["max"]): {k: v for k, v in row.items() if k not in ("min", "max")}
+            for row in raw["outfit_by_temperature"]
+        }
+
+        # 이름 → 장소 인덱스
+        self.spots_by_name = {
+            spot["name"]: spot
+            for spots in self.spots_by_activity.values()
+            for spot in spots
+        }
+
+        # 지하철역/버스터미널 (없으면 빈 목록 - Kakao 조회로 대체)
+        self.landmarks = raw.get("landmarks", [])
+
+        self._spot_index = None
+        self._landmark_index = None
+
+    def spot_index(self):
+        """장소 공간 인덱스 (첫 사용 시 생성)"""
+        if self._spot_index is None:
+            from src.spot_index import SpotIndex
+            self._spot_index = SpotIndex(self.spots_by_activity)
+        return self._spot_index
+
+    def landmark_index(self):
+        """역/터미널 인덱스 (첫 사용 시 생성)"""
+        if self._landmark_index is None:
+            from src.landmark_index import LandmarkIndex
+            self._landmark_index = LandmarkIndex(self.landmarks)
+        return self._landmark_index
+
+
+_data: Optional[ReferenceData] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _load(path: Path) -> ReferenceData:
+    """데이터 파일 읽기"""
+    try:
+        mtime = path.stat().st_mtime
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ReferenceDataError(f"참조 데이터 로딩 실패: {path} ({e})") from e
+    return ReferenceData(raw, mtime)
+
+
+def get_reference_data() -> ReferenceData:
+    """
+    현재 참조 데이터
+
+    첫 호출 시 로딩하고, 이후 RELOAD_CHECK_SECONDS마다 파일 변경을 확인합니다.
+    리로드 중 오류가 나면 기존 데이터를 계속 사용합니다.
+    """
+    global _data, _last_check
+
+    now = time.monotonic()
+    if _data is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+        return _data
+
+    with _lock:
+        if _data is None:
+            _data = _load(REFERENCE_DATA_PATH)
+            _last_check = now
+            return _data
+
+        if now - _last_check >= RELOAD_CHECK_SECONDS:
+            _last_check = now
+            try:
+                if REFERENCE_DATA_PATH.stat().st_mtime != _data.mtime:
+                    _data = _load(REFERENCE_DATA_PATH)
+            except (OSError, ReferenceDataError):
+                pass
+
+    return _data
+
+
+def reload_reference_data() -> ReferenceData:
+    """참조 데이터 강제 리로드"""
+    global _data, _last_check
+    with _lock:
+        _data = _load(REFERENCE_DATA_PATH)
+        _last_check = time.monotonic()
+    return _data
@@ -0,0 +1,84 @@
+"""
+응답 상세도 (detail) 처리 (v3.8)
+
+모든 도구가 detail 파라미터를 받습니다.
+- compact: 점수/등급/한 줄 요약만 (에이전트 대량 호출용, 토큰 최소화)
+- normal: 기존 응답 (기본값)
+- full: 기존 응답 + 데이터 나이 등 진단 정보, 전체 예보
+
+compact는 도구 안에서 먼저 분기하여 시간대별 예보, 장소 정보 강화,
+랜드마크 조회 같은 무거운 하위 구조를 아예 만들지 않습니다.
+생활지수 도구는 지수 계산기(activity_recommender)에 detail을 넘겨, compact면
+점수/등급/메시지만 계산하고 요인/팁/점수산출기준 목록은 모으지 않습니다.
+"""
+
+DETAIL_COMPACT = "compact"
+DETAIL_NORMAL = "normal"
+DETAIL_FULL = "full"
+
+DETAIL_LEVELS = (DETAIL_COMPACT, DETAIL_NORMAL, DETAIL_FULL)
+
+# 한국어 별칭
+_DETAIL_ALIASES = {
+    "간단": DETAIL_COMPACT,
+    "요약": DETAIL_COMPACT,
+    "기본": DETAIL_NORMAL,
+    "상세": DETAIL_FULL,
+    "전체": DETAIL_FULL,
+}
+
+# compact 응답에서 한 줄 요약으로 사용할 키 (우선순위 순)
+_SUMMARY_KEYS = ("message", "advice", "recommendation", "summary")
+
+
+def normalize_detail(detail: str) -> str:
+    """detail 값 정규화 (알 수 없는 값은 normal)"""
+    if not detail:
+        return DETAIL_NORMAL
+    value = detail.strip().lower()
+    if value in DETAIL_LEVELS:
+        return value
+    return _DETAIL_ALIASES.get(value, DETAIL_NORMAL)
+
+
+def compact_index(result: dict, score_key: str) -> dict:
+    """
+    지수 계산 결과를 compact 형태로 축약
+
+    Args:
+        result: 지수 계산 결과 (score_key로 점수가 들어있어야 함)
+        score_key: 점수 키 (예: "laundry_score")
+
+    Returns:
+        {"location", score_key, "grade", "message"}
+    """
+    compact = {
+        "location": result.get("location"),
+        score_key: result.get(score_key),
+        "grade": result.get("grade"),
+    }
+    for key in _SUMMARY_KEYS:
+        value = result.get(key)
+        if isinstance(value, str) and value:
+            compact["message"] = value
+            break
+    return compact
+
+
+def shape_index_result(result: dict, score_key: str, detail: str, snap=None) -> dict:
+    """
+    지수 도구 응답을 detail에 맞게 조정
+
+    Args:
+        result: 지수 계산 결과
+        score_key: 점수 키
+        detail: 정규화된 detail 값
+        snap: 날씨 스냅샷 (full일 때 데이터 나이 추가)
+    """
+    if "error" in result:
+        return result
+    if detail == DETAIL_COMPACT:
+        return compact_index(result, score_key)
+    if detail == DETAIL_FULL and snap is not None:
+        result["data_age_seconds"] = snap.age_seconds()
+    return result
@@ -1,9 +1,37 @@
 """
-Weather Life MCP 서버 v3.7
+Weather Life MCP 서버 v3.8
 날씨 + 미세먼지 + 생활 도우미 + 한국 특화 + 건강 + 지도 MCP
 
 PlayMCP 공모전 (MCP Player 10) 출품작
 
+v3.8 신규 기능 (성능/플래너):
+- 날씨 스냅샷 빌더 - 모든 도구가 한 번 정규화된 스냅샷 공유
+- 3일 활동 플래너 (plan_activities_3days) - 활동별 최적 날짜/시간대
+- 응답 상세도 (detail=compact/normal/full) - 모든 도구 공통, compact는 토큰 최소화
+- 위치 기반 장소 추천 (get_recommended_spots) - 거리순 공간 인덱스 + 장소별 날씨
+- 참조 데이터 파일 (data/reference_data.json) - 지연 로딩, 재시작 없이 핫 리로드
+- Kakao 검색 결과 캐시 - 검색어/좌표/반경 구간 기준 TTL 캐시, /health에 적중률
+- Kakao 다중 페이지 검색 - 최대 45개, 나머지 페이지 동시 요청
+- 코스 추천 단계 검색 동시 실행 - 공용 커넥션 풀 + 코스별 마감 시간
+- 코스 동선 최적화 - 단계별 후보 거리 행렬로 총 이동 거리 최소 조합 선택
+- 내장 역/터미널 인덱스 - 가까운 랜드마크를 로컬에서 조회, 없을 때만 Kakao
+- 다중 키워드 검색 - 상황 키워드 여러 개를 동시 검색, 중복 제거 후 관련도+거리 순
+- 외부 API 호출량 제어 - 업스트림별 토큰 버킷 + 우선순위 레인 + 일일 한도 장부, /health에 남은 한도
+- 호스트별 서킷 브레이커 + p99 기반 적응형 타임아웃 - 장애 시 즉시 실패 후 이전 캐시 값으로 응답
+- 요청 헤징 - 기상청 실황/예보, 에어코리아 실시간 조회가 늦으면 중복 요청 후 먼저 온 응답 사용
+- 외부 API 오류 분류/재시도 - 일시적 오류만 백오프 재시도, 한도 초과/인증 오류는 즉시 이전 캐시 값으로
+- 앱 한 번 생성 + lifespan - 시작 시 캐시 예열/주기 갱신, 종료 시 자원 정리, /livez·/readyz 프로브
+- 공유 캐시 백엔드 - 프로세스 내 캐시 뒤에 shm(같은 호스트)/Redis(여러 호스트) 백엔드로 워커 간 조회 결과 공유
+- 멀티 워커 모드 - SERVER_WORKERS(기본 CPU 수)개 워커, 새로 받은 데이터는 Unix 소켓 버스로 다른 워커에 전달
+- 캐시 노드 샤딩 - 격자 셀 키 일관된 해싱으로 캐시 노드마다 담당 셀만 저장, 노드 변경 시 재배치
+- /metrics - 도구별/외부 API 엔드포인트별 호출 수·지연 히스토그램, 캐시 적중/미스/이전 값/합치기 수
+- 요청 추적 - 도구 호출 → 캐시 조회 → 외부 API 시도/점수 계산 스팬, 샘플링 후 JSON Lines/OTLP로 내보내기
+- /debug/profile - 토큰 인증 후 정해진 시간 동안 이벤트 루프 스택 샘플링, 도구별 collapsed stack 반환
+- 오프라인 벤치마크 (tests/bench_tools.py) - 녹화 응답 재생 + 주입 지연으로 도구별 지연/외부 호출 수/할당 측정, 기준선 대비 회귀 검사
+- 외부 API 시뮬레이터 (tests/upstream_simulator.py) - 격자 셀별 생성 데이터 + 지연 분포/오류율/일일 한도 주입, PUBLIC_DATA_API_URL·KAKAO_API_URL로 전환
+- /mcp 부하 생성기 (tests/load_generator.py) - 시나리오 가중 혼합을 목표 RPS/동시성 증가로 재생, 도구별 p50/p95/p99·오류율·외부 호출 증폭 보고
+- 30개 → 31개 도구로 확장
+
 v3.7 신규 기능 (스마트 분석):
 - 최적 시간대 분석 (get_best_time_for_activity) - "언제 나가면 좋을까?"
 - 활동 비교 (compare_activities) - "캠핑 vs 피크닉" 승자 결정
@@ -89,43 +117,42 @@ v2.0 신규 기능:
 - 김장지수 (세계 유일!)
 """
 
+import asyncio
 import sys
 import os
+import hmac
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # 상위 디렉토리를 path에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastmcp import FastMCP
+from fastmcp.server.middleware import Middleware
 import uvicorn
 from starlette.applications import Starlette
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.routing import Route, Mount
 
-from config.settings import server_config, default_location, get_grid_coords
-from src.weather_api import get_current_weather, get_weather_forecast
-from src.air_quality_api import get_air_quality, get_air_quality_forecast
+from config.settings import server_config
 from src.outfit_recommender import (
     WeatherCondition,
-    AirQualityCondition,
     get_outfit_recommendation,
     calculate_outing_score,
     get_comprehensive_recommendation,
 )
 from src.life_index_api import (
     get_uv_index,
-    get_heat_index,
-    get_pollen_index,
     get_food_poison_index,
-    get_all_life_indices,
 )
 from src.activity_recommender import (
-    WeatherData,
     calculate_laundry_index,
     calculate_hiking_index,
     calculate_picnic_index,
     calculate_car_wash_index,
-    calculate_kimjang_index,
     calculate_exercise_index,
     calculate_cold_flu_risk_index,
     calculate_commute_index,
@@ -134,96 +161,44 @@ from src.activity_recommender import (
     calculate_sleep_quality_index,
     calculate_photography_index,
     calculate_joint_pain_index,
-    get_all_activity_recommendations,
-    # v2.5 신규
-    calculate_drive_index,
     calculate_camping_index,
     calculate_fishing_index,
     calculate_golf_index,
-    calculate_running_index,
-    calculate_bbq_index,
-    # v3.0 신규
-    calculate_date_course,
-    get_activity_spots,
 )
 from src.kakao_map_api import (
     search_place_by_keyword,
     search_place_by_category,
-    geocode,
     get_directions_url,
-    get_location_coordinates,
     get_location_coordinates_async,
     get_smart_recommendation,
     get_weather_based_course,
     CATEGORY_CODES,
-    SITUATION_CATEGORIES,
-    TIME_RECOMMENDATIONS,
 )
-from functools import lru_cache
-from datetime import datetime, timedelta
-import time
-
-# =============================================================================
-# 캐싱 레이어 (v2.2 신규 - API 최적화)
-# =============================================================================
-
-# 메모리 캐시 (TTL 지원)
-_cache = {}
-_cache_ttl = {}
-
-def cached_async(ttl_seconds: int = 300):
-    """비동기 함수용 TTL 캐시 데코레이터"""
-    def decorator(func):
-        async def wrapper(*args, **kwargs):
-            # 캐시 키 생성
-            cache_key = f"{func.__name__}:{str(args)}:{str(kwargs)}"
-            now = time.time()
-
-            # 캐시 히트 확인
-            if cache_key in _cache:
-                if now < _cache_ttl.get(cache_key, 0):
-                    return _cache[cache_key]
-
-            # 캐시 미스 - 함수 실행
-            result = await func(*args, **kwargs)
-
-            # 캐시 저장
-            _cache[cache_key] = result
-            _cache_ttl[cache_key] = now + ttl_seconds
-
-            return result
-        return wrapper
-    return decorator
-
-
-# =============================================================================
-# 캐싱된 API 래퍼 함수들 (v2.5 성능 최적화)
-# =============================================================================
-
-# 원본 함수 저장 (래퍼에서 사용)
-_orig_get_weather = get_current_weather
-_orig_get_forecast = get_weather_forecast
-_orig_get_air = get_air_quality
-
-@cached_async(ttl_seconds=300)  # 5분 캐시
-async def cached_get_weather(location: str) -> dict:
-    """캐싱된 날씨 조회"""
-    return await _orig_get_weather(location)
-
-@cached_async(ttl_seconds=300)  # 5분 캐시
-async def cached_get_forecast(location: str) -> dict:
-    """캐싱된 예보 조회"""
-    return await _orig_get_forecast(location)
-
-@cached_async(ttl_seconds=600)  # 10분 캐시
-async def cached_get_air_quality(location: str) -> dict:
-    """캐싱된 미세먼지 조회"""
-    return await _orig_get_air(location)
-
-@cached_async(ttl_seconds=3600)  # 1시간 캐시
-async def cached_get_life_index(location: str) -> dict:
-    """캐싱된 생활기상지수 조회"""
-    return await get_life_index_data(location)
+from src.cache import get_cache_stats
+from src.circuit_breaker import get_host_stats
+from src.rate_limiter import WORKER_COUNT, get_limiter_stats
+from src.upstream import get_hedge_stats, get_retry_stats
+from src.lifecycle import get_readiness, lifespan
+from src.worker_bus import get_bus_stats
+from src.metrics import record_tool, render_metrics
+from src.tracing import get_trace_stats, span
+from src.profiler import (
+    PROFILE_DEFAULT_INTERVAL_MS, PROFILE_TOKEN, ProfileBusyError, is_profiling, profile_event_loop, tool_scope,
+)
+from src.weather_snapshot import (
+    ACTIVITY_SCORERS,
+    CONDITION_SOURCES,
+    SOURCE_AIR,
+    SOURCE_FORECAST,
+    SOURCE_LIFE,
+    SOURCE_WEATHER,
+    get_weather_snapshot,
+)
+from src.activity_planner import plan_activities
+from src.response_detail import (
+    DETAIL_COMPACT, DETAIL_FULL, normalize_detail, shape_index_result,
+)
+from datetime import datetime
 
 
 # MCP 서버 인스턴스 생성
@@ -242,13 +217,49 @@ mcp = FastMCP(
 )
 
 
+class ToolMetricsMiddleware(Middleware):
+    """도구별 호출 수/오류 수/처리 시간 기록 (v3.8, /metrics)"""
+
+    async def on_call_tool(self, context, call_next):
+        started = time.perf_counter()
+        error = True
+        try:
+            result = await call_next(context)
+            content = getattr(result, "structured_content", None)
+            error = isinstance(content, dict) and "error" in content
+            return result
+        finally:
+            record_tool(context.message.name, time.perf_counter() - started, error)
+
+
+class ToolTracingMiddleware(Middleware):
+    """
+    도구 호출마다 루트 스팬 (v3.8, 캐시/외부 API/점수 계산 스팬이 자식으로 붙음)
+
+    프로파일 샘플에도 도구 이름이 붙도록 tool_scope로 감쌉니다.
+    """
+
+    async def on_call_tool(self, context, call_next):
+        name = context.message.name
+        with tool_scope(name), span(f"tool {name}", tool=name) as tool_span:
+            result = await call_next(context)
+            content = getattr(result, "structured_content", None)
+            if isinstance(content, dict) and "error" in content:
+                tool_span.set("error", str(content["error"]))
+            return result
+
+
+mcp.add_middleware(ToolMetricsMiddleware())
+mcp.add_middleware(ToolTracingMiddleware())
+
+
 # =============================================================================
 # Tools
 # =============================================================================
 
 
 @mcp.tool()
-async def get_weather(location: str = "서울") -> dict:
+async def get_weather(location: str = "서울", detail: str = "normal") -> dict:
     """
     현재 날씨와 오늘의 날씨 예보를 조회합니다.
 
@@ -256,40 +267,56 @@ async def get_weather(location: str = "서울") -> dict:
 
     Args:
         location: 지역명 (예: "서울", "강남구", "부산", "제주")
+        detail: 응답 상세도
+            - compact: 현재 기온/하늘/강수확률만 (시간대별 예보 없음)
+            - normal: 현재 날씨 + 12시간 예보 (기본값)
+            - full: 현재 날씨 + 전체 예보 (3일)
 
     Returns:
         현재 날씨 정보와 오늘의 예보
     """
-    current = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-
-    if "error" in current:
-        return {"error": current["error"], "location": location}
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, (SOURCE_WEATHER, SOURCE_FORECAST))
+
+    if not snap.has_weather:
+        return {"error": snap.errors["weather"], "location": location}
+
+    if detail == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "temperature": snap.temperature,
+            "sky": snap.sky,
+            "rain_prob": snap.rain_prob,
+            "temp_min": snap.temp_min,
+            "temp_max": snap.temp_max,
+        }
 
     result = {
         "location": location,
         "current_weather": {
-            "temperature": current["current"].get("temperature"),
-            "humidity": current["current"].get("humidity"),
-            "wind_speed": current["current"].get("wind_speed"),
-            "precipitation_type": current["current"].get("precipitation_type"),
+            "temperature": snap.temperature,
+            "humidity": snap.humidity,
+            "wind_speed": snap.wind_speed,
+            "precipitation_type": snap.precipitation_type,
         },
         "data_source": {
             "provider": "기상청 단기예보 API",
             "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "reliability": "공공데이터포털 인증 API"
+            "reliability": "공공데이터포털 인증 API",
+            "data_age_seconds": snap.age_seconds(),
         },
     }
 
-    if "error" not in forecast:
-        result["today_summary"] = forecast.get("today_summary")
-        result["hourly_forecast"] = forecast.get("forecasts", [])[:12]  # 12시간 예보
+    if snap.has_forecast:
+        result["today_summary"] = snap.today_summary
+        # 12시간 예보 (full이면 전체)
+        result["hourly_forecast"] = snap.forecasts if detail == DETAIL_FULL else snap.forecasts[:12]
 
     return result
 
 
 @mcp.tool()
-async def get_air_quality_info(location: str = "서울") -> dict:
+async def get_air_quality_info(location: str = "서울", detail: str = "normal") -> dict:
     """
     실시간 미세먼지 정보를 조회합니다.
 
@@ -297,22 +324,37 @@ async def get_air_quality_info(location: str = "서울") -> dict:
 
     Args:
         location: 지역명 또는 측정소명 (예: "서울", "중구", "강남구")
+        detail: 응답 상세도 (compact/normal/full, 기본값 normal)
 
     Returns:
         미세먼지(PM10), 초미세먼지(PM2.5) 수치 및 등급
     """
-    result = await cached_get_air_quality(location)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, (SOURCE_AIR,))
 
-    if "error" in result:
-        return {"error": result["error"], "location": location}
+    if not snap.has_air:
+        return {"error": snap.errors["air"], "location": location}
 
-    # 간결한 응답 포맷
-    return {
-        "location": result.get("station_name") or result.get("sido_name"),
-        "data_time": result.get("data_time"),
-        "pm10": result.get("pm10") or result.get("average", {}).get("pm10"),
-        "pm25": result.get("pm25") or result.get("average", {}).get("pm25"),
+    pm10 = snap.pm_view("pm10")
+    pm25 = snap.pm_view("pm25")
+
+    if detail == DETAIL_COMPACT:
+        return {
+            "location": snap.air_station,
+            "pm10": f"{pm10['value']} ({pm10['grade']})" if pm10["value"] is not None else pm10["grade"],
+            "pm25": f"{pm25['value']} ({pm25['grade']})" if pm25["value"] is not None else pm25["grade"],
+        }
+
+    # 간결한 응답 포맷 (측정값 원본 그대로 - 단위 포함)
+    result = {
+        "location": snap.air_station,
+        "data_time": snap.air_data_time,
+        "pm10": pm10,
+        "pm25": pm25,
     }
+    if detail == DETAIL_FULL:
+        result["data_age_seconds"] = snap.age_seconds()
+    return result
 
 
 @mcp.tool()
@@ -320,6 +362,7 @@ async def get_outfit_recommendation_tool(
     location: str = "서울",
     temperature: float | None = None,
     situation: str = "",
+    detail: str = "normal",
 ) -> dict:
     """
     날씨에 맞는 옷차림을 추천합니다! (v3.4 TPO별/색상별 세분화)
@@ -334,37 +377,26 @@ async def get_outfit_recommendation_tool(
         location: 지역명 (예: "서울", "부산")
         temperature: 직접 기온을 입력할 경우 (선택사항)
         situation: 상황 (출근, 데이트, 운동, 캐주얼) - 비어있으면 일반 추천
+        detail: 응답 상세도 (compact: 분류/팁만, normal/full: TPO/색상 포함)
 
     Returns:
         기온별/TPO별/색상별 옷차림 추천
     """
     # 실시간 날씨 조회
-    weather_data = await cached_get_weather(location)
+    snap = await get_weather_snapshot(location, (SOURCE_WEATHER, SOURCE_FORECAST))
 
     if temperature is None:
-        if "error" in weather_data:
-            return {"error": weather_data["error"]}
-        temperature = weather_data["current"].get("temperature", 20)
+        if not snap.has_weather:
+            return {"error": snap.errors["weather"]}
+        temperature = snap.temperature
 
     # 날씨 조건 구성 (색상 추천을 위해 하늘상태 포함)
-    sky = ""
-    precip_type = "없음"
-    humidity = 50
-    wind_speed = 0
-
-    if "error" not in weather_data:
-        current = weather_data.get("current", {})
-        sky = current.get("sky", "")
-        precip_type = current.get("precipitation_type", "없음")
-        humidity = current.get("humidity", 50)
-        wind_speed = current.get("wind_speed", 0)
-
     weather = WeatherCondition(
         temperature=temperature,
-        sky=sky,
-        precipitation_type=precip_type,
-        humidity=humidity,
-        wind_speed=wind_speed,
+        sky=snap.sky,
+        precipitation_type=snap.precipitation_type,
+        humidity=snap.humidity,
+        wind_speed=snap.wind_speed if snap.has_weather else 0,
     )
 
     # TPO 매핑
@@ -378,6 +410,14 @@ async def get_outfit_recommendation_tool(
 
     recommendation = get_outfit_recommendation(weather, tpo)
 
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "temperature": temperature,
+            "category": recommendation["category"],
+            "tip": recommendation["tip"],
+        }
+
     return {
         "location": location,
         "temperature": temperature,
@@ -393,7 +433,7 @@ async def get_outfit_recommendation_tool(
 
 
 @mcp.tool()
-async def should_i_go_out(location: str = "서울") -> dict:
+async def should_i_go_out(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 외출하기 좋은지 종합적으로 판단합니다.
     날씨, 미세먼지, 기온 등을 고려하여 외출 적합도 점수와 추천을 제공합니다.
@@ -402,100 +442,61 @@ async def should_i_go_out(location: str = "서울") -> dict:
 
     Args:
         location: 지역명 (예: "서울", "부산", "강남구")
+        detail: 응답 상세도 (compact/normal/full, 기본값 normal)
 
     Returns:
         외출 적합도 점수 (0-100), 등급, 주의사항, 옷차림 추천
     """
-    # 날씨 정보 조회
-    weather_data = await cached_get_weather(location)
-    forecast_data = await cached_get_forecast(location)
-    air_data = await cached_get_air_quality(location)
-
-    # 기본값 설정
-    temp = 20
-    humidity = 50
-    wind_speed = 2.0
-    precip_prob = 0
-    precip_type = "없음"
-    sky = "맑음"
-
-    # 날씨 데이터 추출
-    if "error" not in weather_data:
-        current = weather_data.get("current", {})
-        temp = current.get("temperature", temp)
-        humidity = current.get("humidity", humidity)
-        wind_speed = current.get("wind_speed", wind_speed)
-        precip_type = current.get("precipitation_type", precip_type)
-
-    if "error" not in forecast_data:
-        summary = forecast_data.get("today_summary", {})
-        precip_prob = summary.get("precipitation_probability", precip_prob)
-        sky = summary.get("sky", sky)
-
-    # 대기질 데이터 추출
-    pm10_value = -1
-    pm10_grade = "알수없음"
-    pm25_value = -1
-    pm25_grade = "알수없음"
-
-    if "error" not in air_data:
-        pm10_data = air_data.get("pm10") or air_data.get("average", {}).get("pm10", {})
-        pm25_data = air_data.get("pm25") or air_data.get("average", {}).get("pm25", {})
-
-        if isinstance(pm10_data, dict):
-            pm10_value = pm10_data.get("value", -1)
-            pm10_grade = pm10_data.get("grade", "알수없음")
-        if isinstance(pm25_data, dict):
-            pm25_value = pm25_data.get("value", -1)
-            pm25_grade = pm25_data.get("grade", "알수없음")
-
-    # 조건 객체 생성
-    weather = WeatherCondition(
-        temperature=temp,
-        humidity=humidity,
-        wind_speed=wind_speed,
-        precipitation_prob=precip_prob,
-        precipitation_type=precip_type,
-        sky=sky,
-    )
-
-    air_quality = AirQualityCondition(
-        pm10_value=pm10_value,
-        pm10_grade=pm10_grade,
-        pm25_value=pm25_value,
-        pm25_grade=pm25_grade,
-    )
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather = snap.weather_condition()
+    air_quality = snap.air_condition()
+
+    # compact: 옷차림 추천 없이 외출 점수만 계산
+    if detail == DETAIL_COMPACT:
+        with span("score outing"):
+            outing = calculate_outing_score(weather, air_quality)
+        return {
+            "location": location,
+            "outing_score": outing["score"],
+            "grade": outing["grade"],
+            "message": outing["message"],
+        }
 
     # 종합 추천 계산
-    result = get_comprehensive_recommendation(weather, air_quality)
+    with span("score comprehensive"):
+        result = get_comprehensive_recommendation(weather, air_quality)
 
-    return {
+    response = {
         "location": location,
         "conditions": {
-            "temperature": temp,
-            "humidity": humidity,
-            "wind_speed": wind_speed,
-            "sky": sky,
+            "temperature": weather.temperature,
+            "humidity": weather.humidity,
+            "wind_speed": weather.wind_speed,
+            "sky": weather.sky,
             "precipitation": {
-                "type": precip_type,
-                "probability": precip_prob,
+                "type": weather.precipitation_type,
+                "probability": weather.precipitation_prob,
             },
             "air_quality": {
-                "pm10": {"value": pm10_value, "grade": pm10_grade},
-                "pm25": {"value": pm25_value, "grade": pm25_grade},
+                "pm10": snap.pm_view("pm10"),
+                "pm25": snap.pm_view("pm25"),
             },
         },
         "outing_score": result["outing_score"],
         "outfit": result["outfit_recommendation"],
         "summary": result["summary"],
     }
+    if detail == DETAIL_FULL:
+        response["data_age_seconds"] = snap.age_seconds()
+    return response
 
 
 # get_weather_summary 제거됨 - get_weather 사용 권장 (v3.4)
 
 
 @mcp.tool()
-async def get_weekly_forecast(location: str = "서울") -> dict:
+async def get_weekly_forecast(location: str = "서울", detail: str = "normal") -> dict:
     """
     3일간 날씨 예보를 조회합니다. (오늘, 내일, 모레)
     날짜별 최저/최고 기온, 날씨, 강수확률을 한눈에 확인할 수 있습니다.
@@ -504,18 +505,17 @@ async def get_weekly_forecast(location: str = "서울") -> dict:
 
     Args:
         location: 지역명 (예: "서울", "부산", "강남구")
+        detail: 응답 상세도 (compact: 한 줄 요약만, normal/full: 날짜별 상세)
 
     Returns:
         3일간 날씨 예보 (날짜별 최저/최고 기온, 날씨, 강수확률)
     """
-    from datetime import datetime, timedelta
+    snap = await get_weather_snapshot(location, (SOURCE_FORECAST,))
 
-    forecast_data = await cached_get_forecast(location)
+    if not snap.has_forecast:
+        return {"error": snap.errors["forecast"], "location": location}
 
-    if "error" in forecast_data:
-        return {"error": forecast_data["error"], "location": location}
-
-    forecasts = forecast_data.get("forecasts", [])
+    forecasts = snap.forecasts
 
     # 날짜별로 그룹화
     daily_data = {}
@@ -545,9 +545,10 @@ async def get_weekly_forecast(location: str = "서울") -> dict:
         if f.get("max_temperature"):
             daily_data[date]["max_temp"] = f["max_temperature"]
 
-    # 날짜별 요약 생성
+    # 날짜별 요약 생성 (compact는 한 줄 요약만 만들고 날짜별 상세는 생략)
+    compact = normalize_detail(detail) == DETAIL_COMPACT
     result_days = []
-    today = datetime.now()
+    day_summaries = []
     day_names = ["오늘", "내일", "모레"]
 
     for i, (date, data) in enumerate(sorted(daily_data.items())[:3]):
@@ -560,6 +561,12 @@ async def get_weekly_forecast(location: str = "서울") -> dict:
 
         # 최대 강수확률
         max_prob = max(probs) if probs else 0
+        sky = data["sky"] or "맑음"
+        day_summary = f"{min_temp}~{max_temp}°C, {sky}" + (f", 강수 {max_prob}%" if max_prob >= 30 else "")
+
+        if compact:
+            day_summaries.append(f"{day_names[i]}: {day_summary}")
+            continue
 
         # 날짜 포맷
         try:
@@ -571,21 +578,27 @@ async def get_weekly_forecast(location: str = "서울") -> dict:
             weekday = ""
 
         day_name = day_names[i] if i < len(day_names) else f"{date_str}({weekday})"
+        day_summaries.append(f"{day_name}: {day_summary}")
 
         result_days.append({
             "day": day_name,
             "date": f"{date_str}({weekday})",
             "min_temperature": min_temp,
             "max_temperature": max_temp,
-            "sky": data["sky"] or "맑음",
+            "sky": sky,
             "precipitation_probability": max_prob,
-            "summary": f"{min_temp}~{max_temp}°C, {data['sky'] or '맑음'}" + (f", 강수 {max_prob}%" if max_prob >= 30 else "")
+            "summary": day_summary,
         })
 
+    summary = " | ".join(day_summaries)
+
+    if compact:
+        return {"location": location, "summary": summary}
+
     return {
         "location": location,
         "forecast_days": result_days,
-        "summary": " | ".join([f"{d['day']}: {d['summary']}" for d in result_days])
+        "summary": summary
     }
 
 
@@ -598,41 +611,49 @@ async def get_weekly_forecast(location: str = "서울") -> dict:
 
 
 @mcp.tool()
-async def get_uv_info(location: str = "서울") -> dict:
+async def get_uv_info(location: str = "서울", detail: str = "normal") -> dict:
     """
     자외선지수를 조회합니다.
     자외선 강도와 피부 보호 방법을 안내합니다.
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact/normal/full, 기본값 normal)
 
     Returns:
         자외선지수 (0-11+), 등급, 대응 방법
     """
-    return await get_uv_index(location)
+    snap = await get_weather_snapshot(location, (SOURCE_LIFE,))
+    uv = snap.life_indices.get("uv")
+    if uv is None:
+        uv = await get_uv_index(location)
+    # 스냅샷의 캐시된 dict를 수정하지 않도록 복사
+    return shape_index_result(dict(uv), "uv_index", normalize_detail(detail), snap)
 
 
 @mcp.tool()
-async def get_food_safety_index(location: str = "서울") -> dict:
+async def get_food_safety_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     식중독지수를 조회합니다.
     도시락, 야외 식사, 음식 보관 안전성을 판단합니다.
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact/normal/full, 기본값 normal)
 
     Returns:
         식중독지수, 등급, 주의사항
     """
-    weather_data = await cached_get_weather(location)
+    snap = await get_weather_snapshot(location, (SOURCE_WEATHER,))
 
     temp = None
     humidity = None
-    if "error" not in weather_data:
-        temp = weather_data["current"].get("temperature")
-        humidity = weather_data["current"].get("humidity")
+    if snap.has_weather:
+        temp = snap.temperature
+        humidity = snap.humidity
 
-    return await get_food_poison_index(location, temp, humidity)
+    result = await get_food_poison_index(location, temp, humidity)
+    return shape_index_result(result, "food_poison_index", normalize_detail(detail), snap)
 
 
 # =============================================================================
@@ -640,55 +661,8 @@ async def get_food_safety_index(location: str = "서울") -> dict:
 # =============================================================================
 
 
-async def _get_weather_data(location: str) -> WeatherData:
-    """날씨 데이터를 WeatherData 객체로 변환"""
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-    air = await cached_get_air_quality(location)
-
-    # 기본값
-    temp = 20
-    humidity = 50
-    wind_speed = 2.0
-    rain_prob = 0
-    rain_prob_tomorrow = 0
-    sky = "맑음"
-    pm25_grade = "보통"
-    pm25_value = 25
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        temp = current.get("temperature", temp)
-        humidity = current.get("humidity", humidity)
-        wind_speed = current.get("wind_speed", wind_speed)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        rain_prob = summary.get("precipitation_probability", rain_prob)
-        sky = summary.get("sky", sky)
-        # 내일 강수확률은 추가 API 필요, 일단 오늘 것 사용
-        rain_prob_tomorrow = rain_prob
-
-    if "error" not in air:
-        pm25_data = air.get("pm25") or air.get("average", {}).get("pm25", {})
-        if isinstance(pm25_data, dict):
-            pm25_grade = pm25_data.get("grade", pm25_grade)
-            pm25_value = pm25_data.get("value", pm25_value)
-
-    return WeatherData(
-        temperature=temp,
-        humidity=humidity,
-        wind_speed=wind_speed,
-        rain_prob=rain_prob,
-        rain_prob_tomorrow=rain_prob_tomorrow,
-        sky=sky,
-        pm25_grade=pm25_grade,
-        pm25_value=pm25_value,
-    )
-
-
 @mcp.tool()
-async def is_good_for_laundry(location: str = "서울") -> dict:
+async def is_good_for_laundry(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 빨래하기 좋은지 판단합니다. (빨래지수)
     기온, 습도, 강수확률, 바람을 종합하여 빨래 건조 적합도를 알려줍니다.
@@ -698,12 +672,15 @@ async def is_good_for_laundry(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         빨래지수 (0-100), 등급, 건조 팁, 점수산출기준
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_laundry_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_laundry_index(weather_data, detail=detail)
     result["location"] = location
     # API 명세와 일치시키기 위해 score -> laundry_score
     if "score" in result:
@@ -718,11 +695,11 @@ async def is_good_for_laundry(location: str = "서울") -> dict:
         "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
         "note": "실시간 데이터 기반 (1시간 내 갱신)"
     }
-    return result
+    return shape_index_result(result, "laundry_score", detail, snap)
 
 
 @mcp.tool()
-async def is_good_for_hiking(location: str = "서울") -> dict:
+async def is_good_for_hiking(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 등산하기 좋은지 판단합니다. (등산지수)
     기온, 미세먼지, 강수확률, 바람을 종합하여 등산 적합도를 알려줍니다.
@@ -732,12 +709,15 @@ async def is_good_for_hiking(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         등산지수 (0-100), 등급, 추천 산, 주의사항
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_hiking_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location)
+    weather_data = snap.weather_data()
+    result = calculate_hiking_index(weather_data, detail=detail)
     result["location"] = location
     # API 명세와 일치시키기 위해 score -> hiking_score
     if "score" in result:
@@ -745,11 +725,11 @@ async def is_good_for_hiking(location: str = "서울") -> dict:
     # recommended_mountains 필드 추가 (테스트 호환)
     if "recommendations" in result:
         result["recommended_mountains"] = result["recommendations"]
-    return result
+    return shape_index_result(result, "hiking_score", detail, snap)
 
 
 @mcp.tool()
-async def is_good_for_picnic(location: str = "서울") -> dict:
+async def is_good_for_picnic(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 한강/공원 피크닉하기 좋은지 판단합니다. (피크닉지수)
     기온, 미세먼지, 강수확률, 바람을 종합하여 야외 활동 적합도를 알려줍니다.
@@ -759,21 +739,24 @@ async def is_good_for_picnic(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         피크닉지수 (0-100), 등급, 추천 장소, 치맥 타임
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_picnic_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_picnic_index(weather_data, detail=detail)
     result["location"] = location
     # API 명세와 일치시키기 위해 score -> picnic_score
     if "score" in result:
         result["picnic_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "picnic_score", detail, snap)
 
 
 @mcp.tool()
-async def is_good_for_car_wash(location: str = "서울") -> dict:
+async def is_good_for_car_wash(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 세차하기 좋은지 판단합니다. (세차지수)
     오늘/내일 강수확률과 미세먼지를 고려하여 세차 적합도를 알려줍니다.
@@ -783,24 +766,27 @@ async def is_good_for_car_wash(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         세차지수 (0-100), 등급, 팁
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_car_wash_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_car_wash_index(weather_data, detail=detail)
     result["location"] = location
     # API 명세와 일치시키기 위해 score -> car_wash_score
     if "score" in result:
         result["car_wash_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "car_wash_score", detail, snap)
 
 
 # 김장지수 제거됨 - 11-12월만 사용 가능하여 실용성 낮음 (v3.5)
 
 
 @mcp.tool()
-async def is_good_for_exercise(location: str = "서울") -> dict:
+async def is_good_for_exercise(location: str = "서울", detail: str = "normal") -> dict:
     """
     오늘 야외 운동하기 좋은지 판단합니다. (운동지수)
     기온, 습도, 미세먼지, 강수확률을 종합하여 운동 적합도를 알려줍니다.
@@ -810,21 +796,24 @@ async def is_good_for_exercise(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         운동지수 (0-100), 등급, 추천 운동, 최적 시간대, 수분 섭취 권장량, 건강 위험도
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_exercise_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location)
+    weather_data = snap.weather_data()
+    result = calculate_exercise_index(weather_data, detail=detail)
     result["location"] = location
     # API 명세와 일치시키기 위해 score -> exercise_score
     if "score" in result:
         result["exercise_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "exercise_score", detail, snap)
 
 
 @mcp.tool()
-async def get_cold_flu_risk(location: str = "서울") -> dict:
+async def get_cold_flu_risk(location: str = "서울", detail: str = "normal") -> dict:
     """
     감기/독감 위험 지수를 알려드립니다. (v2.3 신규)
     MIT, Yale, PNAS 연구 기반 과학적 알고리즘으로
@@ -834,20 +823,23 @@ async def get_cold_flu_risk(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         감기위험지수 (0-100, 높을수록 위험), 등급, 위험요인, 예방수칙
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_cold_flu_risk_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_cold_flu_risk_index(weather_data, detail=detail)
     result["location"] = location
     if "score" in result:
         result["flu_risk_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "flu_risk_score", detail, snap)
 
 
 @mcp.tool()
-async def get_commute_index(location: str = "서울") -> dict:
+async def get_commute_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     출퇴근 날씨 지수를 알려드립니다. (v2.3 신규)
     자가용, 대중교통, 도보/자전거 각각의 적합도를 분석합니다.
@@ -857,20 +849,23 @@ async def get_commute_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         출퇴근지수 (0-100), 교통수단별 점수, 최적 수단 추천, 시간대별 팁
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_commute_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_commute_index(weather_data, detail=detail)
     result["location"] = location
     if "score" in result:
         result["commute_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "commute_score", detail, snap)
 
 
 @mcp.tool()
-async def get_allergy_risk(location: str = "서울") -> dict:
+async def get_allergy_risk(location: str = "서울", detail: str = "normal") -> dict:
     """
     알레르기 위험 지수를 알려드립니다. (v2.3 신규)
     미세먼지, 꽃가루(계절별), 황사 가능성을 종합 분석합니다.
@@ -880,16 +875,19 @@ async def get_allergy_risk(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         알레르기지수 (0-100, 높을수록 위험), 주요 알레르겐, 계절 정보, 예방수칙
     """
-    weather_data = await _get_weather_data(location)
-    result = calculate_allergy_risk_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    weather_data = snap.weather_data()
+    result = calculate_allergy_risk_index(weather_data, detail=detail)
     result["location"] = location
     if "score" in result:
         result["allergy_risk_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "allergy_risk_score", detail, snap)
 
 
 # =============================================================================
@@ -898,7 +896,7 @@ async def get_allergy_risk(location: str = "서울") -> dict:
 
 
 @mcp.tool()
-async def get_migraine_risk(location: str = "서울") -> dict:
+async def get_migraine_risk(location: str = "서울", detail: str = "normal") -> dict:
     """
     편두통 위험 지수를 알려드립니다. (v2.4 신규)
     기압 변화, 습도, 기온 변화가 편두통에 미치는 영향을 과학적으로 분석합니다.
@@ -908,66 +906,22 @@ async def get_migraine_risk(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         편두통위험지수 (0-100, 높을수록 위험), 위험요인, 예방수칙
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-    air = await cached_get_air_quality(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "sky": "맑음",
-        "temp_current": 20,
-        "temp_min": None,
-        "temp_max": None,
-        "humidity": 50,
-        "rain_prob": 0,
-        "wind_speed": 2.0
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["humidity"] = current.get("humidity", 50)
-        weather_data["wind_speed"] = current.get("wind_speed", 2.0)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["sky"] = summary.get("sky", "맑음")
-        weather_data["temp_min"] = summary.get("min_temperature")
-        weather_data["temp_max"] = summary.get("max_temperature")
-
-    # air_data dict 구성
-    air_data = {
-        "pm10_grade": "보통",
-        "pm25_grade": "보통",
-        "pm10_value": 50,
-        "pm25_value": 25
-    }
-
-    if "error" not in air:
-        pm10_data = air.get("pm10") or air.get("average", {}).get("pm10", {})
-        pm25_data = air.get("pm25") or air.get("average", {}).get("pm25", {})
-        if isinstance(pm10_data, dict):
-            air_data["pm10_grade"] = pm10_data.get("grade", "보통")
-            air_data["pm10_value"] = pm10_data.get("value", 50)
-        if isinstance(pm25_data, dict):
-            air_data["pm25_grade"] = pm25_data.get("grade", "보통")
-            air_data["pm25_value"] = pm25_data.get("value", 25)
-
-    result = calculate_migraine_risk_index(weather_data, air_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_migraine_risk_index(snap.index_weather(), snap.index_air(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["migraine_risk_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "migraine_risk_score", detail, snap)
 
 
 @mcp.tool()
-async def get_sleep_quality_index(location: str = "서울") -> dict:
+async def get_sleep_quality_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     수면 컨디션 지수를 알려드립니다. (v2.4 신규)
     온도, 습도가 수면에 미치는 영향을 과학적으로 분석합니다.
@@ -977,44 +931,22 @@ async def get_sleep_quality_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         수면컨디션지수 (0-100, 높을수록 좋음), 최적조건, 개선팁
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    air = await cached_get_air_quality(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "temp_current": 20,
-        "humidity": 50
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["humidity"] = current.get("humidity", 50)
-
-    # air_data dict 구성
-    air_data = {
-        "pm10_value": 50
-    }
-
-    if "error" not in air:
-        pm10_data = air.get("pm10") or air.get("average", {}).get("pm10", {})
-        if isinstance(pm10_data, dict):
-            air_data["pm10_value"] = pm10_data.get("value", 50)
-
-    result = calculate_sleep_quality_index(weather_data, air_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_sleep_quality_index(snap.index_weather(), snap.index_air(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["sleep_quality_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "sleep_quality_score", detail, snap)
 
 
 @mcp.tool()
-async def get_photography_index(location: str = "서울") -> dict:
+async def get_photography_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     사진 촬영 지수를 알려드립니다. (v2.4 신규)
     하늘 상태, 조명 조건, 골든아워를 분석하여 촬영 적합도를 알려줍니다.
@@ -1024,39 +956,22 @@ async def get_photography_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         사진촬영지수 (0-100, 높을수록 좋음), 골든아워, 촬영조건
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "sky": "맑음",
-        "rain_prob": 0,
-        "humidity": 50
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["humidity"] = current.get("humidity", 50)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["sky"] = summary.get("sky", "맑음")
-
-    result = calculate_photography_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_photography_index(snap.index_weather(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["photography_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "photography_score", detail, snap)
 
 
 @mcp.tool()
-async def get_joint_pain_risk(location: str = "서울") -> dict:
+async def get_joint_pain_risk(location: str = "서울", detail: str = "normal") -> dict:
     """
     관절통 위험 지수를 알려드립니다. (v2.4 신규)
     기압 변화, 습도, 온도 변화가 관절에 미치는 영향을 과학적으로 분석합니다.
@@ -1066,43 +981,18 @@ async def get_joint_pain_risk(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         관절통위험지수 (0-100, 높을수록 관절에 좋음), 위험요인, 관리수칙
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-    air = await cached_get_air_quality(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "temp_current": 20,
-        "temp_min": None,
-        "temp_max": None,
-        "humidity": 50,
-        "rain_prob": 0
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["humidity"] = current.get("humidity", 50)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["temp_min"] = summary.get("min_temperature")
-        weather_data["temp_max"] = summary.get("max_temperature")
-
-    # air_data dict 구성 (인터페이스 통일)
-    air_data = {}
-
-    result = calculate_joint_pain_index(weather_data, air_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_joint_pain_index(snap.index_weather(), snap.index_air(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["joint_pain_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "joint_pain_score", detail, snap)
 
 
 # =============================================================================
@@ -1114,7 +1004,7 @@ async def get_joint_pain_risk(location: str = "서울") -> dict:
 
 
 @mcp.tool()
-async def get_camping_index(location: str = "서울") -> dict:
+async def get_camping_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     캠핑 날씨 적합도를 분석합니다. 낙뢰, 바람, 비, 기온을 고려합니다.
     텐트 캠핑, 글램핑, 차박 계획 시 활용하세요!
@@ -1123,54 +1013,22 @@ async def get_camping_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         캠핑지수 (0-100), 등급, 날씨 조건, 경고, 팁
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-    air = await cached_get_air_quality(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "sky": "맑음",
-        "temp_current": 20,
-        "humidity": 50,
-        "rain_prob": 0,
-        "wind_speed": 2.0
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["humidity"] = current.get("humidity", 50)
-        weather_data["wind_speed"] = current.get("wind_speed", 2.0)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["sky"] = summary.get("sky", "맑음")
-
-    # air_data dict 구성
-    air_data = {
-        "pm25_grade": "보통"
-    }
-
-    if "error" not in air:
-        pm25_data = air.get("pm25") or air.get("average", {}).get("pm25", {})
-        if isinstance(pm25_data, dict):
-            air_data["pm25_grade"] = pm25_data.get("grade", "보통")
-
-    result = calculate_camping_index(weather_data, air_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_camping_index(snap.index_weather(), snap.index_air(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["camping_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "camping_score", detail, snap)
 
 
 @mcp.tool()
-async def get_fishing_index(location: str = "서울") -> dict:
+async def get_fishing_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     낚시 적합도를 분석합니다. 기압 변화, 바람, 구름, 기온을 고려합니다.
     바다낚시, 민물낚시, 배낚시 계획 시 활용하세요!
@@ -1179,41 +1037,22 @@ async def get_fishing_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         낚시지수 (0-100), 등급, 날씨 조건, 최적 시간대, 팁
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "sky": "맑음",
-        "temp_current": 20,
-        "rain_prob": 0,
-        "wind_speed": 2.0
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["wind_speed"] = current.get("wind_speed", 2.0)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["sky"] = summary.get("sky", "맑음")
-
-    result = calculate_fishing_index(weather_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location, CONDITION_SOURCES)
+    result = calculate_fishing_index(snap.index_weather(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["fishing_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "fishing_score", detail, snap)
 
 
 @mcp.tool()
-async def get_golf_index(location: str = "서울") -> dict:
+async def get_golf_index(location: str = "서울", detail: str = "normal") -> dict:
     """
     골프 라운딩 적합도를 분석합니다. 바람, 비, 기온, 자외선을 고려합니다.
     골프장 예약, 라운딩 계획 시 활용하세요!
@@ -1222,49 +1061,18 @@ async def get_golf_index(location: str = "서울") -> dict:
 
     Args:
         location: 지역명
+        detail: 응답 상세도 (compact: 점수/등급만, normal: 기본, full: 데이터 나이 포함)
 
     Returns:
         골프지수 (0-100), 등급, 날씨 조건, 플레이 팁
     """
-    # 날씨 데이터 수집
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-    air = await cached_get_air_quality(location)
-
-    # weather_data dict 구성
-    weather_data = {
-        "sky": "맑음",
-        "temp_current": 20,
-        "rain_prob": 0,
-        "wind_speed": 2.0,
-        "uv_index": 5
-    }
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        weather_data["temp_current"] = current.get("temperature", 20)
-        weather_data["wind_speed"] = current.get("wind_speed", 2.0)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        weather_data["rain_prob"] = summary.get("precipitation_probability", 0)
-        weather_data["sky"] = summary.get("sky", "맑음")
-
-    # air_data dict 구성
-    air_data = {
-        "pm25_grade": "보통"
-    }
-
-    if "error" not in air:
-        pm25_data = air.get("pm25") or air.get("average", {}).get("pm25", {})
-        if isinstance(pm25_data, dict):
-            air_data["pm25_grade"] = pm25_data.get("grade", "보통")
-
-    result = calculate_golf_index(weather_data, air_data)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location)
+    result = calculate_golf_index(snap.index_weather(), snap.index_air(), detail=detail)
     result["location"] = location
     if "score" in result:
         result["golf_score"] = result.pop("score")
-    return result
+    return shape_index_result(result, "golf_score", detail, snap)
 
 
 # 러닝지수 제거됨 - is_good_for_exercise로 대체 (v3.6)
@@ -1285,15 +1093,20 @@ async def get_golf_index(location: str = "서울") -> dict:
 
 
 @mcp.tool()
-async def get_recommended_spots(location: str = "서울", activity: str = "all") -> dict:
+async def get_recommended_spots(
+    location: str = "서울",
+    activity: str = "all",
+    radius_km: float = 100,
+    detail: str = "normal",
+) -> dict:
     """
     활동별 추천 장소를 알려드립니다.
-    현재 날씨를 분석하여 적합한 장소를 추천합니다.
+    내 위치에서 가까운 장소를 장소별 현재 날씨와 함께 추천합니다. (v3.8 위치 기반)
 
-    사용 예시: "등산 어디가 좋아?", "캠핑장 추천해줘", "드라이브 코스 알려줘"
+    사용 예시: "등산 어디가 좋아?", "근처 캠핑장 중 지금 날씨 좋은 곳", "드라이브 코스 알려줘"
 
     Args:
-        location: 지역명
+        location: 지역명 (검색 중심)
         activity: 활동 종류
             - hiking: 등산
             - camping: 캠핑
@@ -1304,24 +1117,33 @@ async def get_recommended_spots(location: str = "서울", activity: str = "all")
             - running: 러닝
             - bbq: 바베큐
             - all: 모든 활동 (기본값)
+        radius_km: 검색 반경 (km, 기본값: 100). 반경 내 장소가 없으면 가장 가까운 장소
+        detail: 응답 상세도 (compact: 장소 이름만, normal/full: 장소 정보 포함)
 
     Returns:
-        추천 장소 목록, 날씨 적합도
+        추천 장소 목록 (거리, 장소별 날씨 점수), 날씨 적합도
     """
-    from src.spots_database import (
-        HIKING_SPOTS, CAMPING_SPOTS, PICNIC_SPOTS,
-        DRIVE_COURSES, FISHING_SPOTS, GOLF_COURSES,
-        RUNNING_COURSES, BBQ_SPOTS
-    )
+    from src.reference_data import get_reference_data
+    from src.spot_index import find_spots_with_weather
 
-    weather = await cached_get_weather(location)
+    data = get_reference_data()
+    spots_by_activity = data.spots_by_activity
+    if activity != "all" and activity not in spots_by_activity:
+        return {"error": f"지원하지 않는 활동: {activity}", "available": list(spots_by_activity.keys())}
 
-    if "error" in weather:
-        return {"error": weather["error"], "location": location}
+    snap, coords = await asyncio.gather(
+        get_weather_snapshot(location),
+        get_location_coordinates_async(location),
+    )
+
+    if not snap.has_weather:
+        return {"error": snap.errors["weather"], "location": location}
+    if not coords:
+        return {"error": f"지역을 찾을 수 없습니다: {location}"}
 
     # 기본 날씨 점수 계산
-    temp = weather.get("current_weather", {}).get("temperature", 20)
-    rain_prob = weather.get("today_summary", {}).get("precipitation_probability", 0)
+    temp = snap.temperature
+    rain_prob = snap.rain_prob
 
     base_score = 100
     if rain_prob >= 50:
@@ -1329,37 +1151,37 @@ async def get_recommended_spots(location: str = "서울", activity: str = "all")
     if temp < 0 or temp > 35:
         base_score -= 20
 
-    results = {"location": location, "weather_score": base_score, "activities": {}}
-
-    activity_map = {
-        "hiking": ("등산", HIKING_SPOTS),
-        "camping": ("캠핑", CAMPING_SPOTS),
-        "picnic": ("피크닉", PICNIC_SPOTS),
-        "drive": ("드라이브", DRIVE_COURSES),
-        "fishing": ("낚시", FISHING_SPOTS),
-        "golf": ("골프", GOLF_COURSES),
-        "running": ("러닝", RUNNING_COURSES),
-        "bbq": ("바베큐", BBQ_SPOTS),
-    }
-
     if activity == "all":
-        for key, (name, spots) in activity_map.items():
-            count = 3 if base_score >= 70 else 2
-            results["activities"][key] = {
-                "name": name,
-                "spots": spots[:count],
-                "total": len(spots)
-            }
-    elif activity in activity_map:
-        name, spots = activity_map[activity]
+        keys = list(spots_by_activity.keys())
+        count = 3 if base_score >= 70 else 2
+    else:
+        keys = [activity]
         count = 5 if base_score >= 70 else 3
-        results["activities"][activity] = {
-            "name": name,
-            "spots": spots[:count],
-            "total": len(spots)
+
+    x, y = coords  # 경도, 위도
+    found = await find_spots_with_weather(
+        keys, y, x, radius_km, count,
+        fallback_weather={
+            "temperature": snap.temperature,
+            "precipitation_type": snap.precipitation_type,
+            "wind_speed": snap.wind_speed,
+        },
+    )
+
+    results = {"location": location, "weather_score": base_score, "radius_km": radius_km, "activities": {}}
+    for key, (spots, outside_radius) in found.items():
+        entry = {
+            "name": data.activity_names[key],
+            "spots": spots,
+            "total": len(spots_by_activity[key]),
         }
-    else:
-        return {"error": f"지원하지 않는 활동: {activity}", "available": list(activity_map.keys())}
+        if outside_radius:
+            entry["note"] = f"반경 {radius_km}km 내 장소가 없어 가장 가까운 곳을 추천해요"
+        results["activities"][key] = entry
+
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        for entry in results["activities"].values():
+            entry["spots"] = [spot["name"] for spot in entry["spots"]]
 
     return results
 
@@ -1369,12 +1191,21 @@ async def get_recommended_spots(location: str = "서울", activity: str = "all")
 # =============================================================================
 
 
+def _compact_places(places: list) -> list:
+    """장소 목록 축약 (detail=compact용)"""
+    return [
+        {"name": p.get("name", ""), "distance": p.get("distance", ""), "place_url": p.get("place_url", "")}
+        for p in places
+    ]
+
+
 @mcp.tool()
 async def search_nearby_places(
     keyword: str,
     location: str = "서울",
     radius: int = 2000,
-    count: int = 5
+    count: int = 5,
+    detail: str = "normal"
 ) -> dict:
     """
     주변 장소를 검색합니다. (Kakao Maps API)
@@ -1386,7 +1217,8 @@ async def search_nearby_places(
         keyword: 검색 키워드 (예: "맛집", "카페", "편의점", "주차장")
         location: 검색 중심 지역 (전국 어디든! 예: "서울", "전주", "속초", "을왕리")
         radius: 검색 반경 (미터, 기본값: 2000, 최대: 20000)
-        count: 결과 개수 (기본값: 5, 최대: 15)
+        count: 결과 개수 (기본값: 5, 최대: 45)
+        detail: 응답 상세도 (compact: 이름/거리/링크만, normal/full: 전체 정보)
 
     Returns:
         장소 목록 (이름, 주소, 전화번호, 거리, 카카오맵 링크)
@@ -1408,6 +1240,9 @@ async def search_nearby_places(
     if "error" in result:
         return result
 
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {"search_center": location, "places": _compact_places(result.get("places", []))}
+
     result["search_center"] = location
     result["radius_meters"] = radius
 
@@ -1418,7 +1253,8 @@ async def search_nearby_places(
 async def get_directions_link(
     origin: str,
     destination: str,
-    mode: str = "car"
+    mode: str = "car",
+    detail: str = "normal"
 ) -> dict:
     """
     출발지에서 목적지까지 길찾기 링크를 생성합니다. (Kakao Maps)
@@ -1434,6 +1270,7 @@ async def get_directions_link(
             - transit: 대중교통
             - walk: 도보
             - bike: 자전거
+        detail: 응답 상세도 (compact: 길찾기 URL만, normal/full: 전체 정보)
 
     Returns:
         카카오맵 길찾기 URL, 이동 수단 정보
@@ -1459,6 +1296,9 @@ async def get_directions_link(
         mode=mode
     )
 
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {"mode": result["mode"], "url": result["url"]}
+
     return result
 
 
@@ -1466,7 +1306,8 @@ async def get_directions_link(
 async def search_restaurant(
     location: str = "서울",
     cuisine: str = "",
-    count: int = 5
+    count: int = 5,
+    detail: str = "normal"
 ) -> dict:
     """
     맛집/음식점을 검색합니다. (Kakao Maps API)
@@ -1478,6 +1319,7 @@ async def search_restaurant(
         location: 검색 지역 (전국 어디든! 예: "전주", "속초", "제주", "부산")
         cuisine: 음식 종류 (예: "한식", "회", "고기", 빈 값이면 전체)
         count: 결과 개수 (기본값: 5)
+        detail: 응답 상세도 (compact: 이름/거리/링크만, normal/full: 전체 정보)
 
     Returns:
         맛집 목록 (이름, 주소, 카테고리, 카카오맵 링크)
@@ -1500,6 +1342,9 @@ async def search_restaurant(
     if "error" in result:
         return result
 
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {"search_location": location, "places": _compact_places(result.get("places", []))}
+
     result["search_location"] = location
     if cuisine:
         result["cuisine"] = cuisine
@@ -1512,7 +1357,8 @@ async def get_place_recommendation(
     location: str = "서울",
     situation: str = "혼자",
     time_of_day: str = "",
-    count: int = 5
+    count: int = 5,
+    detail: str = "normal"
 ) -> dict:
     """
     상황/시간에 맞는 장소를 스마트하게 추천합니다.
@@ -1539,6 +1385,7 @@ async def get_place_recommendation(
             - 저녁 (17-21시): 레스토랑, 고기
             - 심야 (21-6시): 술집, 야식
         count: 결과 개수 (기본값: 5)
+        detail: 응답 상세도 (compact: 랜드마크 조회/추천 이유 생략, normal/full: 전체 정보)
 
     Returns:
         상황에 맞는 장소 추천, 분위기 설명, 추천 카테고리
@@ -1547,7 +1394,8 @@ async def get_place_recommendation(
         location=location,
         situation=situation,
         time_of_day=time_of_day,
-        count=count
+        count=count,
+        detail=normalize_detail(detail),
     )
 
     return result
@@ -1559,7 +1407,8 @@ async def get_place_recommendation(
 @mcp.tool()
 async def get_smart_course(
     location: str = "서울",
-    situation: str = "데이트"
+    situation: str = "데이트",
+    detail: str = "normal"
 ) -> dict:
     """
     현재 날씨를 분석해서 최적의 코스를 추천합니다! (A→B→C 동선)
@@ -1577,35 +1426,22 @@ async def get_smart_course(
             - 친구: 카페 → 볼링장/맛집 → 술집
             - 가족: 카페 → 박물관/키즈카페 → 식당
             - 혼자: 카페 → 서점/산책 → 맛집
+        detail: 응답 상세도 (compact: 장소 이름/링크만, normal/full: 추천 이유/이동 팁 포함)
 
     Returns:
         날씨 기반 3단계 코스 (각 장소 카카오맵 링크 포함)
     """
     # 현재 날씨 조회
-    weather = await cached_get_weather(location)
-    forecast = await cached_get_forecast(location)
-
-    # 날씨 정보 추출
-    sky = "맑음"
-    rain_prob = 0
-    temperature = 20
-
-    if "error" not in weather:
-        current = weather.get("current", {})
-        temperature = current.get("temperature", 20)
-
-    if "error" not in forecast:
-        summary = forecast.get("today_summary", {})
-        rain_prob = summary.get("precipitation_probability", 0)
-        sky = summary.get("sky", "맑음")
+    snap = await get_weather_snapshot(location)
 
     # 날씨 기반 코스 추천
     result = await get_weather_based_course(
         location=location,
         situation=situation,
-        weather_sky=sky,
-        rain_prob=rain_prob,
-        temperature=temperature,
+        weather_sky=snap.sky,
+        rain_prob=snap.rain_prob,
+        temperature=snap.temperature,
+        detail=normalize_detail(detail),
     )
 
     return result
@@ -1620,7 +1456,7 @@ async def get_smart_course(
 
 
 @mcp.tool()
-async def get_best_time_for_activity(location: str = "서울", activity: str = "외출") -> dict:
+async def get_best_time_for_activity(location: str = "서울", activity: str = "외출", detail: str = "normal") -> dict:
     """
     오늘 하루 중 활동하기 가장 좋은 시간대를 분석합니다! (v3.7 신규)
     시간대별 날씨 예보를 분석해서 최적의 타이밍을 알려드려요.
@@ -1635,17 +1471,18 @@ async def get_best_time_for_activity(location: str = "서울", activity: str = "
     Args:
         location: 지역명
         activity: 활동 종류 (외출, 운동, 빨래, 등산, 피크닉)
+        detail: 응답 상세도 (compact: 최적 시간만, normal: 시간대별 분석 포함, full: 데이터 나이 포함)
 
     Returns:
         시간대별 점수와 최적 시간 추천
     """
-    forecast = await cached_get_forecast(location)
-    air = await get_air_quality(location)
+    detail = normalize_detail(detail)
+    snap = await get_weather_snapshot(location)
 
-    if "error" in forecast:
-        return {"error": forecast["error"], "location": location}
+    if not snap.has_forecast:
+        return {"error": snap.errors["forecast"], "location": location}
 
-    hourly = forecast.get("forecasts", [])
+    hourly = snap.forecasts
 
     # 시간대별 점수 계산
     time_scores = []
@@ -1731,7 +1568,17 @@ async def get_best_time_for_activity(location: str = "서울", activity: str = "
     period_scores = [("아침", morning_avg), ("오후", afternoon_avg), ("저녁", evening_avg)]
     best_period = max(period_scores, key=lambda x: x[1])
 
-    return {
+    if detail == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "activity": activity,
+            "best_time": best["time"],
+            "best_score": best["score"],
+            "best_period": best_period[0],
+            "avoid_time": worst["time"],
+        }
+
+    result = {
         "location": location,
         "activity": activity,
         "best_time": {
@@ -1756,10 +1603,18 @@ async def get_best_time_for_activity(location: str = "서울", activity: str = "
             "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M")
         }
     }
+    if detail == DETAIL_FULL:
+        result["data_source"]["data_age_seconds"] = snap.age_seconds()
+    return result
 
 
 @mcp.tool()
-async def compare_activities(location: str = "서울", activity1: str = "캠핑", activity2: str = "피크닉") -> dict:
+async def compare_activities(
+    location: str = "서울",
+    activity1: str = "캠핑",
+    activity2: str = "피크닉",
+    detail: str = "normal",
+) -> dict:
     """
     두 활동 중 오늘 날씨에 더 적합한 것을 비교 분석합니다! (v3.7 신규)
     "캠핑 갈까 피크닉 갈까?" 같은 고민을 해결해드려요.
@@ -1773,28 +1628,16 @@ async def compare_activities(location: str = "서울", activity1: str = "캠핑"
         location: 지역명
         activity1: 첫 번째 활동
         activity2: 두 번째 활동
+        detail: 응답 상세도 (compact: 승자/점수만, normal/full: 활동별 메시지 포함)
 
     Returns:
         두 활동의 비교 분석 및 승자 추천
     """
-    weather_data = await _get_weather_data(location)
-
-    # 활동별 점수 계산 함수 매핑
-    activity_functions = {
-        "캠핑": calculate_camping_index,
-        "피크닉": calculate_picnic_index,
-        "등산": calculate_hiking_index,
-        "빨래": calculate_laundry_index,
-        "세차": calculate_car_wash_index,
-        "운동": calculate_exercise_index,
-        "러닝": calculate_running_index,
-        "골프": calculate_golf_index,
-        "낚시": calculate_fishing_index,
-    }
+    snap = await get_weather_snapshot(location)
 
     # 활동1 점수
-    if activity1 in activity_functions:
-        result1 = activity_functions[activity1](weather_data)
+    if activity1 in ACTIVITY_SCORERS:
+        result1 = ACTIVITY_SCORERS[activity1](snap)
         score1 = result1.get("score", 50)
         grade1 = result1.get("grade", "보통")
         message1 = result1.get("message", "")
@@ -1804,8 +1647,8 @@ async def compare_activities(location: str = "서울", activity1: str = "캠핑"
         message1 = f"{activity1}은 지원하지 않는 활동입니다"
 
     # 활동2 점수
-    if activity2 in activity_functions:
-        result2 = activity_functions[activity2](weather_data)
+    if activity2 in ACTIVITY_SCORERS:
+        result2 = ACTIVITY_SCORERS[activity2](snap)
         score2 = result2.get("score", 50)
         grade2 = result2.get("grade", "보통")
         message2 = result2.get("message", "")
@@ -1826,6 +1669,14 @@ async def compare_activities(location: str = "서울", activity1: str = "캠핑"
         winner = activity2
         recommendation = f"오늘은 {activity2}가 {-diff}점 더 좋아요!"
 
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "winner": winner,
+            "scores": {activity1: score1, activity2: score2},
+            "recommendation": recommendation,
+        }
+
     return {
         "location": location,
         "comparison": {
@@ -1843,14 +1694,69 @@ async def compare_activities(location: str = "서울", activity1: str = "캠핑"
         "winner": winner,
         "score_difference": abs(diff),
         "recommendation": recommendation,
-        "weather_summary": f"현재 {weather_data.temperature}°C, 강수확률 {weather_data.rain_prob}%",
+        "weather_summary": f"현재 {snap.temperature}°C, 강수확률 {snap.rain_prob}%",
         "data_source": {
             "provider": "기상청 단기예보 API",
-            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M")
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "data_age_seconds": snap.age_seconds(),
         }
     }
 
 
+@mcp.tool()
+async def plan_activities_3days(location: str = "서울", activities: str = "", detail: str = "normal") -> dict:
+    """
+    3일 예보(오늘/내일/모레)로 활동별 최적의 날짜와 시간대를 찾아드립니다! (v3.8 신규)
+    아침/오후/저녁 시간대마다 모든 활동을 점수화해서 가장 좋은 때를 알려드려요.
+
+    사용 예시:
+    - "이번 주에 캠핑 언제 가면 좋아?"
+    - "내일이랑 모레 중에 등산하기 좋은 날은?"
+    - "3일 안에 세차하기 제일 좋은 때는?"
+
+    Args:
+        location: 지역명
+        activities: 활동 목록 (쉼표 구분, 예: "캠핑,등산"). 비어있으면 전체
+            지원 활동: 캠핑, 피크닉, 등산, 빨래, 세차, 운동, 러닝, 골프, 낚시
+        detail: 응답 상세도 (compact: 활동별 최적 시간대만, normal/full: 날짜별 요약 포함)
+
+    Returns:
+        활동별 최적 날짜/시간대, 날짜별 시간대 요약
+    """
+    snap = await get_weather_snapshot(location)
+
+    if not snap.has_forecast:
+        return {"error": snap.errors["forecast"], "location": location}
+
+    requested = [a.strip() for a in activities.split(",") if a.strip()] or None
+    plan = plan_activities(snap, requested)
+
+    if normalize_detail(detail) == DETAIL_COMPACT:
+        return {
+            "location": location,
+            "best_by_activity": {
+                name: f"{best['day']} {best['period']} ({best['score']}점)"
+                for name, best in plan["best_by_activity"].items()
+            },
+        }
+
+    result = {
+        "location": location,
+        "best_by_activity": plan["best_by_activity"],
+        "by_day": plan["by_day"],
+        "data_source": {
+            "provider": "기상청 단기예보 API",
+            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+            "data_age_seconds": snap.age_seconds(),
+            "note": "대기질/자외선은 실시간 값 기준",
+        },
+    }
+    if plan["unsupported"]:
+        result["unsupported"] = plan["unsupported"]
+        result["available"] = list(ACTIVITY_SCORERS.keys())
+    return result
+
+
 # =============================================================================
 # Resources
 # =============================================================================
@@ -1859,9 +1765,9 @@ async def compare_activities(location: str = "서울", activity1: str = "캠핑"
 @mcp.resource("weather://locations")
 def get_supported_locations() -> str:
     """지원하는 지역 목록을 반환합니다."""
-    from config.settings import GRID_COORDINATES
+    from src.reference_data import get_reference_data
 
-    locations = sorted(GRID_COORDINATES.keys())
+    locations = sorted(get_reference_data().grid_coordinates.keys())
     return f"지원 지역 ({len(locations)}개): " + ", ".join(locations)
 
 
@@ -1991,9 +1897,18 @@ async def health_check(request):
     return JSONResponse({
         "status": "healthy",
         "service": "weather-life-mcp",
-        "version": "3.7.0",
-        "tools": 30,
-        "features": ["weather", "weekly_forecast", "air_quality", "outfit", "laundry", "hiking", "picnic", "car_wash", "exercise", "cold_flu_risk", "commute", "allergy", "migraine_risk", "sleep_quality", "photography", "joint_pain", "camping", "fishing", "golf", "uv_info", "food_safety", "recommended_spots", "search_nearby_places", "get_directions_link", "search_restaurant", "get_place_recommendation", "get_smart_course", "get_best_time_for_activity", "compare_activities"],
+        "version": "3.8.0",
+        "tools": 31,
+        "features": ["weather", "weekly_forecast", "air_quality", "outfit", "laundry", "hiking", "picnic", "car_wash", "exercise", "cold_flu_risk", "commute", "allergy", "migraine_risk", "sleep_quality", "photography", "joint_pain", "camping", "fishing", "golf", "uv_info", "food_safety", "recommended_spots", "search_nearby_places", "get_directions_link", "search_restaurant", "get_place_recommendation", "get_smart_course", "get_best_time_for_activity", "compare_activities", "plan_activities_3days"],
+        "v3.8_features": ["weather_snapshot", "plan_activities_3days", "detail_levels", "geo_spot_index", "reference_data_file", "kakao_search_cache", "kakao_multi_page_search", "concurrent_course_steps", "course_route_optimizer", "landmark_index", "multi_keyword_search", "upstream_rate_limiter", "circuit_breaker", "request_hedging", "upstream_retry", "app_lifespan_probes", "shared_cache_backend", "multi_worker", "cache_sharding", "prometheus_metrics", "tracing", "profiling_endpoint", "offline_benchmark", "upstream_simulator", "load_generator"],
+        "caches": get_cache_stats(),
+        "upstream_quota": get_limiter_stats(),
+        "upstream_hosts": get_host_stats(),
+        "upstream_hedging": get_hedge_stats(),
+        "upstream_retry": get_retry_stats(),
+        "worker": {"pid": os.getpid(), "workers": WORKER_COUNT, "bus": get_bus_stats()},
+        "tracing": get_trace_stats(),
+        "profiling": {"enabled": bool(PROFILE_TOKEN), "running": is_profiling()},
         "v3.7_features": ["get_best_time_for_activity", "compare_activities", "score_breakdown", "data_source_info", "creativity_enhancement"],
         "v3.6_features": ["removed_kimjang", "removed_running", "removed_bbq", "removed_drive", "tool_optimization_32_to_28"],
         "v3.5_features": ["tool_consolidation_38_to_32", "removed_duplicates"],
@@ -2008,21 +1923,71 @@ async def health_check(request):
     })
 
 
+async def metrics(request):
+    """Prometheus 텍스트 노출 형식 메트릭"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+async def profile(request):
+    """
+    이벤트 루프 샘플링 프로파일 (v3.8, PROFILE_TOKEN 설정 시에만)
+
+    GET /debug/profile?seconds=10&interval_ms=10&format=collapsed|json&idle=false
+    Authorization: Bearer <PROFILE_TOKEN>
+    """
+    if not PROFILE_TOKEN:
+        return JSONResponse({"error": "Not Found"}, status_code=404)
+    supplied = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+    if not hmac.compare_digest(supplied.encode(), PROFILE_TOKEN.encode()):
+        return JSONResponse({"error": "인증 실패"}, status_code=401)
+
+    try:
+        seconds = float(request.query_params.get("seconds", "10"))
+        interval_ms = float(request.query_params.get("interval_ms", str(PROFILE_DEFAULT_INTERVAL_MS)))
+    except ValueError:
+        return JSONResponse({"error": "seconds, interval_ms는 숫자여야 합니다"}, status_code=400)
+    include_idle = request.query_params.get("idle", "false").lower() == "true"
+
+    try:
+        sampler = await profile_event_loop(seconds, interval_ms / 1000, include_idle)
+    except ProfileBusyError as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+
+    if request.query_params.get("format") == "json":
+        return JSONResponse(sampler.summary())
+    filename = f"profile-{os.getpid()}-{int(sampler.started_at)}.collapsed"
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def livez(request):
+    """Liveness probe (상수 시간, 외부 호출/통계 계산 없음)"""
+    return PlainTextResponse("ok")
+
+
+async def readyz(request):
+    """Readiness probe - 예열이 끝나야 200"""
+    readiness = get_readiness()
+    return JSONResponse(readiness, status_code=200 if readiness["ready"] else 503)
+
+
 async def root(request):
     """Root endpoint"""
     return JSONResponse({
         "name": "Weather Life MCP",
         "description": "날씨, 미세먼지, 옷차림 추천 MCP 서버",
         "mcp_endpoint": "/mcp",
-        "health": "/health"
+        "health": "/health",
+        "liveness": "/livez",
+        "readiness": "/readyz",
+        "metrics": "/metrics",
     })
 
 
-def create_app():
-    """Create combined Starlette app with MCP"""
-    from starlette.middleware import Middleware
-    from starlette.routing import Router
-
+def create_app() -> Starlette:
+    """Create combined Starlette app with MCP (v3.8: 한 번만 생성, lifespan으로 자원 관리)"""
     # Get MCP ASGI app
     mcp_app = mcp.http_app(
         path="/mcp",
@@ -2030,36 +1995,54 @@ def create_app():
         json_response=True,
     )
 
-    # Combine routes: health check first, then MCP handles the rest
-    async def combined_app(scope, receive, send):
-        path = scope.get("path", "")
-        if path == "/" or path == "/health":
-            # Handle health routes with Starlette
-            health_app = Starlette(routes=[
-                Route("/", root),
-                Route("/health", health_check),
-            ])
-            await health_app(scope, receive, send)
-        else:
-            # Forward to MCP app
-            await mcp_app(scope, receive, send)
-
-    return combined_app
+    @asynccontextmanager
+    async def app_lifespan(app):
+        # MCP 세션 매니저 → 서버 공용 자원 순서로 시작, 역순으로 종료
+        async with mcp_app.lifespan(app):
+            async with lifespan(app):
+                yield
+
+    # Health/probe routes first, then MCP handles the rest
+    return Starlette(
+        routes=[
+            Route("/", root),
+            Route("/health", health_check),
+            Route("/livez", livez),
+            Route("/readyz", readyz),
+            Route("/metrics", metrics),
+            Route("/debug/profile", profile),
+            Mount("/", app=mcp_app),
+        ],
+        lifespan=app_lifespan,
+    )
 
 
 def main():
-    """서버 실행"""
+    """서버 실행 (SERVER_WORKERS > 1이면 멀티 워커 모드)"""
     port = int(os.environ.get("PORT", server_config.port))
     host = server_config.host
+    workers = server_config.workers
 
     print(f"Weather Life MCP 서버 시작")
     print(f"   Host: {host}")
     print(f"   Port: {port}")
+    print(f"   Workers: {workers}")
     print(f"   MCP Endpoint: http://{host}:{port}/mcp")
     print(f"   Health: http://{host}:{port}/health")
-
-    app = create_app()
-    uvicorn.run(app, host=host, port=port)
+    print(f"   Probes: http://{host}:{port}/livez, http://{host}:{port}/readyz")
+
+    if workers <= 1:
+        uvicorn.run(create_app(), host=host, port=port)
+        return
+
+    # 멀티 워커 - 워커 프로세스가 물려받을 설정 (호출량은 워커 수로 나눔, 캐시는 같은 호스트 공유)
+    os.environ["SERVER_WORKERS"] = str(workers)
+    os.environ.setdefault("CACHE_BACKEND", "shm")
+    os.environ["WORKER_BUS_DIR"] = tempfile.mkdtemp(prefix="weather-life-mcp-bus-")
+    try:
+        uvicorn.run("src.server:create_app", factory=True, host=host, port=port, workers=workers)
+    finally:
+        shutil.rmtree(os.environ["WORKER_BUS_DIR"], ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,220 @@
+"""
+장소 공간 인덱스 (v3.8)
+
+참조 데이터(reference_data)의 장소를 활동별 numpy 배열(위도 정렬)로 올려두고
+(활동, 사용자 위치, 반경) 질의를 위도 구간 필터 + 벡터화 haversine으로 처리합니다.
+
+장소별 날씨는 기상청 격자 단위로 조회하여 같은 격자의 장소들이 캐시를 공유합니다.
+"근처 캠핑장 중 지금 날씨 좋은 곳"이 인덱스 질의 1번 + 격자별 캐시 조회로 끝납니다.
+격자 조회는 요청당 MAX_GRID_LOOKUPS개까지만 하고, 나머지는 검색 중심 날씨로 평가합니다.
+"""
+
+import asyncio
+from typing import Optional
+
+import numpy as np
+
+from config.settings import latlon_to_grid
+from src.cache import cached_get_weather_at
+from src.reference_data import get_reference_data
+
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.0  # 위도 1도 ≈ 111km (구간 필터용)
+
+# 날씨 조회 후보 수 (요청 개수의 배수) - 날씨 필터로 빠지는 장소 대비
+CANDIDATE_FACTOR = 3
+
+# 요청당 격자 날씨 조회 상한 (활동 전체 합산, 나머지는 검색 중심 날씨로 평가)
+MAX_GRID_LOOKUPS = 8
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """기준점에서 여러 지점까지의 거리 (km, 벡터화)"""
+    lat1 = np.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlon = np.radians(lons) - np.radians(lon)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class SpotIndex:
+    """활동별 장소 공간 인덱스"""
+
+    def __init__(self, spots_by_activity: dict):
+        self._spots = {}
+        self._lats = {}
+        self._lons = {}
+
+        for activity, spots in spots_by_activity.items():
+            # 좌표가 있는 장소만, 위도 순 정렬 + 격자 좌표 부여
+            located = sorted(
+                (s for s in spots if "lat" in s and "lon" in s),
+                key=lambda s: s["lat"],
+            )
+            self._spots[activity] = [
+                {**s, "grid": latlon_to_grid(s["lat"], s["lon"])} for s in located
+            ]
+            self._lats[activity] = np.array([s["lat"] for s in located], dtype=float)
+            self._lons[activity] = np.array([s["lon"] for s in located], dtype=float)
+
+    def activities(self) -> list:
+        """인덱싱된 활동 목록"""
+        return list(self._spots.keys())
+
+    def nearby(
+        self,
+        activity: str,
+        lat: float,
+        lon: float,
+        radius_km: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> list:
+        """
+        가까운 장소 조회
+
+        Args:
+            activity: 활동 키 (hiking, camping, ...)
+            lat, lon: 사용자 위치
+            radius_km: 검색 반경 (None이면 전체)
+            limit: 최대 개수
+
+        Returns:
+            [(장소, 거리km), ...] 가까운 순
+        """
+        lats = self._lats.get(activity)
+        if lats is None or not len(lats):
+            return []
+
+        # 위도 구간으로 후보 범위 축소 (정렬 배열 이진 탐색)
+        lo, hi = 0, len(lats)
+        if radius_km:
+            band = radius_km / KM_PER_DEG_LAT
+            lo = int(np.searchsorted(lats, lat - band, side="left"))
+            hi = int(np.searchsorted(lats, lat + band, side="right"))
+            if lo >= hi:
+                return []
+
+        dist = haversine_km(lat, lon, lats[lo:hi], self._lons[activity][lo:hi])
+        order = np.argsort(dist, kind="stable")
+        if radius_km:
+            order = order[dist[order] <= radius_km]
+        if limit:
+            order = order[:limit]
+
+        spots = self._spots[activity]
+        return [(spots[lo + i], round(float(dist[i]), 1)) for i in order]
+
+
+def get_spot_index() -> SpotIndex:
+    """현재 참조 데이터의 장소 인덱스 (데이터 리로드 시 재생성)"""
+    return get_reference_data().spot_index()
+
+
+def score_spot_weather(current: dict) -> int:
+    """장소의 현재 날씨 점수 (0-100)"""
+    score = 100
+
+    precipitation_type = current.get("precipitation_type", "없음")
+    if precipitation_type and precipitation_type != "없음":
+        score -= 50
+
+    temp = current.get("temperature")
+    if temp is not None and (temp < 0 or temp > 35):
+        score -= 20
+
+    wind = current.get("wind_speed") or 0
+    if wind >= 10:
+        score -= 20
+    elif wind >= 7:
+        score -= 10
+
+    return max(0, score)
+
+
+def _spot_weather_entry(spot: dict, distance: float, current: dict) -> dict:
+    return {
+        **spot,
+        "distance_km": distance,
+        "weather": {
+            "temperature": current.get("temperature"),
+            "precipitation_type": current.get("precipitation_type", "없음"),
+            "wind_speed": current.get("wind_speed"),
+        },
+        "weather_score": score_spot_weather(current),
+    }
+
+
+async def find_spots_with_weather(
+    activities: list,
+    lat: float,
+    lon: float,
+    radius_km: Optional[float] = 50,
+    limit: int = 5,
+    min_weather_score: int = 0,
+    fallback_weather: Optional[dict] = None,
+) -> dict:
+    """
+    여러 활동의 가까운 장소를 장소별 현재 날씨와 함께 조회
+
+    날씨 점수 높은 순, 같으면 가까운 순으로 정렬합니다.
+    반경 내 장소가 없는 활동은 가장 가까운 장소로 대체합니다 (인덱스 질의만, 추가 조회 없음).
+
+    격자 날씨는 활동 전체에서 중복을 없애고, 활동별로 가까운 limit개 장소의 격자만
+    가까운 순서대로 최대 MAX_GRID_LOOKUPS개까지 조회합니다 (cold 호출 비용 상한).
+    조회하지 않았거나 실패한 격자의 장소는 fallback_weather(검색 중심 날씨)로 평가하며
+    "weather_source": "search_center"가 붙습니다. fallback_weather도 없으면 거리 정보만 제공합니다.
+
+    Returns:
+        {활동: ([{...장소, "distance_km", "weather", "weather_score"}, ...], 반경 밖 대체 여부)}
+    """
+    index = get_spot_index()
+    candidates = {}
+    outside = {}
+    for activity in activities:
+        found = index.nearby(activity, lat, lon, radius_km, limit=limit * CANDIDATE_FACTOR)
+        outside[activity] = not found
+        if not found:
+            found = index.nearby(activity, lat, lon, None, limit=limit)
+        candidates[activity] = found
+
+    # 조회할 격자: 활동별 가까운 limit개 장소의 격자를 순위별로 번갈아 모아 중복 제거 후 상한 적용
+    grids = []
+    for rank in range(limit):
+        for found in candidates.values():
+            if rank < len(found):
+                grid = found[rank][0]["grid"]
+                if grid not in grids:
+                    grids.append(grid)
+    grids = grids[:MAX_GRID_LOOKUPS]
+
+    responses = await asyncio.gather(
+        *(cached_get_weather_at(nx, ny) for nx, ny in grids),
+        return_exceptions=True,
+    )
+    weather_by_grid = {}
+    for grid, response in zip(grids, responses):
+        if isinstance(response, dict) and "current" in response:
+            weather_by_grid[grid] = response["current"]
+
+    results = {}
+    for activity, found in candidates.items():
+        entries = []
+        for spot, distance in found:
+            current = weather_by_grid.get(spot["grid"])
+            if current is not None:
+                entry = _spot_weather_entry(spot, distance, current)
+            elif fallback_weather is not None:
+                entry = _spot_weather_entry(spot, distance, fallback_weather)
+                entry["weather_source"] = "search_center"
+            else:
+                # 날씨 조회 실패 - 거리 정보만 제공
+                entry = {**spot, "distance_km": distance, "weather": None, "weather_score": None}
+            if entry["weather_score"] is not None and entry["weather_score"] < min_weather_score:
+                continue
+            entries.append(entry)
+
+        entries.sort(key=lambda e: (-(e["weather_score"] or 0), e["distance_km"]))
+        results[activity] = (entries[:limit], outside[activity])
+    return results
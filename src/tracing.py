@@ -0,0 +1,257 @@
+"""
+요청 추적 스팬 (v3.8)
+
+도구 하나가 느릴 때 시간이 좌표 조회, 기상청/에어코리아 호출, 랜드마크 조회, 점수 계산 중
+어디에 쓰였는지 알 수 있도록 도구 호출마다 스팬 트리를 기록합니다.
+
+- 도구 호출(루트) → 캐시 조회 → 외부 API 시도, 점수 계산/동선 최적화 단계가 자식 스팬
+- 현재 스팬은 contextvars로 전달되어 asyncio 작업(gather/create_task)에도 이어짐
+- 샘플링은 루트 스팬에서 한 번 결정 (TRACE_SAMPLE_RATE, 0이면 기록 안 함 - 기본)
+- 끝난 스팬은 메모리 버퍼에 모았다가 lifespan의 내보내기 작업이 주기적으로 내보냄
+
+| TRACE_EXPORTER | 내보내는 곳 |
+|----------------|-------------|
+| jsonl (기본) | TRACE_FILE에 스팬 한 줄씩 (JSON Lines) |
+| otlp | TRACE_OTLP_ENDPOINT로 OTLP/HTTP JSON POST (수집기 대역: tests/trace_collector.py) |
+
+사용:
+    with span("score outing", location=location) as s:
+        ...
+        s.set("score", 80)
+"""
+
+import asyncio
+import json
+import os
+import random
+import secrets
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import List, Optional
+
+import httpx
+
+
+# 루트 스팬 샘플링 비율 (0~1)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "jsonl").lower()
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+TRACE_SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "weather-life-mcp")
+TRACE_EXPORT_INTERVAL = float(os.getenv("TRACE_EXPORT_INTERVAL", "2.0"))
+TRACE_BUFFER_MAX = 10000  # 내보내기 전 보관할 최대 스팬 수 (넘으면 오래된 것부터 버림)
+OTLP_TIMEOUT_SECONDS = 5.0
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_CANCELLED = "cancelled"
+
+
+_current: ContextVar[Optional["Span"]] = ContextVar("trace_span", default=None)
+_pending: deque = deque()
+_stats = {"traces": 0, "spans": 0, "exported": 0, "dropped": 0, "export_errors": 0}
+
+
+class Span:
+    """스팬 (with 블록 동안 현재 스팬)"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "sampled", "attributes",
+        "status", "start_time", "_started", "_token",
+    )
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.attributes = attributes
+        self.status = STATUS_OK
+        self.start_time = 0.0
+        self._started = 0.0
+        self._token = None
+
+    def set(self, key: str, value) -> None:
+        """속성 추가"""
+        if self.sampled:
+            self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        self.start_time = time.time()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._started
+        _current.reset(self._token)
+        if not self.sampled:
+            return False
+        if exc_type is not None:
+            if issubclass(exc_type, asyncio.CancelledError):
+                self.status = STATUS_CANCELLED
+            else:
+                self.status = STATUS_ERROR
+                self.attributes["exception"] = f"{exc_type.__name__}: {exc}"
+        _finish(self, duration)
+        return False
+
+
+class _NoopSpan:
+    """기록하지 않는 스팬 (추적 꺼짐 / 샘플링 제외된 트레이스의 자식)"""
+
+    sampled = False
+
+    def set(self, key: str, value) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attributes):
+    """
+    스팬 시작 (with 문으로 사용)
+
+    현재 스팬이 없으면 루트 스팬이 되어 샘플링 여부를 정하고, 있으면 그 자식이 됩니다.
+    샘플링에서 빠진 트레이스의 자식은 아무것도 하지 않는 스팬입니다.
+    """
+    parent = _current.get()
+    if parent is None:
+        if TRACE_SAMPLE_RATE <= 0:
+            return _NOOP
+        sampled = random.random() < TRACE_SAMPLE_RATE
+        if sampled:
+            _stats["traces"] += 1
+        # 빠진 루트도 현재 스팬으로 두어 자식이 새 트레이스를 시작하지 않게 함
+        return Span(name, secrets.token_hex(16), None, sampled, attributes)
+    if not parent.sampled:
+        return _NOOP
+    return Span(name, parent.trace_id, parent.span_id, True, attributes)
+
+
+def current_span():
+    """현재 스팬 (없으면 기록하지 않는 스팬)"""
+    return _current.get() or _NOOP
+
+
+def _finish(finished: Span, duration: float) -> None:
+    if len(_pending) >= TRACE_BUFFER_MAX:
+        _pending.popleft()
+        _stats["dropped"] += 1
+    _stats["spans"] += 1
+    _pending.append({
+        "trace_id": finished.trace_id,
+        "span_id": finished.span_id,
+        "parent_id": finished.parent_id,
+        "name": finished.name,
+        "start": round(finished.start_time, 6),
+        "duration_ms": round(duration * 1000, 3),
+        "status": finished.status,
+        "attributes": finished.attributes,
+    })
+
+
+def drain_spans() -> List[dict]:
+    """내보낼 스팬 전부 꺼내기"""
+    spans = list(_pending)
+    _pending.clear()
+    return spans
+
+
+# =============================================================================
+# 내보내기
+# =============================================================================
+
+
+def _write_jsonl(spans: List[dict], path: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for record in spans:
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[dict]) -> dict:
+    """스팬 목록 → OTLP/HTTP JSON 요청 본문"""
+    otlp_spans = []
+    for record in spans:
+        start_ns = int(record["start"] * 1e9)
+        item = {
+            "traceId": record["trace_id"],
+            "spanId": record["span_id"],
+            "name": record["name"],
+            "kind": 1,
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(record["duration_ms"] * 1e6)),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in record["attributes"].items()],
+            "status": {"code": 2 if record["status"] == STATUS_ERROR else 1, "message": record["status"]},
+        }
+        if record["parent_id"]:
+            item["parentSpanId"] = record["parent_id"]
+        otlp_spans.append(item)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "weather-life-mcp.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+async def export_traces() -> int:
+    """쌓인 스팬 내보내기, 내보낸 수 (실패하면 버림 - 요청 처리에 영향 없음)"""
+    spans = drain_spans()
+    if not spans:
+        return 0
+    try:
+        if TRACE_EXPORTER == "otlp":
+            async with httpx.AsyncClient(timeout=OTLP_TIMEOUT_SECONDS) as client:
+                response = await client.post(TRACE_OTLP_ENDPOINT, json=to_otlp(spans))
+                response.raise_for_status()
+        else:
+            await asyncio.to_thread(_write_jsonl, spans, TRACE_FILE)
+    except (OSError, httpx.HTTPError):
+        _stats["export_errors"] += 1
+        _stats["dropped"] += len(spans)
+        return 0
+    _stats["exported"] += len(spans)
+    return len(spans)
+
+
+async def trace_export_loop() -> None:
+    """TRACE_EXPORT_INTERVAL마다 내보내기 (lifespan 백그라운드 작업)"""
+    while True:
+        await asyncio.sleep(TRACE_EXPORT_INTERVAL)
+        await export_traces()
+
+
+def is_tracing_enabled() -> bool:
+    return TRACE_SAMPLE_RATE > 0
+
+
+def get_trace_stats() -> dict:
+    """추적 설정 + 기록/내보내기 통계"""
+    return {
+        "enabled": is_tracing_enabled(),
+        "sample_rate": TRACE_SAMPLE_RATE,
+        "exporter": TRACE_EXPORTER,
+        "target": TRACE_OTLP_ENDPOINT if TRACE_EXPORTER == "otlp" else TRACE_FILE,
+        "pending": len(_pending),
+        **_stats,
+    }
@@ -0,0 +1,317 @@
+"""
+외부 API 공용 HTTP 클라이언트 (v3.8)
+
+요청마다 httpx.AsyncClient를 새로 만들면 매번 TCP/TLS 연결을 다시 맺습니다.
+이벤트 루프마다 커넥션 풀을 가진 클라이언트 하나를 만들어 재사용합니다.
+
+- get_http_client(): 현재 루프의 공용 클라이언트 (없거나 닫혔으면 생성)
+- close_http_clients(): 서버 종료 시 정리
+- set_http_transport(): 전송 계층 교체 (벤치마크의 녹화 응답 재생)
+- upstream_get(): 서킷 브레이커(circuit_breaker) + 호출량 제한(rate_limiter)을 거친 GET 요청
+- hedge=True: 응답이 늦으면 중복 요청을 보내 먼저 온 응답 사용 (헤징)
+- 오류는 upstream_errors의 종류별 예외로 분류, 일시적 오류만 백오프 재시도
+"""
+
+import asyncio
+import os
+import random
+import time
+import weakref
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.circuit_breaker import STATE_CLOSED, get_host_guard
+from src.metrics import record_upstream
+from src.rate_limiter import get_limiter
+from src.tracing import span
+from src.upstream_errors import TransientUpstreamError, UpstreamError, classify_response
+
+
+# 커넥션 풀 설정
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_DEFAULT_TIMEOUT = float(os.getenv("UPSTREAM_DEFAULT_TIMEOUT", "10.0"))
+
+# 요청 헤징 - 응답이 HEDGE_PERCENTILE 백분위 시간을 넘기면 한 번 더 요청
+HEDGING_ENABLED = os.getenv("UPSTREAM_HEDGING", "true").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("UPSTREAM_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DELAY_SECONDS = 0.05
+HEDGE_BUDGET_RATIO = float(os.getenv("UPSTREAM_HEDGE_BUDGET_RATIO", "0.1"))  # 전체 요청 대비 최대 헤징 비율
+
+# 재시도 - 일시적 오류만, 최대 횟수 / 백오프 / 예산 (성공 10건당 재시도 1건까지)
+UPSTREAM_MAX_RETRIES = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+RETRY_BASE_DELAY_SECONDS = float(os.getenv("UPSTREAM_RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY_SECONDS = 2.0
+RETRY_BUDGET_MAX = 10.0
+RETRY_BUDGET_PER_SUCCESS = 0.1
+
+
+# 이벤트 루프별 클라이언트 (httpx 연결은 생성한 루프에서만 사용 가능)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# 공용 클라이언트 전송 계층 (None이면 실제 네트워크)
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """현재 이벤트 루프의 공용 HTTP 클라이언트"""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=UPSTREAM_DEFAULT_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+            ),
+            transport=_transport,
+        )
+        _clients[loop] = client
+    return client
+
+
+def set_http_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """
+    공용 클라이언트의 전송 계층 교체 (테스트/벤치마크용 - 녹화 응답 재생 등)
+
+    이후 get_http_client()가 새 클라이언트를 만듭니다 (기존 클라이언트는 닫지 않음).
+    """
+    global _transport
+    _transport = transport
+    _clients.clear()
+
+
+async def close_http_clients() -> None:
+    """현재 이벤트 루프의 공용 클라이언트 닫기 (서버 종료 시)"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+async def upstream_get(
+    upstream: str,
+    url: str,
+    *,
+    params: Optional[dict] = None,
+    headers: Optional[dict] = None,
+    timeout: Optional[float] = None,
+    hedge: bool = False,
+) -> httpx.Response:
+    """
+    외부 API GET 요청 (서킷 확인 → 호출량 제한 → 공용 클라이언트 → 오류 분류/재시도)
+
+    타임아웃은 호스트의 최근 p99 응답 시간으로 줄어들 수 있습니다 (timeout이 상한).
+    일시적 오류(연결 오류, 5xx, 서비스 일시 오류)는 지수 백오프 + 지터로 재시도하며,
+    재시도는 업스트림별 재시도 예산 안에서만 합니다 (장애 시 재시도 폭주 방지).
+
+    Args:
+        upstream: 업스트림 이름 (kma, airkorea, life_index, kakao)
+        timeout: 최대 타임아웃 (초)
+        hedge: 응답이 늦으면 같은 요청을 한 번 더 보내 먼저 온 응답 사용 (지연 민감 호출용)
+
+    Returns:
+        정상 응답 (오류 본문이 아닌 2xx/3xx)
+
+    Raises:
+        UpstreamError: 분류된 오류 (TransientUpstreamError, QuotaUpstreamError,
+            AuthUpstreamError, BadRequestUpstreamError, CircuitOpenError, UpstreamLimitError)
+    """
+    endpoint = urlsplit(url).path.rsplit("/", 1)[-1]
+    span_name = f"{upstream} {endpoint}"
+    attempt = 0
+    while True:
+        started = time.perf_counter()
+        with span(span_name, upstream=upstream, endpoint=endpoint, attempt=attempt) as attempt_span:
+            try:
+                response, error = await _attempt(upstream, url, params, headers, timeout, hedge)
+                record_upstream(
+                    upstream, endpoint, str(response.status_code),
+                    time.perf_counter() - started, len(response.content),
+                )
+                attempt_span.set("status", response.status_code)
+                attempt_span.set("bytes", len(response.content))
+            except httpx.TimeoutException as e:
+                record_upstream(upstream, endpoint, "timeout", time.perf_counter() - started)
+                attempt_span.set("status", "timeout")
+                error = TransientUpstreamError(upstream, f"{upstream} 응답 시간 초과")
+                error.__cause__ = e
+            except httpx.TransportError as e:
+                record_upstream(upstream, endpoint, "error", time.perf_counter() - started)
+                attempt_span.set("status", "error")
+                error = TransientUpstreamError(upstream, f"{upstream} 연결 실패: {e}")
+                error.__cause__ = e
+            if error is not None:
+                attempt_span.set("error_type", error.kind)
+
+        if error is None:
+            _retry_budget_deposit(upstream)
+            return response
+
+        if not error.retryable or attempt >= UPSTREAM_MAX_RETRIES or not _retry_budget_withdraw(upstream):
+            raise error
+
+        attempt += 1
+        await asyncio.sleep(_backoff_seconds(attempt))
+
+
+async def _attempt(
+    upstream: str,
+    url: str,
+    params: Optional[dict],
+    headers: Optional[dict],
+    timeout: Optional[float],
+    hedge: bool,
+) -> Tuple[httpx.Response, Optional[UpstreamError]]:
+    """요청 1회 시도 (서킷 확인 → 호출량 제한 → 전송/헤징) - (응답, 분류된 오류 또는 None)"""
+    guard = get_host_guard(urlsplit(url).netloc)
+    guard.before_request()
+
+    limiter = get_limiter(upstream)
+    try:
+        await limiter.acquire()
+    except Exception:
+        guard.release_probe()
+        raise
+
+    request = (url, params, headers, guard.timeout(timeout or UPSTREAM_DEFAULT_TIMEOUT))
+    if hedge and HEDGING_ENABLED and guard.state == STATE_CLOSED:
+        return await _hedged_send(upstream, guard, limiter, request)
+    return await _send(upstream, guard, request)
+
+
+async def _send(upstream: str, guard, request: tuple) -> Tuple[httpx.Response, Optional[UpstreamError]]:
+    """
+    요청 1회 전송 + 응답 분류 + 호스트 상태 기록
+
+    공공데이터포털은 일시 오류(코드 01, 04, 05 등)도 HTTP 200 오류 본문으로 돌려주므로
+    상태 코드가 아니라 분류 결과로 실패를 기록하고, 응답 시간은 정상 응답만 기록합니다.
+    """
+    url, params, headers, timeout = request
+    client = get_http_client()
+    started = time.monotonic()
+    try:
+        response = await client.get(url, params=params, headers=headers, timeout=timeout)
+    except httpx.TransportError:
+        guard.record_failure()
+        raise
+    except BaseException:
+        # 취소 등 - 호스트 상태와 무관
+        guard.release_probe()
+        raise
+
+    error = classify_response(upstream, response)
+    if isinstance(error, TransientUpstreamError):
+        guard.record_failure()
+    elif error is None:
+        guard.record_success(time.monotonic() - started)
+    else:
+        # 한도/인증/요청 오류 - 호스트는 응답했지만 응답 시간 표본으로 쓰지 않음
+        guard.record_success(None)
+    return response, error
+
+
+# =============================================================================
+# 재시도 (v3.8 - 일시적 오류만, 백오프 + 지터, 재시도 예산)
+# =============================================================================
+
+# 업스트림별 재시도 예산 (토큰) - 성공마다 적립, 재시도마다 1개 사용
+_retry_tokens: Dict[str, float] = {}
+_retry_stats: Dict[str, int] = {}
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """attempt번째 재시도 전 대기 시간 (지수 백오프, full jitter)"""
+    return random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * (2 ** attempt)))
+
+
+def _retry_budget_deposit(upstream: str) -> None:
+    tokens = _retry_tokens.get(upstream, RETRY_BUDGET_MAX)
+    _retry_tokens[upstream] = min(RETRY_BUDGET_MAX, tokens + RETRY_BUDGET_PER_SUCCESS)
+
+
+def _retry_budget_withdraw(upstream: str) -> bool:
+    """재시도 가능하면 예산 1개 사용"""
+    tokens = _retry_tokens.get(upstream, RETRY_BUDGET_MAX)
+    if tokens < 1:
+        return False
+    _retry_tokens[upstream] = tokens - 1
+    _retry_stats[upstream] = _retry_stats.get(upstream, 0) + 1
+    return True
+
+
+def get_retry_stats() -> dict:
+    """/health용 업스트림별 재시도 횟수/남은 예산"""
+    return {
+        name: {"retries": _retry_stats.get(name, 0), "budget": round(_retry_tokens.get(name, RETRY_BUDGET_MAX), 1)}
+        for name in sorted(set(_retry_stats) | set(_retry_tokens))
+    }
+
+
+# =============================================================================
+# 요청 헤징 (v3.8 - 응답 지연 꼬리 자르기)
+# =============================================================================
+
+# 업스트림별 헤징 통계: {"requests", "hedged", "hedge_wins"}
+_hedge_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _is_success(task: asyncio.Task) -> bool:
+    return (
+        not task.cancelled()
+        and task.exception() is None
+        and not isinstance(task.result()[1], TransientUpstreamError)
+    )
+
+
+async def _hedged_send(
+    upstream: str, guard, limiter, request: tuple
+) -> Tuple[httpx.Response, Optional[UpstreamError]]:
+    """
+    헤징 요청
+
+    호스트 응답 시간의 HEDGE_PERCENTILE 백분위만큼 기다려도 응답이 없으면 같은 요청을 한 번 더 보내고,
+    먼저 성공한 응답을 사용하고 나머지는 취소합니다. 추가 요청은 토큰이 바로 있고
+    헤징 비율이 HEDGE_BUDGET_RATIO 이하일 때만 보냅니다 (호출량 한도 보호).
+    """
+    stats = _hedge_stats.setdefault(upstream, {"requests": 0, "hedged": 0, "hedge_wins": 0})
+    stats["requests"] += 1
+
+    primary = asyncio.ensure_future(_send(upstream, guard, request))
+    delay = guard.hedge_delay(HEDGE_PERCENTILE)
+    if delay is None:
+        return await primary
+
+    done, _ = await asyncio.wait({primary}, timeout=max(delay, HEDGE_MIN_DELAY_SECONDS))
+    if done:
+        return primary.result()
+
+    within_budget = stats["hedged"] < stats["requests"] * HEDGE_BUDGET_RATIO
+    if not within_budget or not limiter.try_acquire():
+        return await primary
+
+    stats["hedged"] += 1
+    secondary = asyncio.ensure_future(_send(upstream, guard, request))
+    pending = {primary, secondary}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in done if _is_success(task)), None)
+            if winner is not None:
+                if winner is secondary:
+                    stats["hedge_wins"] += 1
+                return winner.result()
+        # 둘 다 실패 - 원래 요청의 결과(응답 또는 예외)를 그대로 전달
+        return primary.result()
+    finally:
+        for task in (primary, secondary):
+            if not task.done():
+                task.cancel()
+
+
+def get_hedge_stats() -> dict:
+    """/health용 업스트림별 헤징 통계"""
+    return {name: dict(stats) for name, stats in _hedge_stats.items()}
@@ -0,0 +1,149 @@
+"""
+외부 API 오류 분류 (v3.8)
+
+업스트림 실패를 네 종류로 나눠 재시도/캐시 정책을 정합니다.
+
+| 종류 | 예 | 재시도 | 이전 캐시 값으로 응답 |
+|------|----|--------|----------------------|
+| transient | 타임아웃, 연결 오류, 5xx, 서비스 일시 오류 | O (백오프) | O |
+| quota | 일일 한도 초과 (data.go.kr 22, HTTP 429) | X | O |
+| auth | 서비스 키 미등록/만료 (data.go.kr 20/30/31/32, HTTP 401/403) | X | O |
+| bad_request | 잘못된 파라미터 (data.go.kr 10/11/12, HTTP 400/404) | X | X |
+
+공공데이터포털은 오류를 HTTP 200 + XML 본문(OpenAPI_ServiceResponse)이나
+JSON header.resultCode로 돌려주므로 상태 코드와 본문을 함께 봅니다.
+"""
+
+import re
+from typing import Optional
+
+import httpx
+
+
+ERROR_TRANSIENT = "transient"
+ERROR_QUOTA = "quota"
+ERROR_AUTH = "auth"
+ERROR_BAD_REQUEST = "bad_request"
+
+
+class UpstreamError(Exception):
+    """분류된 외부 API 오류"""
+
+    kind = ERROR_TRANSIENT
+    retryable = False
+
+    def __init__(self, upstream: str, message: str):
+        super().__init__(message)
+        self.upstream = upstream
+
+    @property
+    def serve_stale(self) -> bool:
+        """이전 캐시 값으로 대신 응답해도 되는지"""
+        return self.kind != ERROR_BAD_REQUEST
+
+    def to_error(self) -> dict:
+        """도구 응답용 오류 dict"""
+        return {"error": str(self), "error_type": self.kind}
+
+
+class TransientUpstreamError(UpstreamError):
+    """일시적 오류 - 재시도 대상"""
+
+    kind = ERROR_TRANSIENT
+    retryable = True
+
+
+class QuotaUpstreamError(UpstreamError):
+    """호출 한도 초과"""
+
+    kind = ERROR_QUOTA
+
+
+class AuthUpstreamError(UpstreamError):
+    """인증 실패 (서비스 키)"""
+
+    kind = ERROR_AUTH
+
+
+class BadRequestUpstreamError(UpstreamError):
+    """잘못된 요청"""
+
+    kind = ERROR_BAD_REQUEST
+
+
+# data.go.kr 오류 코드 → 오류 클래스 (미등록 코드는 일시적 오류)
+DATA_GO_KR_CODES = {
+    "01": TransientUpstreamError,   # APPLICATION_ERROR
+    "1": TransientUpstreamError,
+    "02": TransientUpstreamError,   # DB_ERROR
+    "04": TransientUpstreamError,   # HTTP_ERROR
+    "4": TransientUpstreamError,
+    "05": TransientUpstreamError,   # SERVICETIME_OUT
+    "10": BadRequestUpstreamError,  # INVALID_REQUEST_PARAMETER_ERROR
+    "11": BadRequestUpstreamError,  # NO_MANDATORY_REQUEST_PARAMETERS_ERROR
+    "12": BadRequestUpstreamError,  # NO_OPENAPI_SERVICE_ERROR
+    "20": AuthUpstreamError,        # SERVICE_ACCESS_DENIED_ERROR
+    "22": QuotaUpstreamError,       # LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR
+    "30": AuthUpstreamError,        # SERVICE_KEY_IS_NOT_REGISTERED_ERROR
+    "31": AuthUpstreamError,        # DEADLINE_HAS_EXPIRED_ERROR
+    "32": AuthUpstreamError,        # UNREGISTERED_IP_ERROR
+}
+
+# 정상/데이터 없음 (파서가 처리)
+DATA_GO_KR_OK_CODES = {"00", "0", "03", "3"}
+
+_XML_REASON = re.compile(r"<returnReasonCode>\s*(\d+)\s*</returnReasonCode>")
+_XML_MESSAGE = re.compile(r"<returnAuthMsg>\s*([^<]*?)\s*</returnAuthMsg>")
+_JSON_RESULT = re.compile(r'"resultCode"\s*:\s*"(\d+)"')
+_JSON_MESSAGE = re.compile(r'"resultMsg"\s*:\s*"([^"]*)"')
+
+# 본문 앞부분만 확인 (큰 예보 응답 전체를 훑지 않음)
+_BODY_PEEK = 600
+
+
+def classify_response(upstream: str, response: httpx.Response) -> Optional[UpstreamError]:
+    """응답을 확인해 오류면 분류된 UpstreamError, 정상이면 None"""
+    status = response.status_code
+
+    if status >= 500:
+        return TransientUpstreamError(upstream, f"API 호출 실패: HTTP {status}")
+    if status == 429:
+        return QuotaUpstreamError(upstream, f"{upstream} 호출 한도 초과: HTTP 429")
+    if status in (401, 403):
+        return AuthUpstreamError(upstream, f"{upstream} 인증 실패: HTTP {status}")
+    if status >= 400:
+        return BadRequestUpstreamError(upstream, f"API 호출 실패: HTTP {status}")
+
+    head = response.content[:_BODY_PEEK].decode(response.charset_encoding or "utf-8", errors="ignore")
+
+    match = _XML_REASON.search(head)
+    if match:
+        code = match.group(1)
+        message = _XML_MESSAGE.search(head)
+        reason = message.group(1) if message else "SERVICE ERROR"
+        error_class = DATA_GO_KR_CODES.get(code, TransientUpstreamError)
+        return error_class(upstream, f"{upstream} API 오류 ({code}: {reason})")
+
+    match = _JSON_RESULT.search(head)
+    if match and match.group(1) not in DATA_GO_KR_OK_CODES:
+        code = match.group(1)
+        message = _JSON_MESSAGE.search(head)
+        reason = message.group(1) if message else ""
+        error_class = DATA_GO_KR_CODES.get(code, TransientUpstreamError)
+        return error_class(upstream, f"{upstream} API 오류 ({code}: {reason})")
+
+    return None
+
+
+def parse_json(upstream: str, response: httpx.Response):
+    """
+    정상 응답의 JSON 디코드
+
+    Raises:
+        TransientUpstreamError: 본문이 JSON이 아님 (HTTP 200 점검/게이트웨이 HTML 페이지 등)
+    """
+    try:
+        return response.json()
+    except ValueError as e:
+        head = response.content[:100].decode(response.charset_encoding or "utf-8", errors="ignore")
+        raise TransientUpstreamError(upstream, f"{upstream} 응답 JSON 파싱 실패: {head}") from e
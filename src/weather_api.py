@@ -3,7 +3,6 @@
 https://www.data.go.kr/data/15084084/openapi.do
 """
 
-import httpx
 from datetime import datetime, timedelta
 from typing import Optional
 import sys
@@ -13,6 +12,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import api_config, SKY_CODE, PTY_CODE, get_grid_coords
+from src.upstream import upstream_get
+from src.upstream_errors import UpstreamError
 
 
 class WeatherAPI:
@@ -79,26 +80,28 @@ class WeatherAPI:
             "ny": ny,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "kma",
                 f"{self.base_url}/getUltraSrtNcst",
                 params=params,
                 timeout=30.0,
+                hedge=True,
             )
-            # 에러 처리
-            if response.status_code != 200:
-                return {"error": f"API 호출 실패: HTTP {response.status_code}"}
-            try:
-                return self._parse_response(response.json())
-            except Exception as e:
-                return {"error": f"JSON 파싱 실패: {str(e)}, 응답: {response.text[:200]}"}
+        except UpstreamError as e:
+            return e.to_error()
+        try:
+            return self._parse_response(response.json())
+        except Exception as e:
+            return {"error": f"JSON 파싱 실패: {str(e)}, 응답: {response.text[:200]}"}
 
     async def get_short_forecast(
-        self, nx: int, ny: int, num_of_rows: int = 100
+        self, nx: int, ny: int, num_of_rows: int = 1000
     ) -> dict:
         """
         단기예보 조회
         오늘~모레까지의 예보를 조회합니다.
+        (시간당 약 12개 항목 x 최대 3일 → 1000행이면 한 번의 호출로 전체 발표분 수신)
         """
         base_date, base_time = self._get_base_datetime()
 
@@ -113,19 +116,20 @@ class WeatherAPI:
             "ny": ny,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
+        try:
+            response = await upstream_get(
+                "kma",
                 f"{self.base_url}/getVilageFcst",
                 params=params,
                 timeout=30.0,
+                hedge=True,
             )
-            # 에러 처리
-            if response.status_code != 200:
-                return {"error": f"API 호출 실패: HTTP {response.status_code}"}
-            try:
-                return self._parse_forecast_response(response.json())
-            except Exception as e:
-                return {"error": f"JSON 파싱 실패: {str(e)}, 응답: {response.text[:200]}"}
+        except UpstreamError as e:
+            return e.to_error()
+        try:
+            return self._parse_forecast_response(response.json())
+        except Exception as e:
+            return {"error": f"JSON 파싱 실패: {str(e)}, 응답: {response.text[:200]}"}
 
     def _parse_response(self, data: dict) -> dict:
         """초단기실황 응답 파싱"""
@@ -192,10 +196,10 @@ class WeatherAPI:
                     forecasts[key]["humidity"] = int(value)
                 elif category == "WSD":  # 풍속
                     forecasts[key]["wind_speed"] = float(value)
-                elif category == "TMN":  # 최저기온
-                    forecasts[key]["min_temperature"] = int(value)
+                elif category == "TMN":  # 최저기온 (소수점 포함, 예: "8.0")
+                    forecasts[key]["min_temperature"] = int(float(value))
                 elif category == "TMX":  # 최고기온
-                    forecasts[key]["max_temperature"] = int(value)
+                    forecasts[key]["max_temperature"] = int(float(value))
 
             # 리스트로 변환 및 정렬
             forecast_list = sorted(forecasts.values(), key=lambda x: f"{x['date']}{x['time']}")
@@ -219,16 +223,34 @@ async def get_current_weather(location: str) -> dict:
     Returns:
         현재 날씨 정보
     """
-    api = WeatherAPI()
     nx, ny = get_grid_coords(location)
 
+    result = await get_current_weather_at(nx, ny)
+
+    if "error" in result:
+        return result
+
+    return {"location": location, **result}
+
+
+async def get_current_weather_at(nx: int, ny: int) -> dict:
+    """
+    격자 좌표의 현재 날씨 조회 (장소별 날씨용)
+
+    Args:
+        nx, ny: 기상청 격자 좌표
+
+    Returns:
+        현재 날씨 정보
+    """
+    api = WeatherAPI()
+
     current = await api.get_ultra_short_forecast(nx, ny)
 
     if "error" in current:
         return current
 
     return {
-        "location": location,
         "coordinates": {"nx": nx, "ny": ny},
         "current": current,
     }
@@ -278,5 +300,5 @@ async def get_weather_forecast(location: str) -> dict:
             "precipitation_type": current_forecast.get("precipitation_type") if current_forecast else None,
             "precipitation_probability": current_forecast.get("precipitation_probability") if current_forecast else None,
         },
-        "forecasts": forecast["forecasts"][:24],  # 24시간 예보만
+        "forecasts": forecast["forecasts"],  # 오늘~모레 전체 (3일 플래너용)
     }
@@ -0,0 +1,405 @@
+"""
+날씨 스냅샷 빌더 (v3.8)
+
+날씨/예보/미세먼지/생활지수 캐시 데이터를 동시에 모아
+한 번만 정규화한 컴팩트 레코드(WeatherSnapshot)를 만듭니다.
+모든 도구는 이 스냅샷 하나만 입력으로 사용하고, sources로 필요한 소스만 조회합니다
+(예: 미세먼지 도구는 에어코리아만 호출).
+"""
+
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.cache import (
+    cached_async,
+    cached_get_weather,
+    cached_get_forecast,
+    cached_get_air_quality,
+    cached_get_life_index,
+)
+from src.activity_recommender import (
+    WeatherData,
+    calculate_laundry_index,
+    calculate_hiking_index,
+    calculate_picnic_index,
+    calculate_car_wash_index,
+    calculate_exercise_index,
+    calculate_camping_index,
+    calculate_fishing_index,
+    calculate_golf_index,
+    calculate_running_index,
+)
+from src.outfit_recommender import WeatherCondition, AirQualityCondition
+
+
+# 정규화 기본값 (데이터가 없을 때)
+DEFAULT_TEMPERATURE = 20
+DEFAULT_HUMIDITY = 50
+DEFAULT_WIND_SPEED = 2.0
+DEFAULT_SKY = "맑음"
+DEFAULT_PRECIP_TYPE = "없음"
+DEFAULT_PM10 = (50, "보통")  # 점수 계산 전용 - 사용자 응답에는 쓰지 않음
+DEFAULT_PM25 = (25, "보통")
+UNKNOWN_PM_GRADE = "알수없음"
+PM_UNIT = "μg/m³"
+DEFAULT_UV_INDEX = 5
+
+# 스냅샷 데이터 소스
+SOURCE_WEATHER = "weather"
+SOURCE_FORECAST = "forecast"
+SOURCE_AIR = "air"
+SOURCE_LIFE = "life"
+ALL_SOURCES = (SOURCE_WEATHER, SOURCE_FORECAST, SOURCE_AIR, SOURCE_LIFE)
+# 자외선을 쓰지 않는 지수 도구용 (생활지수 API 생략)
+CONDITION_SOURCES = (SOURCE_WEATHER, SOURCE_FORECAST, SOURCE_AIR)
+
+
+def _date_after(days: int) -> str:
+    """오늘로부터 N일 후 날짜 (YYYYMMDD)"""
+    return (datetime.now() + timedelta(days=days)).strftime("%Y%m%d")
+
+
+def _max_rain_prob_on(forecasts: list, date: str) -> Optional[int]:
+    """해당 날짜 시간대별 예보의 최대 강수확률"""
+    probs = [
+        f["precipitation_probability"]
+        for f in forecasts
+        if f.get("date") == date and "precipitation_probability" in f
+    ]
+    return max(probs) if probs else None
+
+
+def _extract_pm(air: dict, key: str) -> Optional[dict]:
+    """측정소/시도 응답 모두에서 pm10/pm25 dict 추출"""
+    data = air.get(key) or air.get("average", {}).get(key)
+    return data if isinstance(data, dict) else None
+
+
+class WeatherSnapshot:
+    """정규화된 날씨 스냅샷 (__slots__ 컴팩트 레코드)"""
+
+    __slots__ = (
+        "location",
+        "built_at",
+        # 현재 날씨
+        "temperature",
+        "humidity",
+        "wind_speed",
+        "precipitation_type",
+        # 예보
+        "rain_prob",
+        "rain_prob_tomorrow",
+        "sky",
+        "temp_min",
+        "temp_max",
+        "today_summary",
+        "forecasts",
+        # 대기질 (pm10/pm25: 측정값 원본 또는 None, *_value/*_grade: 점수 계산용)
+        "pm10",
+        "pm25",
+        "pm10_value",
+        "pm10_grade",
+        "pm25_value",
+        "pm25_grade",
+        "air_station",
+        "air_data_time",
+        # 생활지수
+        "uv_index",
+        "life_indices",
+        # 메타데이터
+        "has_weather",
+        "has_forecast",
+        "has_air",
+        "errors",
+        "data_age",
+        # 지연 생성 뷰 (한 번만 할당)
+        "_weather_data",
+        "_index_weather",
+        "_index_air",
+        "_weather_condition",
+        "_air_condition",
+    )
+
+    def __init__(
+        self,
+        location: str,
+        weather: Optional[dict],
+        forecast: Optional[dict],
+        air: Optional[dict],
+        life: Optional[dict] = None,
+        data_age: Optional[dict] = None,
+    ):
+        """소스 값이 None이면 조회하지 않은 소스 (기본값 사용, 오류로 기록하지 않음)"""
+        self.location = location
+        self.built_at = time.time()
+        self.errors = {}
+
+        # 1. 현재 날씨 (초단기실황)
+        self.has_weather = weather is not None and "error" not in weather
+        weather = weather or {}
+        current = weather.get("current", {}) if self.has_weather else {}
+        if "error" in weather:
+            self.errors["weather"] = weather["error"]
+        self.temperature = current.get("temperature", DEFAULT_TEMPERATURE)
+        self.humidity = current.get("humidity", DEFAULT_HUMIDITY)
+        self.wind_speed = current.get("wind_speed", DEFAULT_WIND_SPEED)
+        self.precipitation_type = current.get("precipitation_type", DEFAULT_PRECIP_TYPE)
+
+        # 2. 예보 (단기예보)
+        self.has_forecast = forecast is not None and "error" not in forecast
+        forecast = forecast or {}
+        summary = (forecast.get("today_summary") or {}) if self.has_forecast else {}
+        if "error" in forecast:
+            self.errors["forecast"] = forecast["error"]
+        self.today_summary = summary
+        self.forecasts = forecast.get("forecasts", []) if self.has_forecast else []
+        self.rain_prob = summary.get("precipitation_probability") or 0
+        # 내일 강수확률: 같은 발표분의 내일 시간대 최대값 (없으면 오늘 것 사용)
+        self.rain_prob_tomorrow = _max_rain_prob_on(self.forecasts, _date_after(1))
+        if self.rain_prob_tomorrow is None:
+            self.rain_prob_tomorrow = self.rain_prob
+        self.sky = summary.get("sky") or DEFAULT_SKY
+        self.temp_min = summary.get("min_temperature")
+        self.temp_max = summary.get("max_temperature")
+
+        # 3. 대기질 (에어코리아)
+        self.has_air = air is not None and "error" not in air
+        air = air or {}
+        if "error" in air:
+            self.errors["air"] = air["error"]
+        if not self.has_air:
+            air = {}
+        self.pm10 = _extract_pm(air, "pm10")
+        self.pm25 = _extract_pm(air, "pm25")
+        pm10 = self.pm10 or {}
+        pm25 = self.pm25 or {}
+        self.pm10_value = pm10.get("value", DEFAULT_PM10[0])
+        self.pm10_grade = pm10.get("grade", DEFAULT_PM10[1])
+        self.pm25_value = pm25.get("value", DEFAULT_PM25[0])
+        self.pm25_grade = pm25.get("grade", DEFAULT_PM25[1])
+        self.air_station = air.get("station_name") or air.get("sido_name")
+        self.air_data_time = air.get("data_time")
+
+        # 4. 생활기상지수
+        self.life_indices = (life or {}).get("indices", {})
+        uv = self.life_indices.get("uv", {})
+        self.uv_index = uv.get("uv_index", DEFAULT_UV_INDEX)
+
+        self.data_age = data_age or {}
+
+        self._weather_data = None
+        self._index_weather = None
+        self._index_air = None
+        self._weather_condition = None
+        self._air_condition = None
+
+    # -------------------------------------------------------------------------
+    # 계산 함수별 입력 뷰 (지연 생성, 스냅샷당 1회만 할당)
+    # -------------------------------------------------------------------------
+
+    def weather_data(self) -> WeatherData:
+        """activity_recommender의 WeatherData 기반 지수용 입력"""
+        if self._weather_data is None:
+            self._weather_data = WeatherData(
+                temperature=self.temperature,
+                humidity=self.humidity,
+                wind_speed=self.wind_speed,
+                rain_prob=self.rain_prob,
+                rain_prob_tomorrow=self.rain_prob_tomorrow,
+                sky=self.sky,
+                pm25_grade=self.pm25_grade,
+                pm25_value=self.pm25_value,
+                uv_index=self.uv_index,
+                temp_min=self.temp_min,
+                temp_max=self.temp_max,
+            )
+        return self._weather_data
+
+    def index_weather(self) -> dict:
+        """dict 기반 지수(편두통, 캠핑, 골프 등)용 weather_data"""
+        if self._index_weather is None:
+            self._index_weather = {
+                "sky": self.sky,
+                "temp_current": self.temperature,
+                "temp_min": self.temp_min,
+                "temp_max": self.temp_max,
+                "humidity": self.humidity,
+                "rain_prob": self.rain_prob,
+                "wind_speed": self.wind_speed,
+                "uv_index": self.uv_index,
+            }
+        return self._index_weather
+
+    def index_air(self) -> dict:
+        """dict 기반 지수용 air_data"""
+        if self._index_air is None:
+            self._index_air = {
+                "pm10_grade": self.pm10_grade,
+                "pm25_grade": self.pm25_grade,
+                "pm10_value": self.pm10_value,
+                "pm25_value": self.pm25_value,
+            }
+        return self._index_air
+
+    def weather_condition(self) -> WeatherCondition:
+        """outfit_recommender용 날씨 조건"""
+        if self._weather_condition is None:
+            self._weather_condition = WeatherCondition(
+                temperature=self.temperature,
+                min_temp=self.temp_min,
+                max_temp=self.temp_max,
+                humidity=self.humidity,
+                wind_speed=self.wind_speed,
+                precipitation_prob=self.rain_prob,
+                precipitation_type=self.precipitation_type,
+                sky=self.sky,
+            )
+        return self._weather_condition
+
+    def air_condition(self) -> AirQualityCondition:
+        """outfit_recommender용 대기질 조건 (측정값이 없는 항목은 -1, '알수없음')"""
+        if self._air_condition is None:
+            pm10 = self.pm10 or {}
+            pm25 = self.pm25 or {}
+            self._air_condition = AirQualityCondition(
+                pm10_value=pm10.get("value", -1),
+                pm10_grade=pm10.get("grade", UNKNOWN_PM_GRADE),
+                pm25_value=pm25.get("value", -1),
+                pm25_grade=pm25.get("grade", UNKNOWN_PM_GRADE),
+            )
+        return self._air_condition
+
+    def pm_view(self, key: str) -> dict:
+        """사용자 응답용 pm10/pm25 (측정값 원본, 단위 포함 - 없으면 value None, '알수없음')"""
+        measured = self.pm10 if key == "pm10" else self.pm25
+        if measured is None:
+            return {"value": None, "grade": UNKNOWN_PM_GRADE}
+        return {"unit": PM_UNIT, **measured}
+
+    @classmethod
+    def from_hourly(cls, base: "WeatherSnapshot", date: str, slots: list) -> "WeatherSnapshot":
+        """
+        시간대별 예보 슬롯으로 파생 스냅샷 생성 (추가 API 호출 없음)
+
+        기온/습도는 평균, 풍속/강수확률은 최대, 하늘상태는 최빈값을 사용합니다.
+        대기질/자외선은 실시간 값을 그대로 사용합니다 (예보 미제공).
+
+        Args:
+            base: 기준 스냅샷 (같은 발표분)
+            date: 예보 날짜 (YYYYMMDD)
+            slots: 해당 시간대의 예보 슬롯 목록
+        """
+        snap = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(snap, name, getattr(base, name))
+
+        temps = [s["temperature"] for s in slots if "temperature" in s]
+        humidities = [s["humidity"] for s in slots if "humidity" in s]
+        winds = [s["wind_speed"] for s in slots if "wind_speed" in s]
+        probs = [s["precipitation_probability"] for s in slots if "precipitation_probability" in s]
+        skies = [s["sky"] for s in slots if s.get("sky")]
+        precip_types = [s["precipitation_type"] for s in slots
+                        if s.get("precipitation_type") not in (None, "없음")]
+
+        if temps:
+            snap.temperature = round(sum(temps) / len(temps), 1)
+        if humidities:
+            snap.humidity = round(sum(humidities) / len(humidities))
+        if winds:
+            snap.wind_speed = max(winds)
+        snap.rain_prob = max(probs) if probs else 0
+        snap.sky = Counter(skies).most_common(1)[0][0] if skies else DEFAULT_SKY
+        snap.precipitation_type = precip_types[0] if precip_types else DEFAULT_PRECIP_TYPE
+
+        day_slots = [f for f in base.forecasts if f.get("date") == date]
+        day_temps = [f["temperature"] for f in day_slots if "temperature" in f]
+        snap.temp_min = next((f["min_temperature"] for f in day_slots if "min_temperature" in f),
+                             min(day_temps) if day_temps else None)
+        snap.temp_max = next((f["max_temperature"] for f in day_slots if "max_temperature" in f),
+                             max(day_temps) if day_temps else None)
+        next_date = (datetime.strptime(date, "%Y%m%d") + timedelta(days=1)).strftime("%Y%m%d")
+        next_prob = _max_rain_prob_on(base.forecasts, next_date)
+        snap.rain_prob_tomorrow = next_prob if next_prob is not None else snap.rain_prob
+
+        snap._weather_data = None
+        snap._index_weather = None
+        snap._index_air = None
+        snap._weather_condition = None
+        snap._air_condition = None
+        return snap
+
+    def age_seconds(self) -> dict:
+        """소스별 데이터 나이 (초) - 스냅샷 생성 이후 경과 시간 포함"""
+        elapsed = time.time() - self.built_at
+        return {
+            source: round(age + elapsed) if age is not None else None
+            for source, age in self.data_age.items()
+        }
+
+
+# 활동명 → 스냅샷 기반 점수 계산 함수
+# (WeatherData 기반 / dict 기반 계산 함수의 입력 차이를 스냅샷 뷰로 흡수)
+ACTIVITY_SCORERS = {
+    "캠핑": lambda snap: calculate_camping_index(snap.index_weather(), snap.index_air()),
+    "피크닉": lambda snap: calculate_picnic_index(snap.weather_data()),
+    "등산": lambda snap: calculate_hiking_index(snap.weather_data()),
+    "빨래": lambda snap: calculate_laundry_index(snap.weather_data()),
+    "세차": lambda snap: calculate_car_wash_index(snap.weather_data()),
+    "운동": lambda snap: calculate_exercise_index(snap.weather_data()),
+    "러닝": lambda snap: calculate_running_index(snap.index_weather(), snap.index_air()),
+    "골프": lambda snap: calculate_golf_index(snap.index_weather(), snap.index_air()),
+    "낚시": lambda snap: calculate_fishing_index(snap.index_weather()),
+}
+
+
+# 소스 → (캐시된 조회 함수, 실패 시 메시지, data_age 키)
+_SOURCE_FETCHERS = {
+    SOURCE_WEATHER: (cached_get_weather, "날씨 조회 실패", "weather"),
+    SOURCE_FORECAST: (cached_get_forecast, "예보 조회 실패", "forecast"),
+    SOURCE_AIR: (cached_get_air_quality, "미세먼지 조회 실패", "air_quality"),
+    SOURCE_LIFE: (cached_get_life_index, None, "life_index"),
+}
+
+
+@cached_async(ttl_seconds=60, shared=False)  # 1분 캐시 (원본 데이터는 각자 TTL로 캐시되고 워커 간 공유됨)
+async def get_weather_snapshot(location: str, sources: tuple = ALL_SOURCES) -> WeatherSnapshot:
+    """
+    날씨 스냅샷 조회
+
+    요청한 소스만 동시에 조회한 뒤 한 번만 정규화합니다.
+    조회하지 않은 소스는 기본값으로 채우고 has_*는 False입니다.
+
+    Args:
+        location: 지역명
+        sources: 조회할 소스 (ALL_SOURCES, CONDITION_SOURCES 또는 SOURCE_* 튜플)
+
+    Returns:
+        WeatherSnapshot
+    """
+    wanted = [source for source in ALL_SOURCES if source in sources]
+    fetched = await asyncio.gather(
+        *(_SOURCE_FETCHERS[source][0](location) for source in wanted),
+        return_exceptions=True,
+    )
+
+    data = dict.fromkeys(ALL_SOURCES)
+    data_age = {}
+    for source, value in zip(wanted, fetched):
+        fetch, failure, age_key = _SOURCE_FETCHERS[source]
+        # 개별 소스 실패는 기본값으로 대체
+        if isinstance(value, Exception):
+            value = {"error": f"{failure}: {value}"} if failure else None
+        data[source] = value
+        data_age[age_key] = fetch.age(location)
+
+    return WeatherSnapshot(
+        location,
+        data[SOURCE_WEATHER],
+        data[SOURCE_FORECAST],
+        data[SOURCE_AIR],
+        data[SOURCE_LIFE],
+        data_age,
+    )
@@ -0,0 +1,178 @@
+"""
+워커 간 캐시 이벤트 버스 (v3.8)
+
+멀티 워커 모드에서 한 워커가 외부 API로 새 데이터(기상청 발표분, 에어코리아 정시 측정값 등)를
+받으면 다른 워커들에게 알려, 각자 외부 API를 다시 호출하지 않고 L1 캐시를 갱신하게 합니다.
+
+외부 브로커 없이 같은 호스트의 Unix 도메인 데이터그램 소켓을 씁니다.
+워커마다 공용 디렉토리(WORKER_BUS_DIR)에 <pid>.sock을 열고, 발행은 디렉토리의 다른 소켓 전체에 보냅니다.
+
+메시지: JSON 헤더 한 줄 + 본문 (본문이 없으면 무효화만)
+- update: 본문은 캐시 항목 (cache_backend.encode_entry) → 받은 워커는 L1에 저장
+- invalidate: 본문이 너무 크면 무효화만 → 받은 워커는 L1에서 지우고 다음 조회 때 공유 백엔드에서 읽음
+"""
+
+import asyncio
+import json
+import os
+import socket
+from pathlib import Path
+from typing import Callable, List, Optional
+
+
+# 워커 공용 소켓 디렉토리 - 비어 있으면 버스 사용 안 함 (main()이 멀티 워커 모드에서 설정)
+WORKER_BUS_DIR = os.getenv("WORKER_BUS_DIR", "")
+
+# 데이터그램 하나에 싣는 최대 본문 (넘으면 무효화만 전송)
+BUS_MAX_PAYLOAD = int(os.getenv("WORKER_BUS_MAX_PAYLOAD", "60000"))
+
+EVENT_UPDATE = "update"
+EVENT_INVALIDATE = "invalidate"
+
+
+class WorkerBus:
+    """Unix 데이터그램 소켓 버스 (워커 1개 = 소켓 1개)"""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.path = self.directory / f"{os.getpid()}-{id(self):x}.sock"
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listeners: List[Callable[[dict, bytes], None]] = []
+
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    def add_listener(self, listener: Callable[[dict, bytes], None]) -> None:
+        """수신 콜백 등록 - listener(헤더 dict, 본문 bytes)"""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """소켓 열고 현재 이벤트 루프에서 수신 시작"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(self.path))
+        sock.setblocking(False)
+        self._sock = sock
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(sock.fileno(), self._on_readable)
+
+    def stop(self) -> None:
+        if self._sock is None:
+            return
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                data = self._sock.recv(BUS_MAX_PAYLOAD + 4096)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            header, _, body = data.partition(b"\n")
+            try:
+                message = json.loads(header)
+            except ValueError:
+                continue
+            self.received += 1
+            for listener in self._listeners:
+                try:
+                    listener(message, body)
+                except Exception:
+                    pass
+
+    def _peers(self) -> List[Path]:
+        return [path for path in self.directory.glob("*.sock") if path != self.path]
+
+    def publish(self, message: dict, body: bytes = b"") -> int:
+        """
+        다른 워커 전체에 전송 (응답을 기다리지 않음)
+
+        본문이 BUS_MAX_PAYLOAD를 넘으면 본문 없이 보냅니다.
+        종료된 워커의 소켓 파일은 지웁니다.
+
+        Returns:
+            전송한 워커 수
+        """
+        if self._sock is None:
+            return 0
+        if len(body) > BUS_MAX_PAYLOAD:
+            message = {**message, "type": EVENT_INVALIDATE}
+            body = b""
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n" + body
+
+        count = 0
+        for peer in self._peers():
+            try:
+                self._sock.sendto(data, str(peer))
+                count += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    peer.unlink()
+                except OSError:
+                    pass
+            except OSError:
+                # 수신 버퍼가 가득 참 등 - 이벤트는 최선 노력
+                self.dropped += 1
+        self.sent += count
+        return count
+
+    def stats(self) -> dict:
+        return {
+            "peers": len(self._peers()),
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
+
+
+_bus: Optional[WorkerBus] = None
+_listeners: List[Callable[[dict, bytes], None]] = []
+
+
+def add_bus_listener(listener: Callable[[dict, bytes], None]) -> None:
+    """버스 수신 콜백 등록 (버스 시작 전에 등록해도 됨)"""
+    _listeners.append(listener)
+    if _bus is not None:
+        _bus.add_listener(listener)
+
+
+def start_worker_bus(directory: Optional[str] = None) -> Optional[WorkerBus]:
+    """WORKER_BUS_DIR이 설정되어 있으면 버스 시작 (lifespan에서 호출)"""
+    global _bus
+    directory = WORKER_BUS_DIR if directory is None else directory
+    if not directory or _bus is not None:
+        return _bus
+    bus = WorkerBus(Path(directory))
+    for listener in _listeners:
+        bus.add_listener(listener)
+    bus.start()
+    _bus = bus
+    return bus
+
+
+def stop_worker_bus() -> None:
+    global _bus
+    if _bus is not None:
+        _bus.stop()
+        _bus = None
+
+
+def publish(message: dict, body: bytes = b"") -> int:
+    """버스가 켜져 있으면 다른 워커에 전송"""
+    if _bus is None:
+        return 0
+    return _bus.publish(message, body)
+
+
+def get_bus_stats() -> Optional[dict]:
+    """/health용 버스 통계 (꺼져 있으면 None)"""
+    return _bus.stats() if _bus is not None else None
@@ -0,0 +1,267 @@
+"""
+도구 벤치마크 - 녹화 응답 재생 (v3.8)
+
+mcp_test_agent.py는 배포된 서버를 호출해 네트워크/실제 API 상태에 따라 결과가 바뀝니다.
+이 벤치마크는 모든 MCP 도구를 프로세스 안에서(fastmcp Client, 미들웨어/직렬화 포함) 호출하고,
+외부 API는 녹화 응답 재생(tests/upstream_replay.py) + 주입 지연으로 대신해 매번 같은 조건으로 측정합니다.
+
+도구별 측정값:
+- cold: 캐시를 비운 뒤 호출한 지연 분포 (p50/p95/max), 호출당 외부 API 호출 수
+- warm: 바로 이어서 같은 호출 (캐시 적중) 지연 p50
+- alloc_peak_kb: cold 호출 1회의 최대 메모리 할당 (tracemalloc)
+
+기준선(tests/fixtures/bench_baseline.json)과 비교해 회귀가 있으면 종료 코드 1 (CI용):
+외부 호출 수/오류 수는 늘면 바로 회귀, 지연/할당은 허용 비율 + 여유값을 넘으면 회귀입니다.
+도구 예외(exceptions)는 기준선과 관계없이 1건이라도 있으면 회귀입니다 (기준선 갱신도 거부).
+
+실행:
+    python -m tests.bench_tools
+    python -m tests.bench_tools --iterations 20 --latency kma=80,airkorea=60,life_index=40,kakao=30
+    python -m tests.bench_tools --update-baseline
+    python -m tests.bench_tools --record    # 실제 API로 녹화 응답 갱신 (API 키 필요)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.upstream_replay import FIXTURE_DIR, RecordingTransport, ReplayTransport, parse_latency
+
+
+BASELINE_PATH = Path(__file__).parent / "fixtures" / "bench_baseline.json"
+
+DEFAULT_LATENCY = "kma=40,airkorea=30,life_index=20,kakao=15"
+
+# 도구별 호출 인자 (없는 도구는 기본값으로 호출)
+TOOL_ARGUMENTS = {
+    "search_nearby_places": {"keyword": "카페", "location": "강남"},
+    "get_directions_link": {"origin": "강남역", "destination": "서울역"},
+    "search_restaurant": {"location": "강남"},
+    "get_place_recommendation": {"location": "강남", "situation": "데이트"},
+    "get_smart_course": {"location": "강남", "situation": "데이트"},
+    "compare_activities": {"location": "서울", "activity1": "캠핑", "activity2": "피크닉"},
+}
+
+# 회귀 판정 여유값 (작은 값의 흔들림은 무시)
+LATENCY_SLACK_MS = 10.0
+ALLOC_SLACK_KB = 64.0
+
+
+def _configure_environment(record: bool) -> None:
+    """src 모듈을 불러오기 전에 환경 설정 (모듈 로드 시 읽는 설정들)"""
+    os.environ["UPSTREAM_HEDGING"] = "false"  # 헤징은 지연에 따라 호출 수가 달라짐
+    os.environ["CACHE_BACKEND"] = "memory"
+    os.environ["TRACE_SAMPLE_RATE"] = "0"
+    os.environ["QUOTA_LEDGER_PATH"] = str(Path(tempfile.mkdtemp(prefix="wlm-bench-")) / "quota.json")
+    for name in ("KMA", "AIRKOREA", "LIFE_INDEX", "KAKAO"):
+        os.environ[f"UPSTREAM_{name}_RATE"] = "100000"
+        os.environ[f"UPSTREAM_{name}_BURST"] = "100000"
+        os.environ[f"UPSTREAM_{name}_DAILY_QUOTA"] = "1000000000"
+    if not record:
+        # 재생은 인증키를 보지 않지만, 키가 없으면 호출 자체를 건너뛰는 코드가 있음
+        for key in ("WEATHER_API_KEY", "AIR_QUALITY_API_KEY", "KAKAO_REST_API_KEY"):
+            os.environ.setdefault(key, "bench-replay-key")
+
+
+def percentile(values: list, p: float) -> float:
+    """최근접 순위 백분위"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def _is_error(result) -> bool:
+    """도구가 오류 응답({"error": ...})을 돌려줌 (녹화에 없는 데이터 등 - 기준선과 비교)"""
+    content = result.structured_content
+    return isinstance(content, dict) and "error" in content
+
+
+async def bench_tool(client, transport: ReplayTransport, name: str, arguments: dict, iterations: int) -> dict:
+    """도구 하나 측정"""
+    from src.cache import clear_all_caches
+
+    cold, warm = [], []
+    upstream_calls = Counter()
+    warm_calls = 0
+    errors = 0
+    exceptions = 0
+    for _ in range(iterations):
+        clear_all_caches()
+        transport.reset_counts()
+        started = time.perf_counter()
+        result = await client.call_tool(name, arguments, raise_on_error=False)
+        cold.append((time.perf_counter() - started) * 1000)
+        # is_error: 도구 안에서 예외 발생 (버그)
+        exceptions += result.is_error
+        errors += not result.is_error and _is_error(result)
+        calls = Counter()
+        for (upstream, _), count in transport.calls.items():
+            calls[upstream] += count
+        if sum(calls.values()) > sum(upstream_calls.values()):
+            upstream_calls = calls
+
+        transport.reset_counts()
+        started = time.perf_counter()
+        await client.call_tool(name, arguments, raise_on_error=False)
+        warm.append((time.perf_counter() - started) * 1000)
+        warm_calls = max(warm_calls, sum(transport.calls.values()))
+
+    # 할당 - 측정 부담이 커서 지연 측정과 따로 1회
+    clear_all_caches()
+    tracemalloc.start()
+    await client.call_tool(name, arguments, raise_on_error=False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "cold_p50_ms": round(percentile(cold, 50), 2),
+        "cold_p95_ms": round(percentile(cold, 95), 2),
+        "cold_max_ms": round(max(cold), 2),
+        "warm_p50_ms": round(percentile(warm, 50), 2),
+        "upstream_calls": sum(upstream_calls.values()),
+        "upstream_calls_by_api": dict(sorted(upstream_calls.items())),
+        "warm_upstream_calls": warm_calls,
+        "alloc_peak_kb": round(peak / 1024, 1),
+        "errors": errors,
+        "exceptions": exceptions,
+    }
+
+
+async def run_benchmark(iterations: int, latency: str, jitter_ms: float, tools=None, record: bool = False) -> dict:
+    """모든(또는 지정한) 도구 측정 결과"""
+    from fastmcp import Client
+    from src.server import mcp
+    from src.upstream import set_http_transport
+
+    if record:
+        transport = RecordingTransport(FIXTURE_DIR)
+        iterations = 1
+    else:
+        transport = ReplayTransport(FIXTURE_DIR, parse_latency(latency), jitter_ms)
+    set_http_transport(transport)
+
+    results = {}
+    async with Client(mcp) as client:
+        names = [tool.name for tool in await client.list_tools()]
+        for name in names:
+            if tools and name not in tools:
+                continue
+            arguments = TOOL_ARGUMENTS.get(name, {})
+            if record:
+                await client.call_tool(name, arguments, raise_on_error=False)
+                continue
+            results[name] = await bench_tool(client, transport, name, arguments, iterations)
+
+    set_http_transport(None)
+    return {
+        "settings": {"iterations": iterations, "latency": latency, "jitter_ms": jitter_ms},
+        "missing_fixtures": dict(transport.missing) if not record else {},
+        "tools": results,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, latency_tolerance: float, alloc_tolerance: float) -> list:
+    """기준선 대비 회귀 목록 (빈 목록이면 통과)"""
+    regressions = []
+    for name, base in baseline.get("tools", {}).items():
+        current = report["tools"].get(name)
+        if current is None:
+            regressions.append(f"{name}: 측정 결과 없음")
+            continue
+        if current["upstream_calls"] > base["upstream_calls"]:
+            regressions.append(f"{name}: 외부 호출 {base['upstream_calls']} → {current['upstream_calls']}")
+        if current["warm_upstream_calls"] > base.get("warm_upstream_calls", 0):
+            regressions.append(f"{name}: 캐시 적중 시 외부 호출 {current['warm_upstream_calls']}")
+        if current.get("exceptions"):
+            regressions.append(f"{name}: 도구 예외 {current['exceptions']}건")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: 오류 {base['errors']} → {current['errors']}")
+        for key in ("cold_p50_ms", "warm_p50_ms"):
+            limit = base[key] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+            if current[key] > limit:
+                regressions.append(f"{name}: {key} {base[key]} → {current[key]} (한도 {limit:.1f})")
+        limit = base["alloc_peak_kb"] * (1 + alloc_tolerance) + ALLOC_SLACK_KB
+        if current["alloc_peak_kb"] > limit:
+            regressions.append(
+                f"{name}: alloc_peak_kb {base['alloc_peak_kb']} → {current['alloc_peak_kb']} (한도 {limit:.1f})"
+            )
+    return regressions
+
+
+def print_report(report: dict) -> None:
+    settings = report["settings"]
+    print(f"반복 {settings['iterations']}회, 주입 지연 {settings['latency']} (+0~{settings['jitter_ms']}ms)")
+    print(f"{'도구':<32} {'cold p50':>9} {'p95':>8} {'max':>8} {'warm p50':>9} {'외부 호출':>9} {'할당 KB':>9} {'오류':>4} {'예외':>4}")
+    for name, r in report["tools"].items():
+        print(
+            f"{name:<32} {r['cold_p50_ms']:>9.1f} {r['cold_p95_ms']:>8.1f} {r['cold_max_ms']:>8.1f} "
+            f"{r['warm_p50_ms']:>9.2f} {r['upstream_calls']:>9} {r['alloc_peak_kb']:>9.1f} {r['errors']:>4} {r.get('exceptions', 0):>4}"
+        )
+    if report["missing_fixtures"]:
+        print(f"녹화 없는 엔드포인트: {report['missing_fixtures']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCP 도구 벤치마크 (녹화 응답 재생)")
+    parser.add_argument("--iterations", type=int, default=5, help="도구별 반복 횟수")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="업스트림별 주입 지연 (ms), 예: kma=80,kakao=30 또는 50")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 흔들림 최대값 (ms)")
+    parser.add_argument("--tools", default="", help="측정할 도구 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5, help="지연 허용 증가 비율")
+    parser.add_argument("--alloc-tolerance", type=float, default=0.25, help="할당 허용 증가 비율")
+    parser.add_argument("--output", default="", help="결과 JSON 저장 경로")
+    parser.add_argument("--record", action="store_true", help="실제 API 응답을 녹화 (API 키 필요)")
+    args = parser.parse_args()
+
+    _configure_environment(args.record)
+    tools = {name.strip() for name in args.tools.split(",") if name.strip()}
+    report = asyncio.run(run_benchmark(args.iterations, args.latency, args.jitter, tools, args.record))
+
+    if args.record:
+        print(f"녹화 완료: {FIXTURE_DIR}")
+        return
+
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    failing = [name for name, r in report["tools"].items() if r.get("exceptions")]
+    baseline_path = Path(args.baseline)
+    if args.update_baseline and failing:
+        print(f"도구 예외가 있어 기준선을 저장하지 않습니다: {', '.join(failing)}")
+        sys.exit(1)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"기준선 저장: {baseline_path}")
+        return
+    if not baseline_path.is_file():
+        print("기준선 없음 - --update-baseline으로 만드세요")
+        return
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline.get("settings") != report["settings"]:
+        print(f"주의: 기준선 설정이 다릅니다 ({baseline.get('settings')})")
+    regressions = compare_to_baseline(report, baseline, args.latency_tolerance, args.alloc_tolerance)
+    if regressions:
+        print("회귀:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("기준선 대비 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
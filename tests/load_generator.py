@@ -0,0 +1,396 @@
+"""
+/mcp 부하 생성기 (v3.8)
+
+mcp_test_agent.py는 도구를 하나씩 순서대로 호출하므로 동시 요청에서의 처리량/지연/회귀를 볼 수 없습니다.
+에이전트가 실제로 부르는 순서(날씨 → 옷차림 → 외출 판단 → 장소 추천 등)를 시나리오로 묶어
+가중치대로 섞어 동시에 재생하고, 파드 크기 산정과 동시성 회귀 확인에 필요한 값을 보고합니다.
+
+부하 방식:
+- 목표 RPS (--rps): 초당 도구 호출 수가 목표에 맞도록 시나리오를 푸아송 도착으로 시작 (열린 부하)
+- 동시성 증가 (--concurrency, --ramp): 가상 사용자를 ramp초 동안 1명에서 N명까지 늘려 각자 시나리오 반복 (닫힌 부하)
+
+보고:
+- 처리량 (도구 호출/초), 구간별 진행 (활성 사용자, RPS, p95, 오류)
+- 도구별 호출 수, p50/p95/p99/max 지연, 오류율
+- 외부 API 호출 증폭 (외부 호출 수 / 도구 호출 수) - 서버 /metrics 또는 시뮬레이터 /_sim/stats 전후 차이
+
+실행:
+    python -m tests.load_generator --url http://localhost:8000 --rps 20 --duration 60
+    python -m tests.load_generator --concurrency 50 --ramp 30 --duration 90 --simulator http://127.0.0.1:8900
+    python -m tests.load_generator --mix outing=1 --rps 5 --duration 30 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tests.bench_tools import percentile
+
+
+LOCATIONS = ("서울", "강남", "홍대", "부산", "해운대", "대구", "인천", "광주", "대전", "수원", "제주")
+SITUATIONS = ("데이트", "혼자", "친구", "가족")
+KEYWORDS = ("카페", "맛집", "공원", "서점")
+
+REQUEST_TIMEOUT_SECONDS = 30.0
+DEFAULT_REPORT_INTERVAL = 5.0
+
+
+def _outing(rng: random.Random) -> List[Tuple[str, dict]]:
+    """외출 준비: 날씨 → 옷차림 → 외출 판단 → 장소 추천"""
+    location = rng.choice(LOCATIONS)
+    return [
+        ("get_weather", {"location": location}),
+        ("get_outfit_recommendation_tool", {"location": location}),
+        ("should_i_go_out", {"location": location}),
+        ("get_place_recommendation", {"location": location, "situation": rng.choice(SITUATIONS)}),
+    ]
+
+
+def _quick_weather(rng: random.Random) -> List[Tuple[str, dict]]:
+    """날씨만 확인"""
+    return [("get_weather", {"location": rng.choice(LOCATIONS), "detail": rng.choice(("compact", "normal"))})]
+
+
+def _air_check(rng: random.Random) -> List[Tuple[str, dict]]:
+    """미세먼지 확인 → 외출 판단"""
+    location = rng.choice(LOCATIONS)
+    return [("get_air_quality_info", {"location": location}), ("should_i_go_out", {"location": location})]
+
+
+def _picnic(rng: random.Random) -> List[Tuple[str, dict]]:
+    """피크닉 판단 → 주변 검색"""
+    location = rng.choice(LOCATIONS)
+    return [
+        ("get_weather", {"location": location}),
+        ("is_good_for_picnic", {"location": location}),
+        ("search_nearby_places", {"keyword": rng.choice(KEYWORDS), "location": location}),
+    ]
+
+
+def _weekend_plan(rng: random.Random) -> List[Tuple[str, dict]]:
+    """주말 계획: 3일 예보 → 활동 계획 → 코스 추천"""
+    location = rng.choice(LOCATIONS)
+    return [
+        ("get_weekly_forecast", {"location": location}),
+        ("plan_activities_3days", {"location": location}),
+        ("get_smart_course", {"location": location, "situation": rng.choice(SITUATIONS)}),
+    ]
+
+
+# 시나리오 → (단계 생성 함수, 기본 가중치)
+SCENARIOS = {
+    "outing": (_outing, 4),
+    "quick_weather": (_quick_weather, 3),
+    "air_check": (_air_check, 2),
+    "picnic": (_picnic, 2),
+    "weekend_plan": (_weekend_plan, 1),
+}
+
+_METRIC_LINE = re.compile(r'^upstream_responses_total\{upstream="([^"]*)",endpoint="[^"]*",status="[^"]*"\} (\d+)', re.M)
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"outing=4,quick_weather=1" → 가중치 (빈 값이면 기본 가중치)"""
+    if not spec:
+        return {name: weight for name, (_, weight) in SCENARIOS.items()}
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"알 수 없는 시나리오: {name} (가능: {', '.join(SCENARIOS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def upstream_calls_from_metrics(text: str) -> Counter:
+    """/metrics 텍스트 → 업스트림별 응답 수 (시도 수)"""
+    calls = Counter()
+    for upstream, count in _METRIC_LINE.findall(text):
+        calls[upstream] += int(count)
+    return calls
+
+
+class LoadStats:
+    """도구 호출 결과 집계"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()  # 도구 → 오류 수
+        self.error_kinds: Counter = Counter()  # 오류 종류 → 수
+        self.scenarios: Counter = Counter()
+        self._window: List[Tuple[float, bool]] = []  # 보고 구간의 (지연 ms, 오류)
+
+    def record(self, tool: str, latency_ms: float, error: Optional[str]) -> None:
+        self.latencies[tool].append(latency_ms)
+        self._window.append((latency_ms, error is not None))
+        if error is not None:
+            self.errors[tool] += 1
+            self.error_kinds[error] += 1
+
+    def drain_window(self) -> List[Tuple[float, bool]]:
+        window, self._window = self._window, []
+        return window
+
+    def total_calls(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+
+    def by_tool(self) -> dict:
+        report = {}
+        for tool, values in sorted(self.latencies.items()):
+            report[tool] = {
+                "calls": len(values),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "max_ms": round(max(values), 1),
+                "error_rate": round(self.errors[tool] / len(values), 4),
+            }
+        return report
+
+
+def classify_result(status_code: int, payload) -> Optional[str]:
+    """JSON-RPC 응답 → 오류 종류 (정상이면 None)"""
+    if status_code != 200:
+        return f"http_{status_code}"
+    if not isinstance(payload, dict):
+        return "invalid_response"
+    if "error" in payload:
+        return "jsonrpc_error"
+    result = payload.get("result", {})
+    if result.get("isError"):
+        return "tool_exception"
+    structured = result.get("structuredContent")
+    if isinstance(structured, dict) and "error" in structured:
+        return structured.get("error_type", "tool_error")
+    return None
+
+
+class LoadGenerator:
+    """시나리오 재생 + 집계"""
+
+    def __init__(self, url: str, mix: Dict[str, float], seed: int = 0, think_time: float = 0.0):
+        """
+        Args:
+            url: 서버 주소 (…/mcp 생략 가능)
+            mix: 시나리오 가중치
+            seed: 시나리오 선택/인자 난수 시드
+            think_time: 시나리오 단계 사이 대기 (초, 에이전트가 응답을 읽는 시간)
+        """
+        self.endpoint = url.rstrip("/") if url.rstrip("/").endswith("/mcp") else url.rstrip("/") + "/mcp"
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.rng = random.Random(seed)
+        self.think_time = think_time
+        self.stats = LoadStats()
+        self.active = 0
+        self._request_id = 0
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def mean_steps(self) -> float:
+        """시나리오 하나의 평균 도구 호출 수 (가중 평균)"""
+        total = sum(self.weights)
+        sample = random.Random(0)
+        return sum(
+            weight * len(SCENARIOS[name][0](sample)) for name, weight in zip(self.names, self.weights)
+        ) / total
+
+    async def call_tool(self, tool: str, arguments: dict) -> None:
+        self._request_id += 1
+        payload = {
+            "jsonrpc": "2.0",
+            "id": self._request_id,
+            "method": "tools/call",
+            "params": {"name": tool, "arguments": arguments},
+        }
+        started = time.perf_counter()
+        try:
+            response = await self._client.post(self.endpoint, json=payload)
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            error = classify_result(response.status_code, body)
+        except httpx.TimeoutException:
+            error = "timeout"
+        except httpx.HTTPError:
+            error = "connection_error"
+        self.stats.record(tool, (time.perf_counter() - started) * 1000, error)
+
+    async def run_scenario(self) -> None:
+        name = self.rng.choices(self.names, self.weights)[0]
+        self.stats.scenarios[name] += 1
+        self.active += 1
+        try:
+            for index, (tool, arguments) in enumerate(SCENARIOS[name][0](self.rng)):
+                if index and self.think_time:
+                    await asyncio.sleep(self.think_time)
+                await self.call_tool(tool, arguments)
+        finally:
+            self.active -= 1
+
+    async def _open_loop(self, rps: float, duration: float) -> None:
+        """목표 RPS - 시나리오를 푸아송 도착으로 시작 (이전 시나리오를 기다리지 않음)"""
+        arrival_rate = rps / self.mean_steps()
+        tasks = set()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            task = asyncio.create_task(self.run_scenario())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.sleep(self.rng.expovariate(arrival_rate))
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _closed_loop(self, concurrency: int, ramp: float, duration: float) -> None:
+        """동시성 증가 - 가상 사용자를 ramp초 동안 늘리고, 각자 시나리오를 끝날 때까지 반복"""
+        deadline = time.perf_counter() + duration
+
+        async def user(start_delay: float):
+            await asyncio.sleep(start_delay)
+            while time.perf_counter() < deadline:
+                await self.run_scenario()
+
+        delays = [ramp * index / max(concurrency - 1, 1) if ramp else 0.0 for index in range(concurrency)]
+        await asyncio.gather(*(user(delay) for delay in delays))
+
+    async def _report_progress(self, interval: float, started: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            window = self.stats.drain_window()
+            latencies = [latency for latency, _ in window]
+            errors = sum(error for _, error in window)
+            print(
+                f"  {time.perf_counter() - started:6.0f}s  활성 {self.active:4d}  "
+                f"{len(window) / interval:7.1f} req/s  p95 {percentile(latencies, 95):8.1f}ms  오류 {errors}",
+                flush=True,
+            )
+
+    async def run(
+        self,
+        duration: float,
+        rps: float = 0.0,
+        concurrency: int = 0,
+        ramp: float = 0.0,
+        report_interval: float = DEFAULT_REPORT_INTERVAL,
+    ) -> float:
+        """부하 실행, 실제 걸린 시간 (초)"""
+        limits = httpx.Limits(max_connections=max(concurrency, int(rps * 2), 10), max_keepalive_connections=None)
+        async with httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            limits=limits,
+            headers={"Accept": "application/json, text/event-stream"},
+        ) as client:
+            self._client = client
+            started = time.perf_counter()
+            progress = asyncio.create_task(self._report_progress(report_interval, started)) if report_interval else None
+            try:
+                if rps:
+                    await self._open_loop(rps, duration)
+                else:
+                    await self._closed_loop(concurrency, ramp, duration)
+            finally:
+                if progress:
+                    progress.cancel()
+            return time.perf_counter() - started
+
+
+async def fetch_upstream_calls(client: httpx.AsyncClient, base_url: str, simulator: str) -> Optional[Counter]:
+    """업스트림별 누적 호출 수 (시뮬레이터 /_sim/stats 우선, 없으면 서버 /metrics)"""
+    try:
+        if simulator:
+            response = await client.get(simulator.rstrip("/") + "/_sim/stats")
+            return Counter(response.json()["calls"])
+        response = await client.get(base_url.rstrip("/").removesuffix("/mcp") + "/metrics")
+        return upstream_calls_from_metrics(response.text) if response.status_code == 200 else None
+    except (httpx.HTTPError, ValueError, KeyError):
+        return None
+
+
+def build_report(generator: LoadGenerator, elapsed: float, upstream: Optional[Counter], settings: dict) -> dict:
+    total = generator.stats.total_calls()
+    errors = sum(generator.stats.errors.values())
+    report = {
+        "settings": settings,
+        "elapsed_s": round(elapsed, 2),
+        "tool_calls": total,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "error_kinds": dict(generator.stats.error_kinds.most_common()),
+        "scenarios": dict(generator.stats.scenarios),
+        "tools": generator.stats.by_tool(),
+    }
+    if upstream is not None:
+        report["upstream_calls"] = dict(upstream)
+        report["upstream_amplification"] = round(sum(upstream.values()) / total, 3) if total else 0.0
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n도구 호출 {report['tool_calls']}회 / {report['elapsed_s']}s = {report['throughput_rps']} req/s, "
+        f"오류율 {report['error_rate'] * 100:.2f}%"
+    )
+    if report["error_kinds"]:
+        print(f"오류 종류: {report['error_kinds']}")
+    print(f"{'도구':<32} {'호출':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'오류율':>7}")
+    for name, r in report["tools"].items():
+        print(
+            f"{name:<32} {r['calls']:>6} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['max_ms']:>8.1f} {r['error_rate'] * 100:>6.2f}%"
+        )
+    if "upstream_amplification" in report:
+        print(f"외부 API 호출 {report['upstream_calls']} → 도구 호출당 {report['upstream_amplification']}회")
+    else:
+        print("외부 API 호출 수 확인 불가 (/metrics 또는 --simulator 필요)")
+
+
+async def main_async(args) -> dict:
+    generator = LoadGenerator(args.url, parse_mix(args.mix), seed=args.seed, think_time=args.think_time)
+    settings = {
+        "mode": "rps" if args.rps else "concurrency",
+        "rps": args.rps, "concurrency": args.concurrency, "ramp_s": args.ramp,
+        "duration_s": args.duration, "mix": dict(zip(generator.names, generator.weights)),
+    }
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        before = await fetch_upstream_calls(client, args.url, args.simulator)
+        print(f"부하 시작: {generator.endpoint} ({settings['mode']}), 시나리오 평균 {generator.mean_steps():.1f}단계", flush=True)
+        elapsed = await generator.run(args.duration, args.rps, args.concurrency, args.ramp, args.report_interval)
+        after = await fetch_upstream_calls(client, args.url, args.simulator)
+    upstream = after - before if before is not None and after is not None else None
+    return build_report(generator, elapsed, upstream, settings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/mcp 부하 생성기 (시나리오 혼합)")
+    parser.add_argument("--url", default="http://localhost:8000", help="서버 주소")
+    parser.add_argument("--rps", type=float, default=0.0, help="목표 도구 호출 수/초 (열린 부하)")
+    parser.add_argument("--concurrency", type=int, default=10, help="가상 사용자 수 (--rps 없을 때)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="가상 사용자를 늘리는 시간 (초)")
+    parser.add_argument("--duration", type=float, default=60.0, help="부하 시간 (초)")
+    parser.add_argument("--mix", default="", help=f"시나리오 가중치, 예: outing=4,quick_weather=1 (가능: {', '.join(SCENARIOS)})")
+    parser.add_argument("--think-time", type=float, default=0.0, help="시나리오 단계 사이 대기 (초)")
+    parser.add_argument("--simulator", default="", help="외부 API 시뮬레이터 주소 (외부 호출 수를 /_sim/stats에서 집계)")
+    parser.add_argument("--report-interval", type=float, default=DEFAULT_REPORT_INTERVAL, help="진행 출력 간격 (초, 0이면 끔)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
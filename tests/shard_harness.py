@@ -0,0 +1,211 @@
+"""
+캐시 샤딩 비교 하네스 (v3.8)
+
+로컬에서 캐시 노드 프로세스 K개(Redis 프로토콜 대역, 노드당 LRU 용량 제한)와
+파드 프로세스 K개를 띄워 같은 요청 흐름을 두 방식으로 재생합니다.
+
+- replicated: 파드마다 자기 노드만 사용 (모든 노드가 같은 셀을 각자 캐시)
+- sharded: 모든 파드가 일관된 해싱 링으로 셀 담당 노드를 사용 (cache_ring.ShardedBackend)
+
+캐시에 없으면 외부 API 호출로 보고 세어, 적중률과 외부 호출 수를 비교합니다.
+중간에 노드를 하나 추가해 재배치(이전 담당 노드에서 옮겨 담기)도 확인합니다.
+
+실행:
+    python -m tests.shard_harness --nodes 4 --cells 2000 --capacity 300 --requests 4000
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.cache_backend import RedisBackend, encode_entry, read_reply
+from src.cache_ring import ShardedBackend
+
+
+# =============================================================================
+# 캐시 노드 (Redis 프로토콜 대역, LRU 용량 제한)
+# =============================================================================
+
+
+def _serve_node(port: int, capacity: int, ready) -> None:
+    """GET / SET / DEL만 지원하는 LRU 노드 (프로세스 진입점)"""
+    store = OrderedDict()
+
+    async def handle(reader, writer):
+        while True:
+            try:
+                command = await read_reply(reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                break
+            name = command[0].upper()
+            if name == b"GET":
+                value = store.get(command[1])
+                if value is None:
+                    writer.write(b"$-1\r\n")
+                else:
+                    store.move_to_end(command[1])
+                    writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+            elif name == b"SET":
+                store[command[1]] = command[2]
+                store.move_to_end(command[1])
+                while len(store) > capacity:
+                    store.popitem(last=False)
+                writer.write(b"+OK\r\n")
+            elif name == b"DEL":
+                writer.write(b":%d\r\n" % int(store.pop(command[1], None) is not None))
+            else:
+                writer.write(b"-ERR unknown command\r\n")
+            await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", port)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(main())
+
+
+# =============================================================================
+# 파드 (요청 재생)
+# =============================================================================
+
+
+def _cell_stream(cells: int, requests: int, seed: int, skew: float):
+    """인기 셀에 몰리는 요청 흐름 (Zipf 형태)"""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) ** skew for rank in range(cells)]
+    return [f"grid:{i}" for i in rng.choices(range(cells), weights=weights, k=requests)]
+
+
+async def _replay(backend, stream) -> dict:
+    hits = upstream_calls = 0
+    for cell in stream:
+        key = f"cached_get_weather:{cell}"
+        if await backend.get(key, cell) is not None:
+            hits += 1
+            continue
+        upstream_calls += 1
+        await backend.set(key, encode_entry({"cell": cell}, time.time(), time.time() + 300), 600, cell)
+    return {"hits": hits, "upstream_calls": upstream_calls}
+
+
+def _run_pod(mode: str, pod: int, nodes: dict, stream, results) -> None:
+    """파드 프로세스 진입점"""
+    if mode == "replicated":
+        name = sorted(nodes)[pod % len(nodes)]
+        backend = RedisBackend(nodes[name], timeout=2.0)
+    else:
+        backend = ShardedBackend(nodes, backend_factory=lambda url: RedisBackend(url, timeout=2.0))
+    results.put(asyncio.run(_replay(backend, stream)))
+
+
+def _start_nodes(count: int, capacity: int, base_port: int):
+    ctx = multiprocessing.get_context("spawn")
+    processes, nodes = [], {}
+    for i in range(count):
+        ready = ctx.Event()
+        port = base_port + i
+        process = ctx.Process(target=_serve_node, args=(port, capacity, ready), daemon=True)
+        process.start()
+        ready.wait(10)
+        processes.append(process)
+        nodes[f"node-{i}"] = f"redis://127.0.0.1:{port}/0"
+    return processes, nodes
+
+
+def run_mode(mode: str, args, base_port: int) -> dict:
+    """한 방식으로 노드/파드를 띄워 재생하고 합계 반환"""
+    ctx = multiprocessing.get_context("spawn")
+    node_processes, nodes = _start_nodes(args.nodes, args.capacity, base_port)
+    results = ctx.Queue()
+    try:
+        # 두 바퀴: 첫 바퀴로 캐시를 채우고 두 번째 바퀴를 측정
+        totals = {"hits": 0, "upstream_calls": 0}
+        for round_ in range(2):
+            pods = [
+                ctx.Process(
+                    target=_run_pod,
+                    args=(mode, pod, nodes, _cell_stream(args.cells, args.requests, pod * 7 + round_, args.skew), results),
+                )
+                for pod in range(args.nodes)
+            ]
+            for p in pods:
+                p.start()
+            outputs = [results.get(timeout=120) for _ in pods]
+            for p in pods:
+                p.join()
+            if round_ == 1:
+                for output in outputs:
+                    totals["hits"] += output["hits"]
+                    totals["upstream_calls"] += output["upstream_calls"]
+        requests = totals["hits"] + totals["upstream_calls"]
+        totals["hit_rate"] = round(totals["hits"] / requests, 3) if requests else 0.0
+        return totals
+    finally:
+        for process in node_processes:
+            process.terminate()
+            process.join()
+
+
+async def _rebalance_check(nodes: dict, extra: dict, cells: int) -> dict:
+    """노드 추가 후 이동한 셀이 이전 담당 노드에서 옮겨 담기는지 확인"""
+    backend = ShardedBackend(nodes, backend_factory=lambda url: RedisBackend(url, timeout=2.0))
+    keys = [f"grid:{i}" for i in range(cells)]
+    for cell in keys:
+        await backend.set(f"k:{cell}", b"1", 600, cell)
+    before = {cell: backend.owner(cell) for cell in keys}
+
+    backend.update_nodes({**nodes, **extra})
+    moved = [cell for cell in keys if backend.owner(cell) != before[cell]]
+    found = sum([await backend.get(f"k:{cell}", cell) is not None for cell in moved])
+    return {"cells": cells, "moved": len(moved), "moved_ratio": round(len(moved) / cells, 3),
+            "found_after_move": found, "handoffs": backend.handoffs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐시 샤딩 vs 복제 비교")
+    parser.add_argument("--nodes", type=int, default=4)
+    parser.add_argument("--cells", type=int, default=2000, help="격자 셀 수")
+    parser.add_argument("--capacity", type=int, default=300, help="노드당 캐시 항목 수")
+    parser.add_argument("--requests", type=int, default=4000, help="파드당 요청 수")
+    parser.add_argument("--skew", type=float, default=0.8, help="Zipf 지수 (클수록 인기 셀 집중)")
+    parser.add_argument("--port", type=int, default=16380)
+    args = parser.parse_args()
+
+    replicated = run_mode("replicated", args, args.port)
+    sharded = run_mode("sharded", args, args.port + args.nodes + 1)
+
+    print(f"노드 {args.nodes}개, 셀 {args.cells}개, 노드당 용량 {args.capacity}, 파드당 요청 {args.requests}")
+    print(f"  replicated: 적중률 {replicated['hit_rate']:.1%}, 외부 호출 {replicated['upstream_calls']}")
+    print(f"  sharded   : 적중률 {sharded['hit_rate']:.1%}, 외부 호출 {sharded['upstream_calls']}")
+    if replicated["upstream_calls"]:
+        reduction = 1 - sharded["upstream_calls"] / replicated["upstream_calls"]
+        print(f"  외부 호출 감소: {reduction:.1%}")
+
+    # 재배치: 노드를 하나 추가
+    processes, nodes = _start_nodes(args.nodes + 1, args.cells, args.port + 2 * (args.nodes + 1))
+    try:
+        extra_name = f"node-{args.nodes}"
+        extra = {extra_name: nodes.pop(extra_name)}
+        result = asyncio.run(_rebalance_check(nodes, extra, args.cells))
+    finally:
+        for process in processes:
+            process.terminate()
+            process.join()
+    print(
+        f"  노드 추가 재배치: 셀 {result['moved_ratio']:.1%} 이동, "
+        f"이동한 {result['moved']}개 중 {result['found_after_move']}개를 이전 노드에서 옮겨 담음"
+    )
+
+
+if __name__ == "__main__":
+    main()
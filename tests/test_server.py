@@ -16,7 +16,34 @@ from src.outfit_recommender import (
     calculate_outing_score,
     get_comprehensive_recommendation,
 )
-from config.settings import get_grid_coords, get_pm_grade
+from config.settings import get_grid_coords, get_pm_grade, latlon_to_grid
+from src.weather_snapshot import WeatherSnapshot
+from src.activity_planner import build_period_snapshots, plan_activities
+from src.response_detail import normalize_detail, shape_index_result
+from src.spot_index import get_spot_index, score_spot_weather
+import src.reference_data as reference_data
+import httpx
+import src.upstream as upstream
+from src.upstream_errors import (
+    BadRequestUpstreamError, QuotaUpstreamError, TransientUpstreamError, classify_response,
+)
+from src.cache import TTLCache, cached_async
+from src.cache_backend import CacheBackend, RedisBackend, SharedFileBackend, read_reply, set_cache_backend
+from src.cache_ring import HashRing, ShardedBackend
+from src.circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitOpenError, HostGuard
+from src.course_planner import optimize_course
+from src.landmark_index import LandmarkIndex
+from src.rate_limiter import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    QuotaExceededError,
+    QuotaLedger,
+    UpstreamLimiter,
+)
+import asyncio
+import time
+import src.kakao_map_api as kakao_map_api
+from src.kakao_map_api import _request_pages, _search_cache_key
 
 
 class TestGridCoordinates:
@@ -119,6 +146,23 @@ class TestOutfitRecommendation:
 
         assert "우산" in result["recommendation"]["accessories"]
 
+    def test_outfit_tool_normal_and_compact(self, monkeypatch):
+        """옷차림 도구 - 상황 전달, compact는 분류/팁만"""
+        import src.server as server_module
+        snap = WeatherSnapshot("서울", {"current": {"temperature": 3}}, {}, {})
+
+        async def fake_snapshot(location, sources=None):
+            return snap
+
+        monkeypatch.setattr(server_module, "get_weather_snapshot", fake_snapshot)
+        normal = asyncio.run(server_module.get_outfit_recommendation_tool("서울", situation="회사"))
+        compact = asyncio.run(server_module.get_outfit_recommendation_tool("서울", detail="compact"))
+
+        assert normal["category"] == "한겨울"
+        assert normal["your_situation"] == "출근"
+        assert "패딩" in str(normal["outfit"]["outer"])
+        assert compact == {"location": "서울", "temperature": 3, "category": "한겨울", "tip": normal["tip"]}
+
 
 class TestOutingScore:
     """외출 적합도 점수 테스트"""
@@ -200,6 +244,1285 @@ class TestComprehensiveRecommendation:
         assert len(result["summary"]) > 0
 
 
+class TestWeatherSnapshot:
+    """날씨 스냅샷 정규화 테스트"""
+
+    def test_normalizes_all_sources(self):
+        """날씨/예보/미세먼지/생활지수를 한 번에 정규화"""
+        snap = WeatherSnapshot(
+            "서울",
+            {"current": {"temperature": 12.5, "humidity": 40, "wind_speed": 3.0}},
+            {"today_summary": {"sky": "흐림", "precipitation_probability": 60,
+                               "min_temperature": 5, "max_temperature": 17},
+             "forecasts": []},
+            {"average": {"pm10": {"value": 90, "grade": "나쁨"},
+                         "pm25": {"value": 40, "grade": "나쁨"}}},
+            {"indices": {"uv": {"uv_index": 8}}},
+        )
+
+        assert snap.temperature == 12.5
+        assert snap.rain_prob == 60
+        assert snap.pm10_grade == "나쁨"
+        assert snap.uv_index == 8
+        assert snap.weather_data().temp_max == 17
+        assert snap.index_weather()["temp_current"] == 12.5
+        assert snap.index_air()["pm25_grade"] == "나쁨"
+
+    def test_errors_fall_back_to_defaults(self):
+        """조회 실패 시 기본값 사용"""
+        snap = WeatherSnapshot(
+            "서울", {"error": "x"}, {"error": "y"}, {"error": "z"}
+        )
+
+        assert not snap.has_weather and not snap.has_air
+        assert snap.temperature == 20
+        assert snap.sky == "맑음"
+        assert snap.air_condition().pm25_grade == "알수없음"
+
+    def test_missing_pollutant_not_reported_as_measured(self):
+        """측정값 없는 항목은 사용자 응답에 '알수없음', 기본값은 점수 계산에만 사용"""
+        snap = WeatherSnapshot(
+            "서울", {}, {},
+            {"station_name": "중구", "pm10": {"value": 27, "grade": "좋음", "unit": "μg/m³"}},
+        )
+
+        assert snap.pm_view("pm10") == {"value": 27, "grade": "좋음", "unit": "μg/m³"}
+        assert snap.pm_view("pm25") == {"value": None, "grade": "알수없음"}
+        assert snap.air_condition().pm25_grade == "알수없음"
+        assert snap.index_air()["pm25_grade"] == "보통"
+
+    def test_fetches_only_requested_sources(self, monkeypatch):
+        """sources로 요청한 소스만 조회하고, 조회하지 않은 소스는 오류 없이 기본값"""
+        import src.weather_snapshot as snapshot_module
+        from src.cache import clear_all_caches
+
+        calls = []
+
+        def fake_fetch(source, value):
+            async def fetch(location):
+                calls.append(source)
+                return value
+            fetch.age = lambda location: 0
+            return fetch
+
+        monkeypatch.setattr(snapshot_module, "_SOURCE_FETCHERS", {
+            "weather": (fake_fetch("weather", {"current": {"temperature": 9}}), "날씨 조회 실패", "weather"),
+            "forecast": (fake_fetch("forecast", {"today_summary": {}}), "예보 조회 실패", "forecast"),
+            "air": (fake_fetch("air", {"pm10": {"value": 30, "grade": "보통"}}), "미세먼지 조회 실패", "air_quality"),
+            "life": (fake_fetch("life", {"indices": {}}), None, "life_index"),
+        })
+        clear_all_caches()
+        try:
+            snap = asyncio.run(snapshot_module.get_weather_snapshot("서울", ("air",)))
+        finally:
+            clear_all_caches()
+
+        assert calls == ["air"]
+        assert snap.has_air and not snap.has_weather and not snap.has_forecast
+        assert snap.errors == {}
+        assert snap.temperature == 20
+        assert list(snap.data_age) == ["air_quality"]
+
+    def test_views_are_built_once(self):
+        """입력 뷰는 스냅샷당 한 번만 생성"""
+        snap = WeatherSnapshot("서울", {}, {}, {})
+        assert snap.weather_data() is snap.weather_data()
+        assert snap.index_weather() is snap.index_weather()
+
+
+class TestActivityPlanner:
+    """3일 활동 플래너 테스트"""
+
+    @staticmethod
+    def _snapshot():
+        from datetime import datetime, timedelta
+
+        start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        forecasts = []
+        for h in range(72):
+            t = start + timedelta(hours=h)
+            rainy = t.date() == start.date() + timedelta(days=1)  # 내일만 비
+            forecasts.append({
+                "date": t.strftime("%Y%m%d"),
+                "time": t.strftime("%H00"),
+                "temperature": 20,
+                "humidity": 50,
+                "wind_speed": 2.0,
+                "sky": "흐림" if rainy else "맑음",
+                "precipitation_probability": 90 if rainy else 0,
+            })
+        return WeatherSnapshot(
+            "서울", {"current": {"temperature": 20}},
+            {"today_summary": {"precipitation_probability": 0}, "forecasts": forecasts},
+            {},
+        )
+
+    def test_tomorrow_rain_prob_from_forecast(self):
+        """내일 강수확률은 예보에서 계산"""
+        assert self._snapshot().rain_prob_tomorrow == 90
+
+    def test_period_snapshots_split_by_day(self):
+        """날짜 x 시간대별 파생 스냅샷 생성"""
+        from datetime import datetime
+
+        windows = build_period_snapshots(self._snapshot(), now=datetime.now().replace(hour=0))
+        days = {w["day"] for w in windows}
+        assert days == {"오늘", "내일", "모레"}
+        tomorrow = [w for w in windows if w["day"] == "내일"]
+        assert all(w["snapshot"].rain_prob == 90 for w in tomorrow)
+
+    def test_best_day_avoids_rain(self):
+        """비 오는 날은 최적 날짜에서 제외"""
+        plan = plan_activities(self._snapshot(), ["캠핑", "세차", "없는활동"])
+        assert plan["best_by_activity"]["캠핑"]["day"] != "내일"
+        assert plan["unsupported"] == ["없는활동"]
+
+
+class TestResponseDetail:
+    """응답 상세도 테스트"""
+
+    def test_normalize_detail(self):
+        """detail 값 정규화 (한국어 별칭, 알 수 없는 값)"""
+        assert normalize_detail("COMPACT") == "compact"
+        assert normalize_detail("상세") == "full"
+        assert normalize_detail("") == "normal"
+        assert normalize_detail("unknown") == "normal"
+
+    def test_compact_keeps_score_and_grade(self):
+        """compact는 점수/등급/메시지만 남김"""
+        result = {
+            "location": "서울", "laundry_score": 80, "grade": "좋음",
+            "message": "빨래하기 좋아요", "factors": ["습도 적당"], "tips": ["오전에 널기"],
+        }
+        compact = shape_index_result(result, "laundry_score", "compact")
+        assert compact == {"location": "서울", "laundry_score": 80, "grade": "좋음", "message": "빨래하기 좋아요"}
+
+    def test_compact_calculator_skips_notes(self):
+        """compact 계산은 요인/팁을 모으지 않고 점수/등급/메시지는 normal과 같음"""
+        from src.activity_recommender import WeatherData, calculate_laundry_index, calculate_camping_index
+
+        weather = WeatherData(temperature=22, humidity=45, wind_speed=3, rain_prob=10)
+        normal = calculate_laundry_index(weather)
+        compact = calculate_laundry_index(weather, detail="compact")
+        assert normal["factors"] and normal["score_breakdown"]
+        assert not list(compact["factors"]) and not list(compact["score_breakdown"])
+        for key in ("score", "grade", "message"):
+            assert compact[key] == normal[key]
+
+        weather_data = {"sky": "맑음", "temp_current": 18, "temp_min": 10, "temp_max": 22,
+                        "humidity": 50, "rain_prob": 0, "wind_speed": 2}
+        normal = calculate_camping_index(weather_data)
+        compact = calculate_camping_index(weather_data, detail="compact")
+        assert (compact["score"], compact["grade"]) == (normal["score"], normal["grade"])
+
+    def test_error_passes_through(self):
+        """에러 응답은 축약하지 않음"""
+        result = {"error": "API 오류"}
+        assert shape_index_result(result, "uv_index", "compact") == result
+
+    def test_weekly_forecast_compact_summary(self, monkeypatch):
+        """주간 예보 compact는 날짜별 상세 없이 같은 요약만 반환"""
+        import src.server as server_module
+        forecast = {"forecasts": [
+            {"date": "20260101", "temperature": 3, "sky": "맑음", "precipitation_probability": 10},
+            {"date": "20260102", "temperature": 5, "sky": "흐림", "precipitation_probability": 60},
+        ]}
+        snap = WeatherSnapshot("서울", {"current": {}}, forecast, {})
+
+        async def fake_snapshot(location, sources=None):
+            return snap
+
+        monkeypatch.setattr(server_module, "get_weather_snapshot", fake_snapshot)
+        normal = asyncio.run(server_module.get_weekly_forecast("서울"))
+        compact = asyncio.run(server_module.get_weekly_forecast("서울", detail="compact"))
+        assert compact == {"location": "서울", "summary": normal["summary"]}
+        assert normal["summary"] == "오늘: 3~3°C, 맑음 | 내일: 5~5°C, 흐림, 강수 60%"
+
+
+class TestSpotIndex:
+    """장소 공간 인덱스 테스트"""
+
+    def test_latlon_to_grid(self):
+        """위경도 → 기상청 격자 변환"""
+        assert latlon_to_grid(37.5665, 126.9780) == get_grid_coords("서울")
+        assert latlon_to_grid(35.1796, 129.0756) == get_grid_coords("부산")
+
+    def test_nearby_sorted_by_distance(self):
+        """가까운 순 정렬 + 반경 필터"""
+        # 강남역 기준
+        results = get_spot_index().nearby("hiking", 37.4979, 127.0276, radius_km=15)
+        distances = [d for _, d in results]
+        assert distances == sorted(distances)
+        assert all(d <= 15 for d in distances)
+        assert results[0][0]["name"] == "청계산"
+        assert "grid" in results[0][0]
+
+    def test_spot_weather_score(self):
+        """비 오는 장소는 날씨 점수 감점"""
+        assert score_spot_weather({"temperature": 20, "precipitation_type": "없음"}) == 100
+        assert score_spot_weather({"temperature": 20, "precipitation_type": "비"}) == 50
+
+    def test_all_activities_grid_lookups_capped(self, monkeypatch):
+        """전체 활동 조회는 격자 중복 제거 + 조회 상한, 나머지는 검색 중심 날씨"""
+        import src.spot_index as spot_index
+        calls = []
+
+        async def fake_weather_at(nx, ny):
+            calls.append((nx, ny))
+            return {"current": {"temperature": 20, "precipitation_type": "없음", "wind_speed": 1.0}}
+
+        monkeypatch.setattr(spot_index, "cached_get_weather_at", fake_weather_at)
+        activities = get_spot_index().activities()
+        fallback = {"temperature": 18, "precipitation_type": "비", "wind_speed": 2.0}
+        found = asyncio.run(
+            spot_index.find_spots_with_weather(activities, 37.5665, 126.9780, None, 3, fallback_weather=fallback)
+        )
+
+        assert len(calls) == len(set(calls)) <= spot_index.MAX_GRID_LOOKUPS
+        assert set(found) == set(activities)
+        spots = [spot for entries, _ in found.values() for spot in entries]
+        assert all(spot["weather"] is not None for spot in spots)
+        assert any(spot.get("weather_source") == "search_center" for spot in spots)
+
+
+class TestReferenceData:
+    """참조 데이터 파일 로딩 테스트"""
+
+    def test_unsupported_version_rejected(self):
+        """지원하지 않는 버전은 로딩 실패"""
+        with pytest.raises(reference_data.ReferenceDataError):
+            reference_data.ReferenceData({"version": 999})
+
+    def test_hot_reload_on_file_change(self, tmp_path, monkeypatch):
+        """파일이 바뀌면 재시작 없이 새 데이터 사용"""
+        import json
+        import os
+
+        raw = json.loads(reference_data.REFERENCE_DATA_PATH.read_text(encoding="utf-8"))
+        path = tmp_path / "reference_data.json"
+        path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+
+        monkeypatch.setattr(reference_data, "REFERENCE_DATA_PATH", path)
+        monkeypatch.setattr(reference_data, "RELOAD_CHECK_SECONDS", 0)
+        monkeypatch.setattr(reference_data, "_data", None)
+        assert "테스트산" not in reference_data.get_reference_data().spots_by_name
+
+        raw["spots"]["hiking"].append({"name": "테스트산", "location": "서울", "lat": 37.5, "lon": 127.0})
+        path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+        os.utime(path, (path.stat().st_atime, path.stat().st_mtime + 10))
+
+        assert "테스트산" in reference_data.get_reference_data().spots_by_name
+
+
+class TestSearchCache:
+    """검색 결과 캐시 테스트"""
+
+    def test_lru_eviction_and_hit_rate(self):
+        """크기 초과 시 가장 오래 안 쓴 항목 축출, 적중률 집계"""
+        cache = TTLCache("test_lru", ttl_seconds=60, max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.get("a") == 1  # a 최근 사용
+        cache.set("c", 3)  # b 축출
+        assert cache.get("b") is None
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_expired_entry_is_miss(self):
+        """TTL 지난 항목은 미스"""
+        cache = TTLCache("test_ttl", ttl_seconds=0, max_entries=10)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+    def test_key_normalization(self):
+        """검색어 공백/대소문자, 근접 좌표, 같은 반경 구간은 같은 키"""
+        key1 = _search_cache_key("keyword", "강남역  맛집", 127.02761, 37.49794, 1500, "accuracy", 5)
+        key2 = _search_cache_key("keyword", " 강남역 맛집", 127.02758, 37.49791, 2000, "accuracy", 5)
+        assert key1 == key2
+        assert key1 != _search_cache_key("keyword", "강남역 맛집", 127.02761, 37.49794, 5000, "accuracy", 5)
+
+    def test_radius_inside_bucket_not_short(self, monkeypatch):
+        """구간 상한보다 작은 반경은 넉넉히 받아 걸러도 요청 개수를 채우고, 거리는 요청 좌표 기준"""
+        requested = []
+
+        async def fake_page(keyword, x, y, radius, size, sort, page=1):
+            requested.append((radius, size, page))
+            # 정확도순 앞쪽은 반경(1500m) 밖, 뒤쪽 7개는 안
+            offsets = [0.017 - i * 0.0001 for i in range(8)] + [0.005 + i * 0.001 for i in range(7)]
+            places = [
+                {"id": str(i), "name": f"장소{i}", "x": "127.0", "y": f"{37.5 + offset:.6f}", "distance": "0"}
+                for i, offset in enumerate(offsets)
+            ]
+            return {"keyword": keyword, "total_count": 15, "places": places,
+                    "meta": {"is_end": True, "pageable_count": 15}}
+
+        monkeypatch.setattr(kakao_map_api, "KAKAO_REST_API_KEY", "test-key")
+        monkeypatch.setattr(kakao_map_api, "_request_keyword_search", fake_page)
+        result = asyncio.run(kakao_map_api.search_place_by_keyword(
+            "반경 구간 테스트", x=127.0, y=37.5, radius=1500, size=5
+        ))
+        assert requested == [(2000, 15, 1)]
+        assert len(result["places"]) == 5
+        assert all(int(place["distance"]) <= 1500 for place in result["places"])
+        assert result["places"][0]["distance"] == str(
+            kakao_map_api.calculate_distance_between_coords(37.5, 127.0, 37.505, 127.0)
+        )
+
+    def test_radius_filter_pages_on_demand(self, monkeypatch):
+        """반경으로 걸러 모자랄 때만 다음 페이지 요청, 더 큰 요청은 캐시에 이어 받음"""
+        requested = []
+
+        async def fake_page(keyword, x, y, radius, size, sort, page=1):
+            requested.append(page)
+            # 페이지마다 앞 10개는 반경(1500m) 안, 뒤 5개는 밖
+            offsets = [0.001 * (i + 1) for i in range(10)] + [0.017] * 5
+            places = [
+                {"id": f"{page}-{i}", "name": f"장소{page}-{i}", "x": "127.0",
+                 "y": f"{37.6 + offset:.6f}", "distance": "0"}
+                for i, offset in enumerate(offsets)
+            ]
+            return {"keyword": keyword, "total_count": 45, "places": places,
+                    "meta": {"is_end": page == 3, "pageable_count": 45}}
+
+        monkeypatch.setattr(kakao_map_api, "KAKAO_REST_API_KEY", "test-key")
+        monkeypatch.setattr(kakao_map_api, "_request_keyword_search", fake_page)
+
+        def search(size):
+            return asyncio.run(kakao_map_api.search_place_by_keyword(
+                "페이지 지연 테스트", x=127.0, y=37.6, radius=1500, size=size
+            ))
+
+        assert len(search(5)["places"]) == 5
+        assert requested == [1]
+        result = search(15)
+        assert len(result["places"]) == 15
+        assert requested == [1, 2]
+        assert "next_page" not in result
+        assert len(search(25)["places"]) == 25
+        assert requested == [1, 2, 3]
+        assert len(search(40)["places"]) == 30  # 마지막 페이지까지 받음 - 더 요청하지 않음
+        assert requested == [1, 2, 3]
+
+    def test_multi_page_merge(self):
+        """여러 페이지 병합 - id 중복 제거, is_end 이후 요청 안 함"""
+        requested = []
+
+        async def fake_page(page, page_size):
+            requested.append(page)
+            ids = {1: range(0, 15), 2: range(14, 29)}[page]  # 14번 중복
+            return {
+                "places": [{"id": str(i)} for i in ids],
+                "meta": {"is_end": page == 2, "pageable_count": 29},
+            }
+
+        result = asyncio.run(_request_pages(fake_page, 45))
+        assert requested == [1, 2]
+        assert [p["id"] for p in result["places"]] == [str(i) for i in range(29)]
+        assert "meta" not in result
+
+    def test_multi_keyword_merge(self, monkeypatch):
+        """여러 키워드 결과를 id로 병합, 여러 키워드에 걸린 가까운 장소가 먼저"""
+        results = {
+            "맛집": [{"id": "1", "name": "먼 맛집", "distance": "2900"}, {"id": "2", "name": "가까운 곳", "distance": "100"}],
+            "술집": [{"id": "2", "name": "가까운 곳", "distance": "100"}],
+        }
+
+        async def fake_search(keyword, *args):
+            return {"total_count": len(results[keyword]), "places": results[keyword]}
+
+        monkeypatch.setattr(kakao_map_api, "search_place_by_keyword", fake_search)
+        merged = asyncio.run(kakao_map_api.search_places_multi(["맛집", "술집", "맛집"], radius=3000, size=5))
+        assert merged["keywords"] == ["맛집", "술집"]
+        assert [p["id"] for p in merged["places"]] == ["2", "1"]
+        assert merged["places"][0]["matched_keywords"] == ["맛집", "술집"]
+
+    def test_multi_keyword_default_radius(self, monkeypatch):
+        """좌표만 주고 반경을 생략하면 기본 반경(5000m)으로 검색"""
+        requested = []
+
+        async def fake_page(keyword, x, y, radius, size, sort, page=1):
+            requested.append(radius)
+            return {"keyword": keyword, "total_count": 1, "meta": {"is_end": True, "pageable_count": 1},
+                    "places": [{"id": "1", "name": "장소", "x": "127.0", "y": "37.51", "distance": "1110"}]}
+
+        monkeypatch.setattr(kakao_map_api, "KAKAO_REST_API_KEY", "test-key")
+        monkeypatch.setattr(kakao_map_api, "_request_keyword_search", fake_page)
+        result = asyncio.run(kakao_map_api.search_places_multi(["기본 반경 테스트"], x="127.0", y="37.5"))
+        assert requested == [5000]
+        assert [place["id"] for place in result["places"]] == ["1"]
+
+    def test_course_steps_concurrent_with_deadline(self, monkeypatch):
+        """코스 단계 검색은 동시에 실행, 마감 시간 넘긴 단계는 timeout"""
+        async def fake_search(keyword, *args):
+            await asyncio.sleep(1.0 if keyword == "느림" else 0.05)
+            return {"places": [{"name": keyword}]}
+
+        monkeypatch.setattr(kakao_map_api, "search_place_by_keyword", fake_search)
+        monkeypatch.setattr(kakao_map_api, "COURSE_DEADLINE_SECONDS", 0.3)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            results = await kakao_map_api._search_course_steps([("a",), ("b",), ("느림",)])
+            return results, loop.time() - started
+
+        results, elapsed = asyncio.run(run())
+        assert [r["places"] for r in results[:2]] == [[{"name": "a"}], [{"name": "b"}]]
+        assert results[2]["timeout"] is True
+        assert elapsed < 0.6
+
+
+class TestCoursePlanner:
+    """코스 동선 최적화 테스트"""
+
+    @staticmethod
+    def _place(name, lat, lon, category="음식점"):
+        return {"id": name, "name": name, "y": str(lat), "x": str(lon), "category": category}
+
+    def test_picks_shortest_route(self):
+        """1순위끼리 멀면 가까운 후보 조합 선택"""
+        origin = (37.50, 127.00)
+        steps = [
+            [self._place("카페A", 37.50, 127.00), self._place("카페B", 37.60, 127.10)],
+            [self._place("전시B", 37.60, 127.10), self._place("전시A", 37.501, 127.001)],
+            [self._place("식당B", 37.60, 127.11), self._place("식당A", 37.502, 127.002)],
+        ]
+        choice, distance = optimize_course(steps, origin=origin)
+        assert choice == [0, 1, 1]
+        assert distance < 1.0
+
+    def test_indoor_weather_skips_outdoor(self):
+        """실내 위주 날씨면 야외 후보 제외, 같은 장소 중복 선택 안 함"""
+        park = self._place("공원", 37.50, 127.00, "여행 > 공원")
+        museum = self._place("박물관", 37.55, 127.05, "문화,예술 > 박물관")
+        choice, _ = optimize_course([[park, museum]], origin=(37.50, 127.00), outdoor_ok=False)
+        assert choice == [1]
+
+        cafe = self._place("카페", 37.50, 127.00)
+        choice, _ = optimize_course([[cafe], [cafe, museum]], origin=(37.50, 127.00))
+        assert choice == [0, 1]
+
+
+class TestLandmarkIndex:
+    """역/터미널 인덱스 테스트"""
+
+    def test_bundled_catalogue(self):
+        """내장 목록에서 가까운 역, 범위 밖이면 None"""
+        index = reference_data.get_reference_data().landmark_index()
+        landmark = index.find(37.4985, 127.0280)  # 강남역 근처
+        assert landmark["name"] == "강남역"
+        assert int(landmark["distance"]) < 200
+        assert index.find(35.0, 124.0) is None  # 서해 바다
+
+    def test_subway_before_terminal_and_learning(self):
+        """지하철역(2km)이 터미널보다 우선, add()로 학습"""
+        index = LandmarkIndex([
+            {"name": "터미널", "type": "terminal", "lat": 37.5000, "lon": 127.0000},
+            {"name": "역", "type": "subway", "lat": 37.5100, "lon": 127.0000},
+        ])
+        assert index.find(37.5000, 127.0000)["name"] == "역"
+        assert index.find(37.5400, 127.0000)["name"] == "터미널"
+        assert index.find(37.3, 126.8) is None
+
+        index.add({"name": "새 역", "type": "subway", "lat": 37.3, "lon": 126.8})
+        assert index.find(37.3, 126.8)["name"] == "새 역"
+        assert len(index) == 3
+
+    def test_missing_station_asks_kakao(self, monkeypatch):
+        """목록에 없는 더 가까운 역(봉천역)은 Kakao로 조회, Kakao 실패 시에만 인덱스 결과"""
+        index = reference_data.get_reference_data().landmark_index()
+        assert index.find(37.4825, 126.9417, 300) is None  # 서울대입구역은 약 1km
+        kakao_results = [{"name": "봉천역", "distance": "12", "x": "126.9417", "y": "37.4825"}]
+
+        async def fake_request(x, y, index=None):
+            return kakao_results.pop() if kakao_results else None
+
+        monkeypatch.setattr(kakao_map_api, "_request_nearest_landmark", fake_request)
+        places = [{"x": "126.9417", "y": "37.4825"}]
+        assert asyncio.run(kakao_map_api.find_nearest_landmarks(places))[0]["name"] == "봉천역"
+        assert asyncio.run(kakao_map_api.find_nearest_landmark("126.9417", "37.4825"))["name"] == "서울대입구역"
+
+
+class TestRateLimiter:
+    """외부 API 호출량 제어 테스트"""
+
+    def test_daily_quota_and_background_reserve(self):
+        """한도 소진 시 거부, 예약분은 사용자 호출만 사용"""
+        limiter = UpstreamLimiter("test", rate=100, burst=10, daily_quota=5, ledger=QuotaLedger())
+
+        async def run():
+            for _ in range(4):
+                await limiter.acquire(PRIORITY_INTERACTIVE)
+            with pytest.raises(QuotaExceededError):
+                await limiter.acquire(PRIORITY_BACKGROUND)  # 남은 1 ≤ 예약분
+            await limiter.acquire(PRIORITY_INTERACTIVE)
+            with pytest.raises(QuotaExceededError):
+                await limiter.acquire(PRIORITY_INTERACTIVE)
+
+        asyncio.run(run())
+        assert limiter.stats()["remaining"] == 0
+
+    def test_interactive_preempts_background(self):
+        """토큰 대기 중에는 사용자 호출이 먼저 통과"""
+        limiter = UpstreamLimiter("test", rate=20, burst=1, daily_quota=100, ledger=QuotaLedger())
+        order = []
+
+        async def call(label, priority):
+            await limiter.acquire(priority)
+            order.append(label)
+
+        async def run():
+            await limiter.acquire(PRIORITY_INTERACTIVE)  # 토큰 소진
+            background = asyncio.create_task(call("background", PRIORITY_BACKGROUND))
+            await asyncio.sleep(0)
+            interactive = asyncio.create_task(call("interactive", PRIORITY_INTERACTIVE))
+            await asyncio.gather(background, interactive)
+
+        asyncio.run(run())
+        assert order == ["interactive", "background"]
+
+    def test_ledger_persists(self, tmp_path):
+        """장부는 파일에 저장되어 재시작 후에도 유지"""
+        path = tmp_path / "quota.json"
+        ledger = QuotaLedger(path)
+        ledger.record("kma", 3)
+        ledger.flush()
+        assert QuotaLedger(path).used("kma") == 3
+
+
+class TestCircuitBreaker:
+    """서킷 브레이커/적응형 타임아웃 테스트"""
+
+    def test_open_half_open_close(self):
+        """연속 실패로 열림, 복구 시간 뒤 시험 호출 1건만 허용"""
+        guard = HostGuard("test", failure_threshold=2, recovery_seconds=0)
+        guard.record_failure()
+        guard.record_failure()
+        assert guard.state == STATE_OPEN
+
+        guard.before_request()  # 복구 시간 지남 → 시험 호출
+        assert guard.state == STATE_HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            guard.before_request()
+        guard.record_success(0.1)
+        assert guard.state == STATE_CLOSED
+
+    def test_adaptive_timeout(self):
+        """표본이 쌓이면 p99 기반으로 타임아웃 단축 (상한은 호출 측 값)"""
+        guard = HostGuard("test")
+        assert guard.timeout(30.0) == 30.0
+        for _ in range(50):
+            guard.record_success(0.2)
+        assert guard.timeout(30.0) == pytest.approx(1.0)  # max(하한 1초, 0.2 × 3)
+        assert guard.timeout(0.5) == 0.5
+
+    def test_upstream_fast_fails_after_5xx(self, monkeypatch):
+        """5xx가 이어지면 이후 호출은 네트워크 없이 즉시 실패"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.url)
+            return httpx.Response(503)
+
+        limiter = UpstreamLimiter("test", rate=100, burst=10, daily_quota=100, ledger=QuotaLedger())
+        monkeypatch.setattr(upstream, "get_limiter", lambda name: limiter)
+        monkeypatch.setattr(upstream, "get_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(upstream, "UPSTREAM_MAX_RETRIES", 0)
+
+        async def run():
+            for _ in range(5):
+                with pytest.raises(TransientUpstreamError):
+                    await upstream.upstream_get("kma", "http://breaker-test.invalid/api")
+            with pytest.raises(CircuitOpenError):
+                await upstream.upstream_get("kma", "http://breaker-test.invalid/api")
+
+        asyncio.run(run())
+        assert len(calls) == 5
+
+    def test_http_200_service_error_counts_as_failure(self, monkeypatch):
+        """HTTP 200 오류 본문(코드 05)도 브레이커 실패로 기록, 응답 시간 표본에서 제외"""
+        body = (
+            "<OpenAPI_ServiceResponse><cmmMsgHeader>"
+            "<returnAuthMsg>SERVICE_TIMEOUT_ERROR</returnAuthMsg>"
+            "<returnReasonCode>05</returnReasonCode>"
+            "</cmmMsgHeader></OpenAPI_ServiceResponse>"
+        )
+        limiter = UpstreamLimiter("test", rate=100, burst=10, daily_quota=100, ledger=QuotaLedger())
+        monkeypatch.setattr(upstream, "get_limiter", lambda name: limiter)
+        monkeypatch.setattr(
+            upstream, "get_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))),
+        )
+        monkeypatch.setattr(upstream, "UPSTREAM_MAX_RETRIES", 0)
+
+        async def run():
+            with pytest.raises(TransientUpstreamError):
+                await upstream.upstream_get("kma", "http://service-error-test.invalid/api")
+
+        asyncio.run(run())
+        guard = upstream.get_host_guard("service-error-test.invalid")
+        assert guard.consecutive_failures == 1
+        assert len(guard._latencies) == 0
+
+    def test_hedged_request_takes_faster_response(self, monkeypatch):
+        """첫 요청이 늦으면 중복 요청을 보내 먼저 온 응답 사용"""
+        calls = []
+
+        async def handler(request):
+            calls.append(len(calls))
+            if len(calls) == 1:
+                await asyncio.sleep(1.0)
+                return httpx.Response(200, json={"from": "primary"})
+            return httpx.Response(200, json={"from": "hedge"})
+
+        guard = upstream.get_host_guard("hedge-test.invalid")
+        for _ in range(30):
+            guard.record_success(0.05)
+        limiter = UpstreamLimiter("test", rate=100, burst=10, daily_quota=100, ledger=QuotaLedger())
+        monkeypatch.setattr(upstream, "get_limiter", lambda name: limiter)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(upstream, "get_http_client", lambda: client)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            response = await upstream.upstream_get("hedge_test", "http://hedge-test.invalid/api", hedge=True)
+            return response, loop.time() - started
+
+        response, elapsed = asyncio.run(run())
+        assert response.json() == {"from": "hedge"}
+        assert elapsed < 0.5
+        assert upstream.get_hedge_stats()["hedge_test"]["hedge_wins"] == 1
+
+    def test_cache_serves_stale_on_failure(self):
+        """만료된 이전 값이 있으면 실패 대신 이전 값"""
+        responses = [{"temperature": 10}, {"error": "API 호출 실패"}]
+
+        @cached_async(ttl_seconds=0)
+        async def fetch(location):
+            return responses.pop(0)
+
+        assert asyncio.run(fetch("stale-test")) == {"temperature": 10}
+        assert asyncio.run(fetch("stale-test")) == {"temperature": 10}
+
+
+class TestUpstreamErrors:
+    """외부 API 오류 분류/재시도 테스트"""
+
+    def test_classify_data_go_kr_xml_error(self):
+        """HTTP 200 + XML 오류 본문도 종류별로 분류"""
+        body = (
+            "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+            "<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>"
+            "<returnReasonCode>22</returnReasonCode></cmmMsgHeader></OpenAPI_ServiceResponse>"
+        )
+        error = classify_response("kma", httpx.Response(200, text=body))
+        assert isinstance(error, QuotaUpstreamError)
+        assert not error.retryable
+        assert error.to_error()["error_type"] == "quota"
+
+        ok = httpx.Response(200, json={"response": {"header": {"resultCode": "00"}}})
+        assert classify_response("kma", ok) is None
+        assert isinstance(classify_response("kma", httpx.Response(400)), BadRequestUpstreamError)
+
+    def test_retries_transient_error(self, monkeypatch):
+        """5xx 후 성공하면 재시도 결과 반환"""
+        statuses = [503, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0), json={"ok": True})
+
+        limiter = UpstreamLimiter("test", rate=100, burst=10, daily_quota=100, ledger=QuotaLedger())
+        monkeypatch.setattr(upstream, "get_limiter", lambda name: limiter)
+        monkeypatch.setattr(upstream, "get_http_client", lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        monkeypatch.setattr(upstream, "RETRY_BASE_DELAY_SECONDS", 0.001)
+
+        response = asyncio.run(upstream.upstream_get("retry_test", "http://retry-test.invalid/api"))
+        assert response.json() == {"ok": True}
+        assert upstream.get_retry_stats()["retry_test"]["retries"] == 1
+
+    def test_cache_does_not_hide_bad_request(self):
+        """잘못된 요청은 이전 캐시 값으로 가리지 않음"""
+        responses = [{"temperature": 10}, {"error": "잘못된 요청", "error_type": "bad_request"}]
+
+        @cached_async(ttl_seconds=0)
+        async def fetch(location):
+            return responses.pop(0)
+
+        assert asyncio.run(fetch("bad-request-test")) == {"temperature": 10}
+        assert asyncio.run(fetch("bad-request-test"))["error_type"] == "bad_request"
+
+    def test_non_json_body_is_classified(self, monkeypatch):
+        """HTTP 200 + HTML 본문은 예외 대신 분류된 오류 dict"""
+        import src.air_quality_api as air_quality_api
+
+        async def fake_get(*args, **kwargs):
+            return httpx.Response(200, text="<html><body>점검 중</body></html>")
+
+        monkeypatch.setattr(air_quality_api, "upstream_get", fake_get)
+        result = asyncio.run(air_quality_api.AirQualityAPI().get_realtime_by_station("중구"))
+        assert result["error_type"] == "transient"
+        assert "JSON" in result["error"]
+
+    def test_uv_index_estimates_on_upstream_error(self, monkeypatch):
+        """자외선지수 조회 실패(5xx 등) 시 계절 기반 추정값"""
+        import src.life_index_api as life_index_api
+
+        async def fake_get(*args, **kwargs):
+            raise TransientUpstreamError("life_index", "API 호출 실패: HTTP 503")
+
+        monkeypatch.setattr(life_index_api, "upstream_get", fake_get)
+        result = asyncio.run(life_index_api.get_uv_index("서울"))
+        assert result["estimated"] is True
+        assert "error" not in result
+
+
+class TestCacheBackend:
+    """공유 캐시 백엔드 테스트"""
+
+    @staticmethod
+    def _shared_fetch(calls):
+        @cached_async(ttl_seconds=60)
+        async def shared_fetch(location):
+            calls.append(location)
+            return {"location": location, "temperature": 10}
+        return shared_fetch
+
+    def test_shm_backend_shares_between_workers(self, tmp_path, monkeypatch):
+        """다른 워커(L1 비어 있음)는 공유 백엔드 값을 사용"""
+        import src.cache as cache
+
+        set_cache_backend(SharedFileBackend(tmp_path))
+        try:
+            calls = []
+            fetch = self._shared_fetch(calls)
+            assert asyncio.run(fetch("공유"))["temperature"] == 10
+
+            # 두 번째 워커: 새 백엔드 인스턴스 + 빈 L1
+            set_cache_backend(SharedFileBackend(tmp_path))
+            for name in ("_cache", "_cache_ttl", "_cache_stored"):
+                monkeypatch.setattr(cache, name, {})
+            assert asyncio.run(fetch("공유")) == {"location": "공유", "temperature": 10}
+            assert calls == ["공유"]
+        finally:
+            set_cache_backend(None)
+
+    def test_redis_backend_round_trip(self):
+        """Redis 프로토콜 대역 서버로 SET PX / GET / DEL"""
+        store = {}
+
+        async def handle(reader, writer):
+            while True:
+                try:
+                    command = await read_reply(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                name = command[0].upper()
+                if name == b"SET":
+                    store[command[1]] = command[2]
+                    writer.write(b"+OK\r\n")
+                elif name == b"GET":
+                    value = store.get(command[1])
+                    writer.write(b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value))
+                elif name == b"DEL":
+                    writer.write(b":%d\r\n" % int(store.pop(command[1], None) is not None))
+                await writer.drain()
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            backend = RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=1.0)
+            async with server:
+                await backend.set("key", "값".encode(), 60)
+                value = await backend.get("key")
+                await backend.delete("key")
+                missing = await backend.get("key")
+            return value, missing, backend.stats()
+
+        value, missing, stats = asyncio.run(run())
+        assert value == "값".encode()
+        assert missing is None
+        assert stats["hits"] == 1 and stats["misses"] == 1
+
+    def test_redis_backend_cancel_mid_reply_drops_connection(self):
+        """응답을 기다리다 취소된 연결은 버림 (다음 명령이 이전 응답을 읽지 않음)"""
+        store = {b"A": b"value-A", b"B": b"value-B"}
+
+        async def handle(reader, writer):
+            while True:
+                try:
+                    command = await read_reply(reader)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    break
+                if command[1] == b"A":
+                    await asyncio.sleep(0.2)  # A 응답은 늦게
+                value = store[command[1]]
+                try:
+                    writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+                    await writer.drain()
+                except ConnectionError:
+                    break
+            writer.close()
+
+        async def run():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            backend = RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=1.0)
+            async with server:
+                pending = asyncio.create_task(backend.command("GET", b"A"))
+                await asyncio.sleep(0.05)
+                pending.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await pending
+                await asyncio.sleep(0.3)  # 늦은 A 응답이 도착할 시간
+                return await backend.command("GET", b"B"), backend.stats()
+
+        value, stats = asyncio.run(run())
+        assert value == b"value-B"
+        assert stats["errors"] == 0
+
+    def test_redis_backend_down_is_cache_miss(self):
+        """서버가 없으면 예외 없이 조회 없음"""
+        backend = RedisBackend("redis://127.0.0.1:1/0", timeout=0.2)
+        assert asyncio.run(backend.get("key")) is None
+        assert backend.stats()["errors"] == 1
+
+
+class _DictBackend(CacheBackend):
+    """테스트용 메모리 노드"""
+
+    def __init__(self, address):
+        super().__init__()
+        self.address = address
+        self.store = {}
+
+    async def get(self, key, route=None):
+        return self.store.get(key)
+
+    async def set(self, key, data, ttl_seconds, route=None):
+        self.store[key] = data
+
+    async def delete(self, key, route=None):
+        self.store.pop(key, None)
+
+
+class TestCacheRing:
+    """일관된 해싱 샤딩 테스트"""
+
+    def test_ring_balance_and_minimal_movement(self):
+        """셀이 노드에 고르게 나뉘고, 노드 추가 시 일부만 이동"""
+        cells = [f"grid:{nx}:{ny}" for nx in range(40) for ny in range(50)]
+        ring = HashRing(["a", "b", "c", "d"])
+        counts = {}
+        for cell in cells:
+            counts[ring.owner(cell)] = counts.get(ring.owner(cell), 0) + 1
+        assert min(counts.values()) > len(cells) / 4 * 0.7
+
+        grown = HashRing(["a", "b", "c", "d", "e"])
+        moved = ring.moved(cells, grown)
+        assert 0.1 < len(moved) / len(cells) < 0.3
+        assert all(grown.owner(cell) == "e" for cell in moved)
+
+    def test_sharded_backend_hands_off_after_rebalance(self):
+        """재배치 후 새 담당 노드에 없으면 이전 노드에서 옮겨 담음"""
+        backend = ShardedBackend({"a": "a", "b": "b"}, backend_factory=_DictBackend)
+        cells = [f"grid:{i}" for i in range(200)]
+
+        async def run():
+            for cell in cells:
+                await backend.set(f"k:{cell}", b"v", 60, cell)
+            before = {cell: backend.owner(cell) for cell in cells}
+            backend.update_nodes({"a": "a", "b": "b", "c": "c"})
+            moved = [cell for cell in cells if backend.owner(cell) != before[cell]]
+            values = [await backend.get(f"k:{cell}", cell) for cell in moved]
+            return moved, values
+
+        moved, values = asyncio.run(run())
+        assert moved and all(value == b"v" for value in values)
+        assert backend.handoffs == len(moved)
+        assert backend._backends["c"].store
+
+
+class TestMultiWorker:
+    """멀티 워커 버스/장부 테스트"""
+
+    def test_bus_delivers_cache_update(self, tmp_path):
+        """한 워커가 발행한 캐시 항목을 다른 워커가 수신"""
+        from src.cache_backend import decode_entry, encode_entry
+        from src.worker_bus import EVENT_UPDATE, WorkerBus
+
+        received = []
+
+        async def run():
+            sender, receiver = WorkerBus(tmp_path), WorkerBus(tmp_path)
+            receiver.add_listener(lambda message, body: received.append((message, decode_entry(body))))
+            sender.start()
+            receiver.start()
+            try:
+                count = sender.publish({"type": EVENT_UPDATE, "key": "k"}, encode_entry({"pm10": 30}, 1.0, 2.0))
+                for _ in range(50):
+                    if received:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                sender.stop()
+                receiver.stop()
+            return count
+
+        assert asyncio.run(run()) == 1
+        message, entry = received[0]
+        assert message["key"] == "k"
+        assert entry["value"] == {"pm10": 30}
+
+    def test_ledger_merges_workers(self, tmp_path):
+        """워커 두 개가 같은 장부 파일에 사용량을 합산"""
+        path = tmp_path / "quota.json"
+        first, second = QuotaLedger(path), QuotaLedger(path)
+        first.record("kma", 3)
+        second.record("kma", 2)
+        first.flush()
+        second.flush()
+        assert second.used("kma") == 5
+        assert QuotaLedger(path).used("kma") == 5
+
+
+class TestAppLifespan:
+    """앱 lifespan/프로브 테스트"""
+
+    def test_probes_after_warmup(self, monkeypatch):
+        """lifespan 시작 후 /livez, /readyz 응답 (예열 지역 없음 - 외부 호출 없음)"""
+        from starlette.testclient import TestClient
+        import src.lifecycle as lifecycle
+        from src.server import create_app
+
+        monkeypatch.setattr(lifecycle, "WARMUP_LOCATIONS", [])
+        monkeypatch.setattr(lifecycle, "flush_quota_ledger", lambda: None)
+
+        with TestClient(create_app()) as client:
+            assert client.get("/livez").text == "ok"
+            for _ in range(50):
+                response = client.get("/readyz")
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+            assert response.status_code == 200
+            assert response.json()["ready"] is True
+            assert "kma" in response.json()["quota_remaining"]
+
+
+class TestMetrics:
+    """메트릭 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_cache_events_and_coalescing(self):
+        """동시 미스는 한 번만 실행하고 coalesced로 기록"""
+        from src.cache import cached_async
+        from src.metrics import CACHE_EVENTS
+
+        calls = []
+
+        @cached_async(ttl_seconds=60, shared=False)
+        async def metrics_probe(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return {"key": key}
+
+        results = await asyncio.gather(*[metrics_probe("a") for _ in range(3)])
+        assert results == [{"key": "a"}] * 3
+        assert calls == ["a"]
+        await metrics_probe("a")
+
+        assert CACHE_EVENTS.value("metrics_probe", "miss") == 1
+        assert CACHE_EVENTS.value("metrics_probe", "coalesced") == 2
+        assert CACHE_EVENTS.value("metrics_probe", "hit") == 1
+
+    def test_metrics_endpoint(self):
+        """/metrics 텍스트 노출 형식"""
+        from starlette.testclient import TestClient
+        from src.metrics import record_tool
+        from src.server import create_app
+
+        record_tool("metrics_test_tool", 0.03, error=True)
+        response = TestClient(create_app()).get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'mcp_tool_errors_total{tool="metrics_test_tool"} 1' in response.text
+        assert 'mcp_tool_duration_seconds_bucket{tool="metrics_test_tool",le="0.025"} 0' in response.text
+        assert 'mcp_tool_duration_seconds_bucket{tool="metrics_test_tool",le="0.05"} 1' in response.text
+        assert 'mcp_tool_duration_seconds_bucket{tool="metrics_test_tool",le="+Inf"} 1' in response.text
+
+
+class TestTracing:
+    """요청 추적 스팬 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_span_tree_across_tasks(self, monkeypatch):
+        """도구 스팬 아래 캐시 스팬이 asyncio 작업을 거쳐도 이어짐 + OTLP 변환"""
+        import src.tracing as tracing
+        from src.cache import cached_async
+        from tests.trace_collector import parse_otlp
+
+        monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+        tracing.drain_spans()
+
+        @cached_async(ttl_seconds=60, shared=False)
+        async def traced_probe(key):
+            with tracing.span("step", key=key):
+                await asyncio.sleep(0)
+            return {"key": key}
+
+        with tracing.span("tool probe", tool="probe"):
+            await asyncio.gather(traced_probe("a"), traced_probe("b"))
+            await traced_probe("a")
+
+        spans = tracing.drain_spans()
+        root = next(s for s in spans if s["name"] == "tool probe")
+        caches = [s for s in spans if s["name"] == "cache traced_probe"]
+        steps = [s for s in spans if s["name"] == "step"]
+
+        assert root["parent_id"] is None
+        assert {s["trace_id"] for s in spans} == {root["trace_id"]}
+        assert all(s["parent_id"] == root["span_id"] for s in caches)
+        assert sorted(s["attributes"]["event"] for s in caches) == ["hit", "miss", "miss"]
+        assert {s["parent_id"] for s in steps} <= {s["span_id"] for s in caches}
+
+        parsed = parse_otlp(tracing.to_otlp(spans))
+        assert [(s["span_id"], s["parent_id"], s["name"]) for s in parsed] == [
+            (s["span_id"], s["parent_id"], s["name"]) for s in spans
+        ]
+
+    def test_sampling(self, monkeypatch):
+        """샘플링에서 빠진 트레이스는 자식 스팬도 기록하지 않음"""
+        import src.tracing as tracing
+
+        tracing.drain_spans()
+        monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 0.0)
+        with tracing.span("off"):
+            with tracing.span("child"):
+                pass
+
+        monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 0.5)
+        monkeypatch.setattr(tracing.random, "random", lambda: 0.9)
+        with tracing.span("unsampled") as root:
+            with tracing.span("child") as child:
+                child.set("x", 1)
+        assert root.sampled is False and child.sampled is False
+        assert tracing.drain_spans() == []
+
+    @pytest.mark.asyncio
+    async def test_jsonl_export(self, monkeypatch, tmp_path):
+        """JSON Lines 내보내기 + 예외 스팬 상태"""
+        import json
+        import src.tracing as tracing
+
+        monkeypatch.setattr(tracing, "TRACE_SAMPLE_RATE", 1.0)
+        monkeypatch.setattr(tracing, "TRACE_EXPORTER", "jsonl")
+        monkeypatch.setattr(tracing, "TRACE_FILE", str(tmp_path / "traces.jsonl"))
+        tracing.drain_spans()
+
+        with pytest.raises(ValueError):
+            with tracing.span("failing"):
+                raise ValueError("boom")
+
+        assert await tracing.export_traces() == 1
+        record = json.loads((tmp_path / "traces.jsonl").read_text(encoding="utf-8"))
+        assert record["status"] == "error"
+        assert record["attributes"]["exception"] == "ValueError: boom"
+
+
+class TestProfiler:
+    """프로파일링 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_samples_tagged_by_tool(self):
+        """도구 안에서 CPU를 쓰는 코드가 도구 이름 태그와 함께 샘플됨 (하위 작업 포함)"""
+        from src.profiler import profile_event_loop, tool_scope
+
+        def busy_scoring(seconds):
+            end = time.perf_counter() + seconds
+            while time.perf_counter() < end:
+                sum(i * i for i in range(200))
+
+        async def child():
+            busy_scoring(0.1)
+
+        async def tool_call():
+            await asyncio.sleep(0.02)
+            with tool_scope("should_i_go_out"):
+                busy_scoring(0.1)
+                await asyncio.gather(child())
+
+        task = asyncio.create_task(tool_call())
+        sampler = await profile_event_loop(0.4, 0.002)
+        await task
+
+        summary = sampler.summary()
+        assert summary["by_tool"].get("should_i_go_out", 0) >= 20
+        tagged = [stack for stack in sampler.stacks if stack.startswith("should_i_go_out;")]
+        assert any("busy_scoring (tests/test_server.py:" in stack for stack in tagged)
+        assert any(";child (tests/test_server.py:" in stack for stack in tagged)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in sampler.collapsed().splitlines())
+
+    def test_endpoint_auth(self, monkeypatch):
+        """토큰 없으면 404, 틀리면 401, 맞으면 collapsed stack"""
+        from starlette.testclient import TestClient
+        import src.server as server
+
+        client = TestClient(server.create_app())
+        monkeypatch.setattr(server, "PROFILE_TOKEN", "")
+        assert client.get("/debug/profile?seconds=0").status_code == 404
+
+        monkeypatch.setattr(server, "PROFILE_TOKEN", "secret")
+        assert client.get("/debug/profile?seconds=0").status_code == 401
+        assert client.get(
+            "/debug/profile?seconds=0", headers={"Authorization": "Bearer wrong"}
+        ).status_code == 401
+
+        response = client.get("/debug/profile?seconds=0.1", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+        assert response.headers["content-disposition"].endswith('.collapsed"')
+
+        response = client.get(
+            "/debug/profile?seconds=0.1&format=json", headers={"Authorization": "Bearer secret"}
+        )
+        assert response.json()["samples"] >= 1
+
+
+class TestBenchmark:
+    """오프라인 벤치마크 테스트"""
+
+    def test_replay_selects_recording_and_shifts_dates(self):
+        """파라미터가 가장 많이 일치하는 녹화를 고르고 예보 날짜를 요청 날짜로 옮김"""
+        from tests.upstream_replay import ReplayTransport, shift_dates
+
+        recordings = [
+            {"request": {"nx": "60", "ny": "127"}},
+            {"request": {"nx": "98", "ny": "76", "base_date": "20240101"}},
+        ]
+        assert ReplayTransport._select(recordings, {"nx": "98", "ny": "76", "base_date": "20250505"}) == 1
+
+        body = {"items": [{"baseDate": "20240101", "fcstDate": "20240102", "fcstValue": "20240101"}]}
+        assert shift_dates(body, 3)["items"][0] == {
+            "baseDate": "20240104", "fcstDate": "20240105", "fcstValue": "20240101",
+        }
+
+    @pytest.mark.asyncio
+    async def test_replay_through_shared_client(self):
+        """공용 HTTP 클라이언트의 전송 계층을 바꾸면 녹화 응답으로 조회됨"""
+        from src.upstream import get_http_client, set_http_transport
+        from tests.upstream_replay import ReplayTransport
+
+        transport = ReplayTransport()
+        set_http_transport(transport)
+        try:
+            response = await get_http_client().get(
+                "https://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst",
+                params={"nx": "60", "ny": "127"},
+            )
+        finally:
+            set_http_transport(None)
+        assert response.json()["response"]["header"]["resultCode"] == "00"
+        assert transport.calls == {("kma", "getUltraSrtNcst"): 1}
+
+    def test_compare_to_baseline(self):
+        """외부 호출 수 증가는 바로 회귀, 지연은 허용 범위 안이면 통과"""
+        from tests.bench_tools import compare_to_baseline
+
+        base = {
+            "cold_p50_ms": 50.0, "warm_p50_ms": 2.0, "upstream_calls": 6,
+            "warm_upstream_calls": 0, "alloc_peak_kb": 1000.0, "errors": 0,
+        }
+        baseline = {"tools": {"get_weather": base}}
+        assert compare_to_baseline({"tools": {"get_weather": {**base, "cold_p50_ms": 80.0}}}, baseline, 0.5, 0.25) == []
+
+        regressions = compare_to_baseline(
+            {"tools": {"get_weather": {**base, "upstream_calls": 7, "warm_upstream_calls": 1}}}, baseline, 0.5, 0.25
+        )
+        assert len(regressions) == 2
+
+        # 도구 예외는 기준선에 기록돼 있어도 회귀
+        failing = {**base, "exceptions": 5}
+        regressions = compare_to_baseline({"tools": {"get_weather": failing}}, {"tools": {"get_weather": failing}}, 0.5, 0.25)
+        assert regressions == ["get_weather: 도구 예외 5건"]
+
+
+class TestUpstreamSimulator:
+    """외부 API 시뮬레이터 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_wrappers_parse_generated_responses(self, monkeypatch):
+        """래퍼가 시뮬레이터 응답을 그대로 파싱하고, 같은 격자 셀은 같은 날씨"""
+        import httpx
+        from config.settings import api_config
+        from src.cache import clear_all_caches
+        from src.upstream import set_http_transport
+        from src.weather_api import get_current_weather
+        from tests.upstream_simulator import UpstreamSimulator, create_simulator
+
+        monkeypatch.setattr(api_config, "weather_api_key", "test-key")
+        simulator = UpstreamSimulator()
+        set_http_transport(httpx.ASGITransport(app=create_simulator(simulator)))
+        try:
+            clear_all_caches()
+            first = await get_current_weather("부산")
+            clear_all_caches()
+            second = await get_current_weather("부산")
+        finally:
+            set_http_transport(None)
+            clear_all_caches()
+        assert "error" not in first
+        assert first["current"] == second["current"]
+        assert simulator.stats()["calls"]["kma"] == 2
+
+    def test_quota_exhaustion(self):
+        """일일 한도를 넘으면 data.go.kr 오류 22 (한도 초과로 분류)"""
+        import httpx
+        from starlette.testclient import TestClient
+        from src.upstream_errors import QuotaUpstreamError, classify_response
+        from tests.upstream_simulator import UpstreamSimulator, create_simulator
+
+        client = TestClient(create_simulator(UpstreamSimulator(quota={"kma": 1})))
+        url = "/1360000/VilageFcstInfoService_2.0/getUltraSrtNcst"
+        params = {"serviceKey": "k", "base_date": "20261019", "base_time": "0800", "nx": "60", "ny": "127"}
+        assert client.get(url, params=params).json()["response"]["header"]["resultCode"] == "00"
+
+        response = client.get(url, params=params)
+        error = classify_response("kma", httpx.Response(response.status_code, content=response.content))
+        assert isinstance(error, QuotaUpstreamError)
+        assert client.get("/_sim/stats").json()["injected_errors"] == {"kma/quota": 1}
+
+
+class TestLoadGenerator:
+    """부하 생성기 테스트"""
+
+    def test_classify_result(self):
+        """HTTP 오류, 도구 예외, 오류 dict 응답을 구분"""
+        from tests.load_generator import classify_result
+
+        assert classify_result(200, {"result": {"structuredContent": {"score": 80}, "isError": False}}) is None
+        assert classify_result(503, None) == "http_503"
+        assert classify_result(200, {"result": {"isError": True}}) == "tool_exception"
+        assert classify_result(
+            200, {"result": {"structuredContent": {"error": "한도 초과", "error_type": "quota"}}}
+        ) == "quota"
+
+    def test_upstream_calls_from_metrics(self):
+        """/metrics의 외부 API 응답 수를 업스트림별로 합산"""
+        from src.metrics import record_upstream, render_metrics
+        from tests.load_generator import upstream_calls_from_metrics
+
+        before = upstream_calls_from_metrics(render_metrics())
+        record_upstream("kma", "getVilageFcst", "200", 0.05)
+        record_upstream("kma", "getUltraSrtNcst", "timeout", 0.05)
+        after = upstream_calls_from_metrics(render_metrics())
+        assert after["kma"] - before["kma"] == 2
+
+
 # =============================================================================
 # API 통합 테스트 (실제 API 호출 - 선택적 실행)
 # =============================================================================
@@ -0,0 +1,91 @@
+"""
+OTLP 수집기 대역 (v3.8)
+
+TRACE_EXPORTER=otlp로 보낸 스팬(OTLP/HTTP JSON)을 받아 JSON Lines 파일에 저장하고,
+트레이스가 들어올 때마다 루트 스팬과 가장 오래 걸린 자식 스팬을 출력합니다.
+
+실행:
+    python -m tests.trace_collector --port 4318 --out collected_traces.jsonl
+    TRACE_SAMPLE_RATE=1 TRACE_EXPORTER=otlp python src/server.py
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _attribute(value: dict):
+    for kind in ("stringValue", "boolValue", "doubleValue"):
+        if kind in value:
+            return value[kind]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def parse_otlp(body: dict) -> list:
+    """OTLP/HTTP JSON 본문 → 스팬 목록 (src.tracing의 JSON Lines 형식과 같은 필드)"""
+    spans = []
+    for resource in body.get("resourceSpans", []):
+        for scope in resource.get("scopeSpans", []):
+            for item in scope.get("spans", []):
+                start = int(item["startTimeUnixNano"])
+                end = int(item["endTimeUnixNano"])
+                spans.append({
+                    "trace_id": item["traceId"],
+                    "span_id": item["spanId"],
+                    "parent_id": item.get("parentSpanId"),
+                    "name": item["name"],
+                    "start": start / 1e9,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "status": item.get("status", {}).get("message", "ok"),
+                    "attributes": {a["key"]: _attribute(a["value"]) for a in item.get("attributes", [])},
+                })
+    return spans
+
+
+def summarize(spans: list) -> list:
+    """트레이스별 한 줄 요약 (루트 스팬 시간 + 가장 오래 걸린 자식)"""
+    lines = []
+    for root in [s for s in spans if not s["parent_id"]]:
+        children = [s for s in spans if s["trace_id"] == root["trace_id"] and s["parent_id"]]
+        slowest = max(children, key=lambda s: s["duration_ms"], default=None)
+        line = f"{root['name']} {root['duration_ms']:.1f}ms, 스팬 {len(children) + 1}개"
+        if slowest:
+            line += f", 가장 느린 단계 {slowest['name']} {slowest['duration_ms']:.1f}ms"
+        lines.append(line)
+    return lines
+
+
+def create_collector(out: Path) -> Starlette:
+    async def traces(request):
+        spans = parse_otlp(await request.json())
+        with open(out, "a", encoding="utf-8") as f:
+            for record in spans:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        for line in summarize(spans):
+            print(line, flush=True)
+        return JSONResponse({})
+
+    return Starlette(routes=[Route("/v1/traces", traces, methods=["POST"])])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OTLP/HTTP JSON 수집기 대역")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--out", default="collected_traces.jsonl")
+    args = parser.parse_args()
+    uvicorn.run(create_collector(Path(args.out)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
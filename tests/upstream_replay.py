@@ -0,0 +1,220 @@
+"""
+녹화된 외부 API 응답 재생 (v3.8)
+
+tests/fixtures/upstream/<엔드포인트>.json에 녹화된 기상청/에어코리아/생활기상지수/Kakao 응답을
+공용 HTTP 클라이언트의 전송 계층(upstream.set_http_transport)으로 재생합니다.
+네트워크와 API 키 없이 모든 도구를 같은 조건으로 실행할 수 있어 벤치마크(tests/bench_tools.py)에 사용합니다.
+
+- 엔드포인트: URL 경로 마지막 부분 (getVilageFcst, keyword.json → keyword 등)
+- 녹화 선택: 요청 파라미터가 가장 많이 일치하는 녹화 (날짜/시각/인증키는 비교하지 않음, 없으면 첫 녹화)
+- 날짜 보정: 요청 날짜와 녹화 날짜의 차이만큼 baseDate/fcstDate를 옮김 ("오늘" 예보가 항상 있게)
+- 지연 주입: 업스트림별 고정 지연 + 균등 분포 흔들림 (시드 고정)
+
+RecordingTransport는 실제 API 응답을 같은 형식으로 녹화합니다 (인증키/Authorization 헤더 제외).
+"""
+
+import asyncio
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "upstream"
+
+# 녹화 선택 시 비교하지 않는 파라미터 (호출 시각/인증에 따라 바뀜)
+VOLATILE_PARAMS = {"serviceKey", "base_date", "base_time", "time", "searchDate"}
+
+# 날짜를 옮길 응답 필드 (YYYYMMDD)
+DATE_FIELDS = {"baseDate", "fcstDate"}
+
+# 호스트/경로 → 업스트림 이름 (호출 수 집계용)
+UPSTREAM_PREFIXES = (
+    ("/1360000/VilageFcstInfoService", "kma"),
+    ("/1360000/LivingWthrIdxService", "life_index"),
+    ("/B552584/", "airkorea"),
+    ("/v2/local/", "kakao"),
+)
+
+
+def endpoint_name(url: httpx.URL) -> str:
+    return url.path.rsplit("/", 1)[-1].removesuffix(".json")
+
+
+def upstream_name(url: httpx.URL) -> str:
+    for prefix, name in UPSTREAM_PREFIXES:
+        if url.path.startswith(prefix):
+            return name
+    return url.host
+
+
+def request_date(params: dict) -> Optional[datetime]:
+    """요청 기준 날짜 (base_date, time, searchDate 중 하나)"""
+    value = params.get("base_date") or params.get("time") or params.get("searchDate")
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.replace("-", "")[:8], "%Y%m%d")
+    except ValueError:
+        return None
+
+
+def shift_dates(obj, days: int):
+    """응답 본문의 baseDate/fcstDate를 days일 옮긴 사본"""
+    if isinstance(obj, dict):
+        shifted = {}
+        for key, value in obj.items():
+            if key in DATE_FIELDS and isinstance(value, str) and len(value) == 8 and value.isdigit():
+                value = (datetime.strptime(value, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
+            else:
+                value = shift_dates(value, days)
+            shifted[key] = value
+        return shifted
+    if isinstance(obj, list):
+        return [shift_dates(item, days) for item in obj]
+    return obj
+
+
+def parse_latency(spec: str) -> Dict[str, float]:
+    """"kma=80,kakao=30" 또는 "50" (전체) → {업스트림: 밀리초}, 전체 값은 "*" 키"""
+    latency = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.rpartition("=")
+        latency[name or "*"] = float(value)
+    return latency
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """녹화 응답을 돌려주는 전송 계층"""
+
+    def __init__(
+        self,
+        fixture_dir: Path = FIXTURE_DIR,
+        latency_ms: Optional[Dict[str, float]] = None,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            fixture_dir: 녹화 파일 디렉토리
+            latency_ms: 업스트림별 주입 지연 ({"kma": 80, "*": 30})
+            jitter_ms: 지연에 더할 균등 분포 흔들림 최대값
+            seed: 흔들림 난수 시드
+        """
+        self.fixture_dir = Path(fixture_dir)
+        self.latency_ms = latency_ms or {}
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._fixtures: Dict[str, Optional[dict]] = {}
+        self._bodies: Dict[Tuple[str, int, int], bytes] = {}  # (엔드포인트, 녹화 번호, 날짜 차이) → 본문
+        self.calls: Counter = Counter()  # (업스트림, 엔드포인트) → 호출 수
+        self.missing: Counter = Counter()  # 녹화가 없는 엔드포인트
+
+    def _fixture(self, endpoint: str) -> Optional[dict]:
+        if endpoint not in self._fixtures:
+            path = self.fixture_dir / f"{endpoint}.json"
+            self._fixtures[endpoint] = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else None
+        return self._fixtures[endpoint]
+
+    @staticmethod
+    def _select(recordings: list, params: dict) -> int:
+        def score(recording):
+            recorded = recording.get("request", {})
+            return sum(
+                1 for key, value in params.items()
+                if key not in VOLATILE_PARAMS and str(recorded.get(key)) == value
+            )
+        return max(range(len(recordings)), key=lambda i: (score(recordings[i]), -i))
+
+    def _delay(self, upstream: str) -> float:
+        latency = self.latency_ms.get(upstream, self.latency_ms.get("*", 0.0))
+        if self.jitter_ms:
+            latency += self._rng.uniform(0, self.jitter_ms)
+        return latency / 1000
+
+    def reset_counts(self) -> None:
+        self.calls.clear()
+        self.missing.clear()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_name(request.url)
+        endpoint = endpoint_name(request.url)
+        self.calls[(upstream, endpoint)] += 1
+
+        delay = self._delay(upstream)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        fixture = self._fixture(endpoint)
+        if not fixture or not fixture.get("recordings"):
+            self.missing[endpoint] += 1
+            return httpx.Response(404, json={"error": f"녹화 없음: {endpoint}"}, request=request)
+
+        params = dict(request.url.params)
+        recordings = fixture["recordings"]
+        index = self._select(recordings, params)
+        recording = recordings[index]
+
+        wanted, recorded = request_date(params), request_date(recording.get("request", {}))
+        days = (wanted - recorded).days if wanted and recorded else 0
+        key = (endpoint, index, days)
+        body = self._bodies.get(key)
+        if body is None:
+            payload = shift_dates(recording["body"], days) if days else recording["body"]
+            body = self._bodies[key] = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+        return httpx.Response(
+            recording.get("status", 200),
+            content=body,
+            headers={"content-type": "application/json;charset=UTF-8"},
+            request=request,
+        )
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """실제 API 응답을 녹화 파일 형식으로 저장하는 전송 계층"""
+
+    def __init__(self, fixture_dir: Path = FIXTURE_DIR, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self.fixture_dir = Path(fixture_dir)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self.recorded = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        content = await response.aread()
+        try:
+            body = json.loads(content)
+        except ValueError:
+            body = None
+        if body is not None:
+            self._save(request, response.status_code, body)
+        return httpx.Response(response.status_code, headers=response.headers, content=content, request=request)
+
+    def _save(self, request: httpx.Request, status: int, body) -> None:
+        endpoint = endpoint_name(request.url)
+        path = self.fixture_dir / f"{endpoint}.json"
+        if path.is_file():
+            fixture = json.loads(path.read_text(encoding="utf-8"))
+        else:
+            fixture = {"upstream": upstream_name(request.url), "endpoint": endpoint, "recordings": []}
+
+        params = {k: v for k, v in request.url.params.items() if k != "serviceKey"}
+        stable = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+        # 같은 요청(날짜 제외)의 이전 녹화는 교체
+        fixture["recordings"] = [
+            r for r in fixture["recordings"]
+            if {k: v for k, v in r.get("request", {}).items() if k not in VOLATILE_PARAMS} != stable
+        ]
+        fixture["recordings"].append({"request": params, "status": status, "body": body})
+        fixture["recorded_at"] = datetime.now().astimezone().isoformat(timespec="seconds")
+
+        self.fixture_dir.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(fixture, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+        self.recorded += 1
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
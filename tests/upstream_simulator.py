@@ -0,0 +1,630 @@
+"""
+외부 API 시뮬레이터 (v3.8)
+
+실제 API 한도를 쓰지 않고 부하 테스트를 하기 위한 독립 프로세스입니다.
+래퍼들이 호출하는 기상청/에어코리아/생활기상지수/Kakao 엔드포인트를 실제 응답 형식 그대로 구현하고,
+격자 셀/측정소/지역/검색어마다 정해진(같은 요청이면 항상 같은) 데이터를 생성합니다.
+
+- 날씨: 월별 평년 기온 + 위도(ny) 보정 + 일교차, 강수는 인접 셀끼리 같은 구역 단위로 결정
+- 미세먼지: 시도별 그날 농도 수준 + 측정소/시간별 변동
+- 생활기상지수: 자외선/체감온도/꽃가루/식중독 지수를 계절과 시간대에 맞게 생성
+- Kakao: 검색어/카테고리별 장소를 요청 좌표 반경 안에 생성 (페이지당 최대 15개, 최대 45개)
+
+장애 주입 (업스트림별: kma, airkorea, life_index, kakao):
+- 지연: 중앙값:p99 (ms) 로그정규 분포, 예: --latency kma=80:400,kakao=30
+- 오류율: 일시적 오류 (HTTP 503 또는 data.go.kr XML 오류 01), 예: --error-rate kma=0.02
+- 일일 한도: 넘으면 data.go.kr XML 오류 22 / Kakao HTTP 429, 예: --quota kma=10000
+
+상태 확인: GET /_sim/stats (업스트림/엔드포인트별 호출·주입 오류·한도 사용량), POST /_sim/reset
+
+실행:
+    python -m tests.upstream_simulator --port 8900 --latency kma=80:400,airkorea=60:300 --error-rate 0.01
+    PUBLIC_DATA_API_URL=http://127.0.0.1:8900 KAKAO_API_URL=http://localhost:8900 python src/server.py
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.settings import MEASUREMENT_STATIONS
+from tests.upstream_replay import endpoint_name, upstream_name
+
+
+UPSTREAMS = ("kma", "airkorea", "life_index", "kakao")
+
+# 서울 월별 평년 기온 (1~12월, °C)
+MONTHLY_MEAN_TEMPERATURE = (-2.4, 0.4, 5.7, 12.5, 17.8, 22.2, 24.9, 25.7, 21.2, 14.8, 7.2, 0.4)
+# 월별 강수 확률 (6시간 구간 기준)
+MONTHLY_RAIN_CHANCE = (0.08, 0.08, 0.12, 0.15, 0.17, 0.25, 0.4, 0.35, 0.22, 0.12, 0.15, 0.1)
+
+SEOUL_STATIONS = (
+    "중구", "종로구", "용산구", "광진구", "성동구", "중랑구", "동대문구", "성북구", "도봉구", "은평구", "서대문구", "마포구",
+    "강서구", "구로구", "영등포구", "동작구", "관악구", "강남구", "서초구", "송파구", "강동구", "노원구", "양천구", "금천구", "강북구",
+)
+STATIONS_BY_SIDO = {**MEASUREMENT_STATIONS, "서울": list(SEOUL_STATIONS)}
+
+FORECAST_REGIONS = (
+    "서울", "제주", "전남", "전북", "광주", "경남", "경북", "울산", "대구", "부산",
+    "충남", "충북", "세종", "대전", "영동", "영서", "경기남부", "경기북부", "인천",
+)
+
+# 생활기상지수 엔드포인트 → 지수 코드
+LIFE_INDEX_CODES = {
+    "getUVIdxV4": "A07_1",
+    "getSenTaIdxV4": "A41",
+    "getOakPollenRiskIdxV4": "D07",
+    "getWeedsPollenRiskndxV4": "D06",
+    "getFsnIdxV4": "A01_2",
+}
+
+# Kakao 카테고리 코드 → (그룹 이름, 카테고리 경로, 장소 이름 뒤에 붙일 말)
+KAKAO_CATEGORIES = {
+    "CE7": ("카페", "음식점 > 카페", ("커피", "로스터리", "디저트카페", "베이커리카페")),
+    "FD6": ("음식점", "음식점 > 한식", ("식당", "한정식", "고깃집", "국밥", "비스트로")),
+    "AT4": ("관광명소", "여행 > 관광,명소", ("공원", "전망대", "문화거리", "둘레길")),
+    "CT1": ("문화시설", "문화,예술 > 문화시설", ("미술관", "공연장", "영화관", "전시관")),
+    "SW8": ("지하철역", "교통,수송 > 지하철,전철", ("역",)),
+    "BT1": ("", "교통,수송 > 터미널", ("버스터미널",)),
+    "PK6": ("주차장", "교통,수송 > 주차장", ("공영주차장",)),
+    "MT1": ("대형마트", "가정,생활 > 대형마트", ("마트",)),
+}
+PLACE_NAME_WORDS = ("한빛", "푸른", "중앙", "새봄", "다온", "하늘", "솔숲", "별빛", "온누리", "늘봄", "가람", "여울")
+KAKAO_PAGE_SIZE_MAX = 15
+KAKAO_RESULTS_MAX = 45
+
+# 좌표 없는 검색의 기준 영역 (서울)
+DEFAULT_CENTER = (127.0, 37.55)
+METERS_PER_DEGREE_LAT = 111000
+METERS_PER_DEGREE_LON = 88800
+
+
+def _rng(*parts) -> random.Random:
+    """입력이 같으면 항상 같은 난수열 (프로세스/실행이 달라도)"""
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+
+def parse_spec(spec: str, convert: Callable = float) -> Dict[str, object]:
+    """"kma=80:400,kakao=30" 또는 "0.01" (전체) → {업스트림: 값}, 전체 값은 "*" 키"""
+    values = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.rpartition("=")
+        values[name or "*"] = convert(value)
+    return values
+
+
+def parse_latency(value: str) -> Tuple[float, float]:
+    """"80:400" → (중앙값, p99), "80" → 고정 지연"""
+    median, _, p99 = value.partition(":")
+    return float(median), float(p99 or median)
+
+
+# =============================================================================
+# 데이터 생성 - 기상청
+# =============================================================================
+
+
+def weather_at(nx: int, ny: int, when: datetime) -> dict:
+    """격자 셀의 한 시각 날씨 (기온/습도/바람/하늘/강수)"""
+    month = when.month - 1
+    # 강수/구름은 인접 셀이 같이 움직이도록 10x10 셀 구역, 6시간 구간 단위로 결정
+    block = _rng("sky", nx // 10, ny // 10, when.strftime("%Y%m%d"), when.hour // 6)
+    rainy = block.random() < MONTHLY_RAIN_CHANCE[month]
+    sky = "4" if rainy else block.choice(("1", "1", "3", "4"))
+
+    cell = _rng("cell", nx, ny, when.strftime("%Y%m%d"))
+    day_offset = cell.uniform(-2.5, 2.5)
+    diurnal = 5.0 * math.sin((when.hour - 9) / 24 * 2 * math.pi)
+    temperature = MONTHLY_MEAN_TEMPERATURE[month] - (ny - 127) * 0.04 + day_offset + diurnal - (2.0 if rainy else 0.0)
+
+    hour = _rng("hour", nx, ny, when.strftime("%Y%m%d%H"))
+    wind_speed = round(hour.uniform(0.3, 3.5) + (2.0 if rainy else 0.0), 1)
+    wind_direction = hour.randint(0, 359)
+    radians = math.radians(wind_direction)
+    if rainy:
+        precipitation_type = "3" if temperature < 0 else "1"
+        rain_mm = round(hour.uniform(0.5, 6.0), 1)
+    else:
+        precipitation_type, rain_mm = "0", 0.0
+    return {
+        "temperature": round(temperature, 1),
+        "humidity": min(100, hour.randint(75, 95) if rainy else hour.randint(35, 75)),
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "uuu": round(-wind_speed * math.sin(radians), 1),
+        "vvv": round(-wind_speed * math.cos(radians), 1),
+        "sky": sky,
+        "pty": precipitation_type,
+        "rain_mm": rain_mm,
+        "pop": hour.choice((60, 70, 80)) if rainy else hour.choice((0, 0, 10, 20, 30)),
+    }
+
+
+def _data_go_kr(items: list, page: int = 1, rows: Optional[int] = None, total: Optional[int] = None) -> dict:
+    """data.go.kr JSON 응답 (items를 pageNo/numOfRows로 자름)"""
+    rows = rows or len(items) or 10
+    page_items = items[(page - 1) * rows:page * rows]
+    return {"response": {
+        "header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"},
+        "body": {
+            "dataType": "JSON",
+            "items": {"item": page_items},
+            "pageNo": page,
+            "numOfRows": rows,
+            "totalCount": total if total is not None else len(items),
+        },
+    }}
+
+
+def _base_time(params: dict) -> datetime:
+    return datetime.strptime(params.get("base_date", "") + params.get("base_time", "0000")[:2], "%Y%m%d%H")
+
+
+def ultra_srt_ncst(params: dict) -> dict:
+    """기상청 초단기실황 (getUltraSrtNcst)"""
+    nx, ny = int(params["nx"]), int(params["ny"])
+    base = _base_time(params)
+    weather = weather_at(nx, ny, base)
+    values = [
+        ("PTY", weather["pty"]), ("REH", str(weather["humidity"])), ("RN1", f"{weather['rain_mm']:g}"),
+        ("T1H", f"{weather['temperature']:.1f}"), ("UUU", str(weather["uuu"])), ("VEC", str(weather["wind_direction"])),
+        ("VVV", str(weather["vvv"])), ("WSD", str(weather["wind_speed"])),
+    ]
+    items = [
+        {"baseDate": params["base_date"], "baseTime": params["base_time"], "category": category,
+         "nx": nx, "ny": ny, "obsrValue": value}
+        for category, value in values
+    ]
+    return _data_go_kr(items, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)))
+
+
+def vilage_fcst(params: dict) -> dict:
+    """기상청 단기예보 (getVilageFcst) - 발표 다음 시각부터 3일 뒤 자정 전까지 1시간 간격"""
+    nx, ny = int(params["nx"]), int(params["ny"])
+    base = _base_time(params)
+    end = (base + timedelta(days=4)).replace(hour=0)
+    items = []
+    when = base + timedelta(hours=1)
+    while when < end:
+        weather = weather_at(nx, ny, when)
+        values = [
+            ("TMP", str(round(weather["temperature"]))), ("UUU", str(weather["uuu"])), ("VVV", str(weather["vvv"])),
+            ("VEC", str(weather["wind_direction"])), ("WSD", str(weather["wind_speed"])), ("SKY", weather["sky"]),
+            ("PTY", weather["pty"]), ("POP", str(weather["pop"])), ("WAV", "0"),
+            ("PCP", f"{weather['rain_mm']}mm" if weather["pty"] == "1" else "강수없음"),
+            ("REH", str(weather["humidity"])),
+            ("SNO", f"{weather['rain_mm']}cm" if weather["pty"] == "3" else "적설없음"),
+        ]
+        if when.hour == 6:
+            values.append(("TMN", f"{round(weather_at(nx, ny, when.replace(hour=5))['temperature']):.1f}"))
+        if when.hour == 15:
+            values.append(("TMX", f"{round(weather['temperature'] + 0.5):.1f}"))
+        fcst_date, fcst_time = when.strftime("%Y%m%d"), when.strftime("%H00")
+        items.extend(
+            {"baseDate": params["base_date"], "baseTime": params["base_time"], "category": category,
+             "fcstDate": fcst_date, "fcstTime": fcst_time, "fcstValue": value, "nx": nx, "ny": ny}
+            for category, value in values
+        )
+        when += timedelta(hours=1)
+    return _data_go_kr(items, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)))
+
+
+# =============================================================================
+# 데이터 생성 - 에어코리아
+# =============================================================================
+
+
+def _grade(value: float, bounds: Tuple[float, float, float]) -> str:
+    """에어코리아 등급 (1 좋음 ~ 4 매우나쁨)"""
+    return str(1 + sum(value > bound for bound in bounds))
+
+
+def _sido_of(station: str) -> str:
+    for sido, stations in STATIONS_BY_SIDO.items():
+        if station in stations:
+            return sido
+    return "서울"
+
+
+def station_measurement(sido: str, station: str, when: datetime) -> dict:
+    """측정소 한 시각 측정값 (시도별 그날 수준 + 측정소/시간 변동)"""
+    level = _rng("air", sido, when.strftime("%Y%m%d")).choice((0.6, 0.8, 1.0, 1.0, 1.3, 1.8, 2.6))
+    hour = _rng("air", station, when.strftime("%Y%m%d%H"))
+    pm10 = max(3, round(level * hour.uniform(22, 45)))
+    pm25 = max(1, round(pm10 * hour.uniform(0.4, 0.6)))
+    o3 = round(hour.uniform(0.01, 0.05) * (1.5 if 12 <= when.hour <= 17 else 1.0), 3)
+    no2 = round(hour.uniform(0.008, 0.04), 3)
+    khai = max(pm10 + 20, round(o3 * 1500))
+    return {
+        "stationName": station, "sidoName": sido, "dataTime": when.strftime("%Y-%m-%d %H:00"),
+        "pm10Value": str(pm10), "pm10Grade": _grade(pm10, (30, 80, 150)), "pm10Flag": None,
+        "pm25Value": str(pm25), "pm25Grade": _grade(pm25, (15, 35, 75)), "pm25Flag": None,
+        "o3Value": f"{o3:.3f}", "o3Grade": _grade(o3, (0.03, 0.09, 0.15)), "o3Flag": None,
+        "no2Value": f"{no2:.3f}", "no2Grade": _grade(no2, (0.03, 0.06, 0.2)), "no2Flag": None,
+        "so2Value": "0.003", "so2Grade": "1", "so2Flag": None,
+        "coValue": f"{hour.uniform(0.2, 0.7):.1f}", "coGrade": "1", "coFlag": None,
+        "khaiValue": str(khai), "khaiGrade": _grade(khai, (50, 100, 250)),
+    }
+
+
+def _air(items: list, page: int = 1, rows: Optional[int] = None) -> dict:
+    """에어코리아 JSON 응답 (items가 바로 목록)"""
+    rows = rows or len(items) or 10
+    return {"response": {
+        "body": {"totalCount": len(items), "items": items[(page - 1) * rows:page * rows], "pageNo": page, "numOfRows": rows},
+        "header": {"resultMsg": "NORMAL_CODE", "resultCode": "00"},
+    }}
+
+
+def _now_hour() -> datetime:
+    return datetime.now().replace(minute=0, second=0, microsecond=0)
+
+
+def station_realtime(params: dict, now: datetime) -> dict:
+    """측정소별 실시간 측정정보 (getMsrstnAcctoRltmMesureDnsty) - 최근 시각부터 1시간 간격"""
+    station = params.get("stationName", "")
+    sido = _sido_of(station)
+    items = [station_measurement(sido, station, now - timedelta(hours=h)) for h in range(24)]
+    return _air(items, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)))
+
+
+def sido_realtime(params: dict, now: datetime) -> dict:
+    """시도별 실시간 측정정보 (getCtprvnRltmMesureDnsty) - 없는 시도는 빈 목록"""
+    sido = params.get("sidoName", "")
+    items = [station_measurement(sido, station, now) for station in STATIONS_BY_SIDO.get(sido, ())]
+    return _air(items, int(params.get("pageNo", 1)), int(params.get("numOfRows", 10)))
+
+
+def dust_forecast(params: dict) -> dict:
+    """대기질 예보통보 (getMinuDustFrcstDspth) - 조회일/다음날 PM10, PM25, O3"""
+    search = datetime.strptime(params.get("searchDate", datetime.now().strftime("%Y-%m-%d")), "%Y-%m-%d")
+    labels = ("좋음", "보통", "나쁨", "매우나쁨")
+    items = []
+    for day in (search, search + timedelta(days=1)):
+        for code in ("PM10", "PM25", "O3"):
+            grades = []
+            for region in FORECAST_REGIONS:
+                level = _rng("air", region, day.strftime("%Y%m%d")).choice((0, 1, 1, 1, 2, 2, 3))
+                grades.append(f"{region} : {labels[max(0, level - 1) if code == 'O3' else min(level, 3)]}")
+            items.append({
+                "informCode": code,
+                "informData": day.strftime("%Y-%m-%d"),
+                "dataTime": f"{search.strftime('%Y-%m-%d')} 05시 발표",
+                "informOverall": f"○ [{code}] 권역별 예보를 참고하세요.",
+                "informCause": f"○ [{code}] 대기 확산 상황에 따라 농도가 달라질 것으로 예상됩니다.",
+                "informGrade": ",".join(grades),
+            })
+    return _air(items, int(params.get("pageNo", 1)), int(params.get("numOfRows", 100)))
+
+
+def nearby_stations(params: dict) -> dict:
+    """근접측정소 목록 (getNearbyMsrstnList) - TM 좌표마다 정해진 가까운 측정소 3곳"""
+    rng = _rng("nearby", round(float(params.get("tmX", 0)), -2), round(float(params.get("tmY", 0)), -2))
+    stations = rng.sample(SEOUL_STATIONS, 3)
+    distances = sorted(round(rng.uniform(0.3, 4.0), 1) for _ in stations)
+    items = [
+        {"stationName": station, "addr": f"서울 {station} 측정소", "tm": distance}
+        for station, distance in zip(stations, distances)
+    ]
+    return _air(items)
+
+
+# =============================================================================
+# 데이터 생성 - 생활기상지수
+# =============================================================================
+
+
+def life_index(endpoint: str, params: dict) -> dict:
+    """생활기상지수 (h0 = 발표 시각, 3시간 간격 h75까지)"""
+    area = params.get("areaNo", "")
+    base = datetime.strptime(params.get("time", "")[:10], "%Y%m%d%H")
+    code = LIFE_INDEX_CODES[endpoint]
+    nx, ny = 60 + zlib.crc32(area.encode()) % 40, 70 + zlib.crc32(area[::-1].encode()) % 60
+    item = {"code": code, "areaNo": area, "date": params["time"]}
+    for offset in range(0, 76, 3):
+        when = base + timedelta(hours=offset)
+        weather = weather_at(nx, ny, when)
+        if endpoint == "getUVIdxV4":
+            sun = max(0.0, math.sin((when.hour - 6) / 12 * math.pi)) * (0.4 if weather["sky"] == "4" else 1.0)
+            value = round(sun * (3 + 6 * (1 - abs(when.month - 7) / 6)))
+        elif endpoint == "getSenTaIdxV4":
+            value = round(weather["temperature"] + (weather["humidity"] - 50) * 0.05)
+        elif endpoint == "getFsnIdxV4":
+            value = max(0, min(100, round(weather["temperature"] * 3 + weather["humidity"] * 0.3)))
+        else:
+            # 꽃가루 위험도 0~3 (참나무 4~6월, 잡초류 8~10월)
+            season = (4, 5, 6) if endpoint == "getOakPollenRiskIdxV4" else (8, 9, 10)
+            value = _rng("pollen", area, when.strftime("%Y%m%d")).randint(1, 3) if when.month in season else 0
+        item[f"h{offset}"] = str(value)
+    return _data_go_kr([item])
+
+
+# =============================================================================
+# 데이터 생성 - Kakao 로컬
+# =============================================================================
+
+
+def _center(params: dict, query: str) -> Tuple[float, float]:
+    """요청 좌표, 없으면 검색어마다 정해진 서울 안 좌표"""
+    if params.get("x") and params.get("y"):
+        return float(params["x"]), float(params["y"])
+    rng = _rng("center", query)
+    return DEFAULT_CENTER[0] + rng.uniform(-0.12, 0.12), DEFAULT_CENTER[1] + rng.uniform(-0.08, 0.08)
+
+
+def _place_name(rng: random.Random, query: str, category: str, suffixes: tuple) -> str:
+    word = rng.choice(PLACE_NAME_WORDS)
+    if category == "SW8":
+        return f"{word}역 {rng.randint(1, 9)}호선"
+    if query:
+        return f"{word} {query.split()[-1]} {query.split()[0]}점" if " " in query else f"{word} {query}"
+    return f"{word} {rng.choice(suffixes)}"
+
+
+def _kakao_places(params: dict, query: str, category: str) -> dict:
+    center_x, center_y = _center(params, query)
+    radius = min(int(params.get("radius", 20000)), 20000)
+    size = min(int(params.get("size", KAKAO_PAGE_SIZE_MAX)), KAKAO_PAGE_SIZE_MAX)
+    page = int(params.get("page", 1))
+    group_name, path, suffixes = KAKAO_CATEGORIES.get(category, ("", "가정,생활 > 생활편의", ("",)))
+
+    rng = _rng("kakao", query, category, round(center_x, 3), round(center_y, 3), radius)
+    total = rng.randint(3, 120) if category not in ("SW8", "BT1") else rng.randint(1, 4)
+    pageable = min(total, KAKAO_RESULTS_MAX)
+    area = query.split()[0] if " " in query else "중구"
+    documents = []
+    for index in range(pageable):
+        place_id = 10000000 + zlib.crc32(f"{query}|{category}|{center_x:.3f}|{center_y:.3f}|{index}".encode()) % 89999999
+        distance = rng.uniform(30, radius)
+        angle = rng.uniform(0, 2 * math.pi)
+        x = center_x + distance * math.cos(angle) / METERS_PER_DEGREE_LON
+        y = center_y + distance * math.sin(angle) / METERS_PER_DEGREE_LAT
+        documents.append({
+            "id": str(place_id),
+            "place_name": _place_name(rng, query, category, suffixes),
+            "category_name": path,
+            "category_group_code": category,
+            "category_group_name": group_name,
+            "phone": f"02-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+            "address_name": f"서울 {area} {rng.randint(1, 999)}-{rng.randint(1, 99)}",
+            "road_address_name": f"서울 {area} {rng.choice(('중앙로', '대학로', '공원로', '역로'))} {rng.randint(1, 300)}",
+            "x": f"{x:.13f}",
+            "y": f"{y:.13f}",
+            "place_url": f"http://place.map.kakao.com/{place_id}",
+            "distance": str(round(distance)) if params.get("x") else "",
+        })
+    if params.get("sort") == "distance":
+        documents.sort(key=lambda d: int(d["distance"] or 0))
+
+    meta = {"total_count": total, "pageable_count": pageable, "is_end": page * size >= pageable}
+    if query:
+        meta["same_name"] = {"keyword": query, "region": [], "selected_region": ""}
+    return {"documents": documents[(page - 1) * size:page * size], "meta": meta}
+
+
+def kakao_keyword(params: dict) -> dict:
+    """키워드로 장소 검색 (search/keyword.json)"""
+    return _kakao_places(params, params.get("query", ""), params.get("category_group_code", ""))
+
+
+def kakao_category(params: dict) -> dict:
+    """카테고리로 장소 검색 (search/category.json)"""
+    return _kakao_places(params, "", params.get("category_group_code", ""))
+
+
+def kakao_address(params: dict) -> dict:
+    """주소 검색 (search/address.json) - 검색어마다 정해진 서울 안 좌표 1건"""
+    query = params.get("query", "").strip()
+    if len(query) < 2:
+        return {"documents": [], "meta": {"total_count": 0, "pageable_count": 0, "is_end": True}}
+    x, y = _center({}, query)
+    document = {
+        "address_name": query, "address_type": "REGION", "address": None, "road_address": None,
+        "x": f"{x:.12f}", "y": f"{y:.12f}",
+    }
+    return {"documents": [document], "meta": {"total_count": 1, "pageable_count": 1, "is_end": True}}
+
+
+# 엔드포인트 → (생성 함수, 현재 시각에 따라 바뀌는지)
+ENDPOINTS: Dict[str, Tuple[Callable, bool]] = {
+    "getUltraSrtNcst": (ultra_srt_ncst, False),
+    "getVilageFcst": (vilage_fcst, False),
+    "getMsrstnAcctoRltmMesureDnsty": (station_realtime, True),
+    "getCtprvnRltmMesureDnsty": (sido_realtime, True),
+    "getMinuDustFrcstDspth": (dust_forecast, False),
+    "getNearbyMsrstnList": (nearby_stations, False),
+    **{endpoint: (lambda params, endpoint=endpoint: life_index(endpoint, params), False) for endpoint in LIFE_INDEX_CODES},
+    "keyword": (kakao_keyword, False),
+    "category": (kakao_category, False),
+    "address": (kakao_address, False),
+}
+
+
+@lru_cache(maxsize=4096)
+def render(endpoint: str, params: Tuple[Tuple[str, str], ...], now: Optional[datetime] = None) -> bytes:
+    """응답 본문 (같은 요청은 다시 만들지 않음 - 시뮬레이터가 부하 테스트의 병목이 되지 않게)"""
+    generate, uses_now = ENDPOINTS[endpoint]
+    body = generate(dict(params), now) if uses_now else generate(dict(params))
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+# =============================================================================
+# 장애 주입 + 서버
+# =============================================================================
+
+
+def data_go_kr_error(code: str, message: str) -> Response:
+    """data.go.kr 오류 응답 (HTTP 200 + XML)"""
+    body = (
+        "<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>"
+        f"<returnAuthMsg>{message}</returnAuthMsg><returnReasonCode>{code}</returnReasonCode>"
+        "</cmmMsgHeader></OpenAPI_ServiceResponse>"
+    )
+    return Response(body, media_type="text/xml;charset=UTF-8")
+
+
+class UpstreamSimulator:
+    """요청 처리 + 업스트림별 지연/오류/한도 주입"""
+
+    def __init__(
+        self,
+        latency_ms: Optional[Dict[str, Tuple[float, float]]] = None,
+        error_rate: Optional[Dict[str, float]] = None,
+        quota: Optional[Dict[str, int]] = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            latency_ms: 업스트림별 (중앙값, p99) 지연 ({"kma": (80, 400), "*": (30, 30)})
+            error_rate: 업스트림별 일시적 오류 비율 (0~1)
+            quota: 업스트림별 일일 호출 한도 (없으면 무제한)
+            seed: 지연/오류 주입 난수 시드
+        """
+        self.latency_ms = latency_ms or {}
+        self.error_rate = error_rate or {}
+        self.quota = quota or {}
+        self._rng = random.Random(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls: Counter = Counter()  # (업스트림, 엔드포인트) → 호출 수
+        self.injected: Counter = Counter()  # (업스트림, 종류) → 주입한 오류 수
+        self.used: Counter = Counter()  # 업스트림 → 오늘 사용한 한도
+        self._quota_day = datetime.now().date()
+
+    def _setting(self, table: dict, upstream: str, default):
+        return table.get(upstream, table.get("*", default))
+
+    def _delay(self, upstream: str) -> float:
+        """로그정규 분포 지연 (초) - 중앙값과 p99로 분산을 정함"""
+        median, p99 = self._setting(self.latency_ms, upstream, (0.0, 0.0))
+        if median <= 0:
+            return 0.0
+        sigma = math.log(p99 / median) / 2.326 if p99 > median else 0.0
+        return median * math.exp(self._rng.gauss(0, sigma)) / 1000
+
+    def _quota_exceeded(self, upstream: str) -> bool:
+        today = datetime.now().date()
+        if today != self._quota_day:
+            self.used.clear()
+            self._quota_day = today
+        limit = self._setting(self.quota, upstream, 0)
+        if limit and self.used[upstream] >= limit:
+            return True
+        self.used[upstream] += 1
+        return False
+
+    def _injected_error(self, upstream: str, kind: str) -> Response:
+        self.injected[(upstream, kind)] += 1
+        if kind == "quota":
+            if upstream == "kakao":
+                return JSONResponse({"errorType": "RateLimitExceeded", "message": "API limit has been exceeded."}, 429)
+            return data_go_kr_error("22", "LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR")
+        if kind == "auth":
+            if upstream == "kakao":
+                return JSONResponse({"errorType": "AccessDeniedError", "message": "cannot find appkey"}, 401)
+            return data_go_kr_error("30", "SERVICE_KEY_IS_NOT_REGISTERED_ERROR")
+        if upstream != "kakao" and self._rng.random() < 0.5:
+            return data_go_kr_error("01", "APPLICATION_ERROR")
+        return Response("Service Unavailable", status_code=503)
+
+    async def handle(self, request: Request) -> Response:
+        upstream = upstream_name(request.url)
+        endpoint = endpoint_name(request.url)
+        if endpoint not in ENDPOINTS:
+            return Response("Not Found", status_code=404)
+        self.calls[(upstream, endpoint)] += 1
+
+        delay = self._delay(upstream)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        params = dict(request.query_params)
+        if upstream == "kakao":
+            if not request.headers.get("authorization", "").startswith("KakaoAK "):
+                return self._injected_error(upstream, "auth")
+        elif not params.pop("serviceKey", None):
+            return self._injected_error(upstream, "auth")
+        if self._quota_exceeded(upstream):
+            return self._injected_error(upstream, "quota")
+        if self._rng.random() < self._setting(self.error_rate, upstream, 0.0):
+            return self._injected_error(upstream, "transient")
+
+        uses_now = ENDPOINTS[endpoint][1]
+        try:
+            body = render(endpoint, tuple(sorted(params.items())), _now_hour() if uses_now else None)
+        except (KeyError, ValueError):
+            # 필수 파라미터 누락/형식 오류 (data.go.kr 10, Kakao 400)
+            if upstream == "kakao":
+                return JSONResponse({"errorType": "InvalidArgument", "message": "invalid parameter"}, 400)
+            return data_go_kr_error("10", "INVALID_REQUEST_PARAMETER_ERROR")
+        return Response(body, media_type="application/json;charset=UTF-8")
+
+    def stats(self) -> dict:
+        by_upstream: Counter = Counter()
+        for (upstream, _), count in self.calls.items():
+            by_upstream[upstream] += count
+        return {
+            "calls": dict(by_upstream),
+            "calls_by_endpoint": {f"{u}/{e}": count for (u, e), count in sorted(self.calls.items())},
+            "injected_errors": {f"{u}/{kind}": count for (u, kind), count in sorted(self.injected.items())},
+            "quota_used": dict(self.used),
+            "quota_limit": {u: self._setting(self.quota, u, 0) for u in UPSTREAMS},
+        }
+
+
+def create_simulator(simulator: UpstreamSimulator) -> Starlette:
+    async def stats(request):
+        return JSONResponse(simulator.stats())
+
+    async def reset(request):
+        simulator.reset()
+        return JSONResponse({"reset": True})
+
+    return Starlette(routes=[
+        Route("/_sim/stats", stats),
+        Route("/_sim/reset", reset, methods=["POST"]),
+        Route("/{path:path}", simulator.handle),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="외부 API 시뮬레이터 (기상청/에어코리아/생활기상지수/Kakao)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", default="kma=80:400,airkorea=60:300,life_index=50:250,kakao=30:150",
+                        help="업스트림별 지연 중앙값:p99 (ms), 예: kma=80:400,kakao=30 또는 50:200")
+    parser.add_argument("--error-rate", default="0", help="업스트림별 일시적 오류 비율, 예: kma=0.02 또는 0.01")
+    parser.add_argument("--quota", default="", help="업스트림별 일일 호출 한도, 예: kma=10000,kakao=100000")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    simulator = UpstreamSimulator(
+        latency_ms=parse_spec(args.latency, parse_latency),
+        error_rate=parse_spec(args.error_rate),
+        quota=parse_spec(args.quota, int),
+        seed=args.seed,
+    )
+    print(f"외부 API 시뮬레이터: http://{args.host}:{args.port}", flush=True)
+    print(f"  PUBLIC_DATA_API_URL=http://{args.host}:{args.port} KAKAO_API_URL=http://localhost:{args.port}", flush=True)
+    uvicorn.run(create_simulator(simulator), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()